@@ -11,6 +11,7 @@ from app.db.session import get_db
 from app.core.security import verify_token
 from app.repositories.user_repository import UserRepository
 from app.models.user import AppUser
+from app.services.reference_data import user_role_name
 from app.core.logging_config import logger
 
 # OAuth2 scheme for token authentication
@@ -58,9 +59,9 @@ def get_current_user(
         logger.warning(f"Invalid user_id in token: {user_id_str}")
         raise credentials_exception
 
-    # Get user from database
+    # Get user from database (the role comes from the reference data cache)
     user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
+    user = user_repo.get_by_id(user_id, with_role=False)
 
     if user is None:
         logger.warning(f"User not found: {user_id}")
@@ -84,7 +85,7 @@ def get_current_admin(
     Raises:
         HTTPException: If user is not an admin
     """
-    if not current_user.role or current_user.role.name != "Admin":
+    if user_role_name(current_user) != "Admin":
         logger.warning(f"Non-admin user attempted admin action: {current_user.id}")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -109,7 +110,7 @@ def get_current_researcher_or_admin(
     Raises:
         HTTPException: If user is not a researcher or admin
     """
-    if not current_user.role or current_user.role.name not in ["Researcher", "Admin"]:
+    if user_role_name(current_user) not in ["Researcher", "Admin"]:
         logger.warning(f"Unauthorized user attempted researcher action: {current_user.id}")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -3,7 +3,7 @@ Admin endpoints.
 Requires admin role.
 """
 
-from typing import List
+from typing import Any, Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.db.session import get_db
@@ -15,6 +15,8 @@ from app.schemas.user import UserResponse, UserUpdateRole
 from app.schemas.common import MessageResponse, HealthCheckResponse
 from app.models.user import AppUser
 from app.models.pollutant import Pollutant
+from app.services.recommendation_service import recommendation_reuse_cache
+from app.services.reference_data import reference_data
 from app.core.logging_config import logger
 
 router = APIRouter()
@@ -84,6 +86,7 @@ def create_station(
     )
 
     logger.info(f"Station created by admin {current_admin.id}: {station.id}")
+    reference_data.refresh()
 
     return StationResponse.model_validate(station)
 
@@ -112,6 +115,7 @@ def update_station(
         )
 
     logger.info(f"Station updated by admin {current_admin.id}: {station_id}")
+    reference_data.refresh()
 
     return StationResponse.model_validate(station)
 
@@ -136,6 +140,7 @@ def delete_station(
         )
 
     logger.info(f"Station deleted by admin {current_admin.id}: {station_id}")
+    reference_data.refresh()
 
     return MessageResponse(message=f"Station {station_id} deleted successfully")
 
@@ -181,3 +186,50 @@ def update_user_role(
 
     return UserResponse.model_validate(user)
 
+
+
+# Recommendation statistics
+@router.get("/recommendations/reuse-stats", response_model=Dict[str, int])
+def get_recommendation_reuse_stats(
+    current_admin: AppUser = Depends(get_current_admin)
+):
+    """
+    Get recommendation reuse counters for this API process (admin only).
+
+    Returns how many recommendations were reused from the in-process cache,
+    reused from the database, or newly generated.
+    """
+    return recommendation_reuse_cache.stats()
+
+
+# Reference data cache
+@router.get("/reference-data", response_model=Dict[str, Any])
+def get_reference_data_stats(
+    current_admin: AppUser = Depends(get_current_admin)
+):
+    """
+    Get the state of the reference data cache of this API process (admin only).
+
+    Returns the snapshot version and load time, the number of cached
+    pollutants, stations and roles, and lookup hits and misses.
+    """
+    return reference_data.stats()
+
+
+@router.post("/reference-data/refresh", response_model=Dict[str, Any])
+def refresh_reference_data(
+    current_admin: AppUser = Depends(get_current_admin)
+):
+    """
+    Reload the reference data cache of this API process (admin only).
+
+    Useful after editing pollutants, stations or roles directly in the
+    database; other processes pick the change up on their periodic refresh.
+    """
+    if reference_data.refresh() is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Reference data could not be reloaded"
+        )
+    logger.info(f"Reference data refreshed by admin {current_admin.id}")
+    return reference_data.stats()
@@ -3,14 +3,21 @@ Air quality endpoints.
 Uses Builder and Strategy patterns.
 """
 
-from typing import Optional, List
-from datetime import date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from typing import AsyncIterator, Optional, List
+from datetime import date, datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.db.session import get_db
 from app.services.air_quality_service import AirQualityService
-from app.schemas.air_quality import CurrentAQIResponse, DailyStatsResponse, HistoricalDataResponse
+from app.schemas.air_quality import (
+    CurrentAQIResponse, DailyStatsResponse, HistoricalDataResponse, StationsHistoricalDataResponse,
+    TimeSeriesResponse, DownsampledSeriesResponse
+)
 from app.services.dashboard_service import DashboardResponseSchema
+from app.services.live_update_service import live_update_broadcaster
 
 router = APIRouter()
 
@@ -95,7 +102,52 @@ def get_daily_stats(
     return stats
 
 
-@router.get("/historical/7-days", response_model=HistoricalDataResponse)
+@router.get("/historical", response_model=StationsHistoricalDataResponse)
+def get_historical_data(
+    station_id: List[int] = Query(..., description="Station IDs (repeatable)"),
+    start_date: Optional[date] = Query(None, description="Start date (defaults to HISTORICAL_DEFAULT_DAYS before end_date)"),
+    end_date: Optional[date] = Query(None, description="End date (defaults to today)"),
+    pollutant_id: Optional[List[int]] = Query(None, description="Pollutant IDs (repeatable); all pollutants if omitted"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get daily averages of one or more stations for any date range.
+
+    Returns the daily average value and AQI of each pollutant, per station,
+    for comparison charts over days to years. Served from the hourly rollup
+    with a single query for all stations.
+    """
+    if len(station_id) > settings.HISTORICAL_MAX_STATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.HISTORICAL_MAX_STATIONS} stations per request"
+        )
+
+    end_date = end_date or date.today()
+    start_date = start_date or _window_start(end_date, settings.HISTORICAL_DEFAULT_DAYS)
+
+    air_quality_service = AirQualityService(db)
+
+    try:
+        result = air_quality_service.get_historical_data(
+            station_ids=station_id,
+            start_date=start_date,
+            end_date=end_date,
+            pollutant_ids=pollutant_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Station not found (requested: {station_id})"
+        )
+
+    return result
+
+
+@router.get("/historical/7-days", response_model=HistoricalDataResponse, deprecated=True)
 def get_7_day_historical_data(
     station_id: int = Query(..., description="Station ID to get historical data for"),
     end_date: Optional[date] = Query(None, description="End date (defaults to today)"),
@@ -105,7 +157,8 @@ def get_7_day_historical_data(
     Get 7-day historical data for all pollutants at a specific station.
 
     Returns daily average values for all pollutants in the same date range,
-    allowing for easy comparison in a single chart.
+    allowing for easy comparison in a single chart. Superseded by
+    /historical, which accepts any range, several stations and a pollutant filter.
 
     Args:
         station_id: The station ID to get data for
@@ -120,12 +173,9 @@ def get_7_day_historical_data(
     if end_date is None:
         end_date = date.today()
 
-    # Calculate start_date (7 days before end_date)
-    start_date = end_date - timedelta(days=6)
-
     result = air_quality_service.get_7_day_historical_data(
         station_id=station_id,
-        start_date=start_date,
+        start_date=_window_start(end_date, 7),
         end_date=end_date
     )
 
@@ -138,3 +188,172 @@ def get_7_day_historical_data(
     return result
 
 
+def _window_start(end_date: date, days: int) -> date:
+    """First day of a window of `days` days ending on end_date (inclusive)."""
+    return end_date - timedelta(days=days - 1)
+
+
+@router.get("/series", response_model=TimeSeriesResponse)
+def get_time_series(
+    station_id: int = Query(..., description="Station ID"),
+    start: datetime = Query(..., description="Range start (ISO 8601, UTC if no offset)"),
+    end: Optional[datetime] = Query(None, description="Range end (defaults to now)"),
+    resolution: str = Query("auto", pattern="^(auto|raw|hourly|daily)$",
+                            description="auto, raw, hourly or daily"),
+    pollutant_id: Optional[int] = Query(None, description="Filter by pollutant ID"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a station's time series for an arbitrary range.
+
+    With `resolution=auto` the data tier is chosen from the range length:
+    raw readings for a few hours, the hourly rollup up to a month (e.g. the
+    24h chart) and daily aggregates for longer ranges. Each point carries
+    the average, minimum and maximum value, the average AQI and the number
+    of readings aggregated.
+    """
+    air_quality_service = AirQualityService(db)
+
+    try:
+        result = air_quality_service.get_time_series(
+            station_id=station_id,
+            start=start,
+            end=end or datetime.now(timezone.utc),
+            resolution=resolution,
+            pollutant_id=pollutant_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Station with ID {station_id} not found"
+        )
+
+    return result
+
+
+@router.get("/series/downsampled", response_model=DownsampledSeriesResponse)
+def get_downsampled_series(
+    station_id: int = Query(..., description="Station ID"),
+    start: datetime = Query(..., description="Range start (ISO 8601, UTC if no offset)"),
+    end: Optional[datetime] = Query(None, description="Range end (defaults to now)"),
+    points: int = Query(500, ge=3, le=settings.DOWNSAMPLE_MAX_POINTS,
+                        description="Most points per pollutant"),
+    method: str = Query("lttb", pattern="^(lttb|minmax)$", description="lttb or minmax"),
+    pollutant_id: Optional[int] = Query(None, description="Filter by pollutant ID"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a station's time series reduced to at most `points` per pollutant.
+
+    Meant for long-range charts (years of data): the full series is read
+    server-side and downsampled with Largest-Triangle-Three-Buckets (`lttb`,
+    keeps the visual shape) or the minimum and maximum of each bucket
+    (`minmax`, keeps every peak), so the payload stays small.
+    """
+    air_quality_service = AirQualityService(db)
+
+    try:
+        result = air_quality_service.get_downsampled_series(
+            station_id=station_id,
+            start=start,
+            end=end or datetime.now(timezone.utc),
+            points=points,
+            method=method,
+            pollutant_id=pollutant_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Station with ID {station_id} not found"
+        )
+
+    return result
+
+
+@router.get("/stream")
+async def stream_readings(
+    request: Request,
+    station_id: Optional[List[int]] = Query(None, description="Station IDs to follow (repeatable); all stations if omitted")
+):
+    """
+    Stream new readings with Server-Sent Events.
+
+    Replaces polling /dashboard: an event is pushed as soon as the ingestion
+    service commits new readings for a followed station. Each `reading`
+    event carries `{"station_id": ..., "readings": [...]}` with the latest
+    value per pollutant (`readings` is null if the client should refetch).
+    Idle connections receive a comment line every few seconds as keep-alive.
+    """
+    if not settings.LIVE_UPDATES_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live updates are disabled"
+        )
+
+    async def event_stream() -> AsyncIterator[str]:
+        subscription = live_update_broadcaster.subscribe(station_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                payload = await subscription.next_message(settings.LIVE_UPDATES_KEEPALIVE_SECONDS)
+                if payload is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: reading\ndata: {payload}\n\n"
+        finally:
+            live_update_broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering (nginx) so events are delivered immediately
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.websocket("/ws")
+async def readings_websocket(
+    websocket: WebSocket,
+    station_id: Optional[List[int]] = Query(None)
+):
+    """
+    Push new readings over a WebSocket.
+
+    Same messages as /stream, sent as JSON text frames. Stations are chosen
+    with repeatable `station_id` query parameters (all stations if omitted).
+    """
+    if not settings.LIVE_UPDATES_ENABLED:
+        await websocket.close(code=1013)
+        return
+
+    await websocket.accept()
+    subscription = live_update_broadcaster.subscribe(station_id)
+
+    # Clients do not send anything; reading only detects disconnection
+    async def wait_for_disconnect() -> None:
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    disconnect = asyncio.create_task(wait_for_disconnect())
+    try:
+        while not disconnect.done():
+            payload = await subscription.next_message(settings.LIVE_UPDATES_KEEPALIVE_SECONDS)
+            if payload is not None:
+                await websocket.send_text(payload)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnect.cancel()
+        live_update_broadcaster.unsubscribe(subscription)
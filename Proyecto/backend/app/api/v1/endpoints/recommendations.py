@@ -30,6 +30,10 @@ def get_current_recommendation(
     - User role (Citizen, Researcher, Admin)
     - Location
 
+    If the user already received a recommendation for the same location and
+    AQI category within RECOMMENDATION_REUSE_WINDOW_MINUTES, that recommendation
+    is returned instead of creating a new one.
+
     The recommendation is saved to the database and includes:
     - Health advice
     - Recommended actions
@@ -10,6 +10,7 @@ from app.api.deps import get_current_user
 from app.repositories.report_repository import ReportRepository
 from app.schemas.report import ReportCreate, ReportResponse
 from app.models.user import AppUser
+from app.services.reference_data import user_role_name
 from app.core.logging_config import logger
 
 router = APIRouter()
@@ -92,7 +93,7 @@ def get_report(
         )
 
     # Check ownership (unless admin)
-    if report.user_id != current_user.id and current_user.role.name != "Admin":
+    if report.user_id != current_user.id and user_role_name(current_user) != "Admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to access this report"
@@ -10,6 +10,7 @@ from app.api.deps import get_current_user
 from app.repositories.station_repository import StationRepository
 from app.schemas.station import StationResponse
 from app.services.air_quality_service import AirQualityService
+from app.services.reference_data import reference_data
 from app.schemas.air_quality import CurrentReadingResponse
 from app.models.user import AppUser
 
@@ -55,8 +56,7 @@ def get_station(
     """
     Get a specific station by ID.
     """
-    station_repo = StationRepository(db)
-    station = station_repo.get_by_id(station_id)
+    station = reference_data.station(station_id) or StationRepository(db).get_by_id(station_id)
 
     if not station:
         raise HTTPException(
@@ -51,6 +51,48 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+    # Recommendations
+    # Reuse an identical stored recommendation (same template, location and AQI)
+    # instead of inserting new recommendation/product rows on every request.
+    # Not time bound on purpose: an identical recommendation of any age is
+    # returned as stored, with its original created_at
+    RECOMMENDATION_DEDUPLICATE: bool = False
+    # Return the user's latest recommendation for the same location and AQI
+    # category if it is younger than this many minutes (0 disables reuse)
+    RECOMMENDATION_REUSE_WINDOW_MINUTES: int = 0
+
+    # Live updates (SSE / WebSocket push of new readings)
+    # Listen for ingestion NOTIFY messages and push them to connected clients
+    LIVE_UPDATES_ENABLED: bool = True
+    # Must match READINGS_NOTIFY_CHANNEL in the ingestion service
+    READINGS_NOTIFY_CHANNEL: str = "air_quality_readings"
+    # Messages buffered per client before the oldest are dropped
+    LIVE_UPDATES_CLIENT_QUEUE_SIZE: int = 100
+    # Seconds between keep-alive messages on idle connections
+    LIVE_UPDATES_KEEPALIVE_SECONDS: int = 15
+
+    # Reference data cache (pollutants, stations, roles served from memory)
+    # Seconds between background reloads; admin writes reload it immediately
+    # (0 disables the periodic reload)
+    REFERENCE_DATA_REFRESH_SECONDS: int = 300
+
+    # Time series resolution planner (/air-quality/series with resolution=auto)
+    # Ranges up to this many hours are served from raw readings
+    SERIES_RAW_MAX_HOURS: int = 6
+    # Ranges up to this many days from the hourly rollup; longer ones per day
+    SERIES_HOURLY_MAX_DAYS: int = 31
+
+    # Downsampled series (/air-quality/series/downsampled)
+    # Most points per pollutant a client may request
+    DOWNSAMPLE_MAX_POINTS: int = 5000
+
+    # Historical daily averages (/air-quality/historical)
+    # Days returned when no start_date is given
+    HISTORICAL_DEFAULT_DAYS: int = 7
+    # Longest range and most stations per request
+    HISTORICAL_MAX_DAYS: int = 3660
+    HISTORICAL_MAX_STATIONS: int = 20
+
     # Application Settings
     FIRST_SUPERUSER_EMAIL: str = "admin@airquality.com"
     FIRST_SUPERUSER_PASSWORD: str = "admin123"
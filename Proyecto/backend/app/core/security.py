@@ -4,13 +4,25 @@ Handles JWT token creation/validation and password hashing.
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Union, Any
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_password_context():
+    """
+    Get the password hashing context.
+
+    passlib (and its bcrypt backend) is only imported on first use (login,
+    user creation), so it does not slow down worker start.
+
+    Returns:
+        passlib CryptContext
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -74,7 +86,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -87,5 +99,5 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
 
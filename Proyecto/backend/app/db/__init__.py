@@ -1,9 +1,11 @@
 """
 Database module initialization.
+
+The MongoDB helpers are resolved on first access, so importing the
+PostgreSQL session does not load motor/pymongo.
 """
 
 from app.db.session import get_db, SessionLocal, engine
-from app.db.mongodb import MongoDB, get_mongodb, get_mongodb_collection
 
 __all__ = [
     "get_db",
@@ -14,3 +16,12 @@ __all__ = [
     "get_mongodb_collection"
 ]
 
+_MONGODB_NAMES = {"MongoDB", "get_mongodb", "get_mongodb_collection"}
+
+
+def __getattr__(name: str):
+    """Import MongoDB helpers lazily."""
+    if name in _MONGODB_NAMES:
+        from app.db import mongodb
+        return getattr(mongodb, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,28 @@
 """
 MongoDB connection configuration.
 Handles connection to MongoDB for application settings and configuration.
+
+motor and pymongo are imported when the connection is created, not when
+this module is imported, and the application connects in the background
+(connect_in_background) so worker start does not wait for the ping.
 """
 
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
-from typing import Optional
+import asyncio
+from typing import TYPE_CHECKING, Optional
 from app.core.config import settings
 from app.core.logging_config import logger
 
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import MongoClient
+
 
 class MongoDB:
     """MongoDB connection manager."""
 
-    client: Optional[AsyncIOMotorClient] = None
-    sync_client: Optional[MongoClient] = None
+    client: Optional["AsyncIOMotorClient"] = None
+    sync_client: Optional["MongoClient"] = None
+    _connect_task: Optional[asyncio.Task] = None
 
     @classmethod
     async def connect(cls) -> None:
@@ -23,6 +31,9 @@ class MongoDB:
         """
         try:
             if settings.NOSQL_URI:
+                from motor.motor_asyncio import AsyncIOMotorClient
+                from pymongo import MongoClient
+
                 logger.info("Connecting to MongoDB...")
                 cls.client = AsyncIOMotorClient(settings.NOSQL_URI)
                 cls.sync_client = MongoClient(settings.NOSQL_URI)
@@ -36,11 +47,37 @@ class MongoDB:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
 
+    @classmethod
+    def connect_in_background(cls) -> None:
+        """
+        Start connecting without waiting for the result (returns immediately).
+
+        A failed connection is logged and the application continues
+        without MongoDB, as with a failed blocking connect().
+        """
+        if settings.NOSQL_URI and cls._connect_task is None:
+            cls._connect_task = asyncio.create_task(cls._connect_logged())
+
+    @classmethod
+    async def _connect_logged(cls) -> None:
+        """Connect, logging (not raising) failures."""
+        try:
+            await cls.connect()
+        except Exception as e:
+            logger.warning(f"MongoDB connection failed (continuing without it): {e}")
+
     @classmethod
     async def disconnect(cls) -> None:
         """
         Close database connection.
         """
+        if cls._connect_task is not None:
+            cls._connect_task.cancel()
+            try:
+                await cls._connect_task
+            except asyncio.CancelledError:
+                pass
+            cls._connect_task = None
         try:
             if cls.client:
                 cls.client.close()
@@ -9,6 +9,8 @@ from app.core.config import settings
 from app.core.logging_config import logger
 from app.api.v1.router import api_router
 from app.db.mongodb import MongoDB
+from app.services.live_update_service import live_update_broadcaster
+from app.services.reference_data import reference_data
 
 # Create FastAPI application
 app = FastAPI(
@@ -42,11 +44,16 @@ async def startup_event():
     logger.info(f"API available at {settings.API_V1_STR}")
     logger.info(f"Documentation available at {settings.API_V1_STR}/docs")
 
-    # Initialize MongoDB connection
-    try:
-        await MongoDB.connect()
-    except Exception as e:
-        logger.warning(f"MongoDB connection failed (continuing without it): {e}")
+    # Connect to MongoDB in the background (startup does not wait for the ping)
+    MongoDB.connect_in_background()
+
+    # Load pollutants, stations and roles into memory in the background
+    # (refreshed periodically)
+    await reference_data.start(settings.REFERENCE_DATA_REFRESH_SECONDS)
+
+    # Start the LISTEN connection for live updates (connects in the background)
+    if settings.LIVE_UPDATES_ENABLED:
+        await live_update_broadcaster.start()
 
 
 @app.on_event("shutdown")
@@ -60,6 +67,12 @@ async def shutdown_event():
     # Close MongoDB connection
     await MongoDB.disconnect()
 
+    # Stop live updates listener
+    await live_update_broadcaster.stop()
+
+    # Stop reference data refresh
+    await reference_data.stop()
+
 
 @app.get("/")
 def root():
@@ -15,6 +15,7 @@ from app.models.recommendation import Recommendation
 from app.models.product_recommendation import ProductRecommendation
 from app.models.report import Report
 from app.models.daily_stats import AirQualityDailyStats
+from app.models.hourly_stats import AirQualityHourlyStats
 
 __all__ = [
     "Pollutant",
@@ -30,5 +31,6 @@ __all__ = [
     "ProductRecommendation",
     "Report",
     "AirQualityDailyStats",
+    "AirQualityHourlyStats",
 ]
 
@@ -3,7 +3,7 @@ AirQualityReading ORM model.
 Represents individual air quality measurements from monitoring stations.
 """
 
-from sqlalchemy import Column, Integer, Float, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, Float, ForeignKey, String, TIMESTAMP
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -19,6 +19,7 @@ class AirQualityReading(Base):
         datetime: Timestamp of the reading
         value: Measured value of the pollutant
         aqi: Air Quality Index calculated for this reading
+        source: Data source of the reading ('historical_csv', 'aqicn', ...)
 
     Relationships:
         station: The monitoring station where reading was taken
@@ -33,6 +34,7 @@ class AirQualityReading(Base):
     datetime = Column(TIMESTAMP(timezone=True), nullable=False)
     value = Column(Float, nullable=False)
     aqi = Column(Integer, nullable=True)
+    source = Column(String(50), nullable=True)
 
     # Relationships
     station = relationship("Station", backref="readings")
@@ -0,0 +1,51 @@
+"""
+AirQualityHourlyStats ORM model.
+Represents the hourly rollup of air quality readings.
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, Float, DateTime, ForeignKey, UniqueConstraint
+from app.db.base import Base
+
+
+class AirQualityHourlyStats(Base):
+    """
+    AirQualityHourlyStats model - hourly rollup of readings, maintained by the
+    ingestion service with each batch.
+
+    Sums and counts are stored instead of averages so new readings can be
+    merged in exactly; averages are computed when reading (and stay exact
+    when hours are combined into days).
+
+    Attributes:
+        id: Primary key
+        station_id: Foreign key to Station
+        pollutant_id: Foreign key to Pollutant
+        hour: Start of the UTC hour
+        readings_count: Number of readings in the hour
+        value_sum: Sum of the readings' values
+        min_value: Minimum value
+        max_value: Maximum value
+        aqi_count: Number of readings with an AQI
+        aqi_sum: Sum of the readings' AQI
+        min_aqi: Minimum AQI
+        max_aqi: Maximum AQI
+    """
+
+    __tablename__ = "air_quality_hourly_stats"
+    __table_args__ = (UniqueConstraint("station_id", "pollutant_id", "hour"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    station_id = Column(Integer, ForeignKey("station.id"), nullable=False)
+    pollutant_id = Column(Integer, ForeignKey("pollutant.id"), nullable=False)
+    hour = Column(DateTime(timezone=True), nullable=False)
+    readings_count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0)
+    min_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+    aqi_count = Column(Integer, nullable=False, default=0)
+    aqi_sum = Column(BigInteger, nullable=False, default=0)
+    min_aqi = Column(Integer, nullable=True)
+    max_aqi = Column(Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<AirQualityHourlyStats(station_id={self.station_id}, pollutant_id={self.pollutant_id}, hour={self.hour})>"
@@ -19,6 +19,7 @@ class Recommendation(Base):
         pollution_level: AQI value used to determine the recommendation
         message: Human-readable recommendation text
         created_at: Timestamp when recommendation was created
+        template_id: Identifier of the factory template used to build the message
 
     Relationships:
         user: The user who received this recommendation
@@ -33,6 +34,7 @@ class Recommendation(Base):
     pollution_level = Column(Integer, nullable=False)
     message = Column(Text, nullable=False)
     created_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    template_id = Column(String(100), nullable=True)
 
     # Relationships
     user = relationship("AppUser", back_populates="recommendations")
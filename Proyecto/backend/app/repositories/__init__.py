@@ -1,21 +1,28 @@
 """
 Repository package initialization.
 Import all repositories for easy access.
+
+Repositories are imported on first access (`from app.repositories import
+X`), so importing one repository module does not load all of them.
 """
 
-from app.repositories.user_repository import UserRepository
-from app.repositories.station_repository import StationRepository
-from app.repositories.air_quality_repository import AirQualityRepository
-from app.repositories.recommendation_repository import RecommendationRepository
-from app.repositories.report_repository import ReportRepository
-from app.repositories.alert_repository import AlertRepository
+from importlib import import_module
+
+_REPOSITORIES = {
+    "UserRepository": "app.repositories.user_repository",
+    "StationRepository": "app.repositories.station_repository",
+    "AirQualityRepository": "app.repositories.air_quality_repository",
+    "RecommendationRepository": "app.repositories.recommendation_repository",
+    "ReportRepository": "app.repositories.report_repository",
+    "AlertRepository": "app.repositories.alert_repository",
+}
+
+__all__ = list(_REPOSITORIES)
 
-__all__ = [
-    "UserRepository",
-    "StationRepository",
-    "AirQualityRepository",
-    "RecommendationRepository",
-    "ReportRepository",
-    "AlertRepository",
-]
 
+def __getattr__(name: str):
+    """Import a repository lazily."""
+    module = _REPOSITORIES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module), name)
@@ -1,17 +1,36 @@
 """
 Air quality repository for database operations.
-Handles queries for air quality readings and daily statistics.
+Handles queries for air quality readings, the hourly rollup and daily statistics.
 """
 
-from typing import Optional, List
-from datetime import datetime, date
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc
+from typing import Optional, List, Dict, Iterator, Tuple
+from datetime import datetime, date, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy import Float, cast, desc, func, literal, literal_column, select
+from app.core.config import settings
 from app.models.air_quality_reading import AirQualityReading
 from app.models.daily_stats import AirQualityDailyStats
-from app.models.pollutant import Pollutant
+from app.models.hourly_stats import AirQualityHourlyStats
 from app.models.station import Station
 
+# Time series resolutions ("auto" lets the planner choose)
+RESOLUTION_AUTO = "auto"
+RESOLUTION_RAW = "raw"
+RESOLUTION_HOURLY = "hourly"
+RESOLUTION_DAILY = "daily"
+RESOLUTIONS = (RESOLUTION_AUTO, RESOLUTION_RAW, RESOLUTION_HOURLY, RESOLUTION_DAILY)
+
+# Longest range that may be requested at each explicit resolution
+# (raw readings and hours of long ranges would be huge responses)
+MAX_RANGE_BY_RESOLUTION = {
+    RESOLUTION_RAW: timedelta(days=7),
+    RESOLUTION_HOURLY: timedelta(days=366),
+}
+
+# Rows fetched per round trip by the server-side cursor of series streams
+SERIES_FETCH_SIZE = 10_000
+
+
 
 class AirQualityRepository:
     """Repository for AirQuality-related database operations."""
@@ -33,7 +52,8 @@ class AirQualityRepository:
             station_id: Station ID
 
         Returns:
-            List of latest readings per pollutant
+            List of latest readings per pollutant (pollutants are not loaded;
+            resolve them by pollutant_id through the reference data cache)
         """
         # Subquery to get the latest datetime per pollutant for this station
         subquery = (
@@ -55,7 +75,6 @@ class AirQualityRepository:
                 (AirQualityReading.datetime == subquery.c.max_datetime)
             )
             .filter(AirQualityReading.station_id == station_id)
-            .options(joinedload(AirQualityReading.pollutant))
             .all()
         )
 
@@ -161,7 +180,9 @@ class AirQualityRepository:
         """
         Get historical daily average data for all pollutants in a station for a date range.
 
-        This method calculates daily averages from air_quality_reading table in real-time.
+        Calculated from the raw readings, with days in the database session
+        time zone (the semantics of the deprecated /historical/7-days
+        endpoint); get_daily_history() reads the hourly rollup with UTC days.
 
         Args:
             station_id: Station ID
@@ -169,54 +190,31 @@ class AirQualityRepository:
             end_date: End date for the range
 
         Returns:
-            Dictionary with pollutant data organized by pollutant_id
-        """
-        from datetime import datetime, timedelta
-        
-        # Convert dates to datetime for comparison
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        
-        # Query readings and calculate daily averages grouped by date and pollutant
-        # Using func.date() to extract date from datetime column
+            Dictionary of data points organized by pollutant_id (pollutants are
+            resolved by the caller through the reference data cache)
+        """
+        day = func.date(AirQualityReading.datetime)
         results = (
             self.db.query(
-                func.date(AirQualityReading.datetime).label('date'),
+                day.label('date'),
                 AirQualityReading.pollutant_id,
-                Pollutant,
                 func.avg(AirQualityReading.value).label('avg_value'),
                 func.avg(AirQualityReading.aqi).label('avg_aqi')
             )
-            .join(Pollutant, AirQualityReading.pollutant_id == Pollutant.id)
             .filter(
                 AirQualityReading.station_id == station_id,
-                AirQualityReading.datetime >= start_datetime,
-                AirQualityReading.datetime <= end_datetime
+                AirQualityReading.datetime >= datetime.combine(start_date, datetime.min.time()),
+                AirQualityReading.datetime <= datetime.combine(end_date, datetime.max.time())
             )
-            .group_by(
-                func.date(AirQualityReading.datetime),
-                AirQualityReading.pollutant_id,
-                Pollutant.id,
-                Pollutant.name,
-                Pollutant.unit,
-                Pollutant.description
-            )
-            .order_by(func.date(AirQualityReading.datetime))
+            .group_by(day, AirQualityReading.pollutant_id)
+            .order_by(day)
             .all()
         )
 
-        # Organize data by pollutant
         pollutants_data = {}
-        for result in results:
-            date_value, pollutant_id, pollutant, avg_value, avg_aqi = result
-            
-            if pollutant_id not in pollutants_data:
-                pollutants_data[pollutant_id] = {
-                    'pollutant': pollutant,
-                    'data_points': []
-                }
-
-            pollutants_data[pollutant_id]['data_points'].append({
+        for date_value, pollutant_id, avg_value, avg_aqi in results:
+            pollutant = pollutants_data.setdefault(pollutant_id, {'data_points': []})
+            pollutant['data_points'].append({
                 'date': date_value.isoformat(),
                 'value': round(avg_value, 2) if avg_value else None,
                 'aqi': round(avg_aqi) if avg_aqi else None
@@ -224,3 +222,352 @@ class AirQualityRepository:
 
         return pollutants_data
 
+    def get_daily_history(self, station_ids: List[int], start_date: date, end_date: date,
+                          pollutant_ids: Optional[List[int]] = None) -> Dict[int, Dict[int, dict]]:
+        """
+        Get daily averages of several stations for a date range.
+
+        Served from the hourly rollup with a single query (no per-station
+        queries, no join with pollutant): a day is 24 rollup rows per
+        pollutant instead of every raw reading. Days are UTC days, and the
+        averages are exact (sums and counts are combined before dividing).
+        Stations without rollup rows in the range (readings not backfilled
+        yet) are aggregated from the raw readings instead.
+
+        Args:
+            station_ids: Station IDs
+            start_date: First day of the range
+            end_date: Last day of the range (inclusive)
+            pollutant_ids: Pollutant IDs filter (all pollutants if None)
+
+        Returns:
+            Dictionary of station_id -> pollutant_id -> {'data_points': [...]},
+            each point with date (ISO), value and aqi (daily averages)
+        """
+        # From the first to the last hour of the range (whole UTC days)
+        start = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc)
+        end = datetime.combine(end_date, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=23)
+
+        history: Dict[int, Dict[int, dict]] = {}
+        self._add_daily_history(history, self._bucket_query(
+            RESOLUTION_HOURLY, station_ids, start, end, 'day', pollutant_ids
+        ))
+
+        missing = [station_id for station_id in station_ids if station_id not in history]
+        if missing:
+            self._add_daily_history(history, self._bucket_query(
+                RESOLUTION_RAW, missing, start, end, 'day', pollutant_ids
+            ))
+
+        return history
+
+    @staticmethod
+    def _add_daily_history(history: Dict[int, Dict[int, dict]], rows) -> None:
+        """Add daily bucket rows to a station -> pollutant -> data points history."""
+        for row in rows:
+            pollutants = history.setdefault(row.station_id, {})
+            pollutant = pollutants.setdefault(row.pollutant_id, {'data_points': []})
+            pollutant['data_points'].append({
+                'date': row.bucket.date().isoformat(),
+                'value': round(row.value_sum / row.readings_count, 2) if row.readings_count else None,
+                'aqi': round(row.aqi_sum / row.aqi_count) if row.aqi_count else None
+            })
+
+    def plan_resolution(self, start: datetime, end: datetime, resolution: str = RESOLUTION_AUTO) -> str:
+        """
+        Choose the data tier that serves a time range.
+
+        With "auto", short ranges are read from raw readings
+        (up to SERIES_RAW_MAX_HOURS), ranges up to SERIES_HOURLY_MAX_DAYS from
+        the hourly rollup and longer ones are aggregated per day from the rollup.
+
+        Args:
+            start: Range start
+            end: Range end
+            resolution: "auto", "raw", "hourly" or "daily"
+
+        Returns:
+            "raw", "hourly" or "daily"
+
+        Raises:
+            ValueError: If the resolution is unknown or the range too long for it
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution '{resolution}' (expected one of {', '.join(RESOLUTIONS)})")
+
+        span = end - start
+        if resolution == RESOLUTION_AUTO:
+            if span <= timedelta(hours=settings.SERIES_RAW_MAX_HOURS):
+                return RESOLUTION_RAW
+            if span <= timedelta(days=settings.SERIES_HOURLY_MAX_DAYS):
+                return RESOLUTION_HOURLY
+            return RESOLUTION_DAILY
+
+        max_range = MAX_RANGE_BY_RESOLUTION.get(resolution)
+        if max_range is not None and span > max_range:
+            raise ValueError(f"Ranges longer than {max_range.days} days cannot be requested at {resolution} resolution")
+        return resolution
+
+    def get_time_series(self, station_id: int, start: datetime, end: datetime,
+                        resolution: str = RESOLUTION_AUTO,
+                        pollutant_id: Optional[int] = None) -> Tuple[str, Dict[int, List[dict]]]:
+        """
+        Get a station's time series for a range at the planned resolution.
+
+        Args:
+            station_id: Station ID
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            resolution: "auto", "raw", "hourly" or "daily"
+            pollutant_id: Pollutant ID filter (all pollutants if None)
+
+        Returns:
+            Tuple of (resolution used, data points by pollutant_id); each point
+            has timestamp, value (average), aqi (average), min_value, max_value
+            and count (readings aggregated)
+
+        Raises:
+            ValueError: If the resolution is unknown or the range too long for it
+        """
+        resolution = self.plan_resolution(start, end, resolution)
+        if resolution == RESOLUTION_RAW:
+            return resolution, self._get_raw_series(station_id, start, end, pollutant_id)
+        return resolution, self._get_rollup_series(station_id, start, end, resolution, pollutant_id)
+
+    def _get_raw_series(self, station_id: int, start: datetime, end: datetime,
+                        pollutant_id: Optional[int]) -> Dict[int, List[dict]]:
+        """Time series of raw readings, by pollutant_id."""
+        query = (
+            self.db.query(
+                AirQualityReading.pollutant_id,
+                AirQualityReading.datetime,
+                AirQualityReading.value,
+                AirQualityReading.aqi
+            )
+            .filter(
+                AirQualityReading.station_id == station_id,
+                AirQualityReading.datetime >= start,
+                AirQualityReading.datetime <= end
+            )
+        )
+        if pollutant_id:
+            query = query.filter(AirQualityReading.pollutant_id == pollutant_id)
+
+        series: Dict[int, List[dict]] = {}
+        for row in query.order_by(AirQualityReading.pollutant_id, AirQualityReading.datetime):
+            series.setdefault(row.pollutant_id, []).append({
+                'timestamp': row.datetime,
+                'value': row.value,
+                'aqi': row.aqi,
+                'min_value': row.value,
+                'max_value': row.value,
+                'count': 1
+            })
+        return series
+
+    def _get_rollup_series(self, station_id: int, start: datetime, end: datetime,
+                           resolution: str, pollutant_id: Optional[int]) -> Dict[int, List[dict]]:
+        """
+        Time series from the hourly rollup, per hour or per UTC day.
+
+        Sums and counts are combined before dividing, so daily averages are
+        exact averages of the readings (not averages of hourly averages).
+        If the rollup has no rows for the range (readings ingested before it
+        existed and not backfilled yet), the same buckets are aggregated from
+        the raw readings instead.
+        """
+        unit = 'day' if resolution == RESOLUTION_DAILY else 'hour'
+        series = self._bucket_series(RESOLUTION_HOURLY, station_id, start, end, unit, pollutant_id)
+        if not series:
+            series = self._bucket_series(RESOLUTION_RAW, station_id, start, end, unit, pollutant_id)
+        return series
+
+    def _bucket_series(self, source: str, station_id: int, start: datetime, end: datetime,
+                       unit: str, pollutant_id: Optional[int]) -> Dict[int, List[dict]]:
+        """Time series of one station aggregated per UTC hour or day, by pollutant_id."""
+        rows = self._bucket_query(source, [station_id], start, end, unit,
+                                  [pollutant_id] if pollutant_id else None)
+
+        series: Dict[int, List[dict]] = {}
+        for row in rows:
+            series.setdefault(row.pollutant_id, []).append({
+                # Buckets are computed in UTC (naive timestamps from timezone())
+                'timestamp': row.bucket.replace(tzinfo=timezone.utc),
+                'value': round(row.value_sum / row.readings_count, 2) if row.readings_count else None,
+                'aqi': round(row.aqi_sum / row.aqi_count) if row.aqi_count else None,
+                'min_value': row.min_value,
+                'max_value': row.max_value,
+                'count': int(row.readings_count)
+            })
+        return series
+
+    def _bucket_query(self, source: str, station_ids: List[int], start: datetime, end: datetime,
+                      unit: str, pollutant_ids: Optional[List[int]] = None):
+        """
+        Aggregate readings per station, pollutant and UTC hour or day.
+
+        Both sources return the same sums, counts, minimum and maximum, so
+        callers compute averages the same way whichever source they read.
+        Whole hours overlapping the range are included (like rollup rows).
+
+        Args:
+            source: "hourly" (hourly rollup) or "raw" (readings)
+            station_ids: Station IDs
+            start: Range start
+            end: Range end
+            unit: "hour" or "day"
+            pollutant_ids: Pollutant IDs filter (all pollutants if None)
+
+        Returns:
+            Query of (station_id, pollutant_id, bucket, readings_count,
+            value_sum, min_value, max_value, aqi_count, aqi_sum) rows ordered
+            by station, pollutant and bucket; buckets are naive UTC timestamps
+        """
+        if source == RESOLUTION_RAW:
+            reading = AirQualityReading
+            table, time_column = reading, reading.datetime
+            aggregates = (
+                func.count().label('readings_count'),
+                func.sum(reading.value).label('value_sum'),
+                func.min(reading.value).label('min_value'),
+                func.max(reading.value).label('max_value'),
+                func.count(reading.aqi).label('aqi_count'),
+                func.coalesce(func.sum(reading.aqi), 0).label('aqi_sum')
+            )
+        else:
+            stats = AirQualityHourlyStats
+            table, time_column = stats, stats.hour
+            aggregates = (
+                func.sum(stats.readings_count).label('readings_count'),
+                func.sum(stats.value_sum).label('value_sum'),
+                func.min(stats.min_value).label('min_value'),
+                func.max(stats.max_value).label('max_value'),
+                func.sum(stats.aqi_count).label('aqi_count'),
+                func.sum(stats.aqi_sum).label('aqi_sum')
+            )
+
+        # Literals (not bound parameters) so SELECT and GROUP BY expressions match
+        bucket = func.date_trunc(
+            literal_column(f"'{unit}'"), func.timezone(literal_column("'UTC'"), time_column)
+        ).label('bucket')
+
+        # Hours that start before the range but overlap it are included
+        first_hour = start.replace(minute=0, second=0, microsecond=0)
+        after_last_hour = end.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        query = (
+            self.db.query(table.station_id, table.pollutant_id, bucket, *aggregates)
+            .filter(
+                table.station_id.in_(station_ids),
+                time_column >= first_hour,
+                time_column < after_last_hour
+            )
+        )
+        if pollutant_ids:
+            query = query.filter(table.pollutant_id.in_(pollutant_ids))
+
+        return (
+            query.group_by(table.station_id, table.pollutant_id, bucket)
+            .order_by(table.station_id, table.pollutant_id, bucket)
+        )
+
+    def _rollup_has_rows(self, station_id: int, start: datetime, end: datetime,
+                         pollutant_id: Optional[int] = None) -> bool:
+        """Whether the hourly rollup has any row of a station in a range."""
+        stats = AirQualityHourlyStats
+        first_hour = start.replace(minute=0, second=0, microsecond=0)
+        query = self.db.query(stats.id).filter(
+            stats.station_id == station_id, stats.hour >= first_hour, stats.hour <= end
+        )
+        if pollutant_id:
+            query = query.filter(stats.pollutant_id == pollutant_id)
+        return self.db.query(query.exists()).scalar()
+
+    def stream_series(self, station_id: int, start: datetime, end: datetime, source: str,
+                      pollutant_id: Optional[int] = None) -> Iterator[List[tuple]]:
+        """
+        Stream a station's series through a server-side cursor.
+
+        Rows are plain tuples (no ORM objects), fetched SERIES_FETCH_SIZE at a
+        time, so multi-year ranges never sit in memory as Python objects.
+
+        Args:
+            station_id: Station ID
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            source: "raw" (readings) or "hourly" (hourly rollup; readings
+                aggregated per hour if the rollup has no rows for the range)
+            pollutant_id: Pollutant ID filter (all pollutants if None)
+
+        Yields:
+            Lists of (pollutant_id, epoch seconds, value, aqi, min_value,
+            max_value, count) tuples, ordered by pollutant and time; value and
+            aqi are averages for the hourly rollup
+        """
+        if source != RESOLUTION_RAW and not self._rollup_has_rows(station_id, start, end, pollutant_id):
+            # Not backfilled yet: the same hourly points from the raw readings
+            buckets = self._bucket_query(RESOLUTION_RAW, [station_id], start, end, 'hour',
+                                         [pollutant_id] if pollutant_id else None).subquery()
+            statement = (
+                select(
+                    buckets.c.pollutant_id,
+                    cast(func.extract('epoch', buckets.c.bucket), Float),
+                    cast(buckets.c.value_sum / buckets.c.readings_count, Float),
+                    cast(cast(buckets.c.aqi_sum, Float) / func.nullif(buckets.c.aqi_count, 0), Float),
+                    buckets.c.min_value,
+                    buckets.c.max_value,
+                    buckets.c.readings_count
+                )
+                .order_by(buckets.c.pollutant_id, buckets.c.bucket)
+                .execution_options(yield_per=SERIES_FETCH_SIZE)
+            )
+            result = self.db.execute(statement)
+            try:
+                yield from result.partitions()
+            finally:
+                result.close()
+            return
+
+        if source == RESOLUTION_RAW:
+            reading = AirQualityReading
+            columns = (
+                reading.pollutant_id,
+                cast(func.extract('epoch', reading.datetime), Float),
+                reading.value,
+                reading.aqi,
+                reading.value,
+                reading.value,
+                literal(1)
+            )
+            time_column = reading.datetime
+            filters = [reading.station_id == station_id, reading.datetime >= start, reading.datetime <= end]
+            key = reading.pollutant_id
+        else:
+            stats = AirQualityHourlyStats
+            columns = (
+                stats.pollutant_id,
+                cast(func.extract('epoch', stats.hour), Float),
+                cast(stats.value_sum / stats.readings_count, Float),
+                cast(cast(stats.aqi_sum, Float) / func.nullif(stats.aqi_count, 0), Float),
+                stats.min_value,
+                stats.max_value,
+                stats.readings_count
+            )
+            time_column = stats.hour
+            first_hour = start.replace(minute=0, second=0, microsecond=0)
+            filters = [stats.station_id == station_id, stats.hour >= first_hour, stats.hour <= end]
+            key = stats.pollutant_id
+
+        if pollutant_id:
+            filters.append(key == pollutant_id)
+
+        statement = (
+            select(*columns)
+            .where(*filters)
+            .order_by(key, time_column)
+            .execution_options(yield_per=SERIES_FETCH_SIZE)
+        )
+        result = self.db.execute(statement)
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
@@ -59,17 +59,59 @@ class RecommendationRepository:
             .all()
         )
 
+    def get_latest_by_template(self, user_id: int, template_id: str, location: str,
+                               pollution_level: Optional[int] = None,
+                               since: Optional[datetime] = None) -> Optional[Recommendation]:
+        """
+        Get the most recent recommendation built from a template for a user.
+
+        With pollution_level, only an identical recommendation matches (same
+        template, location and AQI value, hence same message and products).
+        With since, only recommendations created at or after that time match.
+
+        Args:
+            user_id: User ID
+            template_id: Factory template ID
+            location: Location (city) for the recommendation
+            pollution_level: Optional AQI value filter
+            since: Optional minimum creation time
+
+        Returns:
+            Recommendation object or None
+        """
+        query = (
+            self.db.query(Recommendation)
+            .options(joinedload(Recommendation.products))
+            .filter(
+                Recommendation.user_id == user_id,
+                Recommendation.template_id == template_id,
+                Recommendation.location == location
+            )
+        )
+
+        if pollution_level is not None:
+            query = query.filter(Recommendation.pollution_level == pollution_level)
+        if since:
+            query = query.filter(Recommendation.created_at >= since)
+
+        return query.order_by(desc(Recommendation.created_at)).first()
+
     def create(self, user_id: int, location: str, pollution_level: int,
-               message: str, created_at: datetime) -> Recommendation:
+               message: str, created_at: datetime, template_id: Optional[str] = None,
+               products: Optional[List[dict]] = None) -> Recommendation:
         """
         Create a new recommendation.
 
+        Products are inserted together with the recommendation in a single commit.
+
         Args:
             user_id: User ID
             location: Location (city) for the recommendation
             pollution_level: AQI value used
             message: Recommendation message
             created_at: Timestamp of creation
+            template_id: Factory template ID used to build the message
+            products: Optional list of dicts with product_name, product_type and product_url
 
         Returns:
             Created recommendation object
@@ -79,8 +121,12 @@ class RecommendationRepository:
             location=location,
             pollution_level=pollution_level,
             message=message,
-            created_at=created_at
+            created_at=created_at,
+            template_id=template_id
         )
+        for product in products or []:
+            recommendation.products.append(ProductRecommendation(**product))
+
         self.db.add(recommendation)
         self.db.commit()
         self.db.refresh(recommendation)
@@ -22,17 +22,22 @@ class UserRepository:
         """
         self.db = db
 
-    def get_by_id(self, user_id: int) -> Optional[AppUser]:
+    def get_by_id(self, user_id: int, with_role: bool = True) -> Optional[AppUser]:
         """
         Get user by ID.
 
         Args:
             user_id: User ID
+            with_role: Load the role in the same query (callers resolving the
+                role through the reference data cache can skip the join)
 
         Returns:
             User object or None
         """
-        return self.db.query(AppUser).options(joinedload(AppUser.role)).filter(AppUser.id == user_id).first()
+        query = self.db.query(AppUser)
+        if with_role:
+            query = query.options(joinedload(AppUser.role))
+        return query.filter(AppUser.id == user_id).first()
 
     def get_by_email(self, email: str) -> Optional[AppUser]:
         """
@@ -46,7 +46,12 @@ from app.schemas.air_quality import (
     DailyStatsBase,
     DailyStatsResponse,
     CurrentAQIRequest,
-    CurrentAQIResponse
+    CurrentAQIResponse,
+    TimeSeriesPoint,
+    PollutantTimeSeries,
+    TimeSeriesResponse,
+    PollutantDownsampledSeries,
+    DownsampledSeriesResponse
 )
 from app.schemas.recommendation import (
     ProductRecommendationBase,
@@ -107,6 +112,11 @@ __all__ = [
     "DailyStatsResponse",
     "CurrentAQIRequest",
     "CurrentAQIResponse",
+    "TimeSeriesPoint",
+    "PollutantTimeSeries",
+    "TimeSeriesResponse",
+    "PollutantDownsampledSeries",
+    "DownsampledSeriesResponse",
     "ProductRecommendationBase",
     "ProductRecommendationResponse",
     "RecommendationBase",
@@ -16,6 +16,7 @@ class AirQualityReadingBase(BaseModel):
     datetime: datetime
     value: float
     aqi: Optional[int] = None
+    source: Optional[str] = None
 
 
 class AirQualityReadingResponse(AirQualityReadingBase):
@@ -88,7 +89,7 @@ class PollutantHistoricalData(BaseModel):
 
 
 class HistoricalDataResponse(BaseModel):
-    """Schema for 7-day historical data response."""
+    """Schema for historical data response of one station."""
     station: StationResponse
     start_date: date
     end_date: date
@@ -97,3 +98,49 @@ class HistoricalDataResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class StationsHistoricalDataResponse(BaseModel):
+    """Schema for historical data response of several stations."""
+    start_date: date
+    end_date: date
+    stations: List[HistoricalDataResponse]
+
+
+class TimeSeriesPoint(BaseModel):
+    """Schema for one point of a time series (a reading, an hour or a day)."""
+    timestamp: datetime
+    value: Optional[float] = None  # Average of the readings in the bucket
+    aqi: Optional[int] = None  # Average AQI of the readings in the bucket
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    count: int  # Readings aggregated into the point
+
+
+class PollutantTimeSeries(BaseModel):
+    """Schema for the time series of a single pollutant."""
+    pollutant: PollutantResponse
+    data_points: List[TimeSeriesPoint]
+
+
+class TimeSeriesResponse(BaseModel):
+    """Schema for a station's time series over an arbitrary range."""
+    station: StationResponse
+    start: datetime
+    end: datetime
+    resolution: str  # raw, hourly or daily (the one chosen for resolution=auto)
+    pollutants_data: List[PollutantTimeSeries]
+
+
+class PollutantDownsampledSeries(PollutantTimeSeries):
+    """Schema for the downsampled time series of a single pollutant."""
+    source_points: int  # Points of the series before downsampling
+
+
+class DownsampledSeriesResponse(BaseModel):
+    """Schema for a station's downsampled time series."""
+    station: StationResponse
+    start: datetime
+    end: datetime
+    source: str  # raw (readings) or hourly (hourly rollup)
+    method: str  # lttb or minmax
+    points: int  # Most points returned per pollutant
+    pollutants_data: List[PollutantDownsampledSeries]
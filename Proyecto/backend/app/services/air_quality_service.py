@@ -5,14 +5,21 @@ Uses Builder and Strategy patterns.
 """
 
 from typing import Optional, List
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone
 from sqlalchemy.orm import Session
-from app.repositories.air_quality_repository import AirQualityRepository
+from app.repositories.air_quality_repository import AirQualityRepository, RESOLUTION_HOURLY, RESOLUTION_RAW
 from app.repositories.station_repository import StationRepository
+from app.models.pollutant import Pollutant
+from app.services.reference_data import reference_data
 from app.services.risk_category import SimpleRiskCategoryStrategy, RiskCategory
 from app.services.dashboard_service import DashboardResponseBuilder, DashboardResponseSchema
-from app.schemas.air_quality import CurrentReadingResponse, DailyStatsResponse, StationResponse, CurrentAQIResponse
+from app.schemas.air_quality import (
+    CurrentReadingResponse, DailyStatsResponse, StationResponse, CurrentAQIResponse,
+    PollutantTimeSeries, TimeSeriesResponse, PollutantDownsampledSeries, DownsampledSeriesResponse,
+    PollutantHistoricalData, HistoricalDataResponse, StationsHistoricalDataResponse
+)
 from app.schemas.pollutant import PollutantResponse
+from app.core.config import settings
 from app.core.logging_config import logger
 
 
@@ -37,6 +44,30 @@ class AirQualityService:
         # STRATEGY PATTERN: Use pluggable strategy for risk categorization
         self.risk_strategy = risk_strategy or SimpleRiskCategoryStrategy()
 
+    def _get_station(self, station_id: int):
+        """
+        Get a station from the reference data cache (database if not cached).
+
+        Args:
+            station_id: Station ID
+
+        Returns:
+            StationRef, Station or None
+        """
+        return reference_data.station(station_id) or self.station_repo.get_by_id(station_id)
+
+    def _get_pollutant(self, pollutant_id: int):
+        """
+        Get a pollutant from the reference data cache (database if not cached).
+
+        Args:
+            pollutant_id: Pollutant ID
+
+        Returns:
+            PollutantRef or Pollutant
+        """
+        return reference_data.pollutant(pollutant_id) or self.db.get(Pollutant, pollutant_id)
+
     def get_current_aqi_for_city(self, city: str) -> Optional[CurrentAQIResponse]:
         """
         Get current AQI for a city.
@@ -64,12 +95,12 @@ class AirQualityService:
         risk_category = self.risk_strategy.get_category(max_aqi)
 
         # Get station info
-        station = self.station_repo.get_by_id(dominant_reading.station_id)
+        station = self._get_station(dominant_reading.station_id)
 
         return CurrentAQIResponse(
             city=city,
             aqi=max_aqi,
-            dominant_pollutant=dominant_reading.pollutant.name,
+            dominant_pollutant=self._get_pollutant(dominant_reading.pollutant_id).name,
             category=risk_category.label,
             color=risk_category.color,
             health_message=risk_category.description,
@@ -89,7 +120,7 @@ class AirQualityService:
         """
         logger.info(f"Getting current readings for station: {station_id}")
 
-        station = self.station_repo.get_by_id(station_id)
+        station = self._get_station(station_id)
         if not station:
             logger.warning(f"Station not found: {station_id}")
             return None
@@ -99,7 +130,7 @@ class AirQualityService:
         # Convert to response schemas
         current_readings = [
             CurrentReadingResponse(
-                pollutant=PollutantResponse.model_validate(r.pollutant),
+                pollutant=PollutantResponse.model_validate(self._get_pollutant(r.pollutant_id)),
                 value=r.value,
                 aqi=r.aqi,
                 datetime=r.datetime
@@ -130,7 +161,7 @@ class AirQualityService:
 
         # Determine station to use
         if station_id:
-            station = self.station_repo.get_by_id(station_id)
+            station = self._get_station(station_id)
         elif city:
             stations = self.station_repo.get_by_city(city)
             station = stations[0] if stations else None
@@ -151,7 +182,7 @@ class AirQualityService:
         if readings:
             current_readings = [
                 CurrentReadingResponse(
-                    pollutant=PollutantResponse.model_validate(r.pollutant),
+                    pollutant=PollutantResponse.model_validate(self._get_pollutant(r.pollutant_id)),
                     value=r.value,
                     aqi=r.aqi,
                     datetime=r.datetime
@@ -213,6 +244,11 @@ class AirQualityService:
         """
         Get 7-day historical data for all pollutants at a station.
 
+        Kept unchanged for the deprecated /historical/7-days endpoint: daily
+        averages of the raw readings, with days in the database session time
+        zone. get_historical_data() serves the same chart from the hourly
+        rollup, with UTC days.
+
         Args:
             station_id: Station ID
             start_date: Start date for the range
@@ -221,36 +257,229 @@ class AirQualityService:
         Returns:
             HistoricalDataResponse with data organized by pollutant
         """
-        from app.schemas.air_quality import HistoricalDataResponse, PollutantHistoricalData
-        from app.schemas.pollutant import PollutantResponse
-
         logger.info(f"Getting 7-day historical data for station {station_id} from {start_date} to {end_date}")
 
-        # Get station
-        station = self.station_repo.get_by_id(station_id)
+        station = self._get_station(station_id)
         if not station:
             logger.warning(f"Station not found: {station_id}")
             return None
 
-        # Get historical data
         pollutants_data = self.air_quality_repo.get_historical_data_by_station(
             station_id=station_id,
             start_date=start_date,
             end_date=end_date
         )
 
-        # Convert to response schema
-        pollutants_list = []
-        for pollutant_id, data in pollutants_data.items():
-            pollutants_list.append(PollutantHistoricalData(
-                pollutant=PollutantResponse.model_validate(data['pollutant']),
-                data_points=data['data_points']
-            ))
-
         return HistoricalDataResponse(
             station=StationResponse.model_validate(station),
             start_date=start_date,
             end_date=end_date,
-            pollutants_data=pollutants_list
+            pollutants_data=[
+                PollutantHistoricalData(
+                    pollutant=PollutantResponse.model_validate(self._get_pollutant(pollutant_id)),
+                    data_points=data['data_points']
+                )
+                for pollutant_id, data in pollutants_data.items()
+            ]
         )
 
+    def get_historical_data(self, station_ids: List[int], start_date: date, end_date: date,
+                            pollutant_ids: Optional[List[int]] = None) -> Optional[StationsHistoricalDataResponse]:
+        """
+        Get daily averages of several stations for an arbitrary date range.
+
+        All stations are read from the hourly rollup with one query, and
+        stations and pollutants are resolved through the reference data cache.
+
+        Args:
+            station_ids: Station IDs
+            start_date: First day of the range
+            end_date: Last day of the range (inclusive)
+            pollutant_ids: Pollutant IDs filter (all pollutants if None)
+
+        Returns:
+            StationsHistoricalDataResponse (stations in request order), or None
+            if any station does not exist
+
+        Raises:
+            ValueError: If the range is invalid or longer than HISTORICAL_MAX_DAYS
+        """
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        if (end_date - start_date).days + 1 > settings.HISTORICAL_MAX_DAYS:
+            raise ValueError(f"Ranges longer than {settings.HISTORICAL_MAX_DAYS} days are not allowed")
+
+        station_ids = list(dict.fromkeys(station_ids))
+        logger.info(f"Getting historical data for stations {station_ids} from {start_date} to {end_date}")
+
+        stations = {station_id: self._get_station(station_id) for station_id in station_ids}
+        missing = [station_id for station_id, station in stations.items() if not station]
+        if missing:
+            logger.warning(f"Stations not found: {missing}")
+            return None
+
+        history = self.air_quality_repo.get_daily_history(
+            station_ids=station_ids,
+            start_date=start_date,
+            end_date=end_date,
+            pollutant_ids=pollutant_ids
+        )
+
+        return StationsHistoricalDataResponse(
+            start_date=start_date,
+            end_date=end_date,
+            stations=[
+                HistoricalDataResponse(
+                    station=StationResponse.model_validate(station),
+                    start_date=start_date,
+                    end_date=end_date,
+                    pollutants_data=[
+                        PollutantHistoricalData(
+                            pollutant=PollutantResponse.model_validate(self._get_pollutant(pollutant_id)),
+                            data_points=data['data_points']
+                        )
+                        for pollutant_id, data in history.get(station_id, {}).items()
+                    ]
+                )
+                for station_id, station in stations.items()
+            ]
+        )
+
+    def get_time_series(self, station_id: int, start: datetime, end: datetime,
+                        resolution: str = "auto",
+                        pollutant_id: Optional[int] = None) -> Optional[TimeSeriesResponse]:
+        """
+        Get a station's time series for an arbitrary range.
+
+        The repository plans the data tier: raw readings for short ranges,
+        the hourly rollup for ranges up to weeks and daily aggregates of the
+        rollup beyond (or the explicitly requested resolution).
+
+        Args:
+            station_id: Station ID
+            start: Range start (naive datetimes are taken as UTC)
+            end: Range end (naive datetimes are taken as UTC)
+            resolution: "auto", "raw", "hourly" or "daily"
+            pollutant_id: Pollutant ID filter (all pollutants if None)
+
+        Returns:
+            TimeSeriesResponse or None if the station does not exist
+
+        Raises:
+            ValueError: If the range or resolution is invalid
+        """
+        start, end = _as_utc(start), _as_utc(end)
+        if end < start:
+            raise ValueError("end must not be before start")
+
+        station = self._get_station(station_id)
+        if not station:
+            logger.warning(f"Station not found: {station_id}")
+            return None
+
+        resolution, series = self.air_quality_repo.get_time_series(
+            station_id=station_id,
+            start=start,
+            end=end,
+            resolution=resolution,
+            pollutant_id=pollutant_id
+        )
+        logger.info(
+            f"Time series for station {station_id} from {start} to {end}: "
+            f"{resolution} resolution, {sum(len(points) for points in series.values())} points"
+        )
+
+        return TimeSeriesResponse(
+            station=StationResponse.model_validate(station),
+            start=start,
+            end=end,
+            resolution=resolution,
+            pollutants_data=[
+                PollutantTimeSeries(
+                    pollutant=PollutantResponse.model_validate(self._get_pollutant(pid)),
+                    data_points=points
+                )
+                for pid, points in series.items()
+            ]
+        )
+
+    def get_downsampled_series(self, station_id: int, start: datetime, end: datetime,
+                               points: int, method: str = "lttb",
+                               pollutant_id: Optional[int] = None) -> Optional[DownsampledSeriesResponse]:
+        """
+        Get a station's time series reduced to at most `points` per pollutant.
+
+        Ranges up to SERIES_HOURLY_MAX_DAYS are read from raw readings, longer
+        ones from the hourly rollup (whose min/max keep the peaks of each hour
+        for the min/max method). Rows are streamed through a server-side
+        cursor into NumPy arrays and downsampled there.
+
+        Args:
+            station_id: Station ID
+            start: Range start (naive datetimes are taken as UTC)
+            end: Range end (naive datetimes are taken as UTC)
+            points: Most points per pollutant
+            method: "lttb" or "minmax"
+            pollutant_id: Pollutant ID filter (all pollutants if None)
+
+        Returns:
+            DownsampledSeriesResponse or None if the station does not exist
+
+        Raises:
+            ValueError: If the range or method is invalid
+        """
+        # NumPy is only loaded by the endpoints that need it
+        from app.services import downsampling
+
+        start, end = _as_utc(start), _as_utc(end)
+        if end < start:
+            raise ValueError("end must not be before start")
+        if method not in downsampling.METHODS:
+            raise ValueError(f"Unknown downsampling method '{method}'")
+
+        station = self._get_station(station_id)
+        if not station:
+            logger.warning(f"Station not found: {station_id}")
+            return None
+
+        source = RESOLUTION_RAW if end - start <= timedelta(days=settings.SERIES_HOURLY_MAX_DAYS) else RESOLUTION_HOURLY
+        tables = downsampling.series_arrays(
+            self.air_quality_repo.stream_series(station_id, start, end, source, pollutant_id)
+        )
+
+        pollutants_data = []
+        for pid, table in tables.items():
+            selected = table[downsampling.downsample(
+                method,
+                table[:, downsampling.TIME],
+                table[:, downsampling.VALUE],
+                points,
+                low=table[:, downsampling.MIN_VALUE],
+                high=table[:, downsampling.MAX_VALUE]
+            )]
+            pollutants_data.append(PollutantDownsampledSeries(
+                pollutant=PollutantResponse.model_validate(self._get_pollutant(pid)),
+                source_points=len(table),
+                data_points=downsampling.table_points(selected)
+            ))
+
+        logger.info(
+            f"Downsampled series for station {station_id} from {start} to {end}: {source} source, "
+            f"{sum(p.source_points for p in pollutants_data)} -> "
+            f"{sum(len(p.data_points) for p in pollutants_data)} points ({method})"
+        )
+
+        return DownsampledSeriesResponse(
+            station=StationResponse.model_validate(station),
+            start=start,
+            end=end,
+            source=source,
+            method=method,
+            points=points,
+            pollutants_data=pollutants_data
+        )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return a timezone-aware datetime, taking naive values as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
@@ -0,0 +1,180 @@
+"""
+Time series downsampling.
+
+Reduces a series to at most N points for charting while keeping its shape:
+- LTTB (Largest-Triangle-Three-Buckets): one point per bucket, the one that
+  forms the largest triangle with the previously selected point and the
+  average of the next bucket. Keeps peaks and trends visually.
+- Min/max: the minimum and maximum of each bucket, in time order. Keeps
+  every extreme exactly (useful to spot pollution peaks), at the cost of a
+  jagged line.
+
+Both work on NumPy arrays and return the indices of the selected points,
+so the caller can pick any parallel column (timestamps, values, AQI).
+NumPy is only imported by this module, which is loaded on first use.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+# Downsampling methods
+LTTB = "lttb"
+MINMAX = "minmax"
+METHODS = (LTTB, MINMAX)
+
+# Columns of the series tables built by series_arrays()
+KEY, TIME, VALUE, AQI, MIN_VALUE, MAX_VALUE, COUNT = range(7)
+
+
+def series_arrays(partitions: Iterable[List[tuple]]) -> Dict[int, np.ndarray]:
+    """
+    Build one float table per series from streamed rows.
+
+    Args:
+        partitions: Lists of (key, time, value, aqi, min_value, max_value,
+            count) rows ordered by key and time; NULLs become NaN
+
+    Returns:
+        Mapping of key (e.g., pollutant_id) -> 2-D array with one row per point
+    """
+    chunks = [np.array(rows, dtype=float).reshape(-1, 7) for rows in partitions if rows]
+    if not chunks:
+        return {}
+    table = np.concatenate(chunks)
+
+    # Rows are ordered by key: split where the key changes
+    boundaries = np.flatnonzero(np.diff(table[:, KEY])) + 1
+    return {int(part[0, KEY]): part for part in np.split(table, boundaries)}
+
+
+def table_points(table: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Convert rows of a series table into time series points.
+
+    Args:
+        table: Rows selected from a series_arrays() table
+
+    Returns:
+        List of dictionaries matching TimeSeriesPoint
+    """
+    points = []
+    for row in table.tolist():
+        aqi = row[AQI]
+        points.append({
+            'timestamp': datetime.fromtimestamp(row[TIME], tz=timezone.utc),
+            'value': round(row[VALUE], 2),
+            'aqi': round(aqi) if aqi == aqi else None,  # NaN for NULL
+            'min_value': row[MIN_VALUE],
+            'max_value': row[MAX_VALUE],
+            'count': int(row[COUNT])
+        })
+    return points
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the others are split into
+    threshold - 2 buckets of (almost) equal size.
+
+    Args:
+        x: Sorted x values (e.g., epoch seconds)
+        y: Values
+        threshold: Points to keep (at least 3)
+
+    Returns:
+        Indices of the selected points, increasing
+    """
+    n = len(x)
+    if threshold >= n or n <= 2:
+        return np.arange(n)
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3 points")
+
+    # Bucket i spans edges[i]:edges[i + 1]; the last point is its own bucket
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x = x[next_lo:next_hi].mean()
+            avg_y = y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        # Twice the triangle area for every candidate of the bucket
+        areas = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_indices(low: np.ndarray, high: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the minimum and maximum of each bucket.
+
+    Args:
+        low: Values searched for minimums (e.g., hourly min_value)
+        high: Values searched for maximums (the same array for raw readings)
+        threshold: Points to keep (two per bucket)
+
+    Returns:
+        Indices of the selected points, increasing and without duplicates
+    """
+    n = len(low)
+    if threshold >= n:
+        return np.arange(n)
+
+    buckets = max(1, threshold // 2)
+    edges = np.linspace(0, n, buckets + 1).astype(np.intp)
+    starts = edges[:-1]
+    lengths = np.diff(edges)
+
+    # Pad the buckets into a 2-D array so all of them are searched at once
+    width = int(lengths.max())
+    columns = np.arange(width)
+    positions = np.minimum(starts[:, None] + columns, n - 1)
+    outside = columns >= lengths[:, None]
+    low_rows = np.where(outside, np.inf, low[positions])
+    high_rows = np.where(outside, -np.inf, high[positions])
+
+    mins = starts + np.argmin(low_rows, axis=1)
+    maxs = starts + np.argmax(high_rows, axis=1)
+    return np.unique(np.concatenate([mins, maxs]))
+
+
+def downsample(method: str, x: np.ndarray, y: np.ndarray, threshold: int,
+               low: np.ndarray = None, high: np.ndarray = None) -> np.ndarray:
+    """
+    Select at most `threshold` points of a series.
+
+    Args:
+        method: "lttb" or "minmax"
+        x: Sorted x values (e.g., epoch seconds)
+        y: Values (averages for aggregated series)
+        threshold: Points to keep
+        low: Minimums searched by "minmax" (defaults to y)
+        high: Maximums searched by "minmax" (defaults to y)
+
+    Returns:
+        Indices of the selected points, increasing
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method == LTTB:
+        return lttb_indices(x, y, threshold)
+    if method == MINMAX:
+        return minmax_indices(y if low is None else low, y if high is None else high, threshold)
+    raise ValueError(f"Unknown downsampling method '{method}' (expected one of {', '.join(METHODS)})")
@@ -0,0 +1,249 @@
+"""
+Live updates service.
+
+Pushes new readings to dashboard clients (SSE / WebSocket) instead of
+having them poll /air-quality/dashboard. The ingestion service announces
+each committed batch with PostgreSQL NOTIFY; every backend process keeps
+a single LISTEN connection and fans the messages out to the subscribed
+clients in memory.
+"""
+
+import asyncio
+import json
+from typing import Dict, Iterable, Optional, Set
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+
+class LiveUpdateSubscription:
+    """
+    One connected client.
+
+    Messages are buffered in a bounded queue; if a slow client falls
+    behind, the oldest messages are dropped so it never blocks the fan-out.
+    """
+
+    def __init__(self, station_ids: Optional[Iterable[int]] = None, max_queue: int = 100):
+        """
+        Initialize subscription.
+
+        Args:
+            station_ids: Stations to receive updates for (all stations if None)
+            max_queue: Maximum number of buffered messages
+        """
+        self.station_ids: Optional[Set[int]] = set(station_ids) if station_ids else None
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def push(self, payload: str) -> None:
+        """
+        Buffer a message, dropping the oldest one if the queue is full.
+
+        Args:
+            payload: JSON payload
+        """
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(payload)
+
+    async def next_message(self, timeout: float) -> Optional[str]:
+        """
+        Wait for the next message.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            JSON payload, or None if nothing arrived in time
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveUpdateBroadcaster:
+    """
+    Single PostgreSQL LISTEN connection per process with in-memory fan-out.
+
+    The listener connection is registered with the event loop (no thread,
+    no polling) and reconnects with backoff if the database goes away.
+    All methods must be called from the event loop thread.
+    """
+
+    def __init__(self, channel: str, reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 30.0):
+        """
+        Initialize broadcaster.
+
+        Args:
+            channel: NOTIFY channel used by the ingestion service
+            reconnect_delay: Initial delay before reconnecting (seconds)
+            max_reconnect_delay: Maximum delay between reconnect attempts
+        """
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._subscriptions: Set[LiveUpdateSubscription] = set()
+        self._by_station: Dict[int, Set[LiveUpdateSubscription]] = {}
+        self._all_stations: Set[LiveUpdateSubscription] = set()
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+        self._disconnected: Optional[asyncio.Event] = None
+        self.messages_received = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._subscriptions)
+
+    def subscribe(self, station_ids: Optional[Iterable[int]] = None) -> LiveUpdateSubscription:
+        """
+        Register a client.
+
+        Args:
+            station_ids: Stations to receive updates for (all stations if None)
+
+        Returns:
+            LiveUpdateSubscription to read messages from
+        """
+        subscription = LiveUpdateSubscription(station_ids, settings.LIVE_UPDATES_CLIENT_QUEUE_SIZE)
+        self._subscriptions.add(subscription)
+        if subscription.station_ids is None:
+            self._all_stations.add(subscription)
+        else:
+            for station_id in subscription.station_ids:
+                self._by_station.setdefault(station_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LiveUpdateSubscription) -> None:
+        """
+        Remove a client.
+
+        Args:
+            subscription: Subscription returned by subscribe()
+        """
+        self._subscriptions.discard(subscription)
+        if subscription.station_ids is None:
+            self._all_stations.discard(subscription)
+            return
+
+        for station_id in subscription.station_ids:
+            subscribers = self._by_station.get(station_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_station[station_id]
+
+    def publish(self, payload: str) -> None:
+        """
+        Fan a NOTIFY payload out to the clients subscribed to its station.
+
+        Args:
+            payload: JSON payload sent by the ingestion service
+        """
+        self.messages_received += 1
+        try:
+            station_id = json.loads(payload)["station_id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed live update payload: {payload[:200]}")
+            return
+
+        for subscription in self._all_stations:
+            subscription.push(payload)
+        for subscription in self._by_station.get(station_id, ()):
+            subscription.push(payload)
+
+    async def start(self) -> None:
+        """Start the listener in the background (returns immediately)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the listener and close its connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._close_connection()
+
+    async def _run(self) -> None:
+        """Keep a LISTEN connection open, reconnecting with backoff."""
+        loop = asyncio.get_running_loop()
+        delay = self.reconnect_delay
+
+        while True:
+            try:
+                self._connection = await loop.run_in_executor(None, self._open_connection)
+                # Keep the descriptor: fileno() raises once the connection is broken
+                fd = self._connection.fileno()
+            except (psycopg2.Error, OSError) as e:
+                self._close_connection()
+                logger.warning(f"Live updates listener could not connect: {e}; retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            delay = self.reconnect_delay
+            self._disconnected = asyncio.Event()
+            loop.add_reader(fd, self._on_readable)
+            logger.info(f"Live updates listening on channel '{self.channel}'")
+
+            try:
+                await self._disconnected.wait()
+            finally:
+                loop.remove_reader(fd)
+                self._close_connection()
+
+            logger.warning("Live updates listener disconnected; reconnecting")
+
+    def _open_connection(self):
+        """
+        Open a dedicated autocommit connection and LISTEN on the channel.
+
+        Returns:
+            psycopg2 connection
+        """
+        # libpq does not understand SQLAlchemy driver suffixes (postgresql+psycopg2)
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+        connection = psycopg2.connect(dsn.render_as_string(hide_password=False))
+        connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return connection
+
+    def _on_readable(self) -> None:
+        """Read pending notifications from the listener connection."""
+        try:
+            self._connection.poll()
+        except (psycopg2.Error, OSError) as e:
+            logger.error(f"Live updates listener error: {e}")
+            self._disconnected.set()
+            return
+
+        while self._connection.notifies:
+            notify = self._connection.notifies.pop(0)
+            self.publish(notify.payload)
+
+    def _close_connection(self) -> None:
+        """Close the listener connection if open."""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except psycopg2.Error:
+                pass
+            self._connection = None
+
+
+# Global broadcaster shared by all requests in this process
+live_update_broadcaster = LiveUpdateBroadcaster(settings.READINGS_NOTIFY_CHANNEL)
@@ -9,9 +9,12 @@ from sqlalchemy.orm import Session
 from app.repositories.recommendation_repository import RecommendationRepository
 from app.repositories.air_quality_repository import AirQualityRepository
 from app.repositories.user_repository import UserRepository
-from app.services.recommendation_service import RecommendationFactory
+from app.services.recommendation_service import RecommendationFactory, recommendation_reuse_cache
+from app.services.recommendation_service.reuse import window_start
+from app.services.reference_data import user_role_name
 from app.schemas.recommendation import RecommendationResponse
 from app.models.user import AppUser
+from app.core.config import settings
 from app.core.logging_config import logger
 
 
@@ -67,37 +70,103 @@ class RecommendationService:
                 aqi = 50  # Default moderate value
 
         # FACTORY PATTERN: Create recommendation based on AQI and user role
-        user_role = user.role.name if user.role else "Citizen"
+        user_role = user_role_name(user) or "Citizen"
         base_recommendation = RecommendationFactory.create_for_aqi(
             aqi=aqi,
             user_role=user_role,
             location=location
         )
 
-        # Save to database
+        # Reuse a recent or identical recommendation instead of inserting new rows
+        reused = self._find_reusable_recommendation(user.id, location, aqi, base_recommendation.template_id)
+        if reused:
+            return reused
+
+        # Save to database (recommendation and products in one commit)
         recommendation = self.recommendation_repo.create(
             user_id=user.id,
             location=location,
             pollution_level=aqi,
             message=base_recommendation.message,
-            created_at=datetime.utcnow()
+            created_at=datetime.utcnow(),
+            template_id=base_recommendation.template_id,
+            products=[
+                {
+                    "product_name": product.name,
+                    "product_type": product.type,
+                    "product_url": product.url
+                }
+                for product in base_recommendation.products
+            ]
         )
 
-        # Add products to database
-        for product in base_recommendation.products:
-            self.recommendation_repo.add_product(
-                recommendation_id=recommendation.id,
-                product_name=product.name,
-                product_type=product.type,
-                product_url=product.url
+        logger.info(f"Recommendation created: {recommendation.id}")
+
+        response = RecommendationResponse.model_validate(recommendation)
+        recommendation_reuse_cache.record("generated")
+        if settings.RECOMMENDATION_REUSE_WINDOW_MINUTES > 0:
+            recommendation_reuse_cache.put(user.id, location, base_recommendation.template_id, response)
+
+        return response
+
+    def _find_reusable_recommendation(self, user_id: int, location: str, aqi: int,
+                                      template_id: str) -> Optional[RecommendationResponse]:
+        """
+        Find a stored recommendation that can be returned instead of a new one.
+
+        Checks, in order:
+        1. The in-process cache, for the same location and AQI category within
+           RECOMMENDATION_REUSE_WINDOW_MINUTES
+        2. The database, for the same location and AQI category within the window
+        3. The database, for an identical recommendation if RECOMMENDATION_DEDUPLICATE is set
+
+        Args:
+            user_id: User ID
+            location: Location of the recommendation
+            aqi: AQI value used
+            template_id: Factory template ID (AQI category and role)
+
+        Returns:
+            RecommendationResponse to reuse, or None
+        """
+        window_minutes = settings.RECOMMENDATION_REUSE_WINDOW_MINUTES
+        existing = None
+
+        if window_minutes > 0:
+            since = window_start(window_minutes)
+
+            cached = recommendation_reuse_cache.get(user_id, location, template_id, since)
+            if cached:
+                recommendation_reuse_cache.record("reused_cache")
+                logger.debug(f"Reusing cached recommendation {cached.id} for user {user_id}")
+                return cached
+
+            existing = self.recommendation_repo.get_latest_by_template(
+                user_id=user_id,
+                template_id=template_id,
+                location=location,
+                since=since
             )
 
-        # Reload to get products
-        recommendation = self.recommendation_repo.get_by_id(recommendation.id)
+        if existing is None and settings.RECOMMENDATION_DEDUPLICATE:
+            existing = self.recommendation_repo.get_latest_by_template(
+                user_id=user_id,
+                template_id=template_id,
+                location=location,
+                pollution_level=aqi
+            )
 
-        logger.info(f"Recommendation created: {recommendation.id}")
+        if existing is None:
+            return None
+
+        logger.info(f"Reusing recommendation {existing.id} (template {template_id}) for user {user_id}")
+
+        response = RecommendationResponse.model_validate(existing)
+        recommendation_reuse_cache.record("reused_db")
+        if window_minutes > 0:
+            recommendation_reuse_cache.put(user_id, location, template_id, response)
 
-        return RecommendationResponse.model_validate(recommendation)
+        return response
 
     def get_user_recommendation_history(self, user_id: int, skip: int = 0,
                                        limit: int = 100) -> List[RecommendationResponse]:
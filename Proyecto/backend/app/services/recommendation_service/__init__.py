@@ -2,12 +2,16 @@
 Recommendation service initialization.
 """
 
-from app.services.recommendation_service.models import BaseRecommendation, ProductInfo
+from app.services.recommendation_service.models import BaseRecommendation, ProductInfo, RecommendationTemplate
 from app.services.recommendation_service.factory import RecommendationFactory
+from app.services.recommendation_service.reuse import RecommendationReuseCache, recommendation_reuse_cache
 
 __all__ = [
     "BaseRecommendation",
     "ProductInfo",
+    "RecommendationTemplate",
     "RecommendationFactory",
+    "RecommendationReuseCache",
+    "recommendation_reuse_cache",
 ]
 
@@ -2,7 +2,17 @@
 Factory Pattern - Recommendation factory for creating personalized recommendations.
 """
 
-from app.services.recommendation_service.models import BaseRecommendation, ProductInfo
+from typing import Callable, Dict, Tuple
+from app.services.recommendation_service.models import (
+    BaseRecommendation,
+    ProductInfo,
+    RecommendationTemplate
+)
+
+# Roles that can change the content of a recommendation.
+# Any other role receives the same recommendation as a Citizen.
+KNOWN_ROLES: Tuple[str, ...] = ("Citizen", "Researcher", "Admin")
+DEFAULT_ROLE = "Citizen"
 
 
 class RecommendationFactory:
@@ -11,8 +21,14 @@ class RecommendationFactory:
 
     This factory centralizes the logic for generating recommendations based on
     pollution levels and user roles.
+
+    Recommendations only depend on (category, role) plus the location and AQI
+    value, so one immutable RecommendationTemplate is precomputed per
+    category/role and create_for_aqi() only formats the message.
     """
 
+    _templates: Dict[Tuple[str, str], RecommendationTemplate] = {}
+
     @staticmethod
     def create_for_aqi(aqi: int, user_role: str = "Citizen", location: str = "") -> BaseRecommendation:
         """
@@ -26,163 +42,248 @@ class RecommendationFactory:
         Returns:
             BaseRecommendation object with tailored advice
         """
-        # Determine recommendation category based on AQI
+        category = RecommendationFactory.category_for_aqi(aqi)
+        template = RecommendationFactory.get_template(category, user_role)
+        return template.render(aqi=aqi, location=location)
+
+    @staticmethod
+    def category_for_aqi(aqi: int) -> str:
+        """
+        Determine the recommendation category for an AQI value.
+
+        Args:
+            aqi: Air Quality Index value
+
+        Returns:
+            Category name (e.g., 'good', 'unhealthy')
+        """
         if aqi <= 50:
-            return RecommendationFactory._create_good_recommendation(aqi, user_role, location)
+            return "good"
         elif aqi <= 100:
-            return RecommendationFactory._create_moderate_recommendation(aqi, user_role, location)
+            return "moderate"
         elif aqi <= 150:
-            return RecommendationFactory._create_unhealthy_sensitive_recommendation(aqi, user_role, location)
+            return "unhealthy_for_sensitive"
         elif aqi <= 200:
-            return RecommendationFactory._create_unhealthy_recommendation(aqi, user_role, location)
+            return "unhealthy"
         elif aqi <= 300:
-            return RecommendationFactory._create_very_unhealthy_recommendation(aqi, user_role, location)
+            return "very_unhealthy"
         else:
-            return RecommendationFactory._create_hazardous_recommendation(aqi, user_role, location)
+            return "hazardous"
+
+    @staticmethod
+    def get_template(category: str, user_role: str = "Citizen") -> RecommendationTemplate:
+        """
+        Get the precomputed template for a category and role.
+
+        Args:
+            category: Category name as returned by category_for_aqi()
+            user_role: User's role (unknown roles fall back to Citizen)
+
+        Returns:
+            Shared, immutable RecommendationTemplate
+        """
+        role = user_role if user_role in KNOWN_ROLES else DEFAULT_ROLE
+        return RecommendationFactory._templates[(category, role)]
 
     @staticmethod
-    def _create_good_recommendation(aqi: int, user_role: str, location: str) -> BaseRecommendation:
-        """Create recommendation for good air quality (AQI 0-50)."""
-        message = f"Air quality in {location} is good (AQI: {aqi}). It's a great day for outdoor activities!"
+    def _build_templates() -> Dict[Tuple[str, str], RecommendationTemplate]:
+        """Build the template table for every category and known role."""
+        builders: Dict[str, Callable[[str], RecommendationTemplate]] = {
+            "good": RecommendationFactory._create_good_template,
+            "moderate": RecommendationFactory._create_moderate_template,
+            "unhealthy_for_sensitive": RecommendationFactory._create_unhealthy_sensitive_template,
+            "unhealthy": RecommendationFactory._create_unhealthy_template,
+            "very_unhealthy": RecommendationFactory._create_very_unhealthy_template,
+            "hazardous": RecommendationFactory._create_hazardous_template,
+        }
+
+        return {
+            (category, role): builder(role)
+            for category, builder in builders.items()
+            for role in KNOWN_ROLES
+        }
+
+    @staticmethod
+    def _template(category: str, message: str, role_suffix: str = "",
+                  products: Tuple[ProductInfo, ...] = (),
+                  actions: Tuple[str, ...] = (), role: str = "") -> RecommendationTemplate:
+        """
+        Create a template, giving role-specific variants their own template id.
+
+        Args:
+            category: Category name
+            message: Message with '{location}' and '{aqi}' placeholders
+            role_suffix: Extra sentence for the role, if any
+            products: Suggested products
+            actions: Suggested actions
+            role: Role the suffix applies to
 
+        Returns:
+            RecommendationTemplate
+        """
+        template_id = f"{category}:{role.lower()}" if role_suffix else category
+
+        return RecommendationTemplate(
+            template_id=template_id,
+            category=category,
+            message_template=message + role_suffix,
+            products=products,
+            actions=actions
+        )
+
+    @staticmethod
+    def _create_good_template(user_role: str) -> RecommendationTemplate:
+        """Create template for good air quality (AQI 0-50)."""
+        message = "Air quality in {location} is good (AQI: {aqi}). It's a great day for outdoor activities!"
+
+        suffix = ""
         if user_role == "Researcher":
-            message += " Data shows optimal conditions for monitoring baseline pollutant levels."
+            suffix = " Data shows optimal conditions for monitoring baseline pollutant levels."
 
-        return BaseRecommendation(
-            pollution_level=aqi,
-            message=message,
+        return RecommendationFactory._template(
             category="good",
-            products=[],
-            actions=[
+            message=message,
+            role_suffix=suffix,
+            role=user_role,
+            actions=(
                 "Enjoy outdoor activities",
                 "Perfect time for exercise",
                 "Open windows to ventilate your home"
-            ]
+            )
         )
 
     @staticmethod
-    def _create_moderate_recommendation(aqi: int, user_role: str, location: str) -> BaseRecommendation:
-        """Create recommendation for moderate air quality (AQI 51-100)."""
-        message = f"Air quality in {location} is moderate (AQI: {aqi}). Air quality is acceptable for most people."
+    def _create_moderate_template(user_role: str) -> RecommendationTemplate:
+        """Create template for moderate air quality (AQI 51-100)."""
+        message = "Air quality in {location} is moderate (AQI: {aqi}). Air quality is acceptable for most people."
 
+        suffix = ""
         if user_role == "Researcher":
-            message += " Consider monitoring sensitive population responses."
+            suffix = " Consider monitoring sensitive population responses."
 
-        return BaseRecommendation(
-            pollution_level=aqi,
-            message=message,
+        return RecommendationFactory._template(
             category="moderate",
-            products=[],
-            actions=[
+            message=message,
+            role_suffix=suffix,
+            role=user_role,
+            actions=(
                 "Most people can enjoy outdoor activities",
                 "Unusually sensitive people should consider reducing prolonged outdoor exertion",
                 "Monitor air quality if you have respiratory conditions"
-            ]
+            )
         )
 
     @staticmethod
-    def _create_unhealthy_sensitive_recommendation(aqi: int, user_role: str, location: str) -> BaseRecommendation:
-        """Create recommendation for unhealthy for sensitive groups (AQI 101-150)."""
-        message = f"Air quality in {location} is unhealthy for sensitive groups (AQI: {aqi}). Take precautions if you are sensitive to air pollution."
+    def _create_unhealthy_sensitive_template(user_role: str) -> RecommendationTemplate:
+        """Create template for unhealthy for sensitive groups (AQI 101-150)."""
+        message = "Air quality in {location} is unhealthy for sensitive groups (AQI: {aqi}). Take precautions if you are sensitive to air pollution."
 
-        products = [
+        products = (
             ProductInfo(name="Basic Face Mask", type="mask", url="https://example.com/mask"),
             ProductInfo(name="Air Quality Monitor", type="monitor", url="https://example.com/monitor")
-        ]
+        )
 
+        suffix = ""
         if user_role == "Researcher":
-            message += " Elevated levels detected - recommend sampling for analysis."
+            suffix = " Elevated levels detected - recommend sampling for analysis."
 
-        return BaseRecommendation(
-            pollution_level=aqi,
-            message=message,
+        return RecommendationFactory._template(
             category="unhealthy_for_sensitive",
+            message=message,
+            role_suffix=suffix,
+            role=user_role,
             products=products,
-            actions=[
+            actions=(
                 "Sensitive groups should reduce prolonged outdoor exertion",
                 "Consider wearing a mask outdoors",
                 "Keep windows closed",
                 "Use air purifiers indoors"
-            ]
+            )
         )
 
     @staticmethod
-    def _create_unhealthy_recommendation(aqi: int, user_role: str, location: str) -> BaseRecommendation:
-        """Create recommendation for unhealthy air quality (AQI 151-200)."""
-        message = f"Air quality in {location} is unhealthy (AQI: {aqi}). Everyone may experience health effects."
+    def _create_unhealthy_template(user_role: str) -> RecommendationTemplate:
+        """Create template for unhealthy air quality (AQI 151-200)."""
+        message = "Air quality in {location} is unhealthy (AQI: {aqi}). Everyone may experience health effects."
 
-        products = [
+        products = (
             ProductInfo(name="N95 Respirator Mask", type="respirator", url="https://example.com/n95"),
             ProductInfo(name="HEPA Air Purifier", type="air_purifier", url="https://example.com/purifier"),
             ProductInfo(name="Indoor Air Quality Monitor", type="monitor", url="https://example.com/monitor")
-        ]
+        )
 
+        suffix = ""
         if user_role == "Researcher":
-            message += " Critical pollution event - immediate analysis recommended."
+            suffix = " Critical pollution event - immediate analysis recommended."
 
-        return BaseRecommendation(
-            pollution_level=aqi,
-            message=message,
+        return RecommendationFactory._template(
             category="unhealthy",
+            message=message,
+            role_suffix=suffix,
+            role=user_role,
             products=products,
-            actions=[
+            actions=(
                 "Avoid prolonged outdoor activities",
                 "Wear N95 mask if you must go outside",
                 "Keep windows and doors closed",
                 "Run air purifiers on high",
                 "Sensitive groups should stay indoors"
-            ]
+            )
         )
 
     @staticmethod
-    def _create_very_unhealthy_recommendation(aqi: int, user_role: str, location: str) -> BaseRecommendation:
-        """Create recommendation for very unhealthy air quality (AQI 201-300)."""
-        message = f"Air quality in {location} is very unhealthy (AQI: {aqi}). Health alert - everyone may experience serious health effects."
+    def _create_very_unhealthy_template(user_role: str) -> RecommendationTemplate:
+        """Create template for very unhealthy air quality (AQI 201-300)."""
+        message = "Air quality in {location} is very unhealthy (AQI: {aqi}). Health alert - everyone may experience serious health effects."
 
-        products = [
+        products = (
             ProductInfo(name="N95/N99 Respirator", type="respirator", url="https://example.com/n95"),
             ProductInfo(name="Professional HEPA Air Purifier", type="air_purifier", url="https://example.com/pro-purifier"),
             ProductInfo(name="Emergency Air Quality Kit", type="kit", url="https://example.com/kit")
-        ]
+        )
 
+        suffix = ""
         if user_role == "Admin":
-            message += " ALERT: Issue public health advisory immediately."
+            suffix = " ALERT: Issue public health advisory immediately."
 
-        return BaseRecommendation(
-            pollution_level=aqi,
-            message=message,
+        return RecommendationFactory._template(
             category="very_unhealthy",
+            message=message,
+            role_suffix=suffix,
+            role=user_role,
             products=products,
-            actions=[
+            actions=(
                 "Stay indoors as much as possible",
                 "Avoid all outdoor physical activity",
                 "Wear high-grade respirator if you must go outside",
                 "Seal windows and doors",
                 "Use multiple air purifiers",
                 "Check on vulnerable neighbors"
-            ]
+            )
         )
 
     @staticmethod
-    def _create_hazardous_recommendation(aqi: int, user_role: str, location: str) -> BaseRecommendation:
-        """Create recommendation for hazardous air quality (AQI 301+)."""
-        message = f"HAZARDOUS air quality in {location} (AQI: {aqi}). Health emergency - everyone is likely to be affected."
+    def _create_hazardous_template(user_role: str) -> RecommendationTemplate:
+        """Create template for hazardous air quality (AQI 301+)."""
+        message = "HAZARDOUS air quality in {location} (AQI: {aqi}). Health emergency - everyone is likely to be affected."
 
-        products = [
+        products = (
             ProductInfo(name="Professional Respirator (P100)", type="respirator", url="https://example.com/p100"),
             ProductInfo(name="Hospital-Grade Air Purifier", type="air_purifier", url="https://example.com/hospital-purifier"),
             ProductInfo(name="Emergency Evacuation Kit", type="kit", url="https://example.com/evac-kit")
-        ]
+        )
 
+        suffix = ""
         if user_role == "Admin":
-            message += " EMERGENCY: Activate emergency response protocols."
+            suffix = " EMERGENCY: Activate emergency response protocols."
 
-        return BaseRecommendation(
-            pollution_level=aqi,
-            message=message,
+        return RecommendationFactory._template(
             category="hazardous",
+            message=message,
+            role_suffix=suffix,
+            role=user_role,
             products=products,
-            actions=[
+            actions=(
                 "EMERGENCY: Stay indoors at all times",
                 "Do NOT go outside unless absolutely necessary",
                 "Wear P100 respirator if evacuation required",
@@ -191,6 +292,9 @@ class RecommendationFactory:
                 "Consider evacuation if possible",
                 "Monitor health symptoms closely",
                 "Keep emergency contacts ready"
-            ]
+            )
         )
 
+
+# Precompute all templates once at import time
+RecommendationFactory._templates = RecommendationFactory._build_templates()
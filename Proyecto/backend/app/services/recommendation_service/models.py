@@ -2,8 +2,8 @@
 Factory Pattern - Models for recommendations.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict
 
 
 class ProductInfo(BaseModel):
@@ -12,6 +12,8 @@ class ProductInfo(BaseModel):
     type: str  # 'mask', 'respirator', 'air_purifier', etc.
     url: Optional[str] = None
 
+    model_config = ConfigDict(frozen=True)
+
 
 class BaseRecommendation(BaseModel):
     """
@@ -24,4 +26,48 @@ class BaseRecommendation(BaseModel):
     category: str
     products: List[ProductInfo] = []
     actions: List[str] = []
+    template_id: Optional[str] = None
+
+
+class RecommendationTemplate(BaseModel):
+    """
+    Immutable recommendation template for one AQI category and user role.
+
+    Everything except the location and the AQI value is fixed per
+    (category, role), so templates are built once and only the message
+    is formatted when a recommendation is rendered.
+
+    Attributes:
+        template_id: Stable identifier (e.g. 'unhealthy' or 'hazardous:admin')
+        category: Risk category the template applies to
+        message_template: Message with '{location}' and '{aqi}' placeholders
+        products: Suggested products (shared, immutable)
+        actions: Suggested actions (shared, immutable)
+    """
+    template_id: str
+    category: str
+    message_template: str
+    products: Tuple[ProductInfo, ...] = ()
+    actions: Tuple[str, ...] = ()
+
+    model_config = ConfigDict(frozen=True)
+
+    def render(self, aqi: int, location: str) -> BaseRecommendation:
+        """
+        Render the template for a concrete AQI value and location.
+
+        Args:
+            aqi: Air Quality Index value
+            location: Location name for context
 
+        Returns:
+            BaseRecommendation built from this template
+        """
+        return BaseRecommendation(
+            pollution_level=aqi,
+            message=self.message_template.format(location=location, aqi=aqi),
+            category=self.category,
+            products=list(self.products),
+            actions=list(self.actions),
+            template_id=self.template_id
+        )
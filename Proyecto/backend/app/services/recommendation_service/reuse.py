@@ -0,0 +1,134 @@
+"""
+Recommendation reuse cache.
+
+Keeps the latest recommendation generated per (user, location, template) so
+that polling clients get the same recommendation back within a configurable
+window instead of a new database row on every request.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from app.schemas.recommendation import RecommendationResponse
+
+
+class RecommendationReuseCache:
+    """
+    In-process cache of recent recommendations with reuse counters.
+
+    Entries are keyed by (user_id, location, template_id), where the template
+    id encodes the AQI category. The cache is bounded (least recently used
+    entries are evicted) and is only a fast path: the database is still
+    checked when an entry is missing, e.g. in another worker process.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached recommendations
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str, str], RecommendationResponse]" = OrderedDict()
+        self._lock = Lock()
+        self._counters: Dict[str, int] = {
+            "reused_cache": 0,
+            "reused_db": 0,
+            "generated": 0
+        }
+
+    def get(self, user_id: int, location: str, template_id: str,
+            since: datetime) -> Optional[RecommendationResponse]:
+        """
+        Get a cached recommendation created after `since`.
+
+        Args:
+            user_id: User ID
+            location: Location of the recommendation
+            template_id: Factory template ID (AQI category and role)
+            since: Oldest acceptable creation time
+
+        Returns:
+            Cached RecommendationResponse or None
+        """
+        key = (user_id, location, template_id)
+        with self._lock:
+            recommendation = self._entries.get(key)
+            if recommendation is None:
+                return None
+            if _naive_utc(recommendation.created_at) < since:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return recommendation
+
+    def put(self, user_id: int, location: str, template_id: str,
+            recommendation: RecommendationResponse) -> None:
+        """
+        Store a recommendation in the cache.
+
+        Args:
+            user_id: User ID
+            location: Location of the recommendation
+            template_id: Factory template ID (AQI category and role)
+            recommendation: Recommendation to cache
+        """
+        key = (user_id, location, template_id)
+        with self._lock:
+            self._entries[key] = recommendation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, outcome: str) -> None:
+        """
+        Increment a counter ('reused_cache', 'reused_db' or 'generated').
+
+        Args:
+            outcome: Counter name
+        """
+        with self._lock:
+            self._counters[outcome] = self._counters.get(outcome, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get reuse counters.
+
+        Returns:
+            Dictionary with counters and current cache size
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["cached_entries"] = len(self._entries)
+        return stats
+
+    def clear(self) -> None:
+        """Remove all cached entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+
+def window_start(minutes: int) -> datetime:
+    """
+    Get the start of a reuse window ending now (naive UTC, like created_at).
+
+    Args:
+        minutes: Window length in minutes
+
+    Returns:
+        Datetime `minutes` ago
+    """
+    return datetime.utcnow() - timedelta(minutes=minutes)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Drop timezone info from an aware UTC datetime for comparison."""
+    if value.tzinfo is not None:
+        return (value - value.utcoffset()).replace(tzinfo=None)
+    return value
+
+
+# Global cache instance shared by all requests in this process
+recommendation_reuse_cache = RecommendationReuseCache()
@@ -0,0 +1,264 @@
+"""
+Reference data cache.
+
+Pollutants, stations and roles are small tables that change rarely (only
+through the admin endpoints), yet almost every request needs them. They are
+loaded once at startup into immutable snapshots and served from memory:
+services resolve a station or pollutant by id, and role checks resolve a
+user's role by role_id, without a join or lookup query per request.
+
+Each load produces a new versioned snapshot that replaces the previous one
+atomically, so readers never see a half-refreshed cache. The snapshot is
+reloaded after admin writes and periodically (REFERENCE_DATA_REFRESH_SECONDS),
+which also picks up changes made by other worker processes or by the
+ingestion service (e.g. new stations).
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.logging_config import logger
+from app.db.session import SessionLocal
+from app.models.pollutant import Pollutant
+from app.models.role import Role
+from app.models.station import Station
+
+
+@dataclass(frozen=True, slots=True)
+class PollutantRef:
+    """Cached pollutant (same attributes as the ORM model)."""
+    id: int
+    name: str
+    unit: str
+    description: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class StationRef:
+    """Cached station (same attributes as the ORM model)."""
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+    city: str
+    country: str
+    region_id: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class RoleRef:
+    """Cached role."""
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """
+    One consistent load of the reference tables.
+
+    Attributes:
+        version: Load counter (increases on every refresh)
+        loaded_at: Load time (UTC)
+        pollutants: Pollutants by id
+        stations: Stations by id
+        roles: Roles by id
+    """
+    version: int = 0
+    loaded_at: Optional[datetime] = None
+    pollutants: Dict[int, PollutantRef] = field(default_factory=dict)
+    stations: Dict[int, StationRef] = field(default_factory=dict)
+    roles: Dict[int, RoleRef] = field(default_factory=dict)
+
+
+class ReferenceDataCache:
+    """
+    In-process, versioned cache of pollutants, stations and roles.
+
+    Lookups return None for ids missing from the snapshot (or before the
+    first load), so callers fall back to the database.
+    """
+
+    def __init__(self):
+        """Initialize an empty (not loaded) cache."""
+        self._snapshot = ReferenceSnapshot()
+        self._lock = Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._counters: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot (0 before the first load)."""
+        return self._snapshot.version
+
+    def load(self, db: Session) -> ReferenceSnapshot:
+        """
+        Load the reference tables into a new snapshot.
+
+        Args:
+            db: SQLAlchemy database session
+
+        Returns:
+            The new snapshot
+        """
+        pollutants = {
+            row.id: PollutantRef(row.id, row.name, row.unit, row.description)
+            for row in db.query(Pollutant.id, Pollutant.name, Pollutant.unit, Pollutant.description)
+        }
+        stations = {
+            row.id: StationRef(row.id, row.name, row.latitude, row.longitude,
+                               row.city, row.country, row.region_id)
+            for row in db.query(Station.id, Station.name, Station.latitude, Station.longitude,
+                                Station.city, Station.country, Station.region_id)
+        }
+        roles = {row.id: RoleRef(row.id, row.name) for row in db.query(Role.id, Role.name)}
+
+        with self._lock:
+            snapshot = ReferenceSnapshot(
+                version=self._snapshot.version + 1,
+                loaded_at=datetime.now(timezone.utc),
+                pollutants=pollutants,
+                stations=stations,
+                roles=roles
+            )
+            self._snapshot = snapshot
+
+        logger.info(
+            f"Reference data v{snapshot.version} loaded: {len(pollutants)} pollutants, "
+            f"{len(stations)} stations, {len(roles)} roles"
+        )
+        return snapshot
+
+    def refresh(self) -> Optional[ReferenceSnapshot]:
+        """
+        Reload the snapshot with a session of its own.
+
+        Failures are logged and the previous snapshot is kept.
+
+        Returns:
+            The new snapshot, or None if the load failed
+        """
+        db = SessionLocal()
+        try:
+            return self.load(db)
+        except Exception as e:
+            logger.warning(f"Reference data refresh failed (keeping v{self.version}): {e}")
+            return None
+        finally:
+            db.close()
+
+    def pollutant(self, pollutant_id: int) -> Optional[PollutantRef]:
+        """
+        Get a cached pollutant.
+
+        Args:
+            pollutant_id: Pollutant ID
+
+        Returns:
+            PollutantRef or None if not cached
+        """
+        return self._count(self._snapshot.pollutants.get(pollutant_id))
+
+    def station(self, station_id: int) -> Optional[StationRef]:
+        """
+        Get a cached station.
+
+        Args:
+            station_id: Station ID
+
+        Returns:
+            StationRef or None if not cached
+        """
+        return self._count(self._snapshot.stations.get(station_id))
+
+    def role_name(self, role_id: Optional[int]) -> Optional[str]:
+        """
+        Get the name of a cached role.
+
+        Args:
+            role_id: Role ID
+
+        Returns:
+            Role name or None if not cached
+        """
+        role = self._count(self._snapshot.roles.get(role_id))
+        return role.name if role else None
+
+    def _count(self, value: Any) -> Any:
+        """Count a lookup as a hit or a miss and return it unchanged."""
+        with self._lock:
+            self._counters["hits" if value is not None else "misses"] += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache state and lookup counters.
+
+        Returns:
+            Dictionary with version, load time, table sizes, hits and misses
+        """
+        snapshot = self._snapshot
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at.isoformat() if snapshot.loaded_at else None,
+            "pollutants": len(snapshot.pollutants),
+            "stations": len(snapshot.stations),
+            "roles": len(snapshot.roles),
+            **counters
+        }
+
+    async def start(self, interval_seconds: int) -> None:
+        """
+        Load the cache and keep refreshing it, in the background (returns
+        immediately; lookups fall back to the database until the first load).
+
+        Args:
+            interval_seconds: Seconds between refreshes (0 disables periodic refresh)
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval_seconds))
+
+    async def stop(self) -> None:
+        """Stop the periodic refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, interval_seconds: int) -> None:
+        """Load the snapshot, then refresh it every `interval_seconds` (off the event loop)."""
+        await asyncio.to_thread(self.refresh)
+        while interval_seconds > 0:
+            await asyncio.sleep(interval_seconds)
+            await asyncio.to_thread(self.refresh)
+
+
+def user_role_name(user: Any) -> Optional[str]:
+    """
+    Get a user's role name from the cache, loading the relationship only
+    for roles missing from the cache.
+
+    Args:
+        user: AppUser
+
+    Returns:
+        Role name or None if the user has no role
+    """
+    name = reference_data.role_name(user.role_id)
+    if name is None and user.role is not None:
+        name = user.role.name
+    return name
+
+
+# Global cache instance shared by all requests in this process
+reference_data = ReferenceDataCache()
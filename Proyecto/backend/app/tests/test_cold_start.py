@@ -0,0 +1,54 @@
+"""
+Cold-start tests: a new worker must import the API within the target time
+and without loading the lazily imported subsystems.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Median seconds to import app.main (override with COLD_START_TARGET_SECONDS)
+COLD_START_TARGET_SECONDS = float(os.environ.get("COLD_START_TARGET_SECONDS", "2.0"))
+
+LAZY_MODULES = ("motor", "pymongo", "passlib", "numpy")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _import_app() -> subprocess.CompletedProcess:
+    """Import app.main in a new interpreter, printing the lazy modules it loaded."""
+    snippet = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    return subprocess.run([sys.executable, "-c", snippet], cwd=BACKEND_DIR,
+                          capture_output=True, text=True)
+
+
+@pytest.mark.slow
+def test_lazy_subsystems_not_imported_at_startup():
+    """MongoDB clients, passlib and NumPy are only imported on first use."""
+    result = _import_app()
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.slow
+def test_cold_start_within_target():
+    """Median import time of app.main stays within the target."""
+    _import_app()  # Warm-up (compiles .pyc files)
+    times = []
+    for _ in range(3):
+        started = time.perf_counter()
+        result = _import_app()
+        times.append(time.perf_counter() - started)
+        assert result.returncode == 0, result.stderr
+
+    median = statistics.median(times)
+    assert median <= COLD_START_TARGET_SECONDS, (
+        f"Cold start {median:.3f}s above target {COLD_START_TARGET_SECONDS:.3f}s"
+    )
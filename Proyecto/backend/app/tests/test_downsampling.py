@@ -0,0 +1,61 @@
+"""
+Downsampling tests: LTTB and min/max keep at most N points and the peaks.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.downsampling import lttb_indices, minmax_indices, series_arrays
+
+# Ten years of 10-minute readings with one pollution peak
+N = 10 * 365 * 144
+PEAK = 300_000
+
+
+@pytest.fixture
+def series():
+    x = np.arange(N) * 600.0
+    y = 30 + 20 * np.sin(x / 86400) + np.random.default_rng(0).normal(0, 3, N)
+    y[PEAK] = 500.0
+    return x, y
+
+
+@pytest.mark.unit
+def test_lttb_keeps_endpoints_and_peak(series):
+    """LTTB returns exactly N increasing indices, including both ends and the peak."""
+    x, y = series
+    indices = lttb_indices(x, y, 1000)
+    assert len(indices) == 1000
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0 and indices[-1] == N - 1
+    assert PEAK in indices
+
+
+@pytest.mark.unit
+def test_minmax_keeps_extremes(series):
+    """Min/max returns at most N points including the global extremes."""
+    x, y = series
+    indices = minmax_indices(y, y, 1000)
+    assert len(indices) <= 1000
+    assert PEAK in indices
+    assert int(np.argmin(y)) in indices
+
+
+@pytest.mark.unit
+def test_short_series_returned_whole():
+    """Series shorter than the threshold are not downsampled."""
+    y = np.array([1.0, 5.0, 2.0])
+    assert list(lttb_indices(np.arange(3.0), y, 10)) == [0, 1, 2]
+    assert list(minmax_indices(y, y, 10)) == [0, 1, 2]
+
+
+@pytest.mark.unit
+def test_series_arrays_split_by_pollutant():
+    """Streamed chunks become one table per pollutant, NULL AQI as NaN."""
+    chunks = [
+        [(1, 0.0, 10.0, None, 10.0, 10.0, 1), (1, 600.0, 12.0, 40, 12.0, 12.0, 1)],
+        [(1, 1200.0, 11.0, 38, 11.0, 11.0, 1), (3, 0.0, 0.5, 10, 0.5, 0.5, 1)],
+    ]
+    tables = series_arrays(chunks)
+    assert {key: len(table) for key, table in tables.items()} == {1: 3, 3: 1}
+    assert np.isnan(tables[1][0, 3])
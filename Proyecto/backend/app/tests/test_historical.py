@@ -0,0 +1,99 @@
+"""
+Historical data tests: range validation and grouping of the daily history.
+"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from app.core.config import settings
+from app.repositories.air_quality_repository import AirQualityRepository
+from app.services.air_quality_service import AirQualityService
+from app.services.reference_data import PollutantRef, StationRef
+
+END = date(2024, 6, 5)
+
+
+@pytest.fixture
+def service():
+    # Reference data comes from the cache, the rollup query is mocked
+    with mock.patch.object(AirQualityService, "_get_station",
+                           side_effect=lambda i: StationRef(i, f"S{i}", 4.6, -74.1, "Bogotá", "Colombia", None) if i < 10 else None), \
+         mock.patch.object(AirQualityService, "_get_pollutant",
+                           side_effect=lambda i: PollutantRef(i, f"P{i}", "µg/m³", None)):
+        service = AirQualityService(db=None)
+        service.air_quality_repo = mock.Mock()
+        service.air_quality_repo.get_daily_history.return_value = {
+            2: {1: {'data_points': [{'date': '2024-06-05', 'value': 12.5, 'aqi': 52}]}}
+        }
+        yield service
+
+
+@pytest.mark.unit
+def test_stations_in_request_order(service):
+    """Every requested station is returned once, in order, with its own pollutants."""
+    result = service.get_historical_data([2, 1, 2], END - timedelta(days=6), END, pollutant_ids=[1])
+
+    assert [s.station.id for s in result.stations] == [2, 1]
+    assert [p.pollutant.id for p in result.stations[0].pollutants_data] == [1]
+    assert result.stations[1].pollutants_data == []
+    service.air_quality_repo.get_daily_history.assert_called_once_with(
+        station_ids=[2, 1], start_date=END - timedelta(days=6), end_date=END, pollutant_ids=[1]
+    )
+
+
+@pytest.mark.unit
+def test_unknown_station(service):
+    """A missing station makes the whole request not found."""
+    assert service.get_historical_data([1, 99], END, END) is None
+
+
+@pytest.mark.unit
+def test_invalid_ranges(service):
+    """Reversed and too long ranges are rejected before querying."""
+    with pytest.raises(ValueError):
+        service.get_historical_data([1], END, END - timedelta(days=1))
+    with pytest.raises(ValueError):
+        service.get_historical_data([1], END - timedelta(days=settings.HISTORICAL_MAX_DAYS), END)
+    service.air_quality_repo.get_daily_history.assert_not_called()
+
+
+@pytest.mark.unit
+def test_seven_days_keeps_legacy_query(service):
+    """The deprecated 7-day endpoint still averages raw readings (session time zone days)."""
+    service.air_quality_repo.get_historical_data_by_station.return_value = {
+        1: {'data_points': [{'date': '2024-06-05', 'value': 12.5, 'aqi': 52}]}
+    }
+    result = service.get_7_day_historical_data(2, END - timedelta(days=6), END)
+
+    assert result.station.id == 2
+    assert [p.pollutant.id for p in result.pollutants_data] == [1]
+    service.air_quality_repo.get_historical_data_by_station.assert_called_once_with(
+        station_id=2, start_date=END - timedelta(days=6), end_date=END
+    )
+    service.air_quality_repo.get_daily_history.assert_not_called()
+
+
+def day_row(station_id, day, value_sum, readings_count):
+    return SimpleNamespace(station_id=station_id, pollutant_id=1, bucket=datetime.combine(day, datetime.min.time()),
+                           readings_count=readings_count, value_sum=value_sum, aqi_count=0, aqi_sum=0)
+
+
+@pytest.mark.unit
+def test_daily_history_falls_back_per_station():
+    """Stations without rollup rows in the range are read from the raw readings."""
+    repo = AirQualityRepository(db=None)
+    rollup = [day_row(1, END, 125.0, 10)]
+    raw = [day_row(2, END, 30.0, 3)]
+    with mock.patch.object(repo, "_bucket_query", side_effect=[rollup, raw]) as bucket_query:
+        history = repo.get_daily_history([1, 2], END, END)
+
+    assert history == {
+        1: {1: {'data_points': [{'date': '2024-06-05', 'value': 12.5, 'aqi': None}]}},
+        2: {1: {'data_points': [{'date': '2024-06-05', 'value': 10.0, 'aqi': None}]}},
+    }
+    (rollup_call, raw_call) = bucket_query.call_args_list
+    assert rollup_call.args[:2] == ("hourly", [1, 2])
+    assert raw_call.args[:2] == ("raw", [2])
@@ -0,0 +1,92 @@
+"""
+Live updates tests: the LISTEN connection reconnects after a poll error.
+"""
+
+import asyncio
+import json
+import socket
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+
+from app.services.live_update_service import LiveUpdateBroadcaster
+
+
+class FakeListenConnection:
+    """
+    psycopg2 connection stand-in backed by a socket pair.
+
+    Writing to `server` makes the connection readable; poll() turns each
+    line into a notification, or raises if the connection is set to fail.
+    Like psycopg2, fileno() raises once the connection is broken.
+    """
+
+    def __init__(self, fail: bool = False):
+        self.server, self.client = socket.socketpair()
+        self.fail = fail
+        self.broken = False
+        self.closed = False
+        self.notifies = []
+
+    def fileno(self):
+        if self.broken:
+            raise psycopg2.InterfaceError("connection already closed")
+        return self.client.fileno()
+
+    def poll(self):
+        data = self.client.recv(4096)
+        if self.fail:
+            self.broken = True
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        for line in data.decode().splitlines():
+            self.notifies.append(SimpleNamespace(payload=line))
+
+    def notify(self, payload: dict):
+        self.server.sendall((json.dumps(payload) + "\n").encode())
+
+    def close(self):
+        self.closed = True
+        self.client.close()
+        self.server.close()
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.unit
+def test_reconnects_after_poll_error():
+    """A poll error closes the connection and the listener opens a new one."""
+    connections = [FakeListenConnection(fail=True), FakeListenConnection()]
+    opened = []
+
+    def open_connection():
+        opened.append(connections[len(opened)])
+        return opened[-1]
+
+    async def scenario():
+        broadcaster = LiveUpdateBroadcaster("readings", reconnect_delay=0.01)
+        broadcaster._open_connection = open_connection
+        subscription = broadcaster.subscribe([1])
+
+        await broadcaster.start()
+        try:
+            await wait_for(lambda: len(opened) == 1)
+            connections[0].notify({"station_id": 1})
+            await wait_for(lambda: len(opened) == 2)
+            assert connections[0].closed
+            assert not broadcaster._task.done()
+
+            connections[1].notify({"station_id": 1, "value": 12.5})
+            message = await subscription.next_message(timeout=2.0)
+            assert json.loads(message) == {"station_id": 1, "value": 12.5}
+        finally:
+            await broadcaster.stop()
+
+        assert connections[1].closed
+
+    asyncio.run(scenario())
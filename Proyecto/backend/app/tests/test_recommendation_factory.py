@@ -0,0 +1,56 @@
+"""
+Recommendation factory tests: templates precomputed per category and role.
+"""
+
+import pytest
+
+from app.services.recommendation_service.factory import KNOWN_ROLES, RecommendationFactory
+
+CATEGORIES = ("good", "moderate", "unhealthy_for_sensitive", "unhealthy", "very_unhealthy", "hazardous")
+
+
+@pytest.mark.unit
+def test_templates_built_once():
+    """Every category/role has one template, reused by every call."""
+    assert set(RecommendationFactory._templates) == {(c, r) for c in CATEGORIES for r in KNOWN_ROLES}
+
+    template = RecommendationFactory.get_template("unhealthy", "Citizen")
+    RecommendationFactory.create_for_aqi(180, "Citizen", "Bogotá")
+    RecommendationFactory.create_for_aqi(160, "Citizen", "Medellín")
+    assert RecommendationFactory.get_template("unhealthy", "Citizen") is template
+
+    # Unknown roles share the Citizen template
+    assert RecommendationFactory.get_template("unhealthy", "Guest") is template
+
+
+@pytest.mark.unit
+def test_only_location_and_aqi_change():
+    """Two renders of a template differ only in the location and the AQI."""
+    first = RecommendationFactory.create_for_aqi(160, "Researcher", "Bogotá")
+    second = RecommendationFactory.create_for_aqi(190, "Researcher", "Medellín")
+
+    assert (first.pollution_level, second.pollution_level) == (160, 190)
+    assert "Bogotá" in first.message and "(AQI: 160)" in first.message
+    assert second.message == first.message.replace("Bogotá", "Medellín").replace("160", "190")
+    assert (first.category, first.products, first.actions) == (second.category, second.products, second.actions)
+
+    # Rendered lists are copies: changing one does not affect the template
+    first.actions.append("changed")
+    assert "changed" not in RecommendationFactory.create_for_aqi(160, "Researcher", "Bogotá").actions
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("aqi, role, template_id", [
+    (10, "Citizen", "good"),
+    (10, "Admin", "good"),
+    (10, "Researcher", "good:researcher"),
+    (120, "Citizen", "unhealthy_for_sensitive"),
+    (250, "Admin", "very_unhealthy:admin"),
+    (250, "Researcher", "very_unhealthy"),
+    (400, "Admin", "hazardous:admin"),
+    (400, "Guest", "hazardous"),
+])
+def test_template_id_is_stable(aqi, role, template_id):
+    """Template ids depend on category and role-specific content only."""
+    assert RecommendationFactory.create_for_aqi(aqi, role, "Bogotá").template_id == template_id
+    assert RecommendationFactory.create_for_aqi(aqi, role, "Cali").template_id == template_id
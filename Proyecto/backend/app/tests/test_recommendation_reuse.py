@@ -0,0 +1,124 @@
+"""
+Recommendation reuse tests: in-process cache, database lookups and counters.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.recommendation import RecommendationResponse
+from app.services import recommendation_generation_service
+from app.services.recommendation_generation_service import RecommendationService
+from app.services.recommendation_service.reuse import RecommendationReuseCache
+
+USER = SimpleNamespace(id=7, location="Bogotá")
+# AQI 160 for a Citizen renders the "unhealthy" template
+AQI = 160
+TEMPLATE_ID = "unhealthy"
+
+
+def stored(id, age=timedelta(0), aqi=AQI):
+    """Recommendation row stand-in created `age` ago."""
+    return SimpleNamespace(id=id, user_id=USER.id, location=USER.location, pollution_level=aqi,
+                           message="stored", created_at=datetime.utcnow() - age, products=[])
+
+
+@pytest.fixture
+def cache():
+    cache = RecommendationReuseCache()
+    with mock.patch.object(recommendation_generation_service, "recommendation_reuse_cache", cache), \
+         mock.patch.object(recommendation_generation_service, "user_role_name", return_value="Citizen"):
+        yield cache
+
+
+def service(latest=None, window=10, deduplicate=False):
+    service = RecommendationService(db=None)
+    service.recommendation_repo = mock.Mock()
+    service.recommendation_repo.get_latest_by_template.return_value = latest
+    service.recommendation_repo.create.side_effect = lambda **row: stored(100, aqi=row["pollution_level"])
+    patches = (mock.patch.object(settings, "RECOMMENDATION_REUSE_WINDOW_MINUTES", window),
+               mock.patch.object(settings, "RECOMMENDATION_DEDUPLICATE", deduplicate))
+    return service, patches
+
+
+def generate(service, aqi=AQI):
+    return service.generate_current_recommendation(USER, aqi=aqi)
+
+
+@pytest.mark.unit
+def test_cache_hit_within_window(cache):
+    """A second request in the window comes from the cache, without a query or a new row."""
+    svc, (window, deduplicate) = service()
+    with window, deduplicate:
+        first = generate(svc)
+        second = generate(svc, aqi=170)
+
+    assert second is first
+    svc.recommendation_repo.create.assert_called_once()
+    svc.recommendation_repo.get_latest_by_template.assert_called_once()
+    assert cache.stats() == {"reused_cache": 1, "reused_db": 0, "generated": 1, "cached_entries": 1}
+
+
+@pytest.mark.unit
+def test_expired_entry_creates_a_new_row(cache):
+    """A cached recommendation older than the window is dropped and a new row is stored."""
+    old = stored(1, age=timedelta(minutes=11))
+    cache.put(USER.id, USER.location, TEMPLATE_ID, RecommendationResponse.model_validate(old))
+    svc, (window, deduplicate) = service()
+    with window, deduplicate:
+        result = generate(svc)
+
+    assert result.id == 100
+    (call,) = svc.recommendation_repo.get_latest_by_template.call_args_list
+    assert call.kwargs["since"] > old.created_at
+    svc.recommendation_repo.create.assert_called_once()
+    assert cache.stats()["reused_cache"] == 0
+    assert cache.stats()["generated"] == 1
+
+
+@pytest.mark.unit
+def test_database_fallback(cache):
+    """On a cache miss a recent row from the database is reused and then cached."""
+    svc, (window, deduplicate) = service(latest=stored(5, age=timedelta(minutes=3)))
+    with window, deduplicate:
+        first = generate(svc)
+        second = generate(svc)
+
+    assert first.id == second.id == 5
+    svc.recommendation_repo.create.assert_not_called()
+    svc.recommendation_repo.get_latest_by_template.assert_called_once_with(
+        user_id=USER.id, template_id=TEMPLATE_ID, location=USER.location, since=mock.ANY
+    )
+    assert cache.stats() == {"reused_cache": 1, "reused_db": 1, "generated": 0, "cached_entries": 1}
+
+
+@pytest.mark.unit
+def test_deduplicate_has_no_age_limit(cache):
+    """Deduplication returns an identical row of any age, with its original created_at."""
+    old = stored(3, age=timedelta(days=30))
+    svc, (window, deduplicate) = service(latest=old, window=0, deduplicate=True)
+    with window, deduplicate:
+        result = generate(svc)
+
+    assert (result.id, result.created_at) == (3, old.created_at)
+    svc.recommendation_repo.get_latest_by_template.assert_called_once_with(
+        user_id=USER.id, template_id=TEMPLATE_ID, location=USER.location, pollution_level=AQI
+    )
+    # Without a window nothing is cached
+    assert cache.stats() == {"reused_cache": 0, "reused_db": 1, "generated": 0, "cached_entries": 0}
+
+
+@pytest.mark.unit
+def test_reuse_disabled(cache):
+    """With no window and no deduplication every request stores a new row."""
+    svc, (window, deduplicate) = service(latest=stored(5), window=0)
+    with window, deduplicate:
+        generate(svc)
+        generate(svc)
+
+    assert svc.recommendation_repo.create.call_count == 2
+    svc.recommendation_repo.get_latest_by_template.assert_not_called()
+    assert cache.stats() == {"reused_cache": 0, "reused_db": 0, "generated": 2, "cached_entries": 0}
@@ -0,0 +1,62 @@
+"""
+Resolution planner tests: the data tier chosen for a time series range.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from app.core.config import settings
+from app.repositories.air_quality_repository import AirQualityRepository
+
+END = datetime(2024, 6, 5, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def repo():
+    # The planner does not touch the database
+    return AirQualityRepository(db=None)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("span, expected", [
+    (timedelta(hours=1), "raw"),
+    (timedelta(hours=settings.SERIES_RAW_MAX_HOURS), "raw"),
+    (timedelta(hours=24), "hourly"),
+    (timedelta(days=settings.SERIES_HOURLY_MAX_DAYS), "hourly"),
+    (timedelta(days=365), "daily"),
+])
+def test_auto_resolution_by_range(repo, span, expected):
+    """Short ranges read raw readings, up to a month the hourly rollup, then days."""
+    assert repo.plan_resolution(END - span, END) == expected
+
+
+@pytest.mark.unit
+def test_explicit_resolution(repo):
+    """An explicit resolution is kept unless the range is too long for it."""
+    assert repo.plan_resolution(END - timedelta(days=365), END, "hourly") == "hourly"
+    with pytest.raises(ValueError):
+        repo.plan_resolution(END - timedelta(days=30), END, "raw")
+    with pytest.raises(ValueError):
+        repo.plan_resolution(END - timedelta(days=1), END, "weekly")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("resolution, unit", [("hourly", "hour"), ("daily", "day")])
+def test_rollup_falls_back_to_readings(repo, resolution, unit):
+    """Without rollup rows for the range the same buckets come from the raw readings."""
+    point = {'timestamp': END, 'value': 12.5, 'aqi': 52, 'min_value': 10.0, 'max_value': 15.0, 'count': 6}
+    with mock.patch.object(repo, "_bucket_series", side_effect=[{}, {1: [point]}]) as bucket_series:
+        assert repo.get_time_series(7, END - timedelta(days=40), END, resolution) == (resolution, {1: [point]})
+
+    start = END - timedelta(days=40)
+    assert bucket_series.call_args_list == [
+        mock.call("hourly", 7, start, END, unit, None),
+        mock.call("raw", 7, start, END, unit, None),
+    ]
+
+    # Rows in the rollup: the readings are not read
+    with mock.patch.object(repo, "_bucket_series", return_value={1: [point]}) as bucket_series:
+        repo.get_time_series(7, END - timedelta(days=2), END, resolution)
+    bucket_series.assert_called_once()
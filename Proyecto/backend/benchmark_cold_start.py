@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark of the API.
+
+Imports `app.main` in fresh interpreters (what a new worker does before it
+can serve requests) with `python -X importtime`, and reports:
+- Wall time per run and the median, compared with the target
+- Import time per top-level package (where startup time goes)
+- Lazily imported subsystems that were loaded anyway (regressions)
+
+Usage:
+    python benchmark_cold_start.py [--runs 5] [--top 15] [--target 2.0]
+
+Exits with status 1 if the median is above the target.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Median seconds to import app.main (also enforced by app/tests/test_cold_start.py)
+COLD_START_TARGET_SECONDS = float(os.environ.get("COLD_START_TARGET_SECONDS", "2.0"))
+
+# Subsystems that must only be imported on first use
+LAZY_MODULES = ("motor", "pymongo", "passlib", "numpy")
+
+# Prints the lazy modules loaded by the import (last line of stdout)
+IMPORT_SNIPPET = (
+    "import sys, app.main; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_once(importtime: bool = False) -> Tuple[float, List[str], str]:
+    """
+    Import app.main in a new interpreter.
+
+    Args:
+        importtime: Collect the -X importtime profile
+
+    Returns:
+        Tuple of (wall seconds, lazy modules loaded, importtime output)
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", IMPORT_SNIPPET]
+
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app.main failed:\n{result.stderr[-2000:]}")
+
+    lines = result.stdout.strip().splitlines()
+    loaded = [m for m in lines[-1].split(",") if m] if lines else []
+    return elapsed, loaded, result.stderr
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """
+    Import time per top-level package (self time of all its modules).
+
+    Args:
+        output: stderr of `python -X importtime`
+
+    Returns:
+        Mapping of package -> microseconds
+    """
+    packages: Dict[str, int] = {}
+    for line in output.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) < 3 or "cumulative" in line:
+            continue
+        self_us = int(parts[0].split(":")[1])
+        package = parts[2].strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return packages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure API cold-start (import) time")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list (default: 15)")
+    parser.add_argument("--target", type=float, default=COLD_START_TARGET_SECONDS,
+                        help=f"Target median seconds (default: {COLD_START_TARGET_SECONDS})")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("API COLD START BENCHMARK")
+    print("=" * 70)
+
+    # Warm-up run (writes .pyc files), then the profile run
+    run_once()
+    _, loaded, profile = run_once(importtime=True)
+
+    times = []
+    for i in range(args.runs):
+        elapsed, _, _ = run_once()
+        times.append(elapsed)
+        print(f"  Run {i + 1}: {elapsed:.3f}s")
+
+    median = statistics.median(times)
+    print(f"\n  Median: {median:.3f}s (min {min(times):.3f}s, max {max(times):.3f}s), target {args.target:.3f}s")
+
+    print(f"\n  Import time by package (-X importtime):")
+    packages = sorted(parse_importtime(profile).items(), key=lambda item: item[1], reverse=True)
+    for package, micros in packages[:args.top]:
+        print(f"    {micros / 1000:8.1f} ms  {package}")
+
+    ok = median <= args.target
+    if loaded:
+        print(f"\n  ❌ Lazy subsystems imported at startup: {', '.join(loaded)}")
+        ok = False
+    else:
+        print(f"\n  ✓ Lazy subsystems not imported: {', '.join(LAZY_MODULES)}")
+
+    print("\n" + ("✅ Cold start within target" if ok else "❌ Cold start above target"))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
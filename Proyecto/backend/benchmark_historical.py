@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Historical endpoint benchmark.
+
+Compares, against the configured database, the two ways of computing daily
+averages for GET /api/v1/air-quality/historical:
+- Legacy: one query per station over the raw readings, grouped by
+  date(datetime) (what /historical/7-days does)
+- Rollup: a single query for all stations over air_quality_hourly_stats
+  (AirQualityRepository.get_daily_history)
+
+For a realistic volume, --generate first creates synthetic benchmark
+stations with 10-minute readings (e.g. 50M rows) server-side with
+generate_series, plus their hourly rollup. --cleanup deletes them (readings
+and rollup rows cascade).
+
+Usage:
+    python benchmark_historical.py --generate [--rows 50000000] [--stations 20]
+    python benchmark_historical.py [--windows 7 30 365 1095] [--station-counts 1 10] [--repeat 5] [--explain]
+    python benchmark_historical.py --cleanup
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.repositories.air_quality_repository import AirQualityRepository
+
+# Synthetic stations are recognized by this name prefix
+BENCHMARK_PREFIX = "benchmark-historical-"
+
+# Interval between synthetic readings
+READING_INTERVAL_MINUTES = 10
+
+_CREATE_STATION_SQL = """
+INSERT INTO station (name, latitude, longitude, city, country)
+VALUES (:name, 4.6 + random() / 10, -74.1 + random() / 10, 'Benchmark', 'CO')
+RETURNING id
+"""
+
+# Daily and random variation around a per-pollutant base value
+_GENERATE_READINGS_SQL = """
+INSERT INTO air_quality_reading (station_id, pollutant_id, datetime, value, aqi, source)
+SELECT
+    :station_id,
+    p.id,
+    ts,
+    round((10 * p.id + 5 * sin(extract(epoch FROM ts) / 86400 * 2 * pi()) + random() * 8)::numeric, 2),
+    (30 + 20 * random())::int,
+    'benchmark'
+FROM unnest(CAST(:pollutant_ids AS int[])) AS p(id),
+     generate_series(CAST(:start AS timestamptz), CAST(:end AS timestamptz), CAST(:step AS interval)) AS ts
+"""
+
+_REBUILD_ROLLUP_SQL = """
+INSERT INTO air_quality_hourly_stats (
+    station_id, pollutant_id, hour, readings_count, value_sum, min_value, max_value,
+    aqi_count, aqi_sum, min_aqi, max_aqi
+)
+SELECT
+    station_id,
+    pollutant_id,
+    date_trunc('hour', datetime AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+    count(*), sum(value), min(value), max(value),
+    count(aqi), coalesce(sum(aqi), 0), min(aqi), max(aqi)
+FROM air_quality_reading
+WHERE station_id = ANY(CAST(:station_ids AS int[]))
+GROUP BY 1, 2, 3
+"""
+
+
+def benchmark_station_ids(db: Session) -> List[int]:
+    """Return the IDs of the synthetic stations, in creation order."""
+    rows = db.execute(
+        text("SELECT id FROM station WHERE name LIKE :prefix ORDER BY id"),
+        {"prefix": f"{BENCHMARK_PREFIX}%"}
+    )
+    return [row.id for row in rows]
+
+
+def generate(db: Session, rows: int, stations: int, pollutants: int) -> None:
+    """
+    Create synthetic stations, readings ending today (UTC) and their rollup.
+
+    Args:
+        db: Database session
+        rows: Approximate number of readings to create
+        stations: Number of stations to spread them over
+        pollutants: Number of pollutants per station (the first ones by ID)
+    """
+    if benchmark_station_ids(db):
+        raise RuntimeError("Benchmark data already exists; run with --cleanup first")
+
+    pollutant_ids = [row.id for row in db.execute(text("SELECT id FROM pollutant ORDER BY id LIMIT :n"), {"n": pollutants})]
+    if not pollutant_ids:
+        raise RuntimeError("The pollutant table is empty")
+
+    per_series = max(1, rows // (stations * len(pollutant_ids)))
+    end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(minutes=READING_INTERVAL_MINUTES * (per_series - 1))
+    print(f"Generating {per_series * stations * len(pollutant_ids):,} readings: {stations} stations x "
+          f"{len(pollutant_ids)} pollutants, {start:%Y-%m-%d} to {end:%Y-%m-%d}")
+
+    station_ids = []
+    for number in range(stations):
+        started = time.perf_counter()
+        station_id = db.execute(text(_CREATE_STATION_SQL), {"name": f"{BENCHMARK_PREFIX}{number + 1}"}).scalar()
+        db.execute(text(_GENERATE_READINGS_SQL), {
+            "station_id": station_id,
+            "pollutant_ids": pollutant_ids,
+            "start": start,
+            "end": end,
+            "step": f"{READING_INTERVAL_MINUTES} minutes"
+        })
+        db.commit()
+        station_ids.append(station_id)
+        print(f"  station {station_id}: {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    result = db.execute(text(_REBUILD_ROLLUP_SQL), {"station_ids": station_ids})
+    db.commit()
+    print(f"Hourly rollup: {result.rowcount:,} rows in {time.perf_counter() - started:.1f}s")
+
+    db.execute(text("ANALYZE air_quality_reading"))
+    db.execute(text("ANALYZE air_quality_hourly_stats"))
+    db.commit()
+
+
+def cleanup(db: Session) -> None:
+    """Delete the synthetic stations (readings and rollup rows cascade)."""
+    station_ids = benchmark_station_ids(db)
+    db.execute(text("DELETE FROM station WHERE id = ANY(CAST(:ids AS int[]))"), {"ids": station_ids})
+    db.commit()
+    print(f"Deleted {len(station_ids)} benchmark stations")
+
+
+def legacy_history(db: Session, station_ids: List[int], start_date: date, end_date: date) -> int:
+    """
+    Daily averages the way /historical/7-days computes them, one station at a time.
+
+    Returns:
+        Number of (station, pollutant, day) rows
+    """
+    repo = AirQualityRepository(db)
+    return sum(
+        len(p['data_points'])
+        for station_id in station_ids
+        for p in repo.get_historical_data_by_station(station_id, start_date, end_date).values()
+    )
+
+
+def rollup_history(db: Session, station_ids: List[int], start_date: date, end_date: date) -> int:
+    """
+    Daily averages with the single rollup query of the endpoint.
+
+    Returns:
+        Number of (station, pollutant, day) rows
+    """
+    history = AirQualityRepository(db).get_daily_history(station_ids, start_date, end_date)
+    return sum(len(p['data_points']) for pollutants in history.values() for p in pollutants.values())
+
+
+def time_query(query: Callable[[], int], repeat: int) -> Tuple[float, int]:
+    """
+    Run a query several times after a warm-up run.
+
+    Returns:
+        Tuple of (median milliseconds, rows returned)
+    """
+    rows = query()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), rows
+
+
+def explain(db: Session, station_ids: List[int], start_date: date, end_date: date) -> None:
+    """Print the EXPLAIN ANALYZE plan of the rollup query for one window."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        rollup_history(db, station_ids, start_date, end_date)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = captured[-1]
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+        print("\n".join(row[0] for row in cursor.fetchall()))
+    finally:
+        cursor.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the historical endpoint queries")
+    parser.add_argument("--generate", action="store_true", help="Create synthetic benchmark data first")
+    parser.add_argument("--rows", type=int, default=50_000_000, help="Readings to generate (default: 50000000)")
+    parser.add_argument("--stations", type=int, default=20, help="Stations to generate (default: 20)")
+    parser.add_argument("--pollutants", type=int, default=6, help="Pollutants per station (default: 6)")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the synthetic benchmark data and exit")
+    parser.add_argument("--windows", type=int, nargs="+", default=[7, 30, 365, 1095],
+                        help="Window lengths in days (default: 7 30 365 1095)")
+    parser.add_argument("--station-counts", type=int, nargs="+", default=[1, 10],
+                        help="Stations per request (default: 1 10)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (default: 5)")
+    parser.add_argument("--explain", action="store_true", help="Print the plan of the rollup query")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            return 0
+        if args.generate:
+            generate(db, args.rows, args.stations, args.pollutants)
+
+        station_ids = benchmark_station_ids(db)
+        if not station_ids:
+            print("No benchmark data: run with --generate first", file=sys.stderr)
+            return 1
+
+        end_date = datetime.now(timezone.utc).date() - timedelta(days=1)
+        print(f"\n{'days':>6} {'stations':>9} {'rows':>8} {'legacy ms':>11} {'rollup ms':>11} {'speedup':>9}")
+        for days in args.windows:
+            start_date = end_date - timedelta(days=days - 1)
+            for count in args.station_counts:
+                ids = station_ids[:count]
+                legacy_ms, legacy_rows = time_query(lambda: legacy_history(db, ids, start_date, end_date), args.repeat)
+                rollup_ms, rollup_rows = time_query(lambda: rollup_history(db, ids, start_date, end_date), args.repeat)
+                print(f"{days:>6} {len(ids):>9} {rollup_rows:>8} {legacy_ms:>11.1f} {rollup_ms:>11.1f} "
+                      f"{legacy_ms / rollup_ms:>8.1f}x")
+                if legacy_rows != rollup_rows:
+                    # Legacy days follow the session time zone, rollup days are UTC
+                    print(f"{'':>6} note: legacy returned {legacy_rows} rows (session time zone days)")
+
+        if args.explain:
+            days = max(args.windows)
+            print(f"\nRollup query plan ({days} days, {min(len(station_ids), max(args.station_counts))} stations):")
+            explain(db, station_ids[:max(args.station_counts)], end_date - timedelta(days=days - 1), end_date)
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -42,8 +42,9 @@ CREATE TABLE IF NOT EXISTS air_quality_reading (
   station_id integer NOT NULL REFERENCES station (id) ON DELETE CASCADE,
   pollutant_id integer NOT NULL REFERENCES pollutant (id) ON DELETE RESTRICT,
   datetime timestamp with time zone NOT NULL,
-  value double precision NOT NULL,
-  aqi integer
+  value double precision NOT NULL, -- Concentration in the pollutant's standard unit
+  aqi integer,
+  source varchar(50) -- 'historical_csv', 'aqicn', ...
 );
 
 -- AirQualityDailyStats: Aggregated daily statistics for analytics
@@ -59,6 +60,26 @@ CREATE TABLE IF NOT EXISTS air_quality_daily_stats (
   readings_count integer DEFAULT 0
 );
 
+-- AirQualityHourlyStats: Hourly rollup of readings, maintained by the ingestion service
+-- Stores sums and counts (not averages) so merging a batch's readings is exact;
+-- averages are computed when reading
+CREATE TABLE IF NOT EXISTS air_quality_hourly_stats (
+  id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  station_id integer NOT NULL REFERENCES station (id) ON DELETE CASCADE,
+  pollutant_id integer NOT NULL REFERENCES pollutant (id) ON DELETE RESTRICT,
+  hour timestamp with time zone NOT NULL, -- Start of the UTC hour
+  readings_count integer NOT NULL DEFAULT 0,
+  value_sum double precision NOT NULL DEFAULT 0,
+  min_value double precision,
+  max_value double precision,
+  aqi_count integer NOT NULL DEFAULT 0, -- Readings with an AQI
+  aqi_sum bigint NOT NULL DEFAULT 0,
+  min_aqi integer,
+  max_aqi integer,
+  -- Also serves range queries per station and pollutant
+  UNIQUE (station_id, pollutant_id, hour)
+);
+
 -- ============================================================================
 -- USERS & ACCESS CONTROL (Operational)
 -- ============================================================================
@@ -106,6 +127,26 @@ CREATE TABLE IF NOT EXISTS alert (
   triggered_at timestamp with time zone
 );
 
+-- NotificationOutbox: Durable queue of alert notifications pending delivery
+CREATE TABLE IF NOT EXISTS notification_outbox (
+  id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  alert_id integer NOT NULL REFERENCES alert (id) ON DELETE CASCADE,
+  user_id integer NOT NULL REFERENCES app_user (id) ON DELETE CASCADE,
+  channel varchar(50) NOT NULL, -- Copied from alert.method
+  recipient varchar(255) NOT NULL,
+  pollutant_id integer NOT NULL REFERENCES pollutant (id) ON DELETE CASCADE,
+  station_id integer REFERENCES station (id) ON DELETE SET NULL,
+  value double precision NOT NULL,
+  threshold double precision NOT NULL,
+  reading_datetime timestamp with time zone NOT NULL,
+  status varchar(20) NOT NULL DEFAULT 'pending', -- 'pending', 'sent', 'failed'
+  attempts integer NOT NULL DEFAULT 0,
+  next_attempt_at timestamp with time zone NOT NULL DEFAULT NOW(),
+  last_error text,
+  created_at timestamp with time zone NOT NULL DEFAULT NOW(),
+  sent_at timestamp with time zone
+);
+
 -- Recommendation: Health recommendations based on pollution levels
 CREATE TABLE IF NOT EXISTS recommendation (
   id integer GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
@@ -113,7 +154,8 @@ CREATE TABLE IF NOT EXISTS recommendation (
   location varchar(255) NOT NULL,
   pollution_level integer NOT NULL, -- AQI value
   message text NOT NULL,
-  created_at timestamp with time zone NOT NULL DEFAULT NOW()
+  created_at timestamp with time zone NOT NULL DEFAULT NOW(),
+  template_id varchar(100) -- Factory template used to build the message
 );
 
 -- ProductRecommendation: Suggested protection products linked to recommendations
@@ -142,6 +184,46 @@ CREATE TABLE IF NOT EXISTS report (
   file_path varchar(500)
 );
 
+-- ============================================================================
+-- INGESTION
+-- ============================================================================
+
+-- IngestionCheckpoint: Progress of each ingestion source, committed with its batch
+CREATE TABLE IF NOT EXISTS ingestion_checkpoint (
+  id integer GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  source varchar(50) NOT NULL, -- 'historical_csv', 'aqicn', ...
+  source_key varchar(255) NOT NULL, -- CSV file name or AQICN station idx
+  content_hash varchar(64), -- SHA-256 of the CSV file the progress refers to
+  file_size bigint, -- CSV size and mtime: unchanged files are skipped without reading them
+  file_mtime double precision,
+  block_hashes text[], -- SHA-256 per 1 MiB block, to detect files that were only appended to
+  last_row integer, -- Data rows of the CSV already committed
+  last_timestamp timestamp with time zone, -- Latest reading committed
+  completed boolean NOT NULL DEFAULT FALSE,
+  updated_at timestamp with time zone NOT NULL DEFAULT NOW(),
+  UNIQUE (source, source_key)
+);
+
+-- StationExternalId: Identity of a station in each data source (CSV code, AQICN idx)
+CREATE TABLE IF NOT EXISTS station_external_id (
+  id integer GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  source varchar(50) NOT NULL, -- 'historical_csv', 'aqicn', ...
+  external_id varchar(255) NOT NULL, -- station_code of the mapping file or AQICN idx
+  station_id integer NOT NULL REFERENCES station (id) ON DELETE CASCADE,
+  match_method varchar(20) NOT NULL, -- 'created', 'spatial', 'name' or 'manual'
+  created_at timestamp with time zone NOT NULL DEFAULT NOW(),
+  UNIQUE (source, external_id)
+);
+
+-- ============================================================================
+-- COLUMNS ADDED TO EXISTING TABLES
+-- ============================================================================
+-- CREATE TABLE IF NOT EXISTS leaves existing tables untouched, so columns
+-- added after a table was first created are also added here
+
+ALTER TABLE recommendation ADD COLUMN IF NOT EXISTS template_id varchar(100);
+ALTER TABLE air_quality_reading ADD COLUMN IF NOT EXISTS source varchar(50);
+
 -- ============================================================================
 -- INDEXES for Performance Optimization
 -- ============================================================================
@@ -154,6 +236,9 @@ CREATE INDEX IF NOT EXISTS idx_station_region_id ON station (region_id);
 CREATE INDEX IF NOT EXISTS idx_station_city ON station (city);
 CREATE INDEX IF NOT EXISTS idx_station_location ON station (latitude, longitude);
 
+-- StationExternalId indexes
+CREATE INDEX IF NOT EXISTS idx_station_external_id_station_id ON station_external_id (station_id);
+
 -- AirQualityReading indexes
 CREATE INDEX IF NOT EXISTS idx_air_quality_reading_station_id ON air_quality_reading (station_id);
 CREATE INDEX IF NOT EXISTS idx_air_quality_reading_pollutant_id ON air_quality_reading (pollutant_id);
@@ -168,6 +253,9 @@ CREATE INDEX IF NOT EXISTS idx_air_quality_daily_stats_date ON air_quality_daily
 -- Composite index for analytics queries
 CREATE INDEX IF NOT EXISTS idx_air_quality_daily_stats_composite ON air_quality_daily_stats (station_id, pollutant_id, date DESC);
 
+-- AirQualityHourlyStats indexes (station, pollutant, hour ranges use the UNIQUE index)
+CREATE INDEX IF NOT EXISTS idx_air_quality_hourly_stats_hour ON air_quality_hourly_stats (hour DESC);
+
 -- AppUser indexes
 CREATE INDEX IF NOT EXISTS idx_app_user_email ON app_user (email);
 CREATE INDEX IF NOT EXISTS idx_app_user_role_id ON app_user (role_id);
@@ -176,9 +264,16 @@ CREATE INDEX IF NOT EXISTS idx_app_user_role_id ON app_user (role_id);
 CREATE INDEX IF NOT EXISTS idx_alert_user_id ON alert (user_id);
 CREATE INDEX IF NOT EXISTS idx_alert_pollutant_id ON alert (pollutant_id);
 
+-- NotificationOutbox indexes
+-- Partial index: the dispatcher only ever scans pending notifications
+CREATE INDEX IF NOT EXISTS idx_notification_outbox_pending ON notification_outbox (next_attempt_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_notification_outbox_alert_id ON notification_outbox (alert_id);
+
 -- Recommendation indexes
 CREATE INDEX IF NOT EXISTS idx_recommendation_user_id ON recommendation (user_id);
 CREATE INDEX IF NOT EXISTS idx_recommendation_created_at ON recommendation (created_at DESC);
+-- Lookup of an existing recommendation built from the same template
+CREATE INDEX IF NOT EXISTS idx_recommendation_user_template ON recommendation (user_id, template_id, created_at DESC);
 
 -- ProductRecommendation indexes
 CREATE INDEX IF NOT EXISTS idx_product_recommendation_recommendation_id ON product_recommendation (recommendation_id);
@@ -198,11 +293,15 @@ COMMENT ON TABLE pollutant IS 'Catalog of air pollutants (PM2.5, PM10, O3, etc.)
 COMMENT ON TABLE station IS 'Air quality monitoring stations with geolocation';
 COMMENT ON TABLE air_quality_reading IS 'Individual sensor readings from monitoring stations';
 COMMENT ON TABLE air_quality_daily_stats IS 'Aggregated daily statistics for analytics and reporting';
+COMMENT ON TABLE air_quality_hourly_stats IS 'Hourly rollup of readings (sums, counts, min/max) for charts';
 COMMENT ON TABLE role IS 'User roles: Citizen, Researcher, Admin';
 COMMENT ON TABLE permission IS 'System permissions for role-based access control';
 COMMENT ON TABLE role_permission IS 'Maps permissions to roles';
 COMMENT ON TABLE app_user IS 'Application users with authentication credentials';
 COMMENT ON TABLE alert IS 'User-configured pollution threshold alerts';
+COMMENT ON TABLE notification_outbox IS 'Outbox of alert notifications delivered asynchronously by the dispatcher';
 COMMENT ON TABLE recommendation IS 'Health recommendations based on pollution levels';
 COMMENT ON TABLE product_recommendation IS 'Protection products suggested with recommendations';
 COMMENT ON TABLE report IS 'Metadata for generated analytical reports';
+COMMENT ON TABLE ingestion_checkpoint IS 'Resume points of the ingestion service per source (CSV file, AQICN station)';
+COMMENT ON TABLE station_external_id IS 'Mapping of source-specific station identifiers to stations';
@@ -38,9 +38,21 @@ GRANT SELECT, INSERT ON TABLE air_quality_reading TO air_quality_app;
 -- Daily statistics (aggregation service writes, backend reads)
 GRANT SELECT, INSERT, UPDATE ON TABLE air_quality_daily_stats TO air_quality_app;
 
+-- Hourly rollup (ingestion service upserts and rebuilds it, backend reads)
+GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE air_quality_hourly_stats TO air_quality_app;
+
+-- Ingestion resume points (ingestion upserts them with every batch)
+GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE ingestion_checkpoint TO air_quality_app;
+
+-- Station identifiers per data source (ingestion resolves and records them)
+GRANT SELECT, INSERT ON TABLE station_external_id TO air_quality_app;
+
 -- User alerts (full CRUD needed)
 GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE alert TO air_quality_app;
 
+-- Alert notification outbox (ingestion enqueues, dispatcher claims and updates)
+GRANT SELECT, INSERT, UPDATE ON TABLE notification_outbox TO air_quality_app;
+
 -- Recommendations (backend creates, users read)
 GRANT SELECT, INSERT ON TABLE recommendation TO air_quality_app;
 
@@ -99,9 +111,13 @@ SELECT
 --   - air_quality_daily_stats
 --   - recommendation, product_recommendation (SELECT, INSERT only)
 --   - report (SELECT, INSERT only)
+--   - notification_outbox
+--   - station_external_id (SELECT, INSERT only)
 --
 -- FULL CRUD (SELECT, INSERT, UPDATE, DELETE):
 --   - alert
+--   - air_quality_hourly_stats
+--   - ingestion_checkpoint
 --
 -- SEQUENCES:
 --   - All sequences: USAGE, SELECT (required for INSERT operations)
@@ -62,6 +62,43 @@ class Settings(BaseSettings):
         description="Comma-separated list of cities to query (e.g., 'bogota,medellin,cali')"
     )
     
+    aqicn_bounds_enabled: bool = Field(
+        default=True,
+        description="Fetch station coordinates region by region with the map bounds endpoint "
+                    "and request detailed feeds only for updated stations"
+    )
+    
+    aqicn_bounds_max_span_deg: float = Field(
+        default=1.0,
+        description="Maximum height and width (degrees) of a map bounds region"
+    )
+    
+    # Resilience of external provider requests
+    provider_timeout_seconds: float = Field(
+        default=10.0,
+        description="Maximum request timeout; the timeout adapts to observed latency below it"
+    )
+    
+    provider_min_timeout_seconds: float = Field(
+        default=2.0,
+        description="Minimum adaptive request timeout"
+    )
+    
+    provider_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive failed requests that open a provider's circuit breaker"
+    )
+    
+    provider_reset_timeout_seconds: float = Field(
+        default=30.0,
+        description="Seconds an open circuit rejects requests before a probe request"
+    )
+    
+    provider_hedge_enabled: bool = Field(
+        default=True,
+        description="Send a duplicate request when a call is slower than the p95 latency"
+    )
+    
     # ========================================================================
     # Ingestion Behavior
     # ========================================================================
@@ -71,6 +108,23 @@ class Settings(BaseSettings):
         description="Path to historical CSV and GeoJSON data files"
     )
     
+    historical_source_timezone: Optional[str] = Field(
+        default=None,
+        description="Timezone of CSV dates without offset, e.g. 'America/Bogota' (UTC if empty); "
+                    "a station's 'timezone' in the mapping file takes precedence"
+    )
+    
+    historical_columnar_cache_enabled: bool = Field(
+        default=False,
+        description="Cache parsed CSV columns as memory-mapped .npy files and reuse them "
+                    "while the CSV content and parsing settings are unchanged"
+    )
+    
+    historical_columnar_cache_path: Optional[Path] = Field(
+        default=None,
+        description="Directory of the columnar cache (default: .columnar_cache in the historical data path)"
+    )
+    
     station_mapping_path: Path = Field(
         default=Path("data/station_mapping.yaml"),
         description="Path to station mapping configuration file"
@@ -91,6 +145,129 @@ class Settings(BaseSettings):
         description="Time window in minutes for fetching recent data"
     )
     
+    ingestion_batch_size: int = Field(
+        default=5000,
+        description="Readings per batch read from a source and committed to the database"
+    )
+    
+    station_match_max_distance_m: float = Field(
+        default=1000.0,
+        description="Maximum distance (meters) to match a new source station to an existing one (0 disables)"
+    )
+    
+    ingestion_max_workers: int = Field(
+        default=4,
+        description="Adapters read concurrently in total during historical ingestion"
+    )
+    
+    ingestion_source_concurrency: int = Field(
+        default=2,
+        description="Default adapters read concurrently per source (max_concurrency in sources)"
+    )
+    
+    # ========================================================================
+    # Run Reports (performance and rejected rows)
+    # ========================================================================
+    
+    ingestion_report_enabled: bool = Field(
+        default=True,
+        description="Write a JSON performance report (stage timings, rows/s, memory) per run"
+    )
+    
+    ingestion_report_path: Path = Field(
+        default=Path("reports"),
+        description="Directory of the performance reports and --profile output"
+    )
+    
+    ingestion_dead_letter_enabled: bool = Field(
+        default=True,
+        description="Write rejected rows (with raw values and reason code) to a JSON lines file per run"
+    )
+    
+    ingestion_dead_letter_path: Path = Field(
+        default=Path("dead_letter"),
+        description="Directory of the dead-letter files"
+    )
+    
+    # ========================================================================
+    # Alerts
+    # ========================================================================
+    
+    alert_evaluation_enabled: bool = Field(
+        default=True,
+        description="Evaluate user threshold alerts after each ingestion batch"
+    )
+    
+    alert_debounce_minutes: int = Field(
+        default=60,
+        description="Minimum minutes between two triggers of the same alert"
+    )
+    
+    alert_max_reading_age_minutes: int = Field(
+        default=180,
+        description="Ignore readings older than this for alerting (e.g. historical backfills)"
+    )
+    
+    # ========================================================================
+    # Live Updates
+    # ========================================================================
+    
+    readings_notify_enabled: bool = Field(
+        default=True,
+        description="Announce new readings to the backend with PostgreSQL NOTIFY"
+    )
+    
+    readings_notify_channel: str = Field(
+        default="air_quality_readings",
+        description="NOTIFY channel (must match READINGS_NOTIFY_CHANNEL in the backend)"
+    )
+    
+    readings_notify_max_age_minutes: int = Field(
+        default=180,
+        description="Do not announce readings older than this (e.g. historical backfills)"
+    )
+    
+    # ========================================================================
+    # Notifications
+    # ========================================================================
+    
+    notifications_enabled: bool = Field(
+        default=True,
+        description="Queue a notification in the outbox for every triggered alert"
+    )
+    
+    notification_batch_size: int = Field(
+        default=500,
+        description="Notifications claimed and delivered per dispatcher batch"
+    )
+    
+    notification_max_attempts: int = Field(
+        default=5,
+        description="Delivery attempts before a notification is marked as failed"
+    )
+    
+    notification_retry_base_seconds: int = Field(
+        default=60,
+        description="Delay before the first retry (doubled on every further attempt)"
+    )
+    
+    notification_lease_seconds: int = Field(
+        default=300,
+        description="Time a claimed notification stays reserved for one dispatcher"
+    )
+    
+    notification_sink_path: Path = Field(
+        default=Path("data/notifications.jsonl"),
+        description="JSON lines file used for channels without a transport (and email without SMTP)"
+    )
+    
+    smtp_host: Optional[str] = Field(default=None, description="SMTP host for email notifications")
+    smtp_port: int = Field(default=25, description="SMTP port")
+    smtp_sender: str = Field(default="alerts@localhost", description="From address of alert emails")
+    smtp_username: Optional[str] = Field(default=None, description="SMTP user")
+    smtp_password: Optional[str] = Field(default=None, description="SMTP password")
+    smtp_use_tls: bool = Field(default=False, description="Use STARTTLS")
+    
     # ========================================================================
     # Logging
     # ========================================================================
@@ -102,7 +279,17 @@ class Settings(BaseSettings):
     
     log_format: str = Field(
         default="colorlog",
-        description="Log format (colorlog or standard)"
+        description="Log format (colorlog, standard or json)"
+    )
+    
+    log_async: bool = Field(
+        default=True,
+        description="Write logs from a background thread (QueueHandler) instead of the ingestion loop"
+    )
+    
+    log_sample_size: int = Field(
+        default=5,
+        description="Per-reading warnings logged per batch before only a count is reported"
     )
     
     # ========================================================================
@@ -145,6 +332,32 @@ class Settings(BaseSettings):
         base_path = Path(__file__).parent.parent
         return (base_path / self.historical_data_path).resolve()
     
+    def get_historical_cache_path(self) -> Path:
+        """Get absolute path to the columnar cache of the historical data."""
+        if self.historical_columnar_cache_path is None:
+            return self.get_historical_data_path() / ".columnar_cache"
+        if self.historical_columnar_cache_path.is_absolute():
+            return self.historical_columnar_cache_path
+        
+        base_path = Path(__file__).parent.parent
+        return (base_path / self.historical_columnar_cache_path).resolve()
+    
+    def get_ingestion_report_path(self) -> Path:
+        """Get absolute path to the performance reports directory."""
+        if self.ingestion_report_path.is_absolute():
+            return self.ingestion_report_path
+        
+        base_path = Path(__file__).parent.parent
+        return (base_path / self.ingestion_report_path).resolve()
+    
+    def get_ingestion_dead_letter_path(self) -> Path:
+        """Get absolute path to the dead-letter directory."""
+        if self.ingestion_dead_letter_path.is_absolute():
+            return self.ingestion_dead_letter_path
+        
+        base_path = Path(__file__).parent.parent
+        return (base_path / self.ingestion_dead_letter_path).resolve()
+    
     def get_station_mapping_path(self) -> Path:
         """Get absolute path to station mapping file."""
         if self.station_mapping_path.is_absolute():
@@ -152,6 +365,14 @@ class Settings(BaseSettings):
         
         base_path = Path(__file__).parent.parent
         return (base_path / self.station_mapping_path).resolve()
+    
+    def get_notification_sink_path(self) -> Path:
+        """Get absolute path to the notification sink file."""
+        if self.notification_sink_path.is_absolute():
+            return self.notification_sink_path
+        
+        base_path = Path(__file__).parent.parent
+        return (base_path / self.notification_sink_path).resolve()
 
 
 # Global settings instance
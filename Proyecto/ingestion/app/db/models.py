@@ -6,7 +6,8 @@ These models match the database schema defined in init_schema.sql
 from datetime import datetime, date
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, Date, ForeignKey, Text, Boolean, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geometry
@@ -59,6 +60,7 @@ class AirQualityReading(Base):
     datetime = Column(DateTime(timezone=True), nullable=False)
     value = Column(Float, nullable=False)
     aqi = Column(Integer)
+    source = Column(String(50))
     
     # Relationships
     station = relationship("Station", backref="readings")
@@ -82,3 +84,90 @@ class AirQualityDailyStats(Base):
     # Relationships
     station = relationship("Station")
     pollutant = relationship("Pollutant")
+
+
+class AirQualityHourlyStats(Base):
+    """Hourly rollup of readings, maintained incrementally by the ingestion"""
+    __tablename__ = "air_quality_hourly_stats"
+    __table_args__ = (UniqueConstraint("station_id", "pollutant_id", "hour"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    station_id = Column(Integer, ForeignKey("station.id", ondelete="CASCADE"), nullable=False)
+    pollutant_id = Column(Integer, ForeignKey("pollutant.id", ondelete="RESTRICT"), nullable=False)
+    hour = Column(DateTime(timezone=True), nullable=False)
+    # Sums and counts (not averages) so new readings can be merged in
+    readings_count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0)
+    min_value = Column(Float)
+    max_value = Column(Float)
+    aqi_count = Column(Integer, nullable=False, default=0)
+    aqi_sum = Column(BigInteger, nullable=False, default=0)
+    min_aqi = Column(Integer)
+    max_aqi = Column(Integer)
+
+
+class Alert(Base):
+    """User-configured pollutant threshold alerts (managed by the backend API)"""
+    __tablename__ = "alert"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # References app_user.id; users are not mapped in the ingestion service
+    user_id = Column(Integer, nullable=False)
+    pollutant_id = Column(Integer, ForeignKey("pollutant.id", ondelete="CASCADE"), nullable=False)
+    threshold = Column(Float, nullable=False)
+    method = Column(String(50), nullable=False)
+    triggered_at = Column(DateTime(timezone=True))
+
+
+class NotificationOutbox(Base):
+    """Alert notifications queued for asynchronous delivery"""
+    __tablename__ = "notification_outbox"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    alert_id = Column(Integer, ForeignKey("alert.id", ondelete="CASCADE"), nullable=False)
+    # References app_user.id; users are not mapped in the ingestion service
+    user_id = Column(Integer, nullable=False)
+    channel = Column(String(50), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    pollutant_id = Column(Integer, ForeignKey("pollutant.id", ondelete="CASCADE"), nullable=False)
+    station_id = Column(Integer, ForeignKey("station.id", ondelete="SET NULL"))
+    value = Column(Float, nullable=False)
+    threshold = Column(Float, nullable=False)
+    reading_datetime = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    sent_at = Column(DateTime(timezone=True))
+
+
+class IngestionCheckpoint(Base):
+    """Resume point of one ingestion source (CSV file or AQICN station)"""
+    __tablename__ = "ingestion_checkpoint"
+    __table_args__ = (UniqueConstraint("source", "source_key"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(50), nullable=False)
+    source_key = Column(String(255), nullable=False)
+    content_hash = Column(String(64))
+    file_size = Column(BigInteger)
+    file_mtime = Column(Float)
+    block_hashes = Column(ARRAY(Text))
+    last_row = Column(Integer)
+    last_timestamp = Column(DateTime(timezone=True))
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class StationExternalId(Base):
+    """Identity of a station in one data source (CSV station code, AQICN idx)"""
+    __tablename__ = "station_external_id"
+    __table_args__ = (UniqueConstraint("source", "external_id"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(50), nullable=False)
+    external_id = Column(String(255), nullable=False)
+    station_id = Column(Integer, ForeignKey("station.id", ondelete="CASCADE"), nullable=False)
+    match_method = Column(String(20), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
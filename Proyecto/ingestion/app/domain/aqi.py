@@ -0,0 +1,335 @@
+"""
+US EPA AQI breakpoint engine.
+
+Table-driven AQI calculation for PM2.5, PM10, O3, NO2, SO2 and CO:
+- One breakpoint table per (pollutant, averaging period)
+- Concentrations are truncated as specified by the EPA before lookup
+- `calculate_aqi()` works on NumPy arrays and finds the breakpoint of every
+  value with a single `searchsorted` call
+- `aqi_for_value()` is a scalar fast path on the same tables (bisect)
+- `calculate_concentration()` is the inverse: AQI sub-index -> concentration
+  (used for sources such as AQICN that only publish sub-indices)
+
+Concentrations are expected in the standard units of the service
+(see normalization.STANDARD_UNITS): µg/m³ for PM, ppb for O3/NO2/SO2 and
+ppm for CO.
+
+Reference: EPA-454/B-18-007, Technical Assistance Document for the
+Reporting of Daily Air Quality (Table 5).
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# AQI ranges shared by every pollutant (one row per category)
+_AQI_RANGES: Tuple[Tuple[int, int], ...] = (
+    (0, 50),      # Good
+    (51, 100),    # Moderate
+    (101, 150),   # Unhealthy for Sensitive Groups
+    (151, 200),   # Unhealthy
+    (201, 300),   # Very Unhealthy
+    (301, 400),   # Hazardous
+    (401, 500),   # Hazardous
+)
+
+
+@dataclass(frozen=True)
+class BreakpointTable:
+    """
+    Breakpoints of one pollutant for one averaging period.
+
+    Attributes:
+        pollutant_code: Standardized pollutant code
+        averaging_period: Averaging period ('1h', '8h' or '24h')
+        concentrations: (C_low, C_high) per row, in standard units
+        indexes: (I_low, I_high) per row
+        decimals: Decimals kept when truncating concentrations
+    """
+    pollutant_code: str
+    averaging_period: str
+    concentrations: Tuple[Tuple[float, float], ...]
+    indexes: Tuple[Tuple[int, int], ...]
+    decimals: int
+    c_low: np.ndarray = field(init=False, repr=False, compare=False)
+    c_high: np.ndarray = field(init=False, repr=False, compare=False)
+    i_low: np.ndarray = field(init=False, repr=False, compare=False)
+    i_high: np.ndarray = field(init=False, repr=False, compare=False)
+    c_high_list: Tuple[float, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Column arrays for vectorized lookups (frozen dataclass: set directly)
+        c = np.asarray(self.concentrations, dtype=np.float64)
+        i = np.asarray(self.indexes, dtype=np.float64)
+        object.__setattr__(self, 'c_low', c[:, 0])
+        object.__setattr__(self, 'c_high', c[:, 1])
+        object.__setattr__(self, 'i_low', i[:, 0])
+        object.__setattr__(self, 'i_high', i[:, 1])
+        # Plain tuple for scalar bisect lookups
+        object.__setattr__(self, 'c_high_list', tuple(high for _, high in self.concentrations))
+
+    @property
+    def c_max(self) -> float:
+        """Highest concentration covered by the table."""
+        return self.concentrations[-1][1]
+
+    @property
+    def c_min(self) -> float:
+        """Lowest concentration covered by the table."""
+        return self.concentrations[0][0]
+
+
+def _table(pollutant_code: str, averaging_period: str, decimals: int,
+           concentrations: Sequence[Tuple[float, float]],
+           first_category: int = 0) -> BreakpointTable:
+    """Build a table whose rows start at the given AQI category."""
+    return BreakpointTable(
+        pollutant_code=pollutant_code,
+        averaging_period=averaging_period,
+        concentrations=tuple(concentrations),
+        indexes=_AQI_RANGES[first_category:first_category + len(concentrations)],
+        decimals=decimals
+    )
+
+
+AQI_BREAKPOINTS: Dict[Tuple[str, str], BreakpointTable] = {
+    (table.pollutant_code, table.averaging_period): table
+    for table in (
+        _table("PM2.5", "24h", 1, (
+            (0.0, 12.0), (12.1, 35.4), (35.5, 55.4), (55.5, 150.4),
+            (150.5, 250.4), (250.5, 350.4), (350.5, 500.4)
+        )),
+        _table("PM10", "24h", 0, (
+            (0, 54), (55, 154), (155, 254), (255, 354),
+            (355, 424), (425, 504), (505, 604)
+        )),
+        # 8-hour O3 does not define AQI values above 300
+        _table("O3", "8h", 0, (
+            (0, 54), (55, 70), (71, 85), (86, 105), (106, 200)
+        )),
+        # 1-hour O3 only defines AQI values from 101 upwards
+        _table("O3", "1h", 0, (
+            (125, 164), (165, 204), (205, 404), (405, 504), (505, 604)
+        ), first_category=2),
+        _table("NO2", "1h", 0, (
+            (0, 53), (54, 100), (101, 360), (361, 649),
+            (650, 1249), (1250, 1649), (1650, 2049)
+        )),
+        # 1-hour SO2 does not define AQI values above 200
+        _table("SO2", "1h", 0, (
+            (0, 35), (36, 75), (76, 185), (186, 304)
+        )),
+        # 24-hour SO2 is only used for AQI values above 200
+        _table("SO2", "24h", 0, (
+            (305, 604), (605, 804), (805, 1004)
+        ), first_category=4),
+        _table("CO", "8h", 1, (
+            (0.0, 4.4), (4.5, 9.4), (9.5, 12.4), (12.5, 15.4),
+            (15.5, 30.4), (30.5, 40.4), (40.5, 50.4)
+        )),
+    )
+}
+
+# Averaging period used when the caller does not specify one
+DEFAULT_AVERAGING_PERIODS: Dict[str, str] = {
+    "PM2.5": "24h",
+    "PM10": "24h",
+    "O3": "8h",
+    "NO2": "1h",
+    "SO2": "1h",
+    "CO": "8h",
+}
+
+
+# Table used by the inverse conversion for AQI values above the range of the
+# default table (e.g. O3 sub-indices above 300 are defined on 1-hour values)
+EXTENDED_AVERAGING_PERIODS: Dict[str, str] = {
+    "O3": "1h",
+    "SO2": "24h",
+}
+
+
+def get_breakpoint_table(pollutant_code: str,
+                         averaging_period: Optional[str] = None) -> Optional[BreakpointTable]:
+    """
+    Get the breakpoint table for a pollutant.
+
+    Args:
+        pollutant_code: Standardized pollutant code
+        averaging_period: '1h', '8h' or '24h' (pollutant default if None)
+
+    Returns:
+        BreakpointTable, or None if the pollutant/period has no table
+    """
+    period = averaging_period or DEFAULT_AVERAGING_PERIODS.get(pollutant_code)
+    return AQI_BREAKPOINTS.get((pollutant_code, period))
+
+
+def _truncate(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Truncate (not round) concentrations to the table's precision."""
+    scale = 10.0 ** decimals
+    # Small epsilon so that e.g. 12.1 stored as 12.0999999 stays 12.1
+    return np.floor(values * scale + 1e-9) / scale
+
+
+def calculate_aqi(pollutant_code: str,
+                  values: Union[np.ndarray, Sequence[float]],
+                  averaging_period: Optional[str] = None) -> np.ndarray:
+    """
+    Calculate AQI for many concentrations of one pollutant at once.
+
+    Args:
+        pollutant_code: Standardized pollutant code
+        values: Concentrations in standard units (array-like)
+        averaging_period: '1h', '8h' or '24h' (pollutant default if None)
+
+    Returns:
+        Float array of AQI values (rounded to integers), NaN where the AQI is
+        undefined: missing/negative values, values outside the table range
+        or pollutants without a table
+    """
+    concentrations = np.asarray(values, dtype=np.float64)
+    table = get_breakpoint_table(pollutant_code, averaging_period)
+    if table is None:
+        return np.full(concentrations.shape, np.nan)
+
+    c = _truncate(concentrations, table.decimals)
+
+    # Row of each value: first breakpoint whose C_high is >= the value
+    row = np.searchsorted(table.c_high, c, side='left')
+    valid = (c >= table.c_min) & (row < len(table.c_high))
+    row = np.minimum(row, len(table.c_high) - 1)
+
+    c_low = table.c_low[row]
+    c_high = table.c_high[row]
+    i_low = table.i_low[row]
+    i_high = table.i_high[row]
+
+    aqi = (i_high - i_low) / (c_high - c_low) * (np.maximum(c, c_low) - c_low) + i_low
+    aqi = np.floor(aqi + 0.5)
+    aqi[~valid] = np.nan
+    return aqi
+
+
+def aqi_for_value(pollutant_code: str, value: Optional[float],
+                  averaging_period: Optional[str] = None) -> Optional[int]:
+    """
+    Calculate AQI for a single concentration.
+
+    Scalar counterpart of calculate_aqi() for per-reading code paths: same
+    tables, but a bisect instead of NumPy array overhead.
+
+    Args:
+        pollutant_code: Standardized pollutant code
+        value: Concentration in standard units
+        averaging_period: '1h', '8h' or '24h' (pollutant default if None)
+
+    Returns:
+        AQI value, or None if undefined
+    """
+    table = get_breakpoint_table(pollutant_code, averaging_period)
+    if table is None or value is None or value != value:
+        return None
+
+    scale = 10.0 ** table.decimals
+    c = int(value * scale + 1e-9) / scale if value >= 0 else value
+    if c < table.c_min or c > table.c_max:
+        return None
+
+    row = bisect_left(table.c_high_list, c)
+    (c_low, c_high), (i_low, i_high) = table.concentrations[row], table.indexes[row]
+    aqi = (i_high - i_low) / (c_high - c_low) * (max(c, c_low) - c_low) + i_low
+    return int(aqi + 0.5)
+
+
+def _invert(table: BreakpointTable, aqi: np.ndarray) -> np.ndarray:
+    """Map AQI values to concentrations with one table (NaN outside it)."""
+    row = np.searchsorted(table.i_high, aqi, side='left')
+    valid = (aqi >= table.i_low[0]) & (row < len(table.i_high))
+    row = np.minimum(row, len(table.i_high) - 1)
+
+    c_low = table.c_low[row]
+    c_high = table.c_high[row]
+    i_low = table.i_low[row]
+    i_high = table.i_high[row]
+
+    # Sub-indices between two rows (e.g. 50.5) map to the lower bound of the next row
+    concentration = (c_high - c_low) / (i_high - i_low) * (np.maximum(aqi, i_low) - i_low) + c_low
+    concentration[~valid] = np.nan
+    return concentration
+
+
+def calculate_concentration(pollutant_code: str,
+                            aqi_values: Union[np.ndarray, Sequence[float]],
+                            averaging_period: Optional[str] = None) -> np.ndarray:
+    """
+    Convert AQI sub-indices back to concentrations (inverse breakpoints).
+
+    Values above the default table (O3 > 300, SO2 > 200) are converted with
+    the extended table of the pollutant (1-hour O3, 24-hour SO2).
+
+    Args:
+        pollutant_code: Standardized pollutant code
+        aqi_values: AQI sub-indices (array-like)
+        averaging_period: '1h', '8h' or '24h' (pollutant default if None)
+
+    Returns:
+        Float array of concentrations in standard units, rounded to the
+        table's precision; NaN where the AQI cannot be inverted
+    """
+    aqi = np.asarray(aqi_values, dtype=np.float64)
+    table = get_breakpoint_table(pollutant_code, averaging_period)
+    if table is None:
+        return np.full(aqi.shape, np.nan)
+
+    concentration = _invert(table, aqi)
+
+    extended_period = EXTENDED_AVERAGING_PERIODS.get(pollutant_code)
+    if averaging_period is None and extended_period:
+        above = aqi > table.i_high[-1]
+        if above.any():
+            extended = get_breakpoint_table(pollutant_code, extended_period)
+            concentration[above] = _invert(extended, aqi[above])
+
+    return np.round(concentration, table.decimals)
+
+
+def concentrations_for_aqi(pollutant_codes: Sequence[str],
+                           aqi_values: Sequence[float]) -> np.ndarray:
+    """
+    Convert sub-indices of mixed pollutants to concentrations.
+
+    Values are grouped by pollutant, so each pollutant is converted with
+    a single vectorized call regardless of the number of values.
+
+    Args:
+        pollutant_codes: Standardized pollutant code of each value
+        aqi_values: AQI sub-index of each value
+
+    Returns:
+        Float array of concentrations aligned with the inputs (NaN if undefined)
+    """
+    codes = np.asarray(pollutant_codes, dtype=object)
+    aqi = np.asarray(aqi_values, dtype=np.float64)
+    concentrations = np.full(aqi.shape, np.nan)
+
+    for code in set(pollutant_codes):
+        mask = codes == code
+        concentrations[mask] = calculate_concentration(code, aqi[mask])
+
+    return concentrations
+
+
+def aqi_to_int(aqi: np.ndarray) -> list:
+    """
+    Convert an AQI array to a list of ints with None for undefined values.
+
+    Args:
+        aqi: Array returned by calculate_aqi()
+
+    Returns:
+        List of Optional[int]
+    """
+    return [None if v != v else int(v) for v in aqi.tolist()]
@@ -72,6 +72,12 @@ class NormalizedReading(BaseModel):
         description="Measurement timestamp in UTC"
     )
     
+    # Provenance
+    source: Optional[str] = Field(
+        default=None,
+        description="Data source the reading came from (e.g., 'historical_csv', 'aqicn')"
+    )
+    
     @field_validator('value')
     @classmethod
     def validate_value(cls, v: float) -> float:
@@ -101,7 +107,8 @@ class NormalizedReading(BaseModel):
                 "unit": "µg/m³",
                 "value": 35.5,
                 "aqi": 100,
-                "timestamp_utc": "2025-11-26T12:00:00Z"
+                "timestamp_utc": "2025-11-26T12:00:00Z",
+                "source": "historical_csv"
             }
         }
 
@@ -119,6 +126,10 @@ class StationMetadata(BaseModel):
     longitude: float = Field(ge=-180, le=180, description="Longitude")
     altitude: Optional[int] = Field(default=None, description="Altitude in meters")
     address: Optional[str] = Field(default=None, description="Physical address")
+    timezone: Optional[str] = Field(
+        default=None,
+        description="IANA timezone of the station's naive timestamps (e.g., 'America/Bogota')"
+    )
     
     # File mappings for historical data
     csv_file: Optional[str] = Field(default=None, description="CSV data file name")
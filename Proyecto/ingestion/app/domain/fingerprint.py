@@ -0,0 +1,134 @@
+"""
+File fingerprints for change detection.
+
+A fingerprint records the size and mtime of a file (cheap check, no read)
+plus a SHA-256 per fixed-size block of its content. Comparing the block
+hashes with an earlier fingerprint gives the offset of the first changed
+byte, so a file that only grew at the end can be processed from the new
+tail and an untouched file can be skipped without parsing it.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+# Bytes per hashed block
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024
+
+
+@dataclass(slots=True)
+class FileFingerprint:
+    """
+    Fingerprint of a file's content.
+
+    Attributes:
+        size: File size in bytes
+        mtime: Modification time (POSIX seconds)
+        block_hashes: SHA-256 of each FINGERPRINT_BLOCK_SIZE block
+            (the last block may be shorter)
+    """
+    size: int
+    mtime: float
+    block_hashes: List[str] = field(default_factory=list)
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of the whole content (derived from the block hashes)."""
+        return hashlib.sha256("".join(self.block_hashes).encode()).hexdigest()
+
+    def same_stat(self, path: Path) -> bool:
+        """
+        Check whether a file still has this size and mtime (no read).
+
+        Args:
+            path: File to check
+
+        Returns:
+            True if size and mtime are unchanged
+        """
+        stat = path.stat()
+        return stat.st_size == self.size and stat.st_mtime == self.mtime
+
+
+def fingerprint_file(path: Path) -> FileFingerprint:
+    """
+    Compute the fingerprint of a file in one sequential read.
+
+    Args:
+        path: File to fingerprint
+
+    Returns:
+        FileFingerprint
+    """
+    stat = path.stat()
+    fingerprint = FileFingerprint(size=stat.st_size, mtime=stat.st_mtime)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(FINGERPRINT_BLOCK_SIZE), b''):
+            fingerprint.block_hashes.append(hashlib.sha256(block).hexdigest())
+    return fingerprint
+
+
+def unchanged_prefix(path: Path, previous: FileFingerprint, current: FileFingerprint) -> int:
+    """
+    Find how many leading bytes of a file are identical to a previous version.
+
+    Full blocks are compared through their hashes; the previous version's
+    last (partial) block is re-hashed over the same byte range, so a file
+    that was only appended to keeps its whole previous content as prefix.
+
+    Args:
+        path: File on disk (with content `current`)
+        previous: Fingerprint of the earlier version
+        current: Fingerprint of the file as it is now
+
+    Returns:
+        Length in bytes of the unchanged prefix (previous.size if the file
+        only grew or did not change)
+    """
+    if current.size < previous.size:
+        limit = current.size
+    else:
+        limit = previous.size
+
+    full_blocks = limit // FINGERPRINT_BLOCK_SIZE
+    for i in range(full_blocks):
+        if i >= len(previous.block_hashes) or previous.block_hashes[i] != current.block_hashes[i]:
+            return i * FINGERPRINT_BLOCK_SIZE
+
+    offset = full_blocks * FINGERPRINT_BLOCK_SIZE
+    if offset == limit:
+        return offset
+
+    # Previous last block ended mid-block: hash the same range of the file now
+    if limit < previous.size or full_blocks >= len(previous.block_hashes):
+        return offset
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        tail = f.read(previous.size - offset)
+    if hashlib.sha256(tail).hexdigest() != previous.block_hashes[full_blocks]:
+        return offset
+    return previous.size
+
+
+def count_lines(path: Path, n_bytes: int) -> int:
+    """
+    Count complete lines in the first bytes of a file.
+
+    Args:
+        path: File to read
+        n_bytes: Number of bytes to scan
+
+    Returns:
+        Number of newline characters in the range
+    """
+    lines = 0
+    remaining = n_bytes
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            block = f.read(min(FINGERPRINT_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            lines += block.count(b'\n')
+            remaining -= len(block)
+    return lines
@@ -9,10 +9,16 @@ Provides functions to:
 - Validate data ranges
 """
 
-from datetime import datetime, timezone
-from typing import Optional, Dict
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
 from dateutil import parser as date_parser
 
+from app.domain.aqi import aqi_for_value
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -93,13 +99,197 @@ def get_standard_unit(pollutant_code: str) -> str:
 # Timestamp Normalization
 # ============================================================================
 
+# Formats tried (in order) before falling back to dateutil.
+# strptime accepts non-padded months/days, so "%Y/%m/%d" also parses "2019/10/2".
+TIMESTAMP_FORMATS: Tuple[str, ...] = (
+    "%Y/%m/%d",
+    "%Y-%m-%d",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M",
+)
+
+# Marker for ISO 8601 strings (parsed with datetime.fromisoformat)
+ISO_FORMAT = "iso"
+
+
+@lru_cache(maxsize=32)
+def _get_zone(name: str) -> tzinfo:
+    """Resolve a timezone name once (e.g., 'America/Bogota')."""
+    return ZoneInfo(name)
+
+
+class TimestampParser:
+    """
+    Format-detecting timestamp parser with a per-instance format cache.
+    
+    The first successfully parsed value fixes the format for the following
+    ones (a data source uses one format), so most values cost one
+    strptime/fromisoformat call. dateutil is only used when no known
+    format matches. Naive timestamps are interpreted in the source timezone
+    (UTC if none) and every result is converted to UTC.
+    """
+    
+    def __init__(self, source_timezone: Optional[str] = None):
+        """
+        Initialize parser.
+        
+        Args:
+            source_timezone: Timezone of naive timestamps (e.g., "America/Bogota")
+        """
+        self.source_timezone = source_timezone
+        self.zone: tzinfo = _get_zone(source_timezone) if source_timezone else timezone.utc
+        self.format: Optional[str] = None
+        self.fallback_count = 0
+    
+    def parse(self, timestamp_str: str) -> datetime:
+        """
+        Parse one timestamp string to a UTC datetime.
+        
+        Args:
+            timestamp_str: Timestamp string
+            
+        Returns:
+            Aware datetime in UTC
+            
+        Raises:
+            ValueError: If the string cannot be parsed
+        """
+        value = timestamp_str.strip()
+        
+        dt = self._parse_cached(value)
+        if dt is None:
+            dt = self._detect(value)
+        if dt is None:
+            dt = self._parse_fallback(value)
+        
+        return self._to_utc(dt)
+    
+    def parse_series(self, values: pd.Series) -> pd.Series:
+        """
+        Parse a whole column of timestamp strings to UTC.
+        
+        The format is detected on the first non-empty value and the column is
+        converted with a single pd.to_datetime(format=...) call; only values
+        that do not match the format are parsed one by one.
+        
+        Args:
+            values: Series of timestamp strings
+            
+        Returns:
+            Series of UTC timestamps (NaT where parsing failed)
+        """
+        strings = values.astype("string").str.strip()
+        non_empty = strings.dropna()
+        non_empty = non_empty[non_empty != ""]
+        if non_empty.empty:
+            return pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns, UTC]")
+        
+        if self.format is None:
+            try:
+                self.parse(non_empty.iloc[0])
+            except ValueError:
+                pass
+        
+        if self.format == ISO_FORMAT:
+            parsed = pd.to_datetime(strings, format="ISO8601", errors="coerce", utc=False)
+        elif self.format is not None:
+            parsed = pd.to_datetime(strings, format=self.format, errors="coerce")
+        else:
+            parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+        
+        if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+            parsed = parsed.dt.tz_convert("UTC")
+        else:
+            parsed = parsed.dt.tz_localize(self.zone, ambiguous="NaT", nonexistent="NaT").dt.tz_convert("UTC")
+        
+        # Values in another format: parse individually (dateutil as last resort)
+        missing = parsed.isna() & strings.notna() & (strings != "")
+        for idx in missing[missing].index:
+            try:
+                parsed.at[idx] = self.parse(strings.at[idx])
+            except ValueError:
+                pass
+        
+        return parsed
+    
+    def _parse_cached(self, value: str) -> Optional[datetime]:
+        """Parse with the cached format, if any."""
+        if self.format is None:
+            return None
+        try:
+            if self.format == ISO_FORMAT:
+                return datetime.fromisoformat(value)
+            return datetime.strptime(value, self.format)
+        except ValueError:
+            return None
+    
+    def _detect(self, value: str) -> Optional[datetime]:
+        """Try every known format; the first match is cached if none was yet."""
+        try:
+            dt = datetime.fromisoformat(value)
+            self._remember(ISO_FORMAT)
+            return dt
+        except ValueError:
+            pass
+        
+        for fmt in TIMESTAMP_FORMATS:
+            try:
+                dt = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            self._remember(fmt)
+            return dt
+        
+        return None
+    
+    def _remember(self, fmt: str) -> None:
+        """Cache the detected format (an occasional outlier does not replace it)."""
+        if self.format is None:
+            self.format = fmt
+    
+    def _parse_fallback(self, value: str) -> datetime:
+        """Parse with dateutil (slow path, format not cached)."""
+        try:
+            dt = date_parser.parse(value)
+        except (ValueError, OverflowError) as e:
+            logger.warning(f"Failed to parse timestamp '{value}': {e}")
+            raise ValueError(f"Invalid timestamp format: {value}")
+        
+        self.fallback_count += 1
+        return dt
+    
+    def _to_utc(self, dt: datetime) -> datetime:
+        """Attach the source timezone to naive values and convert to UTC."""
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=self.zone)
+        return dt.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=32)
+def get_timestamp_parser(source_timezone: Optional[str] = None) -> TimestampParser:
+    """
+    Get a shared parser for a source timezone.
+    
+    Args:
+        source_timezone: Timezone of naive timestamps (UTC if None)
+        
+    Returns:
+        TimestampParser
+    """
+    return TimestampParser(source_timezone)
+
+
 def normalize_timestamp(timestamp_str: str, source_timezone: Optional[str] = None) -> datetime:
     """
     Convert timestamp string to UTC datetime.
     
     Args:
         timestamp_str: Timestamp string in various formats
-        source_timezone: Source timezone name (e.g., "America/Bogota")
+        source_timezone: Source timezone name (e.g., "America/Bogota");
+            timestamps without offset are interpreted in it (UTC if None)
         
     Returns:
         Datetime object in UTC
@@ -107,34 +297,27 @@ def normalize_timestamp(timestamp_str: str, source_timezone: Optional[str] = Non
     Examples:
         >>> normalize_timestamp("2019/10/2")
         datetime.datetime(2019, 10, 2, 0, 0, tzinfo=datetime.timezone.utc)
+        >>> normalize_timestamp("2019/10/2", "America/Bogota")
+        datetime.datetime(2019, 10, 2, 5, 0, tzinfo=datetime.timezone.utc)
     """
-    try:
-        # Parse the timestamp
-        dt = date_parser.parse(timestamp_str)
-        
-        # If no timezone info, assume source timezone or UTC
-        if dt.tzinfo is None:
-            if source_timezone:
-                # TODO: Apply source timezone conversion if needed
-                # For now, assume UTC for dates without time
-                dt = dt.replace(tzinfo=timezone.utc)
-            else:
-                dt = dt.replace(tzinfo=timezone.utc)
-        
-        # Convert to UTC
-        dt_utc = dt.astimezone(timezone.utc)
-        
-        return dt_utc
-    
-    except Exception as e:
-        logger.warning(f"Failed to parse timestamp '{timestamp_str}': {e}")
-        raise ValueError(f"Invalid timestamp format: {timestamp_str}")
+    return get_timestamp_parser(source_timezone).parse(timestamp_str)
 
 
 # ============================================================================
 # Data Validation
 # ============================================================================
 
+# Upper bounds (very conservative, for catching obvious errors)
+MAX_CONCENTRATIONS = {
+    "PM2.5": 1000,  # µg/m³
+    "PM10": 2000,   # µg/m³
+    "O3": 500,      # ppb
+    "NO2": 500,     # ppb
+    "SO2": 500,     # ppb
+    "CO": 100,      # ppm
+}
+
+
 def is_valid_concentration(value: float, pollutant_code: str) -> bool:
     """
     Check if a pollutant concentration value is within reasonable bounds.
@@ -150,79 +333,57 @@ def is_valid_concentration(value: float, pollutant_code: str) -> bool:
     if value < 0:
         return False
     
-    # Upper bounds (very conservative, for catching obvious errors)
-    MAX_VALUES = {
-        "PM2.5": 1000,  # µg/m³
-        "PM10": 2000,   # µg/m³
-        "O3": 500,      # ppb
-        "NO2": 500,     # ppb
-        "SO2": 500,     # ppb
-        "CO": 100,      # ppm
-    }
-    
-    max_val = MAX_VALUES.get(pollutant_code, float('inf'))
+    max_val = MAX_CONCENTRATIONS.get(pollutant_code, float('inf'))
     return value <= max_val
 
 
+def valid_concentration_mask(values: np.ndarray, pollutant_code: str) -> np.ndarray:
+    """
+    Vectorized version of is_valid_concentration.
+    
+    Args:
+        values: Concentration values (NaN for missing)
+        pollutant_code: Pollutant code
+        
+    Returns:
+        Boolean array, True where the value is present and within bounds
+    """
+    max_val = MAX_CONCENTRATIONS.get(pollutant_code, np.inf)
+    with np.errstate(invalid='ignore'):
+        return (values >= 0) & (values <= max_val)
+
+
 # ============================================================================
-# AQI Calculation (Simplified)
+# AQI Calculation (US EPA breakpoints, see app.domain.aqi)
 # ============================================================================
 
-def calculate_aqi_pm25(concentration: float) -> int:
+def calculate_aqi_pm25(concentration: float) -> Optional[int]:
     """
-    Calculate AQI for PM2.5 (simplified US EPA formula).
+    Calculate AQI for PM2.5 (24-hour US EPA breakpoints).
     
     Args:
         concentration: PM2.5 concentration in µg/m³
         
     Returns:
-        AQI value (0-500)
-        
-    Note:
-        This is a simplified approximation. For production use,
-        implement the full EPA AQI calculation with breakpoints.
-    """
-    # Simplified linear approximation
-    # Real EPA AQI uses breakpoints and piecewise linear function
-    
-    if concentration <= 12.0:
-        # Good (0-50)
-        return int((50 / 12.0) * concentration)
-    elif concentration <= 35.4:
-        # Moderate (51-100)
-        return int(51 + ((100 - 51) / (35.4 - 12.1)) * (concentration - 12.1))
-    elif concentration <= 55.4:
-        # Unhealthy for Sensitive Groups (101-150)
-        return int(101 + ((150 - 101) / (55.4 - 35.5)) * (concentration - 35.5))
-    elif concentration <= 150.4:
-        # Unhealthy (151-200)
-        return int(151 + ((200 - 151) / (150.4 - 55.5)) * (concentration - 55.5))
-    elif concentration <= 250.4:
-        # Very Unhealthy (201-300)
-        return int(201 + ((300 - 201) / (250.4 - 150.5)) * (concentration - 150.5))
-    else:
-        # Hazardous (301-500)
-        return int(301 + ((500 - 301) / (500.4 - 250.5)) * (concentration - 250.5))
-
-
-def estimate_aqi(pollutant_code: str, value: float) -> Optional[int]:
+        AQI value (0-500), or None if out of range
+    """
+    return aqi_for_value("PM2.5", concentration)
+
+
+def estimate_aqi(pollutant_code: str, value: float,
+                 averaging_period: Optional[str] = None) -> Optional[int]:
     """
     Estimate AQI for a given pollutant and value.
     
     Args:
         pollutant_code: Standardized pollutant code
         value: Concentration value in standard units
+        averaging_period: '1h', '8h' or '24h' (pollutant default if None)
         
     Returns:
         Estimated AQI value, or None if cannot be calculated
         
     Note:
-        Currently only implements PM2.5 AQI calculation.
-        Other pollutants return None and should be extended as needed.
+        Use app.domain.aqi.calculate_aqi() to convert many values at once.
     """
-    if pollutant_code == "PM2.5":
-        return calculate_aqi_pm25(value)
-    
-    # TODO: Implement AQI calculation for other pollutants
-    # For now, return None for other pollutants
-    return None
+    return aqi_for_value(pollutant_code, value, averaging_period)
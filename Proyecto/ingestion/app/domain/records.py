@@ -0,0 +1,201 @@
+"""
+Lightweight internal reading records.
+
+Adapters produce one record per datapoint, so the internal representation
+has to be cheap: `__slots__` dataclasses without per-field validation, and
+station metadata kept in one shared StationInfo per station instead of being
+copied onto every reading. Validation runs once per batch with
+`validate_records()` before persistence; the Pydantic DTOs in dto.py remain
+the schema at external boundaries.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from app.domain.dto import NormalizedReading, StationMetadata
+
+
+@dataclass(slots=True)
+class StationInfo:
+    """
+    Station metadata shared by all readings of a station.
+
+    Attributes:
+        external_station_id: External station identifier (CSV code or API id)
+        station_name: Human-readable station name
+        latitude: Latitude in WGS84
+        longitude: Longitude in WGS84
+        city: City name
+        country: Country name
+    """
+    external_station_id: str
+    station_name: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+
+    @classmethod
+    def from_metadata(cls, metadata: StationMetadata) -> "StationInfo":
+        """
+        Build from configured station metadata.
+
+        Args:
+            metadata: Station metadata from the mapping file
+
+        Returns:
+            StationInfo
+        """
+        return cls(
+            external_station_id=metadata.station_code,
+            station_name=metadata.station_name,
+            latitude=metadata.latitude,
+            longitude=metadata.longitude,
+            city=metadata.city,
+            country=metadata.country
+        )
+
+
+@dataclass(slots=True)
+class ReadingRecord:
+    """
+    One normalized reading.
+
+    Attributes:
+        station: Shared station metadata
+        pollutant_code: Standardized pollutant code (e.g., 'PM2.5')
+        unit: Measurement unit
+        value: Concentration in the pollutant's standard unit
+        timestamp_utc: Measurement timestamp in UTC
+        aqi: Air Quality Index (optional)
+        source: Data source (e.g., 'historical_csv', 'aqicn')
+    """
+    station: StationInfo
+    pollutant_code: str
+    unit: str
+    value: float
+    timestamp_utc: datetime
+    aqi: Optional[int] = None
+    source: Optional[str] = None
+
+    def to_normalized(self) -> NormalizedReading:
+        """
+        Convert to the validated Pydantic DTO (for external boundaries).
+
+        Returns:
+            NormalizedReading
+
+        Raises:
+            pydantic.ValidationError: If the record is invalid
+        """
+        station = self.station
+        return NormalizedReading(
+            external_station_id=station.external_station_id,
+            station_name=station.station_name,
+            latitude=station.latitude,
+            longitude=station.longitude,
+            city=station.city,
+            country=station.country,
+            pollutant_code=self.pollutant_code,
+            unit=self.unit,
+            value=self.value,
+            aqi=self.aqi,
+            timestamp_utc=self.timestamp_utc,
+            source=self.source
+        )
+
+    @classmethod
+    def from_normalized(cls, reading: NormalizedReading,
+                        station: Optional[StationInfo] = None) -> "ReadingRecord":
+        """
+        Build a record from a validated DTO.
+
+        Args:
+            reading: NormalizedReading
+            station: Shared StationInfo to attach (built from the DTO if None)
+
+        Returns:
+            ReadingRecord
+        """
+        if station is None:
+            station = StationInfo(
+                external_station_id=reading.external_station_id,
+                station_name=reading.station_name,
+                latitude=reading.latitude,
+                longitude=reading.longitude,
+                city=reading.city,
+                country=reading.country
+            )
+        return cls(
+            station=station,
+            pollutant_code=reading.pollutant_code,
+            unit=reading.unit,
+            value=reading.value,
+            timestamp_utc=reading.timestamp_utc,
+            aqi=reading.aqi,
+            source=reading.source
+        )
+
+
+def _station_error(station: StationInfo) -> Optional[str]:
+    """Validate station metadata (same rules as NormalizedReading)."""
+    if station.latitude is not None and not -90 <= station.latitude <= 90:
+        return f"latitude out of range: {station.latitude}"
+    if station.longitude is not None and not -180 <= station.longitude <= 180:
+        return f"longitude out of range: {station.longitude}"
+    return None
+
+
+def record_error(record: ReadingRecord) -> Optional[str]:
+    """
+    Validate one record.
+
+    Args:
+        record: Record to check
+
+    Returns:
+        Error message, or None if the record is valid
+    """
+    value = record.value
+    if value is None or value != value:
+        return "missing value"
+    if value < 0:
+        return f"Pollutant value cannot be negative: {value}"
+    if record.aqi is not None and not 0 <= record.aqi <= 500:
+        return f"AQI out of range: {record.aqi}"
+    if record.timestamp_utc is None or record.timestamp_utc.tzinfo is None:
+        return "timestamp must be timezone-aware"
+    if not record.pollutant_code:
+        return "missing pollutant code"
+    return None
+
+
+def validate_records(records: Iterable[ReadingRecord]) -> Tuple[List[ReadingRecord], List[Tuple[ReadingRecord, str]]]:
+    """
+    Validate a batch of records with the rules of NormalizedReading.
+
+    Station metadata is checked once per distinct StationInfo.
+
+    Args:
+        records: Records to validate
+
+    Returns:
+        Tuple of (valid records, list of (rejected record, error message))
+    """
+    valid: List[ReadingRecord] = []
+    rejected: List[Tuple[ReadingRecord, str]] = []
+    station_errors = {}
+
+    for record in records:
+        station_key = id(record.station)
+        if station_key not in station_errors:
+            station_errors[station_key] = _station_error(record.station)
+
+        error = station_errors[station_key] or record_error(record)
+        if error:
+            rejected.append((record, error))
+        else:
+            valid.append(record)
+
+    return valid, rejected
@@ -1,10 +1,25 @@
 """
 Logging configuration for the ingestion service.
 Provides colored console output and structured logging.
+
+Formats (LOG_FORMAT):
+- colorlog: colored console lines (falls back to standard without colorlog)
+- standard: plain console lines
+- json: one JSON object per line; fields passed with `extra=` (e.g., the
+  per-batch summaries of the ingestion service) are included as keys
+
+With async logging (LOG_ASYNC), records are put on an in-memory queue by a
+QueueHandler and written by a background QueueListener thread, so the
+ingestion loop never blocks on console or file I/O.
 """
 
+import atexit
+import json
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 try:
@@ -13,34 +28,66 @@ try:
 except ImportError:
     COLORLOG_AVAILABLE = False
 
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
 
-def setup_logging(level: str = "INFO", use_color: bool = True) -> logging.Logger:
-    """
-    Configure and return a logger for the ingestion service.
+# Loggers configured by setup_logging(): the CLI logger and the module
+# loggers (get_logger(__name__) returns "app.*" loggers)
+SERVICE_LOGGERS = ("ingestion", "app")
 
-    Args:
-        level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        use_color: Whether to use colored output (if colorlog is available)
+# Background writer of the async handler (None when logging synchronously)
+_listener: Optional[QueueListener] = None
 
-    Returns:
-        Configured logger instance
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects.
     """
-    log_level = getattr(logging, level.upper(), logging.INFO)
 
-    # Create logger
-    logger = logging.getLogger("ingestion")
-    logger.setLevel(log_level)
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record as JSON.
+
+        Args:
+            record: Log record
+
+        Returns:
+            JSON line with time, level, logger, line, message, extra fields
+            and the exception traceback (if any)
+        """
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _create_formatter(log_format: str, use_color: bool) -> logging.Formatter:
+    """
+    Create the console formatter of a log format.
 
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
+    Args:
+        log_format: colorlog, standard or json
+        use_color: Whether to use colored output (colorlog format only)
 
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
+    Returns:
+        Formatter
+    """
+    if log_format == "json":
+        return JsonFormatter()
 
-    # Configure formatter
-    if use_color and COLORLOG_AVAILABLE:
-        formatter = colorlog.ColoredFormatter(
+    if log_format == "colorlog" and use_color and COLORLOG_AVAILABLE:
+        return colorlog.ColoredFormatter(
             "%(log_color)s%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s%(reset)s",
             datefmt="%Y-%m-%d %H:%M:%S",
             log_colors={
@@ -51,19 +98,82 @@ def setup_logging(level: str = "INFO", use_color: bool = True) -> logging.Logger
                 'CRITICAL': 'red,bg_white',
             }
         )
-    else:
-        formatter = logging.Formatter(
-            "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
 
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    return logging.Formatter(
+        "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps `extra=` fields and defers formatting.
+
+    The default QueueHandler.prepare() renders the record with its own
+    formatter; here only the message arguments are merged (so the record
+    can cross threads safely) and the real formatting is left to the
+    listener's handler.
+    """
 
-    # Prevent propagation to root logger
-    logger.propagate = False
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks cannot be pickled or outlive the frame safely
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-    return logger
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background log writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(level: str = "INFO", use_color: bool = True,
+                  log_format: str = "colorlog", async_logging: bool = False) -> logging.Logger:
+    """
+    Configure and return a logger for the ingestion service.
+
+    Args:
+        level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        use_color: Whether to use colored output (if colorlog is available)
+        log_format: colorlog, standard or json
+        async_logging: Write records from a background thread (QueueHandler)
+
+    Returns:
+        Configured logger instance
+    """
+    global _listener
+    log_level = getattr(logging, level.upper(), logging.INFO)
+
+    # Remove existing handlers to avoid duplicates
+    stop_logging()
+
+    # Create console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(log_level)
+    console_handler.setFormatter(_create_formatter(log_format.lower(), use_color))
+
+    handler: logging.Handler = console_handler
+    if async_logging:
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = QueueListener(records, console_handler, respect_handler_level=True)
+        _listener.start()
+        handler = _StructuredQueueHandler(records)
+
+    for name in SERVICE_LOGGERS:
+        service_logger = logging.getLogger(name)
+        service_logger.setLevel(log_level)
+        service_logger.handlers.clear()
+        service_logger.addHandler(handler)
+        # Prevent propagation to root logger
+        service_logger.propagate = False
+
+    return logging.getLogger("ingestion")
 
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
@@ -77,3 +187,7 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
         Logger instance
     """
     return logging.getLogger(name or "ingestion")
+
+
+# Records still queued at exit are written before the process ends
+atexit.register(stop_logging)
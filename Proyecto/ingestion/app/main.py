@@ -2,32 +2,139 @@
 Main entry point for the ingestion service.
 
 Usage:
-    python -m app.main --mode historical
+    python -m app.main --mode historical [--from-scratch] [--profile]
     python -m app.main --mode realtime (not implemented yet)
+    python -m app.main --mode notifications
+    python -m app.main --mode rollups
 """
 
 import argparse
+import cProfile
+import io
+import pstats
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Dict, Optional
 
 from app.config import settings
 from app.logging_config import setup_logging, get_logger
-from app.db.session import get_db, test_connection
+from app.db.session import engine, get_db, test_connection
+from app.profiling import StageProfiler
+from app.providers.resilience import provider_states
+from app.services.dead_letter import DeadLetterStore
 from app.services.ingestion_service import IngestionService
+from app.services.notification_service import NotificationDispatcher
+from app.services.rollup_service import rebuild_hourly_rollups
 
 # Setup logging
-logger = setup_logging(level=settings.ingestion_log_level)
+logger = setup_logging(
+    level=settings.ingestion_log_level,
+    log_format=settings.log_format,
+    async_logging=settings.log_async
+)
 
 
-def run_historical_ingestion():
+def write_performance_report(profiler: StageProfiler, stats: Optional[Dict] = None):
+    """
+    Stop the run's profiler and write its performance report.
+    
+    Written for failed runs too (with whatever was processed), so slow
+    failures can be compared as well. A report that cannot be written only
+    logs a warning.
+    
+    Args:
+        profiler: Profiler of the run
+        stats: Statistics returned by the ingestion service (if it finished)
+    """
+    profiler.stop()
+    if not settings.ingestion_report_enabled:
+        return
+    try:
+        profiler.write_report(settings.get_ingestion_report_path(), stats, provider_states())
+    except OSError as e:
+        logger.warning(f"Could not write performance report: {e}")
+
+
+def create_dead_letter_store(run_name: str) -> Optional[DeadLetterStore]:
+    """
+    Create the dead-letter store of a run (None if disabled).
+    
+    Args:
+        run_name: Run identifier used in the file name
+        
+    Returns:
+        DeadLetterStore or None
+    """
+    if not settings.ingestion_dead_letter_enabled:
+        return None
+    return DeadLetterStore.for_run(settings.get_ingestion_dead_letter_path(), run_name)
+
+
+def close_dead_letter_store(dead_letters: Optional[DeadLetterStore]) -> Dict[str, int]:
+    """
+    Write the remaining rejected rows and log the counts per reason.
+    
+    Args:
+        dead_letters: Store of the run (or None)
+        
+    Returns:
+        Mapping of '<source>.<reason>' -> rejected rows
+    """
+    if dead_letters is None:
+        return {}
+    dead_letters.close()
+    counts = dead_letters.summary()
+    for reason, count in counts.items():
+        logger.info(f"Rejected ({reason}): {count}")
+    return counts
+
+
+def run_with_cprofile(name: str, handler: Callable[[], int]) -> int:
+    """
+    Run a mode under cProfile and save its function-level profile.
+    
+    The profile is written next to the performance reports as a .prof file
+    (open it with `python -m pstats` or snakeviz); the top functions by
+    cumulative time are also logged.
+    
+    Args:
+        name: Mode name (used in the file name)
+        handler: Mode function to run
+        
+    Returns:
+        Exit code of the handler
+    """
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(handler)
+    finally:
+        report_dir = settings.get_ingestion_report_path()
+        path = report_dir / f"ingestion-{name}-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.prof"
+        try:
+            report_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(path)
+            logger.info(f"cProfile output written to {path}")
+        except OSError as e:
+            logger.warning(f"Could not write cProfile output: {e}")
+        
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(25)
+        logger.info(f"Top functions by cumulative time:\n{summary.getvalue()}")
+
+
+def run_historical_ingestion(from_scratch: bool = False):
     """
     Run one-time historical data ingestion from CSV files.
     
     This function:
     1. Tests database connectivity
     2. Creates ingestion service
-    3. Processes all CSV files in data_air/
+    3. Processes all CSV files in data_air/ (resuming from checkpoints)
     4. Inserts readings into PostgreSQL
+    
+    Args:
+        from_scratch: Ignore checkpoints and re-read every file
     """
     logger.info("=" * 70)
     logger.info("AIR QUALITY PLATFORM - HISTORICAL DATA INGESTION")
@@ -42,14 +149,18 @@ def run_historical_ingestion():
     # Create database session
     logger.info("\n[2/3] Initializing ingestion service...")
     db = next(get_db())
+    profiler = StageProfiler("historical")
+    profiler.track_engine(engine)
+    dead_letters = create_dead_letter_store("historical")
+    stats = None
     
     try:
-        service = IngestionService(db)
+        service = IngestionService(db, profiler=profiler, dead_letters=dead_letters)
         service.preload_caches()
         
         # Run ingestion
         logger.info("\n[3/3] Running historical data ingestion...")
-        stats = service.run_historical_ingestion()
+        stats = service.run_historical_ingestion(from_scratch=from_scratch)
         
         # Success
         logger.info("\n" + "✓" * 70)
@@ -63,10 +174,12 @@ def run_historical_ingestion():
         return 1
         
     finally:
+        rejected = close_dead_letter_store(dead_letters)
+        write_performance_report(profiler, {**(stats or {}), 'rejected': rejected})
         db.close()
 
 
-def run_realtime_ingestion():
+def run_realtime_ingestion(from_scratch: bool = False):
     """
     Run one-time real-time data ingestion from AQICN API.
     
@@ -75,6 +188,9 @@ def run_realtime_ingestion():
     2. Creates ingestion service with AQICN adapter
     3. Fetches current air quality data from AQICN
     4. Inserts readings into PostgreSQL
+    
+    Args:
+        from_scratch: Ignore the per-station checkpoints
     """
     logger.info("=" * 70)
     logger.info("AIR QUALITY PLATFORM - REAL-TIME DATA INGESTION (AQICN)")
@@ -89,14 +205,18 @@ def run_realtime_ingestion():
     # Create database session
     logger.info("\n[2/3] Initializing ingestion service...")
     db = next(get_db())
+    profiler = StageProfiler("realtime")
+    profiler.track_engine(engine)
+    dead_letters = create_dead_letter_store("realtime")
+    stats = None
     
     try:
-        service = IngestionService(db)
+        service = IngestionService(db, profiler=profiler, dead_letters=dead_letters)
         service.preload_caches()
         
         # Run AQICN ingestion
         logger.info("\n[3/3] Running real-time data ingestion from AQICN API...")
-        stats = service.run_aqicn_ingestion()
+        stats = service.run_aqicn_ingestion(from_scratch=from_scratch)
         
         # Success
         logger.info("\n" + "✓" * 70)
@@ -109,6 +229,101 @@ def run_realtime_ingestion():
         logger.error(f"\n✗ Real-time ingestion failed: {e}", exc_info=True)
         return 1
         
+    finally:
+        rejected = close_dead_letter_store(dead_letters)
+        write_performance_report(profiler, {**(stats or {}), 'rejected': rejected})
+        db.close()
+
+
+def run_notification_dispatch():
+    """
+    Deliver alert notifications queued in the outbox table.
+    
+    This function:
+    1. Tests database connectivity
+    2. Creates the notification dispatcher with the configured transports
+    3. Delivers due notifications in batches (failures are retried later)
+    """
+    logger.info("=" * 70)
+    logger.info("AIR QUALITY PLATFORM - ALERT NOTIFICATION DISPATCH")
+    logger.info("=" * 70)
+    
+    # Test database connection
+    logger.info("\n[1/3] Testing database connection...")
+    if not test_connection():
+        logger.error("Database connection failed. Exiting.")
+        sys.exit(1)
+    
+    # Create database session
+    logger.info("\n[2/3] Initializing notification dispatcher...")
+    db = next(get_db())
+    dispatcher = None
+    
+    try:
+        dispatcher = NotificationDispatcher(
+            db,
+            batch_size=settings.notification_batch_size,
+            max_attempts=settings.notification_max_attempts,
+            retry_base_seconds=settings.notification_retry_base_seconds,
+            lease_seconds=settings.notification_lease_seconds
+        )
+        
+        # Deliver pending notifications
+        logger.info("\n[3/3] Delivering pending notifications...")
+        stats = dispatcher.dispatch_pending()
+        
+        # Success
+        logger.info("\n" + "✓" * 70)
+        logger.info("Notification dispatch completed successfully!")
+        logger.info("✓" * 70)
+        
+        return 0
+        
+    except Exception as e:
+        logger.error(f"\n✗ Notification dispatch failed: {e}", exc_info=True)
+        return 1
+        
+    finally:
+        if dispatcher:
+            dispatcher.close()
+        db.close()
+
+
+def run_rollup_rebuild():
+    """
+    Rebuild the hourly rollup from the raw readings.
+    
+    Needed once for readings inserted before the rollup existed, or after
+    readings were changed outside the ingestion service; new batches keep
+    the rollup up to date on their own.
+    """
+    logger.info("=" * 70)
+    logger.info("AIR QUALITY PLATFORM - HOURLY ROLLUP REBUILD")
+    logger.info("=" * 70)
+    
+    # Test database connection
+    logger.info("\n[1/2] Testing database connection...")
+    if not test_connection():
+        logger.error("Database connection failed. Exiting.")
+        sys.exit(1)
+    
+    db = next(get_db())
+    
+    try:
+        logger.info("\n[2/2] Rebuilding air_quality_hourly_stats...")
+        rebuild_hourly_rollups(db)
+        
+        # Success
+        logger.info("\n" + "✓" * 70)
+        logger.info("Hourly rollup rebuilt successfully!")
+        logger.info("✓" * 70)
+        
+        return 0
+        
+    except Exception as e:
+        logger.error(f"\n✗ Hourly rollup rebuild failed: {e}", exc_info=True)
+        return 1
+        
     finally:
         db.close()
 
@@ -122,20 +337,48 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  # Run historical ingestion (one-time)
+  # Run historical ingestion (one-time, resumes after a failure)
   python -m app.main --mode historical
   
+  # Re-ingest every CSV file, ignoring checkpoints
+  python -m app.main --mode historical --from-scratch
+  
+  # Save a cProfile of the run next to the performance reports
+  python -m app.main --mode historical --profile
+  
   # Run real-time ingestion (periodic, not implemented yet)
   python -m app.main --mode realtime
+  
+  # Deliver queued alert notifications (periodic)
+  python -m app.main --mode notifications
+  
+  # Recompute the hourly rollup from the raw readings (one-time backfill)
+  python -m app.main --mode rollups
         """
     )
     
     parser.add_argument(
         '--mode',
         type=str,
-        choices=['historical', 'realtime'],
+        choices=['historical', 'realtime', 'notifications', 'rollups'],
         default='historical',
-        help='Ingestion mode: historical (CSV files) or realtime (AQICN API)'
+        help='Ingestion mode: historical (CSV files), realtime (AQICN API), '
+             'notifications (deliver queued alert notifications) or rollups '
+             '(rebuild the hourly rollup)'
+    )
+    
+    parser.add_argument(
+        '--from-scratch',
+        action='store_true',
+        help='Ignore ingestion checkpoints and process every source again '
+             '(duplicates are still skipped)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Run under cProfile and save the profile next to the '
+             'performance reports (adds overhead)'
     )
     
     parser.add_argument(
@@ -151,16 +394,26 @@ Examples:
     # Override log level if provided
     if args.log_level:
         global logger
-        logger = setup_logging(level=args.log_level)
+        logger = setup_logging(
+            level=args.log_level,
+            log_format=settings.log_format,
+            async_logging=settings.log_async
+        )
     
     # Route to appropriate handler
     if args.mode == 'historical':
-        exit_code = run_historical_ingestion()
+        handler = lambda: run_historical_ingestion(from_scratch=args.from_scratch)
     elif args.mode == 'realtime':
-        exit_code = run_realtime_ingestion()
+        handler = lambda: run_realtime_ingestion(from_scratch=args.from_scratch)
+    elif args.mode == 'notifications':
+        handler = run_notification_dispatch
+    elif args.mode == 'rollups':
+        handler = run_rollup_rebuild
     else:
         logger.error(f"Unknown mode: {args.mode}")
-        exit_code = 1
+        sys.exit(1)
+    
+    exit_code = run_with_cprofile(args.mode, handler) if args.profile else handler()
     
     sys.exit(exit_code)
 
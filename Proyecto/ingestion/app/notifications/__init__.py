@@ -0,0 +1 @@
+"""Notifications package - Pluggable transports for alert notifications"""
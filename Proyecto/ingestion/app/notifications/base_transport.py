@@ -0,0 +1,74 @@
+"""
+Base transport interface for alert notifications.
+
+Transports deliver a batch of notifications for one channel ('email',
+'sms', ...). The dispatcher groups pending notifications per channel and
+hands each group to the transport registered for it, so a transport can
+reuse one connection for the whole batch.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+@dataclass
+class NotificationMessage:
+    """
+    One notification ready to be delivered.
+
+    Attributes:
+        outbox_id: ID of the notification_outbox row
+        channel: Delivery channel (copied from alert.method)
+        recipient: Recipient address
+        subject: Short subject line
+        body: Message text
+        alert_id: Alert that was triggered
+        pollutant: Pollutant name
+        value: Reading value that crossed the threshold
+        threshold: Alert threshold
+        reading_datetime: Timestamp of the reading
+    """
+    outbox_id: int
+    channel: str
+    recipient: str
+    subject: str
+    body: str
+    alert_id: int
+    pollutant: str
+    value: float
+    threshold: float
+    reading_datetime: Optional[datetime] = None
+
+
+class BaseNotificationTransport(ABC):
+    """
+    Base transport that delivers batches of notification messages.
+
+    Concrete transports must implement:
+    - send_batch(): Deliver messages and report per-message failures
+    """
+
+    @abstractmethod
+    def send_batch(self, messages: List[NotificationMessage]) -> Dict[int, str]:
+        """
+        Deliver a batch of messages.
+
+        A transport must not raise for individual delivery errors; failed
+        messages are reported so that only they are retried.
+
+        Args:
+            messages: Messages to deliver (all for the same channel)
+
+        Returns:
+            Mapping of outbox_id -> error message for failed deliveries
+            (empty if every message was delivered)
+        """
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the transport."""
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}>"
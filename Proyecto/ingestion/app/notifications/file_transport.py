@@ -0,0 +1,73 @@
+"""
+File sink transport.
+
+Appends every notification as one JSON line to a local file. Used for
+channels without a real transport (e.g. 'sms') and for local testing.
+"""
+
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List
+
+from app.notifications.base_transport import BaseNotificationTransport, NotificationMessage
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class FileSinkTransport(BaseNotificationTransport):
+    """Writes notifications as JSON lines to a local file."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize file sink.
+
+        Args:
+            path: JSON lines file (parent directories are created if needed)
+        """
+        self.path = Path(path)
+        self._lock = Lock()
+
+    def send_batch(self, messages: List[NotificationMessage]) -> Dict[int, str]:
+        """
+        Append a batch of messages to the sink file with a single write.
+
+        Args:
+            messages: Messages to deliver
+
+        Returns:
+            Mapping of outbox_id -> error for every message if the write failed
+        """
+        if not messages:
+            return {}
+
+        lines = "".join(
+            json.dumps({
+                'outbox_id': m.outbox_id,
+                'channel': m.channel,
+                'recipient': m.recipient,
+                'subject': m.subject,
+                'body': m.body,
+                'alert_id': m.alert_id,
+                'pollutant': m.pollutant,
+                'value': m.value,
+                'threshold': m.threshold,
+                'reading_datetime': m.reading_datetime.isoformat() if m.reading_datetime else None
+            }, ensure_ascii=False) + "\n"
+            for m in messages
+        )
+
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as sink:
+                    sink.write(lines)
+        except OSError as e:
+            logger.error(f"Failed to write notifications to {self.path}: {e}")
+            return {m.outbox_id: str(e) for m in messages}
+
+        return {}
+
+    def __repr__(self) -> str:
+        return f"<FileSinkTransport path={self.path}>"
@@ -0,0 +1,100 @@
+"""
+SMTP transport for email notifications.
+
+Opens one SMTP connection per batch and sends every message over it. Works
+against any SMTP server, including local stubs such as
+`python -m aiosmtpd -n -l localhost:1025` for testing.
+"""
+
+import smtplib
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+from app.notifications.base_transport import BaseNotificationTransport, NotificationMessage
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SmtpTransport(BaseNotificationTransport):
+    """Sends email notifications through an SMTP server."""
+
+    def __init__(self, host: str, port: int = 25, sender: str = "alerts@localhost",
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: bool = False, timeout: float = 10.0):
+        """
+        Initialize SMTP transport.
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            sender: From address
+            username: Login user (optional)
+            password: Login password (optional)
+            use_tls: Upgrade the connection with STARTTLS
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send_batch(self, messages: List[NotificationMessage]) -> Dict[int, str]:
+        """
+        Send a batch of emails over a single SMTP connection.
+
+        Args:
+            messages: Messages to deliver
+
+        Returns:
+            Mapping of outbox_id -> error message for failed deliveries
+        """
+        if not messages:
+            return {}
+
+        failures: Dict[int, str] = {}
+        sent = set()
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                if self.use_tls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password or "")
+
+                for message in messages:
+                    try:
+                        smtp.send_message(self._build_email(message))
+                        sent.add(message.outbox_id)
+                    except smtplib.SMTPException as e:
+                        failures[message.outbox_id] = str(e)
+        except (smtplib.SMTPException, OSError) as e:
+            # Connection-level error: only messages already accepted were sent
+            logger.error(f"SMTP connection to {self.host}:{self.port} failed: {e}")
+            for message in messages:
+                if message.outbox_id not in sent:
+                    failures.setdefault(message.outbox_id, str(e))
+
+        return failures
+
+    def _build_email(self, message: NotificationMessage) -> EmailMessage:
+        """
+        Build an email from a notification message.
+
+        Args:
+            message: Notification message
+
+        Returns:
+            EmailMessage
+        """
+        email = EmailMessage()
+        email['From'] = self.sender
+        email['To'] = message.recipient
+        email['Subject'] = message.subject
+        email.set_content(message.body)
+        return email
+
+    def __repr__(self) -> str:
+        return f"<SmtpTransport {self.host}:{self.port}>"
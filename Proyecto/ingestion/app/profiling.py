@@ -0,0 +1,327 @@
+"""
+Ingestion stage profiler.
+
+Collects per-adapter timings of the pipeline stages (read, parse, AQI,
+normalize, dedup, write, commit), rows processed, database round trips and
+peak memory, and writes them as a JSON report at the end of each run so
+performance can be compared between deployments.
+
+Timings are taken per chunk/batch with time.perf_counter(), so the
+overhead is negligible and the profiler is always on. Detailed function
+level profiles are available separately with `--profile` (cProfile).
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Pipeline stages, in report order
+STAGES = ("read", "parse", "aqi", "normalize", "dedup", "write", "rollups", "alerts", "publish", "commit")
+
+# Scope of round trips made outside any adapter (setup, checkpoints)
+RUN_SCOPE = "(run)"
+
+
+@dataclass(slots=True)
+class StageStats:
+    """
+    Accumulated timing of one stage.
+
+    Attributes:
+        seconds: Total wall time
+        calls: Number of timed sections
+        round_trips: Database statements executed during the stage
+    """
+    seconds: float = 0.0
+    calls: int = 0
+    round_trips: int = 0
+
+
+def peak_memory_mb() -> Optional[float]:
+    """
+    Peak resident memory of the process.
+
+    Returns:
+        Megabytes, or None where the resource module is unavailable
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class ProfileScope:
+    """
+    Profiler view bound to one adapter (report section).
+    """
+
+    def __init__(self, profiler: Optional["StageProfiler"], name: str):
+        """
+        Initialize scope.
+
+        Args:
+            profiler: Owning profiler (None for a disabled scope)
+            name: Scope name (e.g., the adapter's repr)
+        """
+        self.profiler = profiler
+        self.name = name
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """
+        Time a section of a stage.
+
+        Sections can be nested: time spent in an inner stage is not counted
+        in the outer one, and database statements run on this thread are
+        attributed to the innermost stage.
+
+        Args:
+            stage: Stage name (see STAGES)
+        """
+        if self.profiler is None:
+            yield
+            return
+        stack = self.profiler._stack()
+        frame = [self.name, stage, 0.0]  # scope, stage, time in inner stages
+        stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            if stack:
+                stack[-1][2] += elapsed
+            self.profiler.add(self.name, stage, elapsed - frame[2])
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        """
+        Add time measured by the caller to a stage.
+
+        Args:
+            stage: Stage name
+            seconds: Wall time
+            calls: Timed sections included
+        """
+        if self.profiler is not None:
+            self.profiler.add(self.name, stage, seconds, calls)
+
+    def add_rows(self, rows: int) -> None:
+        """
+        Count rows (readings) processed by this scope.
+
+        Args:
+            rows: Number of rows
+        """
+        if self.profiler is not None:
+            self.profiler.add_rows(self.name, rows)
+
+
+# Scope that records nothing (adapters used outside a profiled run)
+NULL_SCOPE = ProfileScope(None, RUN_SCOPE)
+
+
+class StageProfiler:
+    """
+    Thread-safe accumulator of stage timings for one ingestion run.
+
+    Adapters are read in worker threads, so every update takes a lock;
+    updates happen per chunk, batch or database query, never per parsed row.
+    """
+
+    def __init__(self, run_name: str):
+        """
+        Initialize profiler.
+
+        Args:
+            run_name: Run identifier used in the report (e.g., 'historical')
+        """
+        self.run_name = run_name
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages: Dict[str, Dict[str, StageStats]] = {}
+        self._rows: Dict[str, int] = {}
+        self._engine: Optional[Engine] = None
+
+    def scope(self, name: str) -> ProfileScope:
+        """
+        Get the scope of an adapter.
+
+        Args:
+            name: Scope name
+
+        Returns:
+            ProfileScope
+        """
+        return ProfileScope(self, name)
+
+    def add(self, scope: str, stage: str, seconds: float, calls: int = 1) -> None:
+        """
+        Add time to a stage of a scope.
+
+        Args:
+            scope: Scope name
+            stage: Stage name
+            seconds: Wall time
+            calls: Timed sections included
+        """
+        with self._lock:
+            stats = self._stage(scope, stage)
+            stats.seconds += seconds
+            stats.calls += calls
+
+    def add_rows(self, scope: str, rows: int) -> None:
+        """
+        Count rows processed by a scope.
+
+        Args:
+            scope: Scope name
+            rows: Number of rows
+        """
+        with self._lock:
+            self._rows[scope] = self._rows.get(scope, 0) + rows
+
+    def track_engine(self, engine: Engine) -> None:
+        """
+        Count database round trips (statements and commits) of an engine
+        until stop() is called.
+
+        Args:
+            engine: Engine used by the run's session
+        """
+        self._engine = engine
+        event.listen(engine, 'before_cursor_execute', self._on_round_trip)
+        event.listen(engine, 'commit', self._on_round_trip)
+
+    def stop(self) -> None:
+        """Stop counting database round trips."""
+        if self._engine is not None:
+            event.remove(self._engine, 'before_cursor_execute', self._on_round_trip)
+            event.remove(self._engine, 'commit', self._on_round_trip)
+            self._engine = None
+
+    def _stack(self) -> List[list]:
+        """Stages open on the current thread (innermost last)."""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _on_round_trip(self, *args: Any, **kwargs: Any) -> None:
+        """SQLAlchemy event handler: attribute one round trip to the current stage."""
+        stack = self._stack()
+        scope, stage = (stack[-1][0], stack[-1][1]) if stack else (RUN_SCOPE, "other")
+        with self._lock:
+            self._stage(scope, stage).round_trips += 1
+
+    def _stage(self, scope: str, stage: str) -> StageStats:
+        """Get (creating it) the stats of a stage; the lock must be held."""
+        stages = self._stages.setdefault(scope, {})
+        if stage not in stages:
+            stages[stage] = StageStats()
+        return stages[stage]
+
+    def report(self, stats: Optional[Dict[str, Any]] = None,
+               providers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build the run report.
+
+        Args:
+            stats: Run statistics returned by the ingestion service
+            providers: State of the external provider clients (circuit,
+                timeouts, latency)
+
+        Returns:
+            JSON-serializable report
+        """
+        duration = time.perf_counter() - self._started
+        order = {stage: i for i, stage in enumerate(STAGES)}
+
+        with self._lock:
+            scopes = {}
+            totals: Dict[str, StageStats] = {}
+            for scope, stages in self._stages.items():
+                rows = self._rows.get(scope, 0)
+                busy = sum(s.seconds for s in stages.values())
+                scopes[scope] = {
+                    'rows': rows,
+                    'seconds': round(busy, 4),
+                    'rows_per_second': round(rows / busy, 1) if busy else None,
+                    'stages': {
+                        stage: {
+                            'seconds': round(s.seconds, 4),
+                            'calls': s.calls,
+                            'round_trips': s.round_trips
+                        }
+                        for stage, s in sorted(stages.items(), key=lambda item: order.get(item[0], len(order)))
+                    }
+                }
+                for stage, s in stages.items():
+                    total = totals.setdefault(stage, StageStats())
+                    total.seconds += s.seconds
+                    total.calls += s.calls
+                    total.round_trips += s.round_trips
+            total_rows = sum(self._rows.values())
+
+        return {
+            'run': self.run_name,
+            'started_at': self.started_at.isoformat(),
+            'duration_seconds': round(duration, 3),
+            'rows': total_rows,
+            'rows_per_second': round(total_rows / duration, 1) if duration else None,
+            'peak_memory_mb': peak_memory_mb(),
+            'db_round_trips': sum(s.round_trips for s in totals.values()),
+            'stages': {
+                stage: {'seconds': round(s.seconds, 4), 'calls': s.calls, 'round_trips': s.round_trips}
+                for stage, s in sorted(totals.items(), key=lambda item: order.get(item[0], len(order)))
+            },
+            'adapters': scopes,
+            'providers': providers or {},
+            'stats': stats or {}
+        }
+
+    def write_report(self, directory: Path, stats: Optional[Dict[str, Any]] = None,
+                     providers: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Write the run report as JSON and log a one-line summary.
+
+        Args:
+            directory: Reports directory (created if needed)
+            stats: Run statistics returned by the ingestion service
+            providers: State of the external provider clients
+
+        Returns:
+            Path of the report file
+        """
+        report = self.report(stats, providers)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"ingestion-{self.run_name}-{self.started_at:%Y%m%dT%H%M%SZ}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+
+        summary = (
+            f"Performance: {report['rows']} rows in {report['duration_seconds']}s "
+            f"({report['rows_per_second']} rows/s), {report['db_round_trips']} DB round trips"
+        )
+        if report['peak_memory_mb'] is not None:
+            summary += f", peak memory {report['peak_memory_mb']:.0f} MB"
+        logger.info(summary)
+        logger.info(f"Performance report written to {path}")
+        return path
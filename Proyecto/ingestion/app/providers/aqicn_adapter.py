@@ -6,43 +6,124 @@ AQICN (Air Quality Index China Network) API, which provides real-time
 air quality data from monitoring stations worldwide.
 
 API Documentation: https://aqicn.org/api/
+
+Station coordinates can be fetched region by region: stations are grouped
+into bounding boxes, each box is queried once with the map bounds endpoint
+(overall AQI and update time of every station in it) and the detailed feed
+(per-pollutant IAQI) is only requested for stations updated since their
+last ingested reading. API calls drop from one per station to one per
+region plus one per updated station.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from itertools import chain
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
+import numpy as np
 import requests
 from requests.exceptions import RequestException, Timeout
 
-from app.domain.dto import NormalizedReading
+from app.config import settings
+from app.domain.records import ReadingRecord, StationInfo
 from app.providers.base_adapter import BaseExternalApiAdapter
+from app.providers.registry import SourceConfig
+from app.providers.resilience import ProviderClient
+from app.domain.aqi import concentrations_for_aqi
 from app.domain.normalization import (
-    normalize_timestamp as convert_timestamp_to_utc
+    get_standard_unit,
+    TimestampParser
 )
+from app.services.dead_letter import DeadLetter, OUT_OF_RANGE
+from app.services.station_resolver import haversine_m
 
 logger = logging.getLogger(__name__)
 
+# Margin added around each bounding box (degrees, ~5 km) so the station
+# nearest to a coordinate at the edge of a box is still inside it
+BOUNDS_PADDING_DEG = 0.05
+
+# AQICN station names (lowercase) of known stations -> our station names
+STATION_NAME_ALIASES = {
+    "carvajal - sevillana": "Carvajal",
+    "carvajal-sevillana": "Carvajal",
+    "carvajal": "Carvajal",
+    "centro de alto rendimiento": "Centro de Alto Rendimiento",
+    "las ferias": "Las Ferias",
+    "puente aranda": "Puente Aranda",
+    "suba": "Suba",
+}
+
+
+def cluster_bounds(
+    coordinates: List[Tuple[float, float]],
+    max_span_deg: float
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Group coordinates into bounding boxes of at most `max_span_deg` per side.
+    
+    Coordinates are visited in latitude order and each one grows the first
+    box that stays within the span, or starts a new box (greedy clustering:
+    stations of one city end up in a single box).
+    
+    Args:
+        coordinates: List of (lat, lon) tuples
+        max_span_deg: Maximum height and width of a box (degrees, before padding)
+        
+    Returns:
+        List of (lat1, lon1, lat2, lon2) boxes (south-west, north-east corners),
+        padded by BOUNDS_PADDING_DEG
+    """
+    boxes: List[List[float]] = []
+    for lat, lon in sorted(coordinates):
+        for box in boxes:
+            south, west = min(box[0], lat), min(box[1], lon)
+            north, east = max(box[2], lat), max(box[3], lon)
+            if north - south <= max_span_deg and east - west <= max_span_deg:
+                box[:] = [south, west, north, east]
+                break
+        else:
+            boxes.append([lat, lon, lat, lon])
+    
+    return [
+        (south - BOUNDS_PADDING_DEG, west - BOUNDS_PADDING_DEG,
+         north + BOUNDS_PADDING_DEG, east + BOUNDS_PADDING_DEG)
+        for south, west, north, east in boxes
+    ]
+
 
 class AqicnApiAdapter(BaseExternalApiAdapter):
     """
     Adapter pattern implementation for AQICN API
     
     Fetches real-time air quality data from AQICN and normalizes it
-    into the internal NormalizedReading format.
+    into the internal ReadingRecord format.
     
     Supports:
     - City-based queries (e.g., "bogota")
     - Geo-based queries (latitude, longitude)
+    - Region queries (map bounds) with per-station feeds only for updated stations
     - Station search
     
     Design Pattern: Adapter
     Purpose: Unify different external API formats into a common internal format
     """
     
+    # Source tag stored with every reading
+    SOURCE = "aqicn"
+    
+    # Readings are checkpointed per AQICN station (iter_batches accepts `since`)
+    STATION_CHECKPOINTS = True
+    
     def __init__(
         self,
         api_key: str,
         base_url: str = "https://api.waqi.info",
-        timeout: int = 10
+        timeout: int = 10,
+        use_bounds: bool = False,
+        bounds_max_span_deg: float = 1.0,
+        session: Optional[requests.Session] = None,
+        client: Optional[ProviderClient] = None,
+        cities: Optional[List[str]] = None,
+        coordinates: Optional[List[tuple]] = None
     ):
         """
         Initialize AQICN API adapter
@@ -50,52 +131,181 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
         Args:
             api_key: AQICN API token
             base_url: Base URL for AQICN API
-            timeout: Request timeout in seconds
+            timeout: Maximum request timeout in seconds (the client adapts it
+                to the observed latency)
+            use_bounds: Fetch coordinates region by region (map bounds endpoint)
+            bounds_max_span_deg: Maximum size of a region (degrees)
+            session: HTTP session (e.g., one replaying recorded responses)
+            client: Resilient HTTP client (circuit breaker, adaptive timeout,
+                hedging); by default one with the given session and timeout
+            cities: Cities queried when fetch_readings()/iter_batches() get none
+            coordinates: (lat, lon) tuples queried when fetch_readings()/
+                iter_batches() get none
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
-        self.session = requests.Session()
+        self.use_bounds = use_bounds
+        self.bounds_max_span_deg = bounds_max_span_deg
+        self.client = client or ProviderClient(self.SOURCE, session, max_timeout=timeout)
+        self.session = self.client.session
+        self.cities = cities
+        self.coordinates = coordinates
+        # HTTP requests made (API quota use)
+        self.api_calls = 0
+        # AQICN timestamps are ISO 8601 with offset; the format is cached
+        self.timestamp_parser = TimestampParser()
         
         logger.info(
             f"Initialized AqicnApiAdapter (base_url={base_url}, timeout={timeout}s)"
         )
     
+    @classmethod
+    def from_config(cls, source: SourceConfig, mapping: Dict[str, Any]) -> List["AqicnApiAdapter"]:
+        """
+        Create one adapter querying the coordinates of the mapped stations.
+        
+        Source options (all optional):
+        - api_key: AQICN token (TOKEN_API_AQICN)
+        - base_url: API base URL (AQICN_BASE_URL)
+        - cities: City names to query as well (list or comma-separated string)
+        - use_bounds: Query coordinates region by region (AQICN_BOUNDS_ENABLED)
+        - bounds_max_span_deg: Maximum region size (AQICN_BOUNDS_MAX_SPAN_DEG)
+        
+        Args:
+            source: Configured source
+            mapping: Station mapping configuration ('stations')
+            
+        Returns:
+            List with one AqicnApiAdapter
+            
+        Raises:
+            ValueError: If no API token is configured
+        """
+        options = source.options
+        api_key = options.get('api_key', settings.aqicn_api_key)
+        if not api_key:
+            raise ValueError("AQICN_API_KEY not configured in environment")
+        
+        cities = options.get('cities')
+        if isinstance(cities, str):
+            cities = [city.strip() for city in cities.split(',') if city.strip()]
+        
+        coordinates = [
+            (station['latitude'], station['longitude'])
+            for station in mapping.get('stations', [])
+            if station.get('latitude') is not None and station.get('longitude') is not None
+        ]
+        
+        client = ProviderClient(
+            cls.SOURCE,
+            max_timeout=settings.provider_timeout_seconds,
+            min_timeout=settings.provider_min_timeout_seconds,
+            failure_threshold=settings.provider_failure_threshold,
+            reset_timeout=settings.provider_reset_timeout_seconds,
+            hedge=settings.provider_hedge_enabled
+        )
+        return [cls(
+            api_key=api_key,
+            base_url=options.get('base_url', settings.aqicn_base_url),
+            use_bounds=bool(options.get('use_bounds', settings.aqicn_bounds_enabled)),
+            bounds_max_span_deg=float(options.get('bounds_max_span_deg', settings.aqicn_bounds_max_span_deg)),
+            client=client,
+            cities=cities or None,
+            coordinates=coordinates or None
+        )]
+    
     def fetch_readings(
         self,
         cities: Optional[List[str]] = None,
         coordinates: Optional[List[tuple]] = None
-    ) -> List[NormalizedReading]:
+    ) -> List[ReadingRecord]:
         """
         Fetch and normalize readings from AQICN API
         
         Args:
-            cities: List of city names to query (e.g., ["bogota", "medellin"])
-            coordinates: List of (lat, lon) tuples to query
+            cities: List of city names to query (e.g., ["bogota", "medellin"];
+                defaults to the adapter's cities)
+            coordinates: List of (lat, lon) tuples to query (defaults to the
+                adapter's coordinates)
             
         Returns:
-            List of NormalizedReading objects
+            List of ReadingRecord objects
         """
+        cities = self.cities if cities is None else cities
+        coordinates = self.coordinates if coordinates is None else coordinates
         all_readings = []
+        for readings in self._iter_feeds(cities, coordinates):
+            all_readings.extend(readings)
+        return all_readings
+    
+    def iter_batches(
+        self,
+        batch_size: int,
+        cities: Optional[List[str]] = None,
+        coordinates: Optional[List[tuple]] = None,
+        since: Optional[Dict[str, datetime]] = None
+    ) -> Iterator[List[ReadingRecord]]:
+        """
+        Fetch readings feed by feed, yielding each feed's readings as soon
+        as it has been parsed.
         
+        Args:
+            batch_size: Maximum number of readings per batch
+            cities: List of city names to query (defaults to the adapter's cities)
+            coordinates: List of (lat, lon) tuples to query (defaults to the
+                adapter's coordinates)
+            since: Last ingested timestamp per AQICN station idx; with
+                use_bounds, stations not updated since are not fetched
+            
+        Yields:
+            Lists of ReadingRecord objects (one or more per feed)
+        """
+        cities = self.cities if cities is None else cities
+        coordinates = self.coordinates if coordinates is None else coordinates
+        if self.use_bounds and coordinates:
+            feeds = chain(self._iter_feeds(cities), self._iter_bounds_feeds(coordinates, since or {}))
+        else:
+            feeds = self._iter_feeds(cities, coordinates)
+        
+        for readings in feeds:
+            for start in range(0, len(readings), batch_size):
+                yield readings[start:start + batch_size]
+    
+    def _iter_feeds(
+        self,
+        cities: Optional[List[str]] = None,
+        coordinates: Optional[List[tuple]] = None
+    ) -> Iterator[List[ReadingRecord]]:
+        """
+        Query each city and coordinate feed in turn.
+        
+        Args:
+            cities: List of city names to query
+            coordinates: List of (lat, lon) tuples to query
+            
+        Yields:
+            Readings of one feed (feeds without readings are skipped)
+        """
         # Fetch by city names
         if cities:
             for city in cities:
                 try:
                     readings = self._fetch_city_feed(city)
-                    all_readings.extend(readings)
                     logger.info(
                         f"Fetched {len(readings)} readings from city: {city}"
                     )
                 except Exception as e:
                     logger.error(f"Failed to fetch data for city {city}: {e}")
+                    continue
+                if readings:
+                    yield readings
         
         # Fetch by coordinates
         if coordinates:
             for lat, lon in coordinates:
                 try:
                     readings = self._fetch_geo_feed(lat, lon)
-                    all_readings.extend(readings)
                     logger.info(
                         f"Fetched {len(readings)} readings from coordinates: {lat}, {lon}"
                     )
@@ -103,10 +313,166 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
                     logger.error(
                         f"Failed to fetch data for coordinates ({lat}, {lon}): {e}"
                     )
+                    continue
+                if readings:
+                    yield readings
+    
+    def _iter_bounds_feeds(
+        self,
+        coordinates: List[tuple],
+        since: Dict[str, datetime]
+    ) -> Iterator[List[ReadingRecord]]:
+        """
+        Query coordinates region by region.
         
-        return all_readings
+        Each coordinate is assigned the nearest AQICN station of its region
+        (as the geo feed would). The detailed feed of a station is fetched
+        only if the region listing shows an update newer than `since`;
+        coordinates of a region that could not be listed use the geo feed.
+        
+        Args:
+            coordinates: List of (lat, lon) tuples to query
+            since: Last ingested timestamp per AQICN station idx
+            
+        Yields:
+            Readings of one station feed
+        """
+        boxes = cluster_bounds(coordinates, self.bounds_max_span_deg)
+        logger.info(f"Querying {len(coordinates)} coordinates in {len(boxes)} regions")
+        
+        uids: Dict[str, Dict[str, Any]] = {}
+        fallback: List[tuple] = []
+        for box in boxes:
+            inside = [
+                (lat, lon) for lat, lon in coordinates
+                if box[0] <= lat <= box[2] and box[1] <= lon <= box[3]
+            ]
+            try:
+                listed = self.fetch_map_bounds(*box)
+            except Exception as e:
+                logger.error(f"Failed to fetch map bounds ({', '.join(f'{v:.4f}' for v in box)}): {e}")
+                listed = []
+            if not listed:
+                fallback.extend(inside)
+                continue
+            
+            latitudes = np.array([float(entry["lat"]) for entry in listed])
+            longitudes = np.array([float(entry["lon"]) for entry in listed])
+            for lat, lon in inside:
+                nearest = listed[int(np.argmin(haversine_m(lat, lon, latitudes, longitudes)))]
+                uids.setdefault(str(nearest["uid"]), nearest)
+        
+        unchanged = 0
+        for uid, entry in uids.items():
+            if not self._is_updated(entry, since.get(uid)):
+                unchanged += 1
+                continue
+            try:
+                readings = self._fetch_station_feed(uid)
+            except Exception as e:
+                logger.error(f"Failed to fetch data for station @{uid}: {e}")
+                continue
+            if readings:
+                yield readings
+        
+        logger.info(
+            f"Map bounds: {len(uids)} stations matched, {unchanged} not updated, "
+            f"{len(fallback)} coordinates without region data"
+        )
+        
+        if fallback:
+            yield from self._iter_feeds(coordinates=fallback)
     
-    def _fetch_city_feed(self, city: str) -> List[NormalizedReading]:
+    def _is_updated(self, entry: Dict[str, Any], last_timestamp: Optional[datetime]) -> bool:
+        """
+        Check whether a map bounds entry is newer than the last ingested reading.
+        
+        Args:
+            entry: Station entry of the map bounds response
+            last_timestamp: Last ingested timestamp of the station (None if never)
+            
+        Returns:
+            True if the detailed feed should be fetched
+        """
+        if entry.get("aqi") in (None, "-", ""):
+            return False
+        if last_timestamp is None:
+            return True
+        updated = (entry.get("station") or {}).get("time")
+        if not updated:
+            return True
+        try:
+            return self.timestamp_parser.parse(updated) > last_timestamp
+        except ValueError:
+            return True
+    
+    def fetch_map_bounds(
+        self,
+        lat1: float,
+        lon1: float,
+        lat2: float,
+        lon2: float
+    ) -> List[Dict[str, Any]]:
+        """
+        List the stations of a rectangle with their overall AQI
+        
+        Endpoint: /map/bounds/?latlng={lat1},{lon1},{lat2},{lon2}
+        
+        Args:
+            lat1: Latitude of the first corner
+            lon1: Longitude of the first corner
+            lat2: Latitude of the opposite corner
+            lon2: Longitude of the opposite corner
+            
+        Returns:
+            List of station entries (lat, lon, uid, aqi, station {name, time})
+        """
+        data = self._get_json(
+            f"{self.base_url}/map/bounds/",
+            {"latlng": f"{lat1:.4f},{lon1:.4f},{lat2:.4f},{lon2:.4f}"}
+        )
+        if data.get("status") != "ok":
+            logger.warning(f"AQICN API error for map bounds: {data.get('data')}")
+            return []
+        return data.get("data") or []
+    
+    def _fetch_station_feed(self, uid: str) -> List[ReadingRecord]:
+        """
+        Fetch data of a station by its AQICN idx
+        
+        Endpoint: /feed/@{uid}/
+        
+        Args:
+            uid: AQICN station idx
+            
+        Returns:
+            List of ReadingRecord objects
+        """
+        data = self._get_json(f"{self.base_url}/feed/@{uid}/")
+        if data.get("status") != "ok":
+            logger.warning(f"AQICN API error for station @{uid}: {data.get('data')}")
+            return []
+        
+        with self.profile.stage("normalize"):
+            return self._parse_station_data(data.get("data", {}))
+    
+    def _get_json(self, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        GET an API endpoint
+        
+        Args:
+            url: Endpoint URL
+            params: Query parameters (the token is added)
+            
+        Returns:
+            Decoded JSON response
+        """
+        self.api_calls += 1
+        with self.profile.stage("read"):
+            response = self.client.get(url, params={"token": self.api_key, **(params or {})})
+            return response.json()
+    
+    def _fetch_city_feed(self, city: str) -> List[ReadingRecord]:
         """
         Fetch data for a specific city using city feed endpoint
         
@@ -116,16 +482,10 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
             city: City name (e.g., "bogota")
             
         Returns:
-            List of NormalizedReading objects
+            List of ReadingRecord objects
         """
-        url = f"{self.base_url}/feed/{city}/"
-        params = {"token": self.api_key}
-        
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(f"{self.base_url}/feed/{city}/")
             
             if data.get("status") != "ok":
                 logger.warning(
@@ -133,7 +493,8 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
                 )
                 return []
             
-            return self._parse_station_data(data.get("data", {}))
+            with self.profile.stage("normalize"):
+                return self._parse_station_data(data.get("data", {}))
             
         except Timeout:
             logger.error(f"Timeout fetching data for city: {city}")
@@ -145,7 +506,7 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
             logger.error(f"Unexpected error fetching city {city}: {e}")
             return []
     
-    def _fetch_geo_feed(self, lat: float, lon: float) -> List[NormalizedReading]:
+    def _fetch_geo_feed(self, lat: float, lon: float) -> List[ReadingRecord]:
         """
         Fetch data for nearest station to given coordinates
         
@@ -156,16 +517,10 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
             lon: Longitude
             
         Returns:
-            List of NormalizedReading objects
+            List of ReadingRecord objects
         """
-        url = f"{self.base_url}/feed/geo:{lat};{lon}/"
-        params = {"token": self.api_key}
-        
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(f"{self.base_url}/feed/geo:{lat};{lon}/")
             
             if data.get("status") != "ok":
                 logger.warning(
@@ -173,7 +528,8 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
                 )
                 return []
             
-            return self._parse_station_data(data.get("data", {}))
+            with self.profile.stage("normalize"):
+                return self._parse_station_data(data.get("data", {}))
             
         except Exception as e:
             logger.error(f"Error fetching geo feed ({lat}, {lon}): {e}")
@@ -191,17 +547,8 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
         Returns:
             List of station information dictionaries
         """
-        url = f"{self.base_url}/search/"
-        params = {
-            "token": self.api_key,
-            "keyword": keyword
-        }
-        
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(f"{self.base_url}/search/", {"keyword": keyword})
             
             if data.get("status") == "ok":
                 stations = data.get("data", [])
@@ -215,15 +562,15 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
             logger.error(f"Error searching stations for keyword {keyword}: {e}")
             return []
     
-    def _parse_station_data(self, station_data: Dict[str, Any]) -> List[NormalizedReading]:
+    def _parse_station_data(self, station_data: Dict[str, Any]) -> List[ReadingRecord]:
         """
-        Parse AQICN station data into NormalizedReading objects
+        Parse AQICN station data into ReadingRecord objects
         
         Args:
             station_data: Raw station data from AQICN API
             
         Returns:
-            List of NormalizedReading objects (one per pollutant)
+            List of ReadingRecord objects (one per pollutant)
         """
         readings = []
         
@@ -268,7 +615,7 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
         timestamp_str = time_data.get("iso")
         
         if timestamp_str:
-            timestamp_utc = convert_timestamp_to_utc(timestamp_str)
+            timestamp_utc = self.timestamp_parser.parse(timestamp_str)
         else:
             timestamp_utc = datetime.now(timezone.utc)
             logger.warning(f"No timestamp in data for station {station_name}, using current time")
@@ -280,6 +627,16 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
         elif overall_aqi is not None:
             overall_aqi = int(overall_aqi)
         
+        # Station metadata shared by all readings of this station
+        station = StationInfo(
+            external_station_id=external_station_id,
+            station_name=station_name_cleaned,
+            latitude=latitude,
+            longitude=longitude,
+            city=city,
+            country=country
+        )
+        
         # Individual pollutant measurements (IAQI - Individual Air Quality Index)
         iaqi = station_data.get("iaqi", {})
         
@@ -293,44 +650,49 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
             "co": "CO"
         }
         
+        # AQICN publishes sub-indices ('v'), not concentrations
+        codes: List[str] = []
+        sub_indices: List[float] = []
         for aqicn_code, pollutant_name in pollutant_mapping.items():
             if aqicn_code in iaqi:
-                pollutant_data = iaqi[aqicn_code]
-                
-                # AQICN provides AQI values directly (not concentrations)
-                # The 'v' field is the AQI value
-                aqi_value = pollutant_data.get("v")
-                
-                if aqi_value is None:
+                aqi_value = iaqi[aqicn_code].get("v")
+                if aqi_value is None or aqi_value == "-":
                     continue
-                
-                # For now, we store AQI as the value
-                # TODO: Convert AQI back to concentration if needed
-                value = float(aqi_value)
-                
-                # Determine unit based on pollutant
-                if pollutant_name in ["PM2.5", "PM10"]:
-                    unit = "µg/m³"
-                elif pollutant_name == "CO":
-                    unit = "ppm"
-                else:  # O3, NO2, SO2
-                    unit = "ppb"
-                
-                reading = NormalizedReading(
-                    external_station_id=external_station_id,
-                    station_name=station_name_cleaned,
-                    latitude=latitude,
-                    longitude=longitude,
-                    city=city,
-                    country=country,
-                    pollutant_code=pollutant_name,
-                    unit=unit,
-                    value=value,
-                    aqi=int(aqi_value),
-                    timestamp_utc=timestamp_utc
+                codes.append(pollutant_name)
+                sub_indices.append(float(aqi_value))
+        
+        # Convert every sub-index back to a concentration in one pass
+        # (inverse EPA breakpoints) so values are comparable with the CSV data
+        concentrations = concentrations_for_aqi(codes, sub_indices)
+        
+        for pollutant_name, aqi_value, value in zip(codes, sub_indices, concentrations.tolist()):
+            if value != value:
+                logger.warning(
+                    f"Cannot convert AQI {aqi_value} of {pollutant_name} to a concentration "
+                    f"for station {station_name}, skipping"
                 )
-                
-                readings.append(reading)
+                if self.dead_letters is not None:
+                    self.dead_letters.add([DeadLetter(
+                        source=self.SOURCE,
+                        source_key=external_station_id,
+                        row=None,
+                        reason=OUT_OF_RANGE,
+                        values={'pollutant': pollutant_name, 'aqi': aqi_value, 'time': timestamp_str},
+                        detail="AQI outside the EPA breakpoints"
+                    )])
+                continue
+            
+            reading = ReadingRecord(
+                station=station,
+                pollutant_code=pollutant_name,
+                unit=get_standard_unit(pollutant_name),
+                value=value,
+                aqi=int(round(aqi_value)),
+                timestamp_utc=timestamp_utc,
+                source=self.SOURCE
+            )
+            
+            readings.append(reading)
         
         if not readings:
             logger.warning(f"No valid pollutant readings found for station {station_name}")
@@ -341,7 +703,10 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
         """
         Clean and normalize station name to match database entries.
         
-        Maps AQICN station names to our database station names.
+        Known AQICN names are mapped to our station names with an exact
+        (case-insensitive) lookup. Stations are matched to database entries
+        by their idx and location (see StationResolver), so the name is only
+        a display name and a first matching hint.
         
         Args:
             name: Raw station name from AQICN
@@ -352,26 +717,16 @@ class AqicnApiAdapter(BaseExternalApiAdapter):
         # Remove common suffixes and prefixes
         name = name.strip()
         
-        # Direct mappings for known stations
-        mappings = {
-            "Carvajal - Sevillana": "Carvajal",
-            "Carvajal-Sevillana": "Carvajal",
-            "Centro de Alto Rendimiento": "Centro de Alto Rendimiento",
-            "Las Ferias": "Las Ferias",
-            "Puente Aranda": "Puente Aranda",
-            "Suba": "Suba",
-        }
-        
-        # Check for exact match
-        for aqicn_name, db_name in mappings.items():
-            if aqicn_name.lower() in name.lower() or name.lower() in aqicn_name.lower():
-                logger.debug(f"Matched station: '{name}' -> '{db_name}'")
-                return db_name
+        db_name = STATION_NAME_ALIASES.get(name.lower())
+        if db_name:
+            logger.debug(f"Matched station: '{name}' -> '{db_name}'")
+            return db_name
         
         # If no match, return cleaned name
         return name
     
     def __del__(self):
         """Close session on cleanup"""
-        if hasattr(self, 'session'):
-            self.session.close()
+        if hasattr(self, 'client'):
+            self.client.close()
+
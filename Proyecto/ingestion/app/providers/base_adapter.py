@@ -6,9 +6,11 @@ air quality data sources (CSV files, APIs) into a common interface.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
 
-from app.domain.dto import NormalizedReading
+from app.domain.records import ReadingRecord
+from app.profiling import NULL_SCOPE, ProfileScope
+from app.services.dead_letter import DeadLetterStore
 
 
 class BaseExternalApiAdapter(ABC):
@@ -16,33 +18,104 @@ class BaseExternalApiAdapter(ABC):
     **Adapter Pattern Implementation**
     
     Base adapter that unifies different external air quality data sources
-    into a common NormalizedReading model.
+    into a common ReadingRecord model.
     
     This allows the ingestion service to work with multiple data sources
     (historical CSV files, real-time APIs) without changing the core logic.
     
     Concrete adapters must implement:
     - fetch_readings(): Retrieve and normalize data from the specific source
+    
+    and should override iter_batches() when the source can be read
+    incrementally, so memory stays bounded for large sources.
+    
+    Adapters used from the `sources` section of station_mapping.yaml
+    (see app.providers.registry) also implement from_config(). Adapters
+    whose progress can be checkpointed return a key from checkpoint_key(),
+    accept `start_row` in iter_batches() and expose `rows_read`,
+    `source_path` and fingerprint(). Adapters whose readings are
+    checkpointed per station instead (last ingested timestamp) set
+    STATION_CHECKPOINTS and accept `since` in iter_batches().
+    
+    The ingestion service sets `profile` to time the adapter's stages
+    (read, parse, aqi, normalize) in the run's performance report, and
+    `dead_letters` to record the rows the adapter rejects.
     """
     
+    # Source tag stored with every reading
+    SOURCE = "unknown"
+    
+    # Readings are checkpointed per station (by external_station_id)
+    STATION_CHECKPOINTS = False
+    
+    # Stage timer of the current run (records nothing by default)
+    profile: ProfileScope = NULL_SCOPE
+    
+    # Store of rejected rows of the current run (rejections are only logged if None)
+    dead_letters: Optional[DeadLetterStore] = None
+    
+    @classmethod
+    def from_config(cls, source: Any, mapping: Dict[str, Any]) -> List["BaseExternalApiAdapter"]:
+        """
+        Create the adapters of a configured source.
+        
+        Args:
+            source: SourceConfig of the `sources` entry
+            mapping: Whole station mapping configuration
+            
+        Returns:
+            List of adapters (e.g., one per file)
+        """
+        raise NotImplementedError(f"{cls.__name__} cannot be created from configuration")
+    
+    def checkpoint_key(self) -> Optional[str]:
+        """
+        Key of this adapter's checkpoint (None if it cannot be resumed).
+        
+        Returns:
+            Checkpoint key or None
+        """
+        return None
+    
+
     @abstractmethod
-    def fetch_readings(self) -> List[NormalizedReading]:
+    def fetch_readings(self) -> List[ReadingRecord]:
         """
         Fetch and normalize readings from the external data source.
         
         This method must:
         1. Retrieve raw data from the source (file, API, etc.)
         2. Parse and validate the data
-        3. Normalize it into NormalizedReading objects
+        3. Normalize it into ReadingRecord objects (sharing one
+           StationInfo per station)
         4. Return a list of valid readings
         
         Returns:
-            List of NormalizedReading objects
+            List of ReadingRecord objects
             
         Raises:
             Exception: If data fetching or normalization fails
         """
         pass
     
+    def iter_batches(self, batch_size: int) -> Iterator[List[ReadingRecord]]:
+        """
+        Fetch readings as a stream of batches.
+        
+        The default implementation fetches everything with fetch_readings()
+        and splits it; adapters that can read their source incrementally
+        override it so only one batch is held in memory at a time.
+        
+        Args:
+            batch_size: Maximum number of readings per batch
+            
+        Yields:
+            Lists of ReadingRecord objects
+        """
+        with self.profile.stage("read"):
+            readings = self.fetch_readings()
+        for start in range(0, len(readings), batch_size):
+            yield readings[start:start + batch_size]
+    
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}>"
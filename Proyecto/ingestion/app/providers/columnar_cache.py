@@ -0,0 +1,233 @@
+"""
+Memory-mapped columnar cache for parsed CSV data.
+
+Parsing a historical CSV (dates, numeric conversion, bounds checks, AQI) is
+the expensive part of re-ingesting or re-analyzing the same files. The CSV
+adapter can store the parsed, normalized columns as one NumPy `.npy` file
+per column; later runs map them with `np.load(mmap_mode='r')`, which costs
+no parsing and no copy until the data is used.
+
+Each cache entry is keyed by the source fingerprint plus everything that
+affects parsing (pollutant mapping, source timezone, cache format), so a
+stale cache is never read.
+
+Entries are written chunk by chunk (ColumnarCacheWriter): each parsed chunk
+is appended to its column files as it is read, so writing the cache does not
+hold the whole file in memory.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+import numpy as np
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the layout or meaning of the cached columns changes
+CACHE_FORMAT_VERSION = 1
+
+_META_FILE = "meta.json"
+
+# Bytes reserved for the .npy header of a streamed column (a multiple of 64,
+# like numpy's own headers, so the data stays aligned when mapped)
+_NPY_HEADER_SIZE = 128
+
+
+def cache_key(**parts: Any) -> str:
+    """
+    Build a cache key from everything the cached data depends on.
+
+    Args:
+        **parts: JSON-serializable values (content hash, mapping, ...)
+
+    Returns:
+        Hex digest identifying the cache content
+    """
+    payload = json.dumps({'version': CACHE_FORMAT_VERSION, **parts}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ColumnarCache:
+    """
+    Directory of cached column sets, one subdirectory per source file.
+
+    Layout: <directory>/<name>/meta.json + <column>.npy
+    """
+
+    def __init__(self, directory: Path):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Root directory of the cache (created on first write)
+        """
+        self.directory = directory
+
+    def load(self, name: str, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Map the cached columns of a source if they match the key.
+
+        Args:
+            name: Source name (e.g., the CSV file name)
+            key: Expected cache key (see cache_key)
+
+        Returns:
+            Mapping of column name -> read-only memory-mapped array,
+            or None if there is no valid cache entry
+        """
+        entry = self.directory / name
+        try:
+            with open(entry / _META_FILE, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('key') != key:
+            logger.debug(f"Columnar cache for {name} is stale")
+            return None
+
+        try:
+            return {
+                column: np.load(entry / f"{column}.npy", mmap_mode='r', allow_pickle=False)
+                for column in meta['columns']
+            }
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable columnar cache for {name}: {e}")
+            return None
+
+    def writer(self, name: str, key: str) -> "ColumnarCacheWriter":
+        """
+        Start a new entry for a source, written chunk by chunk.
+
+        Args:
+            name: Source name
+            key: Cache key of the data
+
+        Returns:
+            ColumnarCacheWriter (the entry is replaced on commit())
+        """
+        return ColumnarCacheWriter(self, name, key)
+
+    def write(self, name: str, key: str, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Store the columns of a source, replacing any previous entry.
+
+        Failures are logged and otherwise ignored: the cache is an
+        optimization only.
+
+        Args:
+            name: Source name
+            key: Cache key of the data
+            columns: Mapping of column name -> array (no object dtype)
+        """
+        writer = self.writer(name, key)
+        writer.append(columns)
+        writer.commit()
+
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    """Build a version 1.0 .npy header of _NPY_HEADER_SIZE bytes for a 1-D array."""
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(dtype), length
+    )
+    prefix = np.lib.format.magic(1, 0)
+    # Magic, 2-byte header length, then the dict padded with spaces up to a newline
+    header_len = _NPY_HEADER_SIZE - len(prefix) - 2
+    return prefix + struct.pack('<H', header_len) + header.ljust(header_len - 1).encode('latin1') + b'\n'
+
+
+class ColumnarCacheWriter:
+    """
+    Writes one cache entry incrementally.
+
+    Every append() adds a chunk of rows to the .npy file of each column in
+    a staging directory (the header is filled in once the length is known),
+    and commit() renames the staging directory into place, so readers never
+    see a partial cache. Failures are logged, discard the entry and make the
+    remaining calls no-ops: the cache is an optimization only.
+    """
+
+    def __init__(self, cache: ColumnarCache, name: str, key: str):
+        """
+        Initialize the writer (the staging directory is created on first append).
+
+        Args:
+            cache: Cache the entry belongs to
+            name: Source name
+            key: Cache key of the data
+        """
+        self.cache = cache
+        self.name = name
+        self.key = key
+        self.staging: Optional[Path] = None
+        self.files: Dict[str, BinaryIO] = {}
+        self.dtypes: Dict[str, np.dtype] = {}
+        self.rows = 0
+        self.failed = False
+
+    def append(self, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Append a chunk of rows.
+
+        Args:
+            columns: Mapping of column name -> array, with the same columns
+                and dtypes as the first chunk
+        """
+        if self.failed:
+            return
+        try:
+            if self.staging is None:
+                self.cache.directory.mkdir(parents=True, exist_ok=True)
+                self.staging = Path(tempfile.mkdtemp(prefix=f".{self.name}.", dir=self.cache.directory))
+                for column, values in columns.items():
+                    self.files[column] = open(self.staging / f"{column}.npy", 'wb')
+                    self.files[column].write(bytes(_NPY_HEADER_SIZE))
+                    self.dtypes[column] = values.dtype
+
+            if columns.keys() != self.files.keys():
+                raise ValueError(f"columns changed from {list(self.files)} to {list(columns)}")
+            for column, values in columns.items():
+                if values.dtype != self.dtypes[column]:
+                    raise ValueError(f"dtype of {column} changed to {values.dtype}")
+                np.ascontiguousarray(values).tofile(self.files[column])
+            self.rows += len(next(iter(columns.values()), ()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write columnar cache for {self.name}: {e}")
+            self.abort()
+
+    def commit(self) -> None:
+        """Finish the column files and replace the previous entry (if any rows were appended)."""
+        if self.failed or self.staging is None:
+            return
+        entry = self.cache.directory / self.name
+        try:
+            for column, f in self.files.items():
+                f.seek(0)
+                f.write(_npy_header(self.dtypes[column], self.rows))
+                f.close()
+            with open(self.staging / _META_FILE, 'w', encoding='utf-8') as f:
+                json.dump({'key': self.key, 'columns': list(self.files)}, f)
+
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(self.staging, entry)
+            logger.info(f"Wrote columnar cache: {entry}")
+        except OSError as e:
+            logger.warning(f"Could not write columnar cache for {self.name}: {e}")
+            self.abort()
+
+    def abort(self) -> None:
+        """Discard the entry being written."""
+        self.failed = True
+        for f in self.files.values():
+            f.close()
+        if self.staging is not None:
+            shutil.rmtree(self.staging, ignore_errors=True)
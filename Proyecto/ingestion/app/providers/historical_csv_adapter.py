@@ -2,35 +2,48 @@
 Historical CSV data adapter.
 
 Implements the Adapter pattern to read air quality data from CSV files
-and convert it to the common NormalizedReading format.
+and convert it to the common ReadingRecord format.
 """
 
-import csv
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+import numpy as np
 import pandas as pd
 
-from app.domain.dto import NormalizedReading, StationMetadata
+from app.config import settings
+from app.domain.dto import StationMetadata
+from app.domain.records import ReadingRecord, StationInfo
 from app.domain.normalization import (
     standardize_pollutant_name,
-    get_standard_unit,
-    normalize_timestamp,
-    is_valid_concentration,
-    estimate_aqi
+    valid_concentration_mask,
+    TimestampParser
 )
+from app.domain.aqi import calculate_aqi
+from app.domain.fingerprint import FileFingerprint, fingerprint_file
 from app.logging_config import get_logger
 from app.providers.base_adapter import BaseExternalApiAdapter
+from app.providers.columnar_cache import ColumnarCache, cache_key
+from app.providers.registry import SourceConfig
+from app.services.dead_letter import (
+    DeadLetter,
+    INVALID_TIMESTAMP,
+    NON_NUMERIC_VALUE,
+    OUT_OF_RANGE
+)
 
 logger = get_logger(__name__)
 
+# Readings per chunk when the whole file is loaded with fetch_readings()
+DEFAULT_BATCH_SIZE = 5000
+
 
 class HistoricalCsvAdapter(BaseExternalApiAdapter):
     """
     **Adapter Pattern: CSV File Source**
     
     Adapts historical CSV air quality data files to the common
-    NormalizedReading format used by the ingestion service.
+    ReadingRecord format used by the ingestion service.
     
     CSV format expected:
     - Header: date, pm25, pm10, o3, no2, so2, co
@@ -38,11 +51,16 @@ class HistoricalCsvAdapter(BaseExternalApiAdapter):
     - Values: numeric or empty (missing data)
     """
     
+    # Source tag stored with every reading
+    SOURCE = "historical_csv"
+    
     def __init__(
         self,
         csv_file_path: Path,
         station_metadata: StationMetadata,
-        pollutant_mapping: Dict[str, Dict[str, str]]
+        pollutant_mapping: Dict[str, Dict[str, str]],
+        source_timezone: Optional[str] = None,
+        columnar_cache: Optional[ColumnarCache] = None
     ):
         """
         Initialize the CSV adapter.
@@ -51,135 +69,442 @@ class HistoricalCsvAdapter(BaseExternalApiAdapter):
             csv_file_path: Path to the CSV file
             station_metadata: Station metadata from configuration
             pollutant_mapping: Mapping of CSV columns to pollutant names/units
+            source_timezone: Timezone of the CSV dates (UTC if None)
+            columnar_cache: Cache of parsed columns (disabled if None)
         """
         self.csv_file_path = csv_file_path
         self.station_metadata = station_metadata
         self.pollutant_mapping = pollutant_mapping
+        # One parser per file: the date format is detected once and reused
+        self.timestamp_parser = TimestampParser(source_timezone)
+        self.columnar_cache = columnar_cache
+        # Data rows consumed by iter_batches (including skipped ones)
+        self.rows_read = 0
+        self._fingerprint: Optional[FileFingerprint] = None
         
         logger.info(f"Initialized CSV adapter for: {csv_file_path.name}")
     
-    def fetch_readings(self) -> List[NormalizedReading]:
+    @classmethod
+    def from_config(cls, source: SourceConfig, mapping: Dict[str, Any]) -> List["HistoricalCsvAdapter"]:
         """
-        Read CSV file and convert to NormalizedReading objects.
+        Create one adapter per station with a CSV file in the mapping.
+        
+        Source options (all optional):
+        - data_path: Directory of the CSV files (HISTORICAL_DATA_PATH)
+        - source_timezone: Default timezone of the dates (HISTORICAL_SOURCE_TIMEZONE)
+        - columnar_cache: Enable the columnar cache (HISTORICAL_COLUMNAR_CACHE_ENABLED)
+        
+        Args:
+            source: Configured source
+            mapping: Station mapping configuration ('stations', 'pollutant_mapping')
+            
+        Returns:
+            List of HistoricalCsvAdapter instances
+        """
+        options = source.options
+        data_dir = Path(options['data_path']) if options.get('data_path') else settings.get_historical_data_path()
+        logger.info(f"Historical data directory: {data_dir}")
+        
+        default_timezone = options.get('source_timezone', settings.historical_source_timezone)
+        pollutant_mapping = mapping.get('pollutant_mapping', {})
+        
+        columnar_cache = None
+        if options.get('columnar_cache', settings.historical_columnar_cache_enabled):
+            columnar_cache = ColumnarCache(settings.get_historical_cache_path())
+            logger.info(f"Columnar cache directory: {columnar_cache.directory}")
+        
+        adapters: List[HistoricalCsvAdapter] = []
+        for station_config in mapping.get('stations', []):
+            csv_filename = station_config.get('csv_file')
+            if not csv_filename:
+                logger.warning(f"Station has no CSV file: {station_config.get('station_name')}")
+                continue
+            
+            # Create StationMetadata DTO
+            station_metadata = StationMetadata(
+                station_code=station_config['station_code'],
+                station_name=station_config['station_name'],
+                city=station_config['city'],
+                country=station_config['country'],
+                latitude=station_config['latitude'],
+                longitude=station_config['longitude'],
+                altitude=station_config.get('altitude'),
+                address=station_config.get('address'),
+                csv_file=csv_filename,
+                geojson_file=station_config.get('geojson_file'),
+                timezone=station_config.get('timezone')
+            )
+            
+            adapters.append(cls(
+                csv_file_path=data_dir / csv_filename,
+                station_metadata=station_metadata,
+                pollutant_mapping=pollutant_mapping,
+                source_timezone=station_metadata.timezone or default_timezone,
+                columnar_cache=columnar_cache
+            ))
+        
+        return adapters
+    
+    @property
+    def source_path(self) -> Path:
+        """File read by this adapter."""
+        return self.csv_file_path
+    
+    def checkpoint_key(self) -> Optional[str]:
+        """Checkpoints are kept per CSV file name."""
+        return self.csv_file_path.name
+    
+    def fetch_readings(self) -> List[ReadingRecord]:
+        """
+        Read CSV file and convert to ReadingRecord objects.
+        
+        Loads every reading in memory; prefer iter_batches() for large files.
         
         Returns:
             List of normalized readings
         """
+        readings: List[ReadingRecord] = []
+        for batch in self.iter_batches(DEFAULT_BATCH_SIZE):
+            readings.extend(batch)
+        return readings
+    
+    def iter_batches(self, batch_size: int, start_row: int = 0) -> Iterator[List[ReadingRecord]]:
+        """
+        Read the CSV file in chunks and yield one batch of records per chunk.
+        
+        Only one chunk of rows is held in memory at a time, so memory use
+        does not depend on the file size. `rows_read` is updated before each
+        batch is yielded, so callers can checkpoint their progress.
+        
+        With a columnar cache, a matching cache entry is memory-mapped
+        instead of parsing the CSV, and a full read of the CSV refreshes it.
+        
+        Args:
+            batch_size: Approximate number of readings per batch (each CSV
+                row yields up to one reading per mapped pollutant column)
+            start_row: Data rows to skip (resume point of a previous run)
+            
+        Yields:
+            Lists of ReadingRecord objects
+        """
         logger.info(f"Reading CSV file: {self.csv_file_path}")
         
         if not self.csv_file_path.exists():
             logger.error(f"CSV file not found: {self.csv_file_path}")
-            return []
+            return
+        
+        chunk_rows = max(1, batch_size // max(1, len(self.pollutant_mapping)))
+        self.rows_read = start_row
+        
+        if start_row:
+            logger.info(f"Resuming {self.csv_file_path.name} after row {start_row}")
         
-        readings: List[NormalizedReading] = []
+        key = None
+        if self.columnar_cache is not None:
+            with self.profile.stage("read"):
+                key = self._cache_key()
+                columns = self.columnar_cache.load(self.csv_file_path.name, key)
+            if columns is not None:
+                logger.info(f"Using columnar cache for {self.csv_file_path.name}")
+                yield from self._iter_column_batches(columns, chunk_rows, start_row)
+                return
+        
+        # A full read of the file refreshes the cache, one chunk at a time
+        cache_writer = (
+            self.columnar_cache.writer(self.csv_file_path.name, key)
+            if key is not None and start_row == 0 else None
+        )
+        total_rows = 0
+        total_readings = 0
         
         try:
-            # Read CSV using pandas for easier handling of missing values
-            df = pd.read_csv(self.csv_file_path)
-            
-            # Clean column names (remove leading/trailing spaces)
-            df.columns = df.columns.str.strip()
-            
-            logger.info(f"CSV loaded: {len(df)} rows, columns: {list(df.columns)}")
-            
-            # Process each row
-            for idx, row in df.iterrows():
-                row_readings = self._process_row(row, idx)
-                readings.extend(row_readings)
-            
-            logger.info(
-                f"✓ Processed {len(df)} rows from {self.csv_file_path.name}, "
-                f"generated {len(readings)} valid readings"
-            )
+            # Read CSV using pandas for easier handling of missing values;
+            # skipped rows are dropped by the parser (the header is kept)
+            with pd.read_csv(
+                self.csv_file_path,
+                chunksize=chunk_rows,
+                skiprows=range(1, start_row + 1) if start_row else None
+            ) as chunks:
+                while True:
+                    with self.profile.stage("read"):
+                        df = next(chunks, None)
+                    if df is None:
+                        break
+                    
+                    # Clean column names (remove leading/trailing spaces)
+                    df.columns = df.columns.str.strip()
+                    
+                    if total_rows == 0:
+                        logger.info(f"CSV columns: {list(df.columns)}")
+                    
+                    with self.profile.stage("parse"):
+                        columns = self._parse_columns(df, first_row=self.rows_read)
+                        if cache_writer is not None:
+                            cache_writer.append(columns)
+                    
+                    with self.profile.stage("normalize"):
+                        readings = self._build_records(columns)
+                    total_rows += len(df)
+                    total_readings += len(readings)
+                    self.rows_read += len(df)
+                    
+                    if readings:
+                        yield readings
             
         except Exception as e:
             logger.error(f"Failed to read CSV file {self.csv_file_path}: {e}")
+            if cache_writer is not None:
+                cache_writer.abort()
+            raise
+        except GeneratorExit:
+            # The caller stopped early: the file was not read completely
+            if cache_writer is not None:
+                cache_writer.abort()
             raise
         
-        return readings
+        if cache_writer is not None:
+            cache_writer.commit()
+        
+        logger.info(
+            f"✓ Processed {total_rows} rows from {self.csv_file_path.name}, "
+            f"generated {total_readings} valid readings"
+        )
     
-    def _process_row(self, row: pd.Series, row_idx: int) -> List[NormalizedReading]:
+    def read_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Parsed, normalized columns of the whole file, for analysis.
+        
+        Returned memory-mapped from the columnar cache when it is valid;
+        otherwise the CSV is parsed (and the cache written, if enabled).
+        
+        Returns:
+            Columns as described in _parse_columns
         """
-        Process a single CSV row and create NormalizedReading objects for each pollutant.
+        key = None
+        if self.columnar_cache is not None:
+            key = self._cache_key()
+            columns = self.columnar_cache.load(self.csv_file_path.name, key)
+            if columns is not None:
+                return columns
+        
+        df = pd.read_csv(self.csv_file_path)
+        df.columns = df.columns.str.strip()
+        columns = self._parse_columns(df)
+        
+        if key is not None:
+            self.columnar_cache.write(self.csv_file_path.name, key, columns)
+        return columns
+    
+    def _iter_column_batches(self, columns: Dict[str, np.ndarray], chunk_rows: int,
+                             start_row: int) -> Iterator[List[ReadingRecord]]:
+        """
+        Yield batches of records from cached (memory-mapped) columns.
         
         Args:
-            row: Pandas Series representing one CSV row
-            row_idx: Row index (for logging)
+            columns: Parsed columns (see _parse_columns)
+            chunk_rows: Rows per batch
+            start_row: Data rows to skip
             
+        Yields:
+            Lists of ReadingRecord objects
+        """
+        total_rows = len(columns['timestamp'])
+        total_readings = 0
+        
+        for start in range(start_row, total_rows, chunk_rows):
+            stop = min(start + chunk_rows, total_rows)
+            with self.profile.stage("normalize"):
+                readings = self._build_records({name: values[start:stop] for name, values in columns.items()})
+            total_readings += len(readings)
+            self.rows_read = stop
+            if readings:
+                yield readings
+        
+        logger.info(
+            f"✓ Processed {total_rows - start_row} cached rows from {self.csv_file_path.name}, "
+            f"generated {total_readings} valid readings"
+        )
+    
+    def fingerprint(self) -> FileFingerprint:
+        """
+        Compute the content fingerprint of the CSV file.
+        
+        Used to detect unchanged and appended files between runs. The result
+        is reused while the file keeps the same size and mtime.
+        
         Returns:
-            List of NormalizedReading objects (one per pollutant with valid data)
+            FileFingerprint
+        """
+        if self._fingerprint is None or not self._fingerprint.same_stat(self.csv_file_path):
+            self._fingerprint = fingerprint_file(self.csv_file_path)
+        return self._fingerprint
+    
+    def _cache_key(self) -> str:
         """
-        readings: List[NormalizedReading] = []
+        Columnar cache key: file content plus every parsing input.
         
-        # Extract timestamp
-        try:
-            date_str = str(row['date']).strip()
-            timestamp_utc = normalize_timestamp(date_str)
-        except Exception as e:
-            logger.warning(f"Row {row_idx}: Invalid date '{row.get('date')}': {e}")
-            return []
+        Returns:
+            Cache key
+        """
+        return cache_key(
+            content_hash=self.fingerprint().content_hash,
+            pollutant_mapping=self.pollutant_mapping,
+            source_timezone=self.timestamp_parser.source_timezone
+        )
+    
+    def _parse_columns(self, df: pd.DataFrame, first_row: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Parse and normalize a chunk of CSV rows into plain NumPy columns.
+        
+        Dates, values, bounds checks and AQI are computed per column with
+        vectorized operations. The result has no Python objects, so it can
+        be stored in the columnar cache as is. Rejected rows and values are
+        sent to the dead-letter store (if set).
+        
+        Args:
+            df: Chunk of CSV rows
+            first_row: Data row index of the chunk's first row
+            
+        Returns:
+            Mapping with 'timestamp' (datetime64[ns] UTC, NaT if invalid) and,
+            per mapped CSV column present in the file, '<column>.value'
+            (NaN if missing or invalid) and '<column>.aqi' (NaN if undefined)
+        """
+        if 'date' not in df.columns:
+            logger.error(f"CSV file has no 'date' column: {self.csv_file_path.name}")
+            return {'timestamp': np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')}
+        
+        timestamps = self.timestamp_parser.parse_series(df['date'])
+        timestamp_values = timestamps.dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+        valid_dates = ~np.isnat(timestamp_values)
+        invalid_dates = int((~valid_dates).sum())
+        if invalid_dates:
+            logger.warning(f"{invalid_dates} rows with invalid dates skipped")
+            self._reject(df, first_row, np.flatnonzero(~valid_dates), INVALID_TIMESTAMP, None,
+                         "Date could not be parsed")
+        
+        columns: Dict[str, np.ndarray] = {'timestamp': timestamp_values}
         
-        # Process each pollutant column
         for csv_column, pollutant_info in self.pollutant_mapping.items():
             # Check if column exists in CSV
-            if csv_column not in row:
+            if csv_column not in df.columns:
                 continue
             
-            # Get raw value
-            raw_value = row[csv_column]
+            pollutant_code = standardize_pollutant_name(pollutant_info['name'])
             
-            # Skip if missing (NaN, empty string, or whitespace)
-            if pd.isna(raw_value) or str(raw_value).strip() == '':
-                continue
+            # Missing and non-numeric values become NaN
+            values = pd.to_numeric(df[csv_column], errors='coerce').to_numpy(dtype=float)
+            present = valid_dates & ~np.isnan(values)
+            in_bounds = valid_concentration_mask(values, pollutant_code)
             
-            # Try to convert to float
-            try:
-                value = float(raw_value)
-            except (ValueError, TypeError):
-                logger.debug(
-                    f"Row {row_idx}: Invalid value for {csv_column}: '{raw_value}'"
+            out_of_bounds = int((present & ~in_bounds).sum())
+            if out_of_bounds:
+                logger.warning(
+                    f"{out_of_bounds} invalid concentrations for {pollutant_code} skipped"
                 )
+                self._reject(df, first_row, np.flatnonzero(present & ~in_bounds), OUT_OF_RANGE,
+                             csv_column, f"Concentration out of range for {pollutant_code}")
+            
+            if self.dead_letters is not None:
+                # NaN values whose raw text is not blank were not numbers
+                candidates = np.flatnonzero(valid_dates & np.isnan(values) & df[csv_column].notna().to_numpy())
+                if len(candidates):
+                    raw = df[csv_column].iloc[candidates].astype(str).str.strip()
+                    non_numeric = candidates[(raw != '').to_numpy()]
+                    self._reject(df, first_row, non_numeric, NON_NUMERIC_VALUE, csv_column,
+                                 f"Value of {pollutant_code} is not a number")
+            
+            values = np.where(present & in_bounds, values, np.nan)
+            columns[f"{csv_column}.value"] = values
+            # CSV values are daily averages: the pollutant's default
+            # averaging period is used (24-hour where the EPA defines one)
+            with self.profile.stage("aqi"):
+                columns[f"{csv_column}.aqi"] = calculate_aqi(pollutant_code, values)
+        
+        return columns
+    
+    def _reject(self, df: pd.DataFrame, first_row: int, positions: np.ndarray, reason: str,
+                column: Optional[str], detail: str) -> None:
+        """
+        Send rejected rows of a chunk to the dead-letter store.
+        
+        Args:
+            df: Chunk of CSV rows
+            first_row: Data row index (0-based) of the chunk's first row
+            positions: Positions of the rejected rows in the chunk
+            reason: Reason code (see app.services.dead_letter)
+            column: Rejected value column (None if the whole row is rejected)
+            detail: Explanation
+        """
+        if self.dead_letters is None or len(positions) == 0:
+            return
+        
+        fields = ['date', column] if column else list(df.columns)
+        raw_rows = df[fields].iloc[positions].to_dict('records')
+        self.dead_letters.add(
+            DeadLetter(
+                source=self.SOURCE,
+                source_key=self.csv_file_path.name,
+                row=first_row + int(position),
+                reason=reason,
+                values=raw_values,
+                detail=detail
+            )
+            for position, raw_values in zip(positions, raw_rows)
+        )
+    
+    def _build_records(self, columns: Dict[str, np.ndarray]) -> List[ReadingRecord]:
+        """
+        Convert parsed columns into reading records.
+        
+        Python objects are only created for the readings that are kept.
+        All records share one StationInfo.
+        
+        Args:
+            columns: Parsed columns (see _parse_columns)
+            
+        Returns:
+            List of ReadingRecord objects (one per valid pollutant value)
+        """
+        timestamp_values = columns['timestamp']
+        valid_dates = ~np.isnat(timestamp_values)
+        if not valid_dates.any():
+            return []
+        
+        datetimes = np.empty(len(timestamp_values), dtype=object)
+        datetimes[valid_dates] = (
+            pd.DatetimeIndex(timestamp_values[valid_dates]).tz_localize('UTC').to_pydatetime()
+        )
+        
+        station = StationInfo.from_metadata(self.station_metadata)
+        readings: List[ReadingRecord] = []
+        
+        for csv_column, pollutant_info in self.pollutant_mapping.items():
+            values = columns.get(f"{csv_column}.value")
+            if values is None:
                 continue
             
-            # Get pollutant metadata
-            pollutant_name = pollutant_info['name']
-            pollutant_code = standardize_pollutant_name(pollutant_name)
+            pollutant_code = standardize_pollutant_name(pollutant_info['name'])
             unit = pollutant_info['unit']
             
-            # Validate concentration
-            if not is_valid_concentration(value, pollutant_code):
-                logger.warning(
-                    f"Row {row_idx}: Invalid concentration for {pollutant_code}: {value} {unit}"
-                )
+            keep = np.flatnonzero(~np.isnan(values))
+            if len(keep) == 0:
                 continue
             
-            # Estimate AQI if possible
-            aqi = estimate_aqi(pollutant_code, value)
-            
-            # Create normalized reading
-            try:
-                reading = NormalizedReading(
-                    external_station_id=self.station_metadata.station_code,
-                    station_name=self.station_metadata.station_name,
-                    latitude=self.station_metadata.latitude,
-                    longitude=self.station_metadata.longitude,
-                    city=self.station_metadata.city,
-                    country=self.station_metadata.country,
+            readings.extend(
+                ReadingRecord(
+                    station=station,
                     pollutant_code=pollutant_code,
                     unit=unit,
                     value=value,
-                    aqi=aqi,
-                    timestamp_utc=timestamp_utc
+                    timestamp_utc=timestamp_utc,
+                    aqi=None if aqi_value != aqi_value else int(aqi_value),
+                    source=self.SOURCE
                 )
-                
-                readings.append(reading)
-                
-            except Exception as e:
-                logger.warning(
-                    f"Row {row_idx}: Failed to create NormalizedReading for "
-                    f"{pollutant_code}: {e}"
+                for value, timestamp_utc, aqi_value in zip(
+                    values[keep].tolist(), datetimes[keep], columns[f"{csv_column}.aqi"][keep].tolist()
                 )
-                continue
+            )
         
         return readings
     
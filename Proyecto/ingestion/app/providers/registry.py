@@ -0,0 +1,160 @@
+"""
+Adapter registry.
+
+Maps source type names (as used in the `sources` section of
+station_mapping.yaml) to adapter classes. Classes are registered as
+"module:ClassName" strings and only imported the first time they are used,
+so unused adapters (and their dependencies) add no startup cost.
+
+Third-party adapters can be registered with register_adapter() or through
+an installed package's entry points:
+
+    [project.entry-points."airquality.ingestion.adapters"]
+    openaq = "my_package.openaq_adapter:OpenAqAdapter"
+"""
+
+import importlib
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional, Type
+
+from app.logging_config import get_logger
+from app.providers.base_adapter import BaseExternalApiAdapter
+
+logger = get_logger(__name__)
+
+# Entry point group scanned for third-party adapters
+ENTRY_POINT_GROUP = "airquality.ingestion.adapters"
+
+# Built-in adapters (imported lazily)
+BUILTIN_ADAPTERS = {
+    "historical_csv": "app.providers.historical_csv_adapter:HistoricalCsvAdapter",
+    "aqicn": "app.providers.aqicn_adapter:AqicnApiAdapter",
+}
+
+
+@dataclass
+class SourceConfig:
+    """
+    One entry of the `sources` section of station_mapping.yaml.
+
+    Attributes:
+        name: Unique source name (defaults to the type)
+        type: Registered adapter type
+        enabled: Whether the source is ingested
+        max_concurrency: Adapters of this source read at the same time
+        options: Adapter-specific options (the remaining keys)
+    """
+    name: str
+    type: str
+    enabled: bool = True
+    max_concurrency: int = 1
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], default_concurrency: int = 1) -> "SourceConfig":
+        """
+        Build from a YAML entry.
+
+        Args:
+            data: Source entry (requires 'type')
+            default_concurrency: max_concurrency if the entry has none
+
+        Returns:
+            SourceConfig
+        """
+        options = dict(data)
+        source_type = options.pop('type')
+        return cls(
+            name=options.pop('name', source_type),
+            type=source_type,
+            enabled=bool(options.pop('enabled', True)),
+            max_concurrency=max(1, int(options.pop('max_concurrency', default_concurrency))),
+            options=options
+        )
+
+
+class AdapterRegistry:
+    """
+    Registry of adapter classes with lazy import.
+    """
+
+    def __init__(self, builtins: Optional[Dict[str, str]] = None):
+        """
+        Initialize registry.
+
+        Args:
+            builtins: Mapping of type name -> "module:ClassName"
+        """
+        self._specs: Dict[str, str] = dict(builtins or {})
+        self._classes: Dict[str, Type[BaseExternalApiAdapter]] = {}
+        self._entry_points_loaded = False
+
+    def register(self, name: str, target: Any) -> None:
+        """
+        Register an adapter type.
+
+        Args:
+            name: Source type name
+            target: Adapter class, or "module:ClassName" to import lazily
+        """
+        if isinstance(target, str):
+            self._specs[name] = target
+            self._classes.pop(name, None)
+        else:
+            self._classes[name] = target
+
+    def names(self) -> List[str]:
+        """Registered source type names."""
+        self._load_entry_points()
+        return sorted(set(self._specs) | set(self._classes))
+
+    def get(self, name: str) -> Type[BaseExternalApiAdapter]:
+        """
+        Get (importing it if needed) the adapter class of a source type.
+
+        Args:
+            name: Source type name
+
+        Returns:
+            Adapter class
+
+        Raises:
+            KeyError: If the type is not registered
+        """
+        if name in self._classes:
+            return self._classes[name]
+
+        if name not in self._specs:
+            self._load_entry_points()
+        if name not in self._specs:
+            raise KeyError(f"Unknown adapter type '{name}' (registered: {', '.join(self.names())})")
+
+        module_name, _, class_name = self._specs[name].partition(':')
+        adapter_class = getattr(importlib.import_module(module_name), class_name)
+        self._classes[name] = adapter_class
+        logger.debug(f"Loaded adapter '{name}': {module_name}.{class_name}")
+        return adapter_class
+
+    def _load_entry_points(self) -> None:
+        """Add adapters advertised by installed packages (without importing them)."""
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self._specs.setdefault(entry_point.name, entry_point.value)
+
+
+# Global registry
+adapter_registry = AdapterRegistry(BUILTIN_ADAPTERS)
+
+
+def register_adapter(name: str, target: Any) -> None:
+    """
+    Register an adapter type in the global registry.
+
+    Args:
+        name: Source type name
+        target: Adapter class, or "module:ClassName" to import lazily
+    """
+    adapter_registry.register(name, target)
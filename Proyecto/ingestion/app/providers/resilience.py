@@ -0,0 +1,364 @@
+"""
+Resilient HTTP client for external providers.
+
+Every request of a provider goes through its ProviderClient, which adds:
+- A circuit breaker: after `failure_threshold` consecutive failures the
+  circuit opens and requests fail immediately (no timeout wait) for
+  `reset_timeout` seconds; then one probe request is let through
+  (half-open) and its outcome closes or re-opens the circuit.
+- An adaptive timeout: a multiple of the observed latency percentile,
+  clamped between a minimum and the configured maximum, so a degraded
+  provider costs seconds per call instead of the full fixed timeout.
+- Hedged requests: a call still running after the observed percentile
+  latency is duplicated and the first successful response wins, trimming
+  the latency tail without doubling the load.
+
+Clients register themselves by provider name; provider_states() returns
+their state for the ingestion run report.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Deque, Dict, Optional
+
+import numpy as np
+import requests
+from requests.exceptions import HTTPError, RequestException
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Latencies kept per provider, and needed before they drive timeouts and hedging
+LATENCY_WINDOW = 100
+MIN_LATENCY_SAMPLES = 10
+
+# Clients by provider name (latest client of each provider)
+_clients: Dict[str, "ProviderClient"] = {}
+_clients_lock = threading.Lock()
+
+
+class CircuitOpenError(RequestException):
+    """Request rejected without being sent because the provider's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker of one provider.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize breaker.
+
+        Args:
+            name: Provider name
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Check that a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or half-open with a
+                probe already in flight)
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+                logger.info(f"Circuit of {self.name} half-open, probing")
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit of {self.name} is open")
+
+    def record_success(self) -> None:
+        """Reset the failure count (closing a half-open circuit)."""
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit of {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or on a failed probe."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+                self.times_opened += 1
+                logger.warning(
+                    f"Circuit of {self.name} opened after {self.failures} consecutive failures "
+                    f"(retry in {self.reset_timeout:.0f}s)"
+                )
+
+
+class LatencyTracker:
+    """
+    Sliding window of request latencies of one provider.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        """
+        Initialize tracker.
+
+        Args:
+            window: Latencies kept
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        """
+        Record the latency of a successful request.
+
+        Args:
+            seconds: Latency
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Latency percentile of the window.
+
+        Args:
+            q: Percentile (0-100)
+
+        Returns:
+            Seconds, or None until MIN_LATENCY_SAMPLES requests succeeded
+        """
+        with self._lock:
+            if len(self._samples) < MIN_LATENCY_SAMPLES:
+                return None
+            samples = np.fromiter(self._samples, dtype=float)
+        return float(np.percentile(samples, q))
+
+
+class ProviderClient:
+    """
+    HTTP GET client of one provider with circuit breaker, adaptive timeout
+    and hedged requests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        session: Optional[requests.Session] = None,
+        max_timeout: float = 10.0,
+        min_timeout: float = 2.0,
+        timeout_multiplier: float = 3.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedge: bool = True,
+        hedge_percentile: float = 95.0
+    ):
+        """
+        Initialize client.
+
+        Args:
+            name: Provider name (e.g., 'aqicn')
+            session: HTTP session (e.g., one replaying recorded responses)
+            max_timeout: Timeout until enough latencies are known, and upper bound
+            min_timeout: Lower bound of the adaptive timeout
+            timeout_multiplier: Timeout as a multiple of the p95 latency
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            hedge: Duplicate requests slower than the hedge percentile
+            hedge_percentile: Latency percentile after which a request is hedged
+        """
+        self.name = name
+        self.session = session or requests.Session()
+        self.max_timeout = max_timeout
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.timeout_multiplier = timeout_multiplier
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        self.latencies = LatencyTracker()
+        self.calls = 0
+        self.errors = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        with _clients_lock:
+            _clients[name] = self
+
+    def timeout(self) -> float:
+        """
+        Current request timeout.
+
+        Returns:
+            Seconds
+        """
+        p95 = self.latencies.percentile(95)
+        if p95 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.timeout_multiplier))
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """
+        Send a GET request.
+
+        Args:
+            url: URL
+            params: Query parameters
+
+        Returns:
+            Successful response
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            RequestException: If the request failed (timeout, connection
+                error, HTTP error status)
+        """
+        self.breaker.before_call()
+        with self._lock:
+            self.calls += 1
+
+        started = time.perf_counter()
+        try:
+            response = self._send(url, params, self.timeout())
+            response.raise_for_status()
+        except HTTPError as e:
+            # Client errors (bad request, unknown station) are not outages
+            status = e.response.status_code if e.response is not None else None
+            self._record_failure(status is None or status >= 500)
+            raise
+        except Exception:
+            self._record_failure(True)
+            raise
+
+        self.latencies.add(time.perf_counter() - started)
+        self.breaker.record_success()
+        return response
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]], timeout: float) -> requests.Response:
+        """
+        Send the request, hedging it if it outlives the hedge delay.
+
+        Args:
+            url: URL
+            params: Query parameters
+            timeout: Per-request timeout
+
+        Returns:
+            First successful response
+        """
+        delay = self.latencies.percentile(self.hedge_percentile) if self.hedge else None
+        if delay is None or delay >= timeout:
+            return self.session.get(url, params=params, timeout=timeout)
+
+        executor = self._get_executor()
+        first = executor.submit(self.session.get, url, params=params, timeout=timeout)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeout:
+            pass
+
+        with self._lock:
+            self.hedged += 1
+        second = executor.submit(self.session.get, url, params=params, timeout=timeout)
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is second:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        raise error
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool of hedged requests (created on first use)."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix=f"{self.name}-hedge")
+            return self._executor
+
+    def _record_failure(self, outage: bool) -> None:
+        """
+        Count a failed request.
+
+        Args:
+            outage: Whether the failure counts towards opening the circuit
+        """
+        with self._lock:
+            self.errors += 1
+        if outage:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Client state for the run report.
+
+        Returns:
+            Circuit state, request counts, current timeout and latency percentiles
+        """
+        p50 = self.latencies.percentile(50)
+        p95 = self.latencies.percentile(95)
+        return {
+            'circuit': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'times_opened': self.breaker.times_opened,
+            'calls': self.calls,
+            'errors': self.errors,
+            'rejected': self.breaker.rejected,
+            'hedged': self.hedged,
+            'hedge_wins': self.hedge_wins,
+            'timeout_seconds': round(self.timeout(), 3),
+            'latency_p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'latency_p95_ms': round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+    def close(self) -> None:
+        """Close the session and the hedging threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+def provider_states() -> Dict[str, Dict[str, Any]]:
+    """
+    State of every provider client.
+
+    Returns:
+        Mapping of provider name -> ProviderClient.state()
+    """
+    with _clients_lock:
+        clients = list(_clients.values())
+    return {client.name: client.state() for client in clients}
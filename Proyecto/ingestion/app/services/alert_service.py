@@ -0,0 +1,245 @@
+"""
+Alert evaluation service.
+
+Evaluates user-configured pollutant threshold alerts against readings
+inserted by each ingestion batch:
+1. Load all alerts once into an in-memory index (sorted thresholds per pollutant)
+2. For each batch, take the highest new value per pollutant
+3. Binary-search the thresholds to find every alert at or below that value
+4. Drop alerts triggered within the debounce window
+5. Mark the remaining alerts as triggered with bulk UPDATE statements
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.db.models import Alert, AirQualityReading
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Rows fetched per round trip when loading alerts
+ALERT_LOAD_BATCH_SIZE = 50_000
+
+# Alert IDs per bulk UPDATE statement
+ALERT_UPDATE_CHUNK_SIZE = 50_000
+
+
+@dataclass
+class TriggeredAlerts:
+    """
+    Alerts triggered for one pollutant by one ingestion batch.
+
+    Attributes:
+        pollutant_id: Pollutant that crossed the thresholds
+        alert_ids: IDs of the alerts triggered
+        station_id: Station of the reading with the highest value
+        value: Highest value of the pollutant in the batch
+        reading_datetime: Timestamp of that reading
+        triggered_at: Time the alerts were marked as triggered
+    """
+    pollutant_id: int
+    alert_ids: List[int]
+    station_id: int
+    value: float
+    reading_datetime: datetime
+    triggered_at: datetime
+
+
+class AlertIndex:
+    """
+    In-memory index of alerts, grouped by pollutant.
+
+    For each pollutant, thresholds are kept sorted in a NumPy array with the
+    alert IDs and last trigger times in parallel arrays, so the alerts crossed
+    by a value are always a prefix found with a single binary search.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.thresholds: Dict[int, np.ndarray] = {}
+        self.alert_ids: Dict[int, np.ndarray] = {}
+        # Last trigger time as POSIX seconds (-inf if never triggered)
+        self.last_triggered: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.alert_ids.values())
+
+    @classmethod
+    def load(cls, db: Session) -> "AlertIndex":
+        """
+        Build the index from the alert table with a single streamed query.
+
+        Args:
+            db: SQLAlchemy database session
+
+        Returns:
+            Populated AlertIndex
+        """
+        index = cls()
+
+        columns: Dict[int, Dict[str, list]] = {}
+        result = db.execute(
+            select(Alert.id, Alert.pollutant_id, Alert.threshold, Alert.triggered_at)
+            .order_by(Alert.pollutant_id, Alert.threshold)
+            .execution_options(yield_per=ALERT_LOAD_BATCH_SIZE)
+        )
+
+        for alert_id, pollutant_id, threshold, triggered_at in result:
+            group = columns.setdefault(pollutant_id, {'ids': [], 'thresholds': [], 'triggered': []})
+            group['ids'].append(alert_id)
+            group['thresholds'].append(threshold)
+            group['triggered'].append(triggered_at.timestamp() if triggered_at else -np.inf)
+
+        for pollutant_id, group in columns.items():
+            index.alert_ids[pollutant_id] = np.asarray(group['ids'], dtype=np.int64)
+            index.thresholds[pollutant_id] = np.asarray(group['thresholds'], dtype=np.float64)
+            index.last_triggered[pollutant_id] = np.asarray(group['triggered'], dtype=np.float64)
+
+        return index
+
+    def match(self, pollutant_id: int, value: float, now: datetime,
+              debounce: timedelta) -> np.ndarray:
+        """
+        Find alerts crossed by a value and mark them as triggered in memory.
+
+        Args:
+            pollutant_id: Pollutant ID of the reading
+            value: Reading value
+            now: Trigger time
+            debounce: Minimum time between two triggers of the same alert
+
+        Returns:
+            Array of triggered alert IDs (may be empty)
+        """
+        thresholds = self.thresholds.get(pollutant_id)
+        if thresholds is None:
+            return np.empty(0, dtype=np.int64)
+
+        # All alerts with threshold <= value form a prefix of the sorted array
+        crossed = int(np.searchsorted(thresholds, value, side='right'))
+        if crossed == 0:
+            return np.empty(0, dtype=np.int64)
+
+        last_triggered = self.last_triggered[pollutant_id][:crossed]
+        ready = last_triggered <= (now - debounce).timestamp()
+
+        last_triggered[ready] = now.timestamp()
+        return self.alert_ids[pollutant_id][:crossed][ready]
+
+
+class AlertEvaluationService:
+    """
+    Evaluates alerts against newly inserted readings.
+
+    The alert index is loaded lazily on the first evaluation and kept for the
+    lifetime of the service (one ingestion run). Trigger updates are written
+    in the caller's transaction, so they are committed or rolled back together
+    with the readings that caused them.
+    """
+
+    def __init__(self, db_session: Session, debounce_minutes: int = 60):
+        """
+        Initialize alert evaluation service.
+
+        Args:
+            db_session: SQLAlchemy database session
+            debounce_minutes: Minimum minutes between two triggers of the same alert
+        """
+        self.db = db_session
+        self.debounce = timedelta(minutes=debounce_minutes)
+        self.index: Optional[AlertIndex] = None
+        self.total_triggered = 0
+
+    def load_index(self) -> AlertIndex:
+        """
+        Load (or return the already loaded) alert index.
+
+        Returns:
+            AlertIndex
+        """
+        if self.index is None:
+            self.index = AlertIndex.load(self.db)
+            logger.info(
+                f"Loaded {len(self.index)} alerts for {len(self.index.alert_ids)} pollutants"
+            )
+        return self.index
+
+    def invalidate(self) -> None:
+        """
+        Drop the index (after a rollback); it is reloaded on next use.
+
+        match() records triggers in memory before the batch commits, so the
+        index of a rolled back batch would debounce alerts whose triggered_at
+        was never written.
+        """
+        self.index = None
+
+    def evaluate(self, readings: Iterable[AirQualityReading],
+                 now: Optional[datetime] = None) -> List[TriggeredAlerts]:
+        """
+        Evaluate alerts for a batch of newly inserted readings.
+
+        Args:
+            readings: Readings inserted by the batch
+            now: Trigger time (defaults to current UTC time)
+
+        Returns:
+            List of TriggeredAlerts, one per pollutant with triggered alerts
+        """
+        index = self.load_index()
+        if not index.alert_ids:
+            return []
+
+        now = now or datetime.now(timezone.utc)
+
+        # Only the highest value per pollutant matters: it crosses a superset
+        # of the thresholds crossed by any other reading of the batch
+        peaks: Dict[int, AirQualityReading] = {}
+        for reading in readings:
+            peak = peaks.get(reading.pollutant_id)
+            if peak is None or reading.value > peak.value:
+                peaks[reading.pollutant_id] = reading
+
+        triggered: List[TriggeredAlerts] = []
+        for pollutant_id, peak in peaks.items():
+            alert_ids = index.match(pollutant_id, peak.value, now, self.debounce)
+            if len(alert_ids) == 0:
+                continue
+
+            triggered.append(TriggeredAlerts(
+                pollutant_id=pollutant_id,
+                alert_ids=alert_ids.tolist(),
+                station_id=peak.station_id,
+                value=peak.value,
+                reading_datetime=peak.datetime,
+                triggered_at=now
+            ))
+
+        if triggered:
+            self._mark_triggered([alert_id for t in triggered for alert_id in t.alert_ids], now)
+            count = sum(len(t.alert_ids) for t in triggered)
+            self.total_triggered += count
+            logger.info(f"Triggered {count} alerts for {len(triggered)} pollutants")
+
+        return triggered
+
+    def _mark_triggered(self, alert_ids: List[int], now: datetime) -> None:
+        """
+        Set triggered_at for many alerts with chunked bulk UPDATE statements.
+
+        Args:
+            alert_ids: Alert IDs to update
+            now: Trigger time
+        """
+        for start in range(0, len(alert_ids), ALERT_UPDATE_CHUNK_SIZE):
+            chunk = alert_ids[start:start + ALERT_UPDATE_CHUNK_SIZE]
+            self.db.execute(
+                text("UPDATE alert SET triggered_at = :now WHERE id = ANY(:ids)"),
+                {'now': now, 'ids': chunk}
+            )
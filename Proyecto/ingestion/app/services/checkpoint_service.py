@@ -0,0 +1,184 @@
+"""
+Ingestion checkpoint service.
+
+Records how far each source has been ingested so a rerun continues where
+the previous one stopped instead of re-reading and re-checking every row:
+- CSV files: content fingerprint (size, mtime, block hashes), data rows
+  committed and a completed flag
+- AQICN stations: timestamp of the latest reading committed
+
+Checkpoints are written in the same transaction as the batch they describe,
+so they never point past data that was rolled back.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import IngestionCheckpoint
+from app.domain.fingerprint import FileFingerprint
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class Checkpoint:
+    """
+    Snapshot of one source's progress.
+
+    Attributes:
+        source: Source type (e.g., 'historical_csv', 'aqicn')
+        source_key: Source instance (CSV file name, AQICN station idx)
+        content_hash: Hash of the content the progress refers to
+        last_row: Data rows already committed
+        last_timestamp: Latest reading timestamp committed
+        completed: Whether the source was fully ingested
+        file_size: Size of the file the progress refers to
+        file_mtime: Modification time of that file
+        block_hashes: Block hashes of that file (see app.domain.fingerprint)
+    """
+    source: str
+    source_key: str
+    content_hash: Optional[str] = None
+    last_row: Optional[int] = None
+    last_timestamp: Optional[datetime] = None
+    completed: bool = False
+    file_size: Optional[int] = None
+    file_mtime: Optional[float] = None
+    block_hashes: Optional[List[str]] = None
+
+    @property
+    def fingerprint(self) -> Optional[FileFingerprint]:
+        """File fingerprint the progress refers to (None if not a file)."""
+        if self.file_size is None or self.block_hashes is None:
+            return None
+        return FileFingerprint(self.file_size, self.file_mtime, list(self.block_hashes))
+
+    def set_fingerprint(self, fingerprint: FileFingerprint) -> None:
+        """
+        Record the fingerprint of the file being ingested.
+
+        Args:
+            fingerprint: Current file fingerprint
+        """
+        self.file_size = fingerprint.size
+        self.file_mtime = fingerprint.mtime
+        self.block_hashes = fingerprint.block_hashes
+        self.content_hash = fingerprint.content_hash
+
+
+class CheckpointStore:
+    """
+    Reads and writes ingestion checkpoints.
+
+    Checkpoints are cached per source after the first lookup; saves update
+    the cache and upsert the row in the caller's transaction.
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+        self._cache: Dict[str, Dict[str, Checkpoint]] = {}
+
+    def load(self, source: str) -> Dict[str, Checkpoint]:
+        """
+        Load (or return the cached) checkpoints of a source.
+
+        Args:
+            source: Source type
+
+        Returns:
+            Mapping of source_key -> Checkpoint
+        """
+        if source not in self._cache:
+            rows = self.db.execute(
+                select(
+                    IngestionCheckpoint.source_key,
+                    IngestionCheckpoint.content_hash,
+                    IngestionCheckpoint.last_row,
+                    IngestionCheckpoint.last_timestamp,
+                    IngestionCheckpoint.completed,
+                    IngestionCheckpoint.file_size,
+                    IngestionCheckpoint.file_mtime,
+                    IngestionCheckpoint.block_hashes
+                ).where(IngestionCheckpoint.source == source)
+            ).all()
+            self._cache[source] = {
+                row.source_key: Checkpoint(source, row.source_key, row.content_hash,
+                                           row.last_row, row.last_timestamp, row.completed,
+                                           row.file_size, row.file_mtime, row.block_hashes)
+                for row in rows
+            }
+        return self._cache[source]
+
+    def get(self, source: str, source_key: str) -> Optional[Checkpoint]:
+        """
+        Get the checkpoint of one source instance.
+
+        Args:
+            source: Source type
+            source_key: Source instance
+
+        Returns:
+            Checkpoint or None if the source was never ingested
+        """
+        return self.load(source).get(source_key)
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        """
+        Upsert a checkpoint in the caller's transaction.
+
+        Args:
+            checkpoint: New progress of the source
+        """
+        values = {
+            'content_hash': checkpoint.content_hash,
+            'last_row': checkpoint.last_row,
+            'last_timestamp': checkpoint.last_timestamp,
+            'completed': checkpoint.completed,
+            'file_size': checkpoint.file_size,
+            'file_mtime': checkpoint.file_mtime,
+            'block_hashes': checkpoint.block_hashes,
+            'updated_at': datetime.now(timezone.utc)
+        }
+        self.db.execute(
+            insert(IngestionCheckpoint)
+            .values(source=checkpoint.source, source_key=checkpoint.source_key, **values)
+            .on_conflict_do_update(index_elements=['source', 'source_key'], set_=values)
+        )
+        self.load(checkpoint.source)[checkpoint.source_key] = checkpoint
+
+    def clear(self, source: Optional[str] = None) -> int:
+        """
+        Delete checkpoints so the next run starts from scratch.
+
+        Args:
+            source: Source type to clear (all sources if None)
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        statement = delete(IngestionCheckpoint)
+        if source is not None:
+            statement = statement.where(IngestionCheckpoint.source == source)
+            self._cache.pop(source, None)
+        else:
+            self._cache.clear()
+
+        deleted = self.db.execute(statement).rowcount
+        logger.info(f"Cleared {deleted} ingestion checkpoints" + (f" for '{source}'" if source else ""))
+        return deleted
+
+    def invalidate(self) -> None:
+        """Drop cached checkpoints (after a rollback)."""
+        self._cache.clear()
@@ -0,0 +1,156 @@
+"""
+Dead-letter store for rejected rows and readings.
+
+Rows and readings dropped during ingestion (unparseable dates, non-numeric
+or out-of-range values, invalid records, unknown pollutants, persistence
+errors, rolled back batches) are written as compact JSON lines with their source, row index, raw
+values and a reason code, and counted per reason. Data quality can then be
+audited from the file instead of re-parsing the sources with DEBUG logs.
+
+Records are buffered and appended in bulk; nothing is written (and no file
+is created) for a run without rejections, so the happy path costs nothing.
+"""
+
+import json
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Reason codes
+INVALID_TIMESTAMP = "invalid_timestamp"
+NON_NUMERIC_VALUE = "non_numeric_value"
+OUT_OF_RANGE = "out_of_range"
+INVALID_RECORD = "invalid_record"
+UNKNOWN_POLLUTANT = "unknown_pollutant"
+PERSIST_ERROR = "persist_error"
+BATCH_ROLLED_BACK = "batch_rolled_back"
+
+# Buffered records written per append
+DEFAULT_FLUSH_SIZE = 1000
+
+
+@dataclass(slots=True)
+class DeadLetter:
+    """
+    One rejected row or reading.
+
+    Attributes:
+        source: Source type (e.g., 'historical_csv')
+        source_key: Source instance (CSV file name, station id)
+        row: Data row index in the source (None if not row based)
+        reason: Reason code
+        values: Raw values of the row (or fields of the reading)
+        detail: Human-readable explanation
+    """
+    source: str
+    source_key: Optional[str]
+    row: Optional[int]
+    reason: str
+    values: Dict[str, Any]
+    detail: Optional[str] = None
+
+
+class DeadLetterStore:
+    """
+    Thread-safe, buffered JSON lines writer of dead letters for one run.
+    """
+
+    def __init__(self, path: Path, flush_size: int = DEFAULT_FLUSH_SIZE):
+        """
+        Initialize store.
+
+        Args:
+            path: JSON lines file (created with its directory on first write)
+            flush_size: Buffered records that trigger a write
+        """
+        self.path = Path(path)
+        self.flush_size = flush_size
+        self.counts: Counter = Counter()
+        self._buffer: List[str] = []
+        self._lock = Lock()
+        self._written = 0
+
+    @classmethod
+    def for_run(cls, directory: Path, run_name: str) -> "DeadLetterStore":
+        """
+        Create the store of a run (one file per run).
+
+        Args:
+            directory: Dead-letter directory
+            run_name: Run identifier (e.g., 'historical')
+
+        Returns:
+            DeadLetterStore
+        """
+        started = datetime.now(timezone.utc)
+        return cls(directory / f"dead-letter-{run_name}-{started:%Y%m%dT%H%M%SZ}.jsonl")
+
+    def add(self, letters: Iterable[DeadLetter]) -> None:
+        """
+        Record rejected rows (written when the buffer is full or on flush).
+
+        Args:
+            letters: Dead letters
+        """
+        letters = list(letters)
+        if not letters:
+            return
+        lines = [
+            json.dumps({
+                'source': letter.source,
+                'key': letter.source_key,
+                'row': letter.row,
+                'reason': letter.reason,
+                'values': letter.values,
+                'detail': letter.detail
+            }, ensure_ascii=False, default=str) + "\n"
+            for letter in letters
+        ]
+
+        with self._lock:
+            # Counted per source and reason, e.g. 'historical_csv.out_of_range'
+            self.counts.update(f"{letter.source}.{letter.reason}" for letter in letters)
+            self._buffer.extend(lines)
+            if len(self._buffer) >= self.flush_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write buffered records."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Append the buffer to the file with a single write; the lock must be held."""
+        if not self._buffer:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("".join(self._buffer))
+            self._written += len(self._buffer)
+        except OSError as e:
+            logger.error(f"Failed to write {len(self._buffer)} dead letters to {self.path}: {e}")
+        self._buffer.clear()
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Rejections per source and reason.
+
+        Returns:
+            Mapping of '<source>.<reason>' -> count
+        """
+        with self._lock:
+            return dict(sorted(self.counts.items()))
+
+    def close(self) -> None:
+        """Flush and log where the dead letters were written."""
+        self.flush()
+        if self._written:
+            logger.info(f"Wrote {self._written} rejected rows to {self.path}")
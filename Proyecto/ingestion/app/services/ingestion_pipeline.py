@@ -0,0 +1,142 @@
+"""
+Concurrent ingestion pipeline.
+
+Reads many adapters at the same time while keeping all database work on
+the calling thread:
+- Each adapter's iter_batches() runs in a worker thread (reading files,
+  calling APIs, parsing), limited per source by its max_concurrency
+- Batches are handed to the caller through a bounded queue, so readers
+  cannot run ahead of persistence and memory stays bounded
+- The caller persists and commits each batch with its single session
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.logging_config import get_logger
+from app.providers.base_adapter import BaseExternalApiAdapter
+from app.domain.records import ReadingRecord
+
+logger = get_logger(__name__)
+
+# Queue markers sent by a worker when its adapter is exhausted or fails
+_DONE = object()
+_FAILED = object()
+
+
+@dataclass
+class AdapterTask:
+    """
+    One adapter to read through the pipeline.
+
+    Attributes:
+        source: Name of the configured source (concurrency group)
+        adapter: Adapter to read
+        batch_kwargs: Extra iter_batches() arguments (e.g., start_row)
+        state: Caller data carried along (e.g., the adapter's checkpoint)
+        error: First error raised while reading or consuming the adapter
+        cancelled: Set to stop reading the adapter
+    """
+    source: str
+    adapter: BaseExternalApiAdapter
+    batch_kwargs: Dict[str, Any] = field(default_factory=dict)
+    state: Any = None
+    error: Optional[BaseException] = None
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+
+class IngestionPipeline:
+    """
+    Runs adapter reads concurrently and feeds their batches to one consumer.
+    """
+
+    def __init__(self, max_workers: int = 4, source_limits: Optional[Dict[str, int]] = None,
+                 queue_size: Optional[int] = None):
+        """
+        Initialize pipeline.
+
+        Args:
+            max_workers: Adapters read at the same time in total
+            source_limits: Adapters read at the same time per source (default 1)
+            queue_size: Batches buffered between readers and the consumer
+                (defaults to two per worker)
+        """
+        self.max_workers = max(1, max_workers)
+        self.source_limits = source_limits or {}
+        self.queue_size = queue_size or 2 * self.max_workers
+
+    def run(self, tasks: List[AdapterTask], batch_size: int,
+            consume: Callable[[AdapterTask, List[ReadingRecord], Optional[int]], None],
+            finish: Callable[[AdapterTask], None]) -> None:
+        """
+        Read all tasks and hand their batches to `consume` on this thread.
+
+        If `consume` raises, the task's error is set and its remaining
+        batches are discarded; other tasks continue.
+
+        Args:
+            tasks: Adapters to read
+            batch_size: Readings per batch
+            consume: Called with (task, readings, rows_read) for each batch;
+                rows_read is the adapter's progress when the batch was read
+                (None if the adapter does not track it)
+            finish: Called once per task after its last batch (check
+                task.error to know whether it succeeded)
+        """
+        if not tasks:
+            return
+
+        batches: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        semaphores = {
+            source: threading.Semaphore(self.source_limits.get(source, 1))
+            for source in {task.source for task in tasks}
+        }
+
+        def read(task: AdapterTask) -> None:
+            with semaphores[task.source]:
+                try:
+                    for readings in task.adapter.iter_batches(batch_size, **task.batch_kwargs):
+                        if task.cancelled.is_set():
+                            break
+                        batches.put((task, readings, getattr(task.adapter, 'rows_read', None)))
+                except Exception as e:
+                    batches.put((task, _FAILED, e))
+                    return
+            batches.put((task, _DONE, None))
+
+        remaining = len(tasks)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ingest") as executor:
+            for task in tasks:
+                executor.submit(read, task)
+
+            try:
+                while remaining:
+                    task, item, extra = batches.get()
+
+                    if item is _DONE or item is _FAILED:
+                        remaining -= 1
+                        if item is _FAILED and task.error is None:
+                            task.error = extra
+                        finish(task)
+                        continue
+
+                    if task.error is not None:
+                        continue
+                    try:
+                        consume(task, item, extra)
+                    except Exception as e:
+                        task.error = e
+                        task.cancelled.set()
+            finally:
+                if remaining:
+                    # Unexpected exit: stop the readers and drain the queue
+                    # so none of them stays blocked on it
+                    for task in tasks:
+                        task.cancelled.set()
+                    while remaining:
+                        _, item, _ = batches.get()
+                        if item is _DONE or item is _FAILED:
+                            remaining -= 1
@@ -9,8 +9,10 @@ Coordinates the ingestion process:
 5. Persist to database
 """
 
+import logging
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import yaml
 
 from sqlalchemy.orm import Session
@@ -18,13 +20,34 @@ from sqlalchemy.exc import IntegrityError
 
 from app.config import settings
 from app.db.models import Station, Pollutant, AirQualityReading
-from app.domain.dto import NormalizedReading, StationMetadata
+from app.domain.fingerprint import count_lines, unchanged_prefix
+from app.domain.records import ReadingRecord, validate_records
 from app.providers.base_adapter import BaseExternalApiAdapter
-from app.providers.historical_csv_adapter import HistoricalCsvAdapter
+from app.providers.registry import SourceConfig, adapter_registry
+from app.services.alert_service import AlertEvaluationService
+from app.services.checkpoint_service import Checkpoint, CheckpointStore
+from app.services.dead_letter import (
+    BATCH_ROLLED_BACK,
+    DeadLetter,
+    DeadLetterStore,
+    INVALID_RECORD,
+    PERSIST_ERROR,
+    UNKNOWN_POLLUTANT
+)
+from app.services.ingestion_pipeline import AdapterTask, IngestionPipeline
+from app.services.notification_service import enqueue_notifications
+from app.services.station_resolver import StationResolver
+from app.services.reading_publisher import publish_readings
+from app.services.rollup_service import upsert_hourly_rollups
 from app.logging_config import get_logger
+from app.profiling import NULL_SCOPE, ProfileScope, StageProfiler
 
 logger = get_logger(__name__)
 
+# Source types (see app.providers.registry)
+HISTORICAL_CSV_SOURCE = "historical_csv"
+AQICN_SOURCE = "aqicn"
+
 
 class IngestionService:
     """
@@ -33,17 +56,33 @@ class IngestionService:
     Handles the complete ingestion workflow from data sources to database.
     """
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, profiler: Optional[StageProfiler] = None,
+                 dead_letters: Optional[DeadLetterStore] = None):
         """
         Initialize ingestion service.
         
         Args:
             db_session: SQLAlchemy database session
+            profiler: Stage profiler of the run (timings are not recorded if None)
+            dead_letters: Store of rejected rows (rejections are only logged if None)
         """
         self.db = db_session
-        self.station_cache: Dict[str, int] = {}  # station_code -> station_id
+        self.profiler = profiler
+        self.dead_letters = dead_letters
+        self.stations = StationResolver(db_session, settings.station_match_max_distance_m)
         self.pollutant_cache: Dict[str, int] = {}  # pollutant_name -> pollutant_id
         
+        # Resume points per source, committed together with each batch
+        self.checkpoints = CheckpointStore(db_session)
+        
+        # Alert evaluation runs after each persisted batch
+        self.alert_service: Optional[AlertEvaluationService] = None
+        if settings.alert_evaluation_enabled:
+            self.alert_service = AlertEvaluationService(
+                db_session,
+                debounce_minutes=settings.alert_debounce_minutes
+            )
+        
         logger.info("Ingestion service initialized")
     
     def load_station_mapping_config(self) -> Dict:
@@ -67,61 +106,73 @@ class IngestionService:
         
         return config
     
-    def create_historical_adapters(self) -> List[BaseExternalApiAdapter]:
+    def load_sources(self, config: Dict) -> List[SourceConfig]:
         """
-        Create CSV adapters for all stations in the mapping configuration.
+        Read the enabled sources from the mapping configuration.
+        
+        Without a `sources` section, only the historical CSV files are used.
         
+        Args:
+            config: Station mapping configuration
+            
         Returns:
-            List of HistoricalCsvAdapter instances
+            List of enabled SourceConfig entries
         """
-        config = self.load_station_mapping_config()
-        adapters: List[BaseExternalApiAdapter] = []
-        
-        data_dir = settings.get_historical_data_path()
-        logger.info(f"Historical data directory: {data_dir}")
+        entries = config.get('sources') or [{'type': HISTORICAL_CSV_SOURCE}]
+        sources = [
+            SourceConfig.from_dict(entry, settings.ingestion_source_concurrency)
+            for entry in entries
+        ]
+        return [source for source in sources if source.enabled]
+    
+    def create_adapters(self, source: SourceConfig, config: Dict) -> List[BaseExternalApiAdapter]:
+        """
+        Create the adapters of one configured source.
         
-        stations_config = config.get('stations', [])
-        pollutant_mapping = config.get('pollutant_mapping', {})
+        The adapter class is looked up (and imported) through the registry.
         
-        for station_config in stations_config:
-            csv_filename = station_config.get('csv_file')
-            if not csv_filename:
-                logger.warning(f"Station has no CSV file: {station_config.get('station_name')}")
-                continue
-            
-            csv_path = data_dir / csv_filename
-            
-            # Create StationMetadata DTO
-            station_metadata = StationMetadata(
-                station_code=station_config['station_code'],
-                station_name=station_config['station_name'],
-                city=station_config['city'],
-                country=station_config['country'],
-                latitude=station_config['latitude'],
-                longitude=station_config['longitude'],
-                altitude=station_config.get('altitude'),
-                address=station_config.get('address'),
-                csv_file=csv_filename,
-                geojson_file=station_config.get('geojson_file')
-            )
-            
-            # Create adapter
-            adapter = HistoricalCsvAdapter(
-                csv_file_path=csv_path,
-                station_metadata=station_metadata,
-                pollutant_mapping=pollutant_mapping
-            )
+        Args:
+            source: Configured source
+            config: Station mapping configuration
             
-            adapters.append(adapter)
-        
-        logger.info(f"✓ Created {len(adapters)} CSV adapters")
+        Returns:
+            List of adapters
+        """
+        adapter_class = adapter_registry.get(source.type)
+        adapters = adapter_class.from_config(source, config)
+        logger.info(f"✓ Created {len(adapters)} adapters for source '{source.name}' ({source.type})")
+        return adapters
+    
+    def create_historical_adapters(self) -> List[BaseExternalApiAdapter]:
+        """
+        Create the adapters of all enabled sources in the mapping configuration.
         
+        Returns:
+            List of adapters (HistoricalCsvAdapter instances by default)
+        """
+        config = self.load_station_mapping_config()
+        adapters: List[BaseExternalApiAdapter] = []
+        for source in self.load_sources(config):
+            adapters.extend(self.create_adapters(source, config))
         return adapters
     
-    def run_historical_ingestion(self) -> Dict[str, int]:
+    def run_historical_ingestion(self, from_scratch: bool = False) -> Dict[str, int]:
         """
         Run the complete historical data ingestion process.
         
+        All enabled sources of the mapping configuration are read through
+        one IngestionPipeline: adapters are read concurrently (up to each
+        source's max_concurrency) while batches are persisted and committed
+        here, one at a time.
+        
+        Resumable adapters (CSV files) continue from their checkpoint:
+        unchanged files are skipped, and appended or partially ingested
+        files continue after the last committed row that is still unchanged
+        (see _plan_resume).
+        
+        Args:
+            from_scratch: Ignore (and delete) existing checkpoints
+        
         Returns:
             Statistics dictionary with counts
         """
@@ -131,113 +182,373 @@ class IngestionService:
         
         stats = {
             'adapters_processed': 0,
+            'files_unchanged': 0,
+            'files_resumed': 0,
             'readings_fetched': 0,
             'stations_created': 0,
             'stations_found': 0,
             'readings_inserted': 0,
             'readings_skipped': 0,
+            'alerts_triggered': 0,
             'errors': 0
         }
         
-        # Create adapters
-        adapters = self.create_historical_adapters()
-        
-        # Process each adapter
-        for adapter in adapters:
+        # Create adapters per configured source (classes are imported lazily);
+        # a source that cannot be created does not stop the others
+        config = self.load_station_mapping_config()
+        sources = self.load_sources(config)
+        adapters_by_source: Dict[str, List[BaseExternalApiAdapter]] = {}
+        for source in sources:
             try:
-                logger.info(f"\n{'='*70}")
-                logger.info(f"Processing: {adapter}")
-                logger.info('='*70)
-                
-                # Fetch normalized readings
-                readings = adapter.fetch_readings()
-                stats['readings_fetched'] += len(readings)
-                
-                logger.info(f"Fetched {len(readings)} readings from CSV")
-                
-                # Persist to database
-                logger.info("Persisting readings to database...")
-                result = self._persist_readings(readings)
-                stats['readings_inserted'] += result['inserted']
-                stats['readings_skipped'] += result['skipped']
-                
-                # Summary for this adapter
-                logger.info(f"\nAdapter Summary:")
-                logger.info(f"  Total fetched: {len(readings)}")
-                logger.info(f"  Inserted:      {result['inserted']}")
-                logger.info(f"  Skipped:       {result['skipped']}")
-                
-                stats['adapters_processed'] += 1
+                adapters_by_source[source.name] = self.create_adapters(source, config)
+            except Exception as e:
+                logger.error(f"Error creating adapters for source '{source.name}': {e}")
+                stats['errors'] += 1
+        
+        if from_scratch:
+            for source_tag in {adapter.SOURCE for adapters in adapters_by_source.values()
+                               for adapter in adapters
+                               if adapter.checkpoint_key() or adapter.STATION_CHECKPOINTS}:
+                self.checkpoints.clear(source_tag)
+            self.db.commit()
+        
+        # Decide where each adapter starts (database work stays on this thread)
+        tasks: List[AdapterTask] = []
+        for source_name, adapters in adapters_by_source.items():
+            for adapter in adapters:
+                adapter.profile = self._profile_scope(repr(adapter))
+                adapter.dead_letters = self.dead_letters
+                task = AdapterTask(source=source_name, adapter=adapter,
+                                   state={'fetched': 0, 'inserted': 0, 'skipped': 0, 'errors': 0})
+                if adapter.STATION_CHECKPOINTS:
+                    # Stations not updated since their checkpoint are not fetched again
+                    task.batch_kwargs['since'] = {
+                        key: checkpoint.last_timestamp
+                        for key, checkpoint in self.checkpoints.load(adapter.SOURCE).items()
+                        if checkpoint.last_timestamp
+                    }
+                key = adapter.checkpoint_key()
+                if key is not None:
+                    try:
+                        checkpoint = Checkpoint(source=adapter.SOURCE, source_key=key)
+                        start_row = self._plan_resume(adapter, checkpoint)
+                    except Exception as e:
+                        logger.error(f"Error processing adapter {adapter}: {e}")
+                        self.db.rollback()
+                        self.checkpoints.invalidate()
+                        stats['errors'] += 1
+                        continue
+                    if start_row is None:
+                        stats['files_unchanged'] += 1
+                        continue
+                    if start_row:
+                        stats['files_resumed'] += 1
+                    task.batch_kwargs['start_row'] = start_row
+                    task.state['checkpoint'] = checkpoint
+                tasks.append(task)
+        
+        def consume(task: AdapterTask, readings: List[ReadingRecord], rows_read: Optional[int]) -> None:
+            # Stream batches, committing each one with its checkpoint, so
+            # memory stays bounded and a failure only loses the current batch
+            task.state['fetched'] += len(readings)
+            stats['readings_fetched'] += len(readings)
+            task.adapter.profile.add_rows(len(readings))
+            
+            if task.adapter.STATION_CHECKPOINTS:
+                # Per-station checkpoints: readings already committed are
+                # dropped, and a failed batch only loses its own stations
+                # (the next batches are still persisted)
+                with task.adapter.profile.stage("dedup"):
+                    new_readings, checkpoints = self._filter_checkpointed(task.adapter.SOURCE, readings)
+                task.state['skipped'] += len(readings) - len(new_readings)
+                stats['readings_skipped'] += len(readings) - len(new_readings)
+                if not new_readings:
+                    return
+                try:
+                    result = self._persist_batch(new_readings, checkpoints, task.adapter.profile)
+                except Exception as e:
+                    logger.error(f"Error persisting batch of {task.adapter}: {e}")
+                    task.state['errors'] += 1
+                    stats['errors'] += 1
+                    return
+            else:
+                checkpoint = task.state.get('checkpoint')
+                if checkpoint is not None:
+                    checkpoint.last_row = rows_read
+                    checkpoint.last_timestamp = _latest_timestamp(readings, checkpoint.last_timestamp)
                 
+                result = self._persist_batch(readings, [checkpoint] if checkpoint else None,
+                                             task.adapter.profile)
+            task.state['inserted'] += result['inserted']
+            task.state['skipped'] += result['skipped']
+            stats['readings_inserted'] += result['inserted']
+            stats['readings_skipped'] += result['skipped']
+            stats['alerts_triggered'] += result['alerts_triggered']
+        
+        def finish(task: AdapterTask) -> None:
+            adapter = task.adapter
+            if task.error is not None:
+                logger.error(f"Error processing adapter {adapter}: {task.error}")
+                stats['errors'] += 1
+                return
+            
+            try:
+                # Mark the file as done (also covers trailing rows without readings)
+                checkpoint = task.state.get('checkpoint')
+                if checkpoint is not None:
+                    checkpoint.last_row = getattr(adapter, 'rows_read', checkpoint.last_row)
+                    checkpoint.completed = True
+                    self.checkpoints.save(checkpoint)
+                    self.db.commit()
             except Exception as e:
                 logger.error(f"Error processing adapter {adapter}: {e}")
+                self.db.rollback()
+                self.checkpoints.invalidate()
                 stats['errors'] += 1
-                continue
+                return
+            
+            # Summary for this adapter
+            logger.info(
+                f"✓ {adapter}: fetched {task.state['fetched']}, "
+                f"inserted {task.state['inserted']}, skipped {task.state['skipped']}, "
+                f"failed batches {task.state['errors']}"
+            )
+            stats['adapters_processed'] += 1
         
-        # Final commit
-        try:
-            self.db.commit()
-            logger.info("✓ Database transaction committed")
-        except Exception as e:
-            logger.error(f"Failed to commit transaction: {e}")
-            self.db.rollback()
-            raise
+        pipeline = IngestionPipeline(
+            max_workers=settings.ingestion_max_workers,
+            source_limits={source.name: source.max_concurrency for source in sources}
+        )
+        pipeline.run(tasks, settings.ingestion_batch_size, consume, finish)
         
         # Log summary
         logger.info("\n" + "=" * 70)
         logger.info("Historical ingestion completed")
         logger.info("=" * 70)
         logger.info(f"Adapters processed: {stats['adapters_processed']}")
+        logger.info(f"Files unchanged (skipped): {stats['files_unchanged']}")
+        logger.info(f"Files resumed (new tail only): {stats['files_resumed']}")
         logger.info(f"Readings fetched: {stats['readings_fetched']}")
         logger.info(f"Readings inserted: {stats['readings_inserted']}")
         logger.info(f"Readings skipped (duplicates): {stats['readings_skipped']}")
+        logger.info(f"Alerts triggered: {stats['alerts_triggered']}")
         logger.info(f"Errors: {stats['errors']}")
         logger.info("=" * 70)
         
         return stats
     
-    def _persist_readings(self, readings: List[NormalizedReading]) -> Dict[str, int]:
+    def _plan_resume(self, adapter: BaseExternalApiAdapter, checkpoint: Checkpoint) -> Optional[int]:
+        """
+        Decide where to start reading a file from its previous checkpoint.
+        
+        - Completed and same size/mtime: skipped without reading the file
+        - Same content (only touched): skipped, the new mtime is recorded
+        - Content unchanged up to some byte (appended or interrupted run):
+          resumed after the committed rows that lie in the unchanged prefix
+        - Otherwise: read from the beginning (duplicates are still skipped)
+        
+        Args:
+            adapter: Resumable (file) adapter, e.g. HistoricalCsvAdapter
+            checkpoint: New checkpoint of the file; its fingerprint (and the
+                previous last_timestamp when resuming) is filled in
+            
+        Returns:
+            Data rows to skip, or None if the file does not need to be read
+        """
+        path = adapter.source_path
+        if not path.exists():
+            raise FileNotFoundError(f"Source file not found: {path}")
+        
+        previous = self.checkpoints.get(checkpoint.source, checkpoint.source_key)
+        previous_fingerprint = previous.fingerprint if previous else None
+        
+        if previous_fingerprint and previous.completed and previous_fingerprint.same_stat(path):
+            logger.info("⊘ Unchanged since the last run (size and mtime), skipping")
+            return None
+        
+        fingerprint = adapter.fingerprint()
+        checkpoint.set_fingerprint(fingerprint)
+        if not previous_fingerprint:
+            return 0
+        
+        prefix = unchanged_prefix(path, previous_fingerprint, fingerprint)
+        if previous.completed and prefix == previous_fingerprint.size == fingerprint.size:
+            logger.info("⊘ Content unchanged since the last run, skipping")
+            checkpoint.last_row = previous.last_row
+            checkpoint.last_timestamp = previous.last_timestamp
+            checkpoint.completed = True
+            self.checkpoints.save(checkpoint)
+            self.db.commit()
+            return None
+        
+        # Rows entirely inside the unchanged prefix (minus the header line)
+        prefix_rows = max(0, count_lines(path, prefix) - 1)
+        start_row = min(previous.last_row or 0, prefix_rows)
+        if start_row:
+            checkpoint.last_timestamp = previous.last_timestamp
+            logger.info(
+                f"First {prefix} bytes unchanged since the last run, "
+                f"resuming after row {start_row}"
+            )
+        else:
+            logger.info("File changed since the last run, ingesting it again")
+        return start_row
+    
+    def _filter_checkpointed(self, source: str,
+                             readings: List[ReadingRecord]) -> Tuple[List[ReadingRecord], List[Checkpoint]]:
+        """
+        Drop readings already covered by their station's checkpoint.
+        
+        Args:
+            source: Source type of the readings
+            readings: Batch of readings
+            
+        Returns:
+            Tuple of (new readings, updated checkpoints to save with the batch)
+        """
+        new_readings: List[ReadingRecord] = []
+        updated: Dict[str, Checkpoint] = {}
+        
+        for reading in readings:
+            key = reading.station.external_station_id
+            checkpoint = updated.get(key) or self.checkpoints.get(source, key)
+            if checkpoint and checkpoint.last_timestamp and reading.timestamp_utc <= checkpoint.last_timestamp:
+                continue
+            
+            new_readings.append(reading)
+            if key not in updated:
+                updated[key] = Checkpoint(source=source, source_key=key,
+                                          last_timestamp=checkpoint.last_timestamp if checkpoint else None)
+        
+        for reading in new_readings:
+            checkpoint = updated[reading.station.external_station_id]
+            checkpoint.last_timestamp = _latest_timestamp([reading], checkpoint.last_timestamp)
+        
+        return new_readings, list(updated.values())
+    
+    def _profile_scope(self, name: str) -> ProfileScope:
+        """
+        Get the profiler scope of an adapter.
+        
+        Args:
+            name: Scope name (the adapter's repr)
+            
+        Returns:
+            ProfileScope (records nothing without a profiler)
+        """
+        return self.profiler.scope(name) if self.profiler else NULL_SCOPE
+    
+    def _persist_batch(self, readings: List[ReadingRecord],
+                       checkpoints: Optional[List[Checkpoint]] = None,
+                       profile: ProfileScope = NULL_SCOPE) -> Dict[str, int]:
+        """
+        Persist one batch of readings and commit it.
+        
+        On failure the batch is rolled back (earlier batches stay committed),
+        its readings are written to the dead-letter store and the exception
+        is re-raised.
+        
+        Args:
+            readings: Batch of normalized readings
+            checkpoints: Source progress to commit together with the batch
+            profile: Profiler scope timing the write stages
+            
+        Returns:
+            Dictionary with 'inserted', 'skipped' (of which 'duplicates' and
+            'rejected' as invalid) and 'alerts_triggered' counts
+        """
+        try:
+            with profile.stage("write"):
+                result = self._persist_readings(readings, profile)
+                for checkpoint in checkpoints or ():
+                    self.checkpoints.save(checkpoint)
+            with profile.stage("commit"):
+                self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            # Stations, checkpoints and alert triggers of the rolled back
+            # batch no longer exist
+            self.stations.invalidate()
+            self.checkpoints.invalidate()
+            if self.alert_service:
+                self.alert_service.invalidate()
+            if self.dead_letters is not None:
+                detail = f"{type(e).__name__}: {e}"
+                self.dead_letters.add(_dead_letter(reading, BATCH_ROLLED_BACK, detail) for reading in readings)
+            raise
+        
+        # One summary per batch instead of one line per reading
+        logger.info(
+            "Committed batch: %d readings, %d inserted, %d duplicates, %d invalid, %d skipped",
+            len(readings), result['inserted'], result['duplicates'], result['rejected'], result['skipped'],
+            extra={'batch': {'source': readings[0].source if readings else None, 'readings': len(readings), **result}}
+        )
+        return result
+    
+    def _persist_readings(self, readings: List[ReadingRecord],
+                          profile: ProfileScope = NULL_SCOPE) -> Dict[str, int]:
         """
         Persist normalized readings to the database.
         
+        The batch is validated once here (adapters build records without
+        per-reading validation); invalid records are counted as skipped.
+        
         Args:
             readings: List of normalized readings
+            profile: Profiler scope timing the dedup and alert stages
             
         Returns:
-            Dictionary with 'inserted' and 'skipped' counts
+            Dictionary with 'inserted', 'skipped', 'duplicates', 'rejected'
+            and 'alerts_triggered' counts
         """
-        result = {'inserted': 0, 'skipped': 0}
+        result = {'inserted': 0, 'skipped': 0, 'duplicates': 0, 'rejected': 0, 'alerts_triggered': 0}
+        inserted_readings: List[AirQualityReading] = []
+        
+        readings, rejected = validate_records(readings)
+        # Only a sample of the per-reading problems is logged; the rest are
+        # counted in the batch summary
+        for record, error in rejected[:settings.log_sample_size]:
+            logger.warning(
+                "Invalid reading skipped: %s | %s | %s: %s",
+                record.station.station_name, record.pollutant_code, record.timestamp_utc, error
+            )
+        result['skipped'] += len(rejected)
+        result['rejected'] = len(rejected)
+        letters = [_dead_letter(record, INVALID_RECORD, error) for record, error in rejected]
+        missing_pollutants: Dict[str, int] = {}
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         for reading in readings:
             try:
                 # Get or create station
-                station_id = self._get_or_create_station(reading)
+                station_id = self.stations.resolve(reading.source, reading.station)
                 
                 # Get pollutant ID
                 pollutant_id = self._get_pollutant_id(reading.pollutant_code)
                 
                 if not pollutant_id:
-                    logger.warning(
-                        f"Pollutant '{reading.pollutant_code}' not found in database, skipping"
-                    )
+                    missing_pollutants[reading.pollutant_code] = missing_pollutants.get(reading.pollutant_code, 0) + 1
+                    letters.append(_dead_letter(reading, UNKNOWN_POLLUTANT, "Pollutant not found in database"))
                     result['skipped'] += 1
                     continue
                 
                 # Check for duplicate
-                existing = self.db.query(AirQualityReading).filter(
-                    AirQualityReading.station_id == station_id,
-                    AirQualityReading.pollutant_id == pollutant_id,
-                    AirQualityReading.datetime == reading.timestamp_utc
-                ).first()
+                with profile.stage("dedup"):
+                    existing = self.db.query(AirQualityReading).filter(
+                        AirQualityReading.station_id == station_id,
+                        AirQualityReading.pollutant_id == pollutant_id,
+                        AirQualityReading.datetime == reading.timestamp_utc
+                    ).first()
                 
                 if existing:
                     # Skip duplicate
-                    logger.debug(
-                        f"⊘ DUPLICATE: {reading.station_name} | "
-                        f"{reading.pollutant_code} | "
-                        f"{reading.timestamp_utc.strftime('%Y-%m-%d %H:%M:%S')} | "
-                        f"Value: {reading.value:.2f} {reading.unit} | AQI: {reading.aqi}"
-                    )
+                    if debug:
+                        logger.debug(
+                            "⊘ DUPLICATE: %s | %s | %s | Value: %.2f %s | AQI: %s",
+                            reading.station.station_name, reading.pollutant_code,
+                            reading.timestamp_utc, reading.value, reading.unit, reading.aqi
+                        )
+                    result['duplicates'] += 1
                     result['skipped'] += 1
                     continue
                 
@@ -247,25 +558,32 @@ class IngestionService:
                     pollutant_id=pollutant_id,
                     datetime=reading.timestamp_utc,
                     value=reading.value,
-                    aqi=reading.aqi
+                    aqi=reading.aqi,
+                    source=reading.source
                 )
                 
                 self.db.add(db_reading)
+                inserted_readings.append(db_reading)
                 result['inserted'] += 1
                 
-                # Log detailed information about inserted reading
-                logger.info(
-                    f"✓ INSERTED: {reading.station_name} | "
-                    f"{reading.pollutant_code} | "
-                    f"{reading.timestamp_utc.strftime('%Y-%m-%d %H:%M:%S')} | "
-                    f"Value: {reading.value:.2f} {reading.unit} | AQI: {reading.aqi}"
-                )
+                if debug:
+                    logger.debug(
+                        "✓ INSERTED: %s | %s | %s | Value: %.2f %s | AQI: %s",
+                        reading.station.station_name, reading.pollutant_code,
+                        reading.timestamp_utc, reading.value, reading.unit, reading.aqi
+                    )
                 
             except Exception as e:
-                logger.error(f"Failed to persist reading: {e}")
+                logger.error("Failed to persist reading: %s", e)
+                letters.append(_dead_letter(reading, PERSIST_ERROR, str(e)))
                 result['skipped'] += 1
                 continue
         
+        for pollutant_code, count in missing_pollutants.items():
+            logger.warning("Pollutant '%s' not found in database, skipped %d readings", pollutant_code, count)
+        if letters and self.dead_letters is not None:
+            self.dead_letters.add(letters)
+        
         # Flush to detect any constraint violations
         try:
             self.db.flush()
@@ -274,52 +592,66 @@ class IngestionService:
             self.db.rollback()
             raise
         
+        if inserted_readings:
+            with profile.stage("rollups"):
+                # Keep the hourly rollup in step with the readings (same
+                # transaction); the backend serves history from it
+                upsert_hourly_rollups(self.db, inserted_readings)
+        
+        with profile.stage("alerts"):
+            # Evaluate threshold alerts against the new readings
+            result['alerts_triggered'] = self._evaluate_alerts(inserted_readings)
+        
+        with profile.stage("publish"):
+            # Push new readings to connected dashboards (delivered on commit)
+            self._publish_readings(inserted_readings)
+        
         return result
     
-    def _get_or_create_station(self, reading: NormalizedReading) -> int:
+    def _publish_readings(self, readings: List[AirQualityReading]) -> None:
         """
-        Get existing station ID or create new station.
+        Notify backend processes about newly inserted recent readings.
         
         Args:
-            reading: Normalized reading with station metadata
-            
-        Returns:
-            Station ID
+            readings: Readings inserted by the current batch
         """
-        station_code = reading.external_station_id
-        
-        # Check cache
-        if station_code in self.station_cache:
-            return self.station_cache[station_code]
+        if not settings.readings_notify_enabled or not readings:
+            return
         
-        # Query database
-        station = self.db.query(Station).filter(
-            Station.name == reading.station_name
-        ).first()
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.readings_notify_max_age_minutes)
+        recent = [r for r in readings if r.datetime >= cutoff]
+        if recent:
+            publish_readings(self.db, recent, settings.readings_notify_channel)
+    
+    def _evaluate_alerts(self, readings: List[AirQualityReading]) -> int:
+        """
+        Evaluate user alerts against newly inserted readings.
         
-        if station:
-            self.station_cache[station_code] = station.id
-            logger.debug(f"Found existing station: {station.name} (ID: {station.id})")
-            return station.id
+        Only recent readings are considered, so historical backfills do not
+        trigger alerts for old pollution episodes. Notifications for the
+        triggered alerts are queued in the outbox table.
         
-        # Create new station
-        logger.info(f"Creating new station: {reading.station_name}")
+        Args:
+            readings: Readings inserted by the current batch
+            
+        Returns:
+            Number of alerts triggered
+        """
+        if not self.alert_service or not readings:
+            return 0
         
-        new_station = Station(
-            name=reading.station_name,
-            latitude=reading.latitude,
-            longitude=reading.longitude,
-            city=reading.city,
-            country=reading.country
-        )
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.alert_max_reading_age_minutes)
+        recent = [r for r in readings if r.datetime >= cutoff]
+        if not recent:
+            return 0
         
-        self.db.add(new_station)
-        self.db.flush()  # Get ID
+        triggered = self.alert_service.evaluate(recent)
         
-        self.station_cache[station_code] = new_station.id
-        logger.info(f"✓ Created station: {new_station.name} (ID: {new_station.id})")
+        # Delivery happens in the notification dispatcher, not here
+        if triggered and settings.notifications_enabled:
+            enqueue_notifications(self.db, triggered)
         
-        return new_station.id
+        return sum(len(t.alert_ids) for t in triggered)
     
     def _get_pollutant_id(self, pollutant_code: str) -> Optional[int]:
         """
@@ -348,7 +680,7 @@ class IngestionService:
     
     def preload_caches(self):
         """
-        Preload station and pollutant caches from database.
+        Preload station identities and pollutant cache from database.
         Improves performance by reducing database queries.
         """
         # Load all pollutants
@@ -358,38 +690,35 @@ class IngestionService:
         
         logger.info(f"Preloaded {len(pollutants)} pollutants into cache")
         
-        # Load existing stations
-        stations = self.db.query(Station).all()
-        for s in stations:
-            # We don't have station_code in DB, so use name as key
-            self.station_cache[s.name] = s.id
-        
-        logger.info(f"Preloaded {len(stations)} stations into cache")
+        # Load station identities (external ids and locations)
+        self.stations.preload()
     
-    def run_aqicn_ingestion(self) -> Dict:
+    def run_aqicn_ingestion(self, from_scratch: bool = False) -> Dict:
         """
         Run real-time ingestion from AQICN API.
         
         Fetches current air quality data from AQICN for stations that are
         already in our database, using their coordinates to query the API.
+        Readings not newer than a station's checkpoint were already
+        committed by a previous run and are skipped without database lookups.
+        
+        Args:
+            from_scratch: Ignore (and delete) existing checkpoints
         
         Returns:
             Statistics dictionary with counts
         """
-        from app.providers.aqicn_adapter import AqicnApiAdapter
+        adapter_class = adapter_registry.get(AQICN_SOURCE)
         
         logger.info("=" * 70)
         logger.info("AQICN API INGESTION - UPDATE EXISTING STATIONS")
         logger.info("=" * 70)
         
-        # Initialize AQICN adapter
-        if not settings.aqicn_api_key:
-            raise ValueError("AQICN_API_KEY not configured in environment")
-        
-        adapter = AqicnApiAdapter(
-            api_key=settings.aqicn_api_key,
-            base_url=settings.aqicn_base_url
-        )
+        # Initialize AQICN adapter (token, client and options as for the
+        # `aqicn` source; coordinates come from the database below)
+        (adapter,) = adapter_class.from_config(SourceConfig(name=AQICN_SOURCE, type=AQICN_SOURCE), {})
+        adapter.profile = self._profile_scope(repr(adapter))
+        adapter.dead_letters = self.dead_letters
         
         # Get all stations from database
         logger.info("\n[1/4] Loading existing stations from database...")
@@ -427,54 +756,80 @@ class IngestionService:
         
         # Fetch readings from AQICN for each station's coordinates
         logger.info("\n[2/4] Fetching current data from AQICN API...")
+        logger.info("[3/4] Persisting readings to database (one commit per feed)...")
+        
+        if from_scratch:
+            self.checkpoints.clear(adapter.SOURCE)
+            self.db.commit()
         
-        readings = adapter.fetch_readings(coordinates=coordinates)
+        # Stations not updated since their checkpoint are not fetched again
+        since = {
+            key: checkpoint.last_timestamp
+            for key, checkpoint in self.checkpoints.load(adapter.SOURCE).items()
+            if checkpoint.last_timestamp
+        }
         
-        logger.info(f"✓ Fetched {len(readings)} readings from AQICN")
-        logger.info(f"✓ Fetched {len(readings)} readings from AQICN")
+        # Each feed is persisted and committed as soon as it arrives; only
+        # counts and the latest value per station and pollutant are kept
+        # for the summary
+        total_fetched = 0
+        station_summary: Dict[str, Dict] = {}
+        result = {'inserted': 0, 'skipped': 0, 'alerts_triggered': 0, 'errors': 0}
+        for batch in adapter.iter_batches(settings.ingestion_batch_size, coordinates=coordinates, since=since):
+            total_fetched += len(batch)
+            _summarize_by_station(station_summary, batch)
+            adapter.profile.add_rows(len(batch))
+            with adapter.profile.stage("dedup"):
+                new_readings, checkpoints = self._filter_checkpointed(adapter.SOURCE, batch)
+            result['skipped'] += len(batch) - len(new_readings)
+            if not new_readings:
+                continue
+            try:
+                batch_result = self._persist_batch(new_readings, checkpoints, adapter.profile)
+            except Exception as e:
+                # The batch was rolled back; the next feeds are still ingested
+                logger.error(f"Error persisting AQICN batch of {len(new_readings)} readings: {e}")
+                result['errors'] += 1
+                continue
+            for key in ('inserted', 'skipped', 'alerts_triggered'):
+                result[key] += batch_result[key]
         
-        # Persist to database
-        logger.info("\n[3/4] Persisting readings to database...")
-        result = self._persist_readings(readings)
+        logger.info(f"✓ Fetched {total_fetched} readings from AQICN")
         
-        # Commit transaction
-        logger.info("\n[4/4] Committing transaction...")
-        self.db.commit()
+        if result['errors']:
+            logger.info(f"\n[4/4] Batches committed ({result['errors']} failed and rolled back)")
+        else:
+            logger.info("\n[4/4] All batches committed")
         
         # Generate detailed summary by station
         logger.info("\n" + "=" * 70)
         logger.info("INGESTION SUMMARY")
         logger.info("=" * 70)
         logger.info(f"  Stations queried:       {len(coordinates)}")
-        logger.info(f"  Total readings fetched: {len(readings)}")
+        logger.info(f"  API calls:              {adapter.api_calls}")
+        logger.info(f"  Total readings fetched: {total_fetched}")
         logger.info(f"  Inserted:               {result['inserted']}")
         logger.info(f"  Skipped (duplicates):   {result['skipped']}")
+        logger.info(f"  Alerts triggered:       {result['alerts_triggered']}")
+        logger.info(f"  Failed batches:         {result['errors']}")
         
-        # Group readings by station for detailed summary
-        if readings:
+        if station_summary:
             logger.info("\n" + "-" * 70)
             logger.info("READINGS BY STATION")
             logger.info("-" * 70)
             
-            # Group readings by station name
-            from collections import defaultdict
-            station_readings = defaultdict(list)
-            for reading in readings:
-                station_readings[reading.station_name].append(reading)
-            
-            for station_name, station_data in sorted(station_readings.items()):
-                # Get unique timestamp (should be the same for all readings from same station)
-                timestamp = station_data[0].timestamp_utc.strftime('%Y-%m-%d %H:%M:%S UTC')
+            for station_name, summary in sorted(station_summary.items()):
+                timestamp = summary['timestamp'].strftime('%Y-%m-%d %H:%M:%S UTC')
                 
-                logger.info(f"\n  📍 {station_name} ({station_data[0].city})")
-                logger.info(f"     Timestamp: {timestamp}")
-                logger.info(f"     Pollutants ({len(station_data)}):")
+                logger.info(f"\n  📍 {station_name} ({summary['city']})")
+                logger.info(f"     Latest timestamp: {timestamp}")
+                logger.info(f"     Readings: {summary['count']}, pollutants ({len(summary['latest'])}):")
                 
-                for reading in sorted(station_data, key=lambda x: x.pollutant_code):
+                for code, reading in sorted(summary['latest'].items()):
                     logger.info(
-                        f"       • {reading.pollutant_code:<6} = "
+                        f"       • {code:<6} = "
                         f"{reading.value:>6.2f} {reading.unit:<6} "
-                        f"(AQI: {reading.aqi:>3})"
+                        f"(AQI: {reading.aqi if reading.aqi is not None else '-':>3})"
                     )
         
         logger.info("\n" + "=" * 70)
@@ -482,7 +837,84 @@ class IngestionService:
         
         return {
             'stations_queried': len(coordinates),
-            'total_fetched': len(readings),
+            'api_calls': adapter.api_calls,
+            'total_fetched': total_fetched,
             'inserted': result['inserted'],
-            'skipped': result['skipped']
+            'skipped': result['skipped'],
+            'alerts_triggered': result['alerts_triggered'],
+            'errors': result['errors']
         }
+
+
+def _dead_letter(reading: ReadingRecord, reason: str, detail: str) -> DeadLetter:
+    """
+    Build the dead letter of a rejected reading.
+    
+    Args:
+        reading: Rejected reading
+        reason: Reason code
+        detail: Explanation
+        
+    Returns:
+        DeadLetter keyed by the reading's station
+    """
+    return DeadLetter(
+        source=reading.source or "unknown",
+        source_key=reading.station.external_station_id,
+        row=None,
+        reason=reason,
+        values={
+            'station': reading.station.station_name,
+            'pollutant': reading.pollutant_code,
+            'value': reading.value,
+            'unit': reading.unit,
+            'aqi': reading.aqi,
+            'timestamp': reading.timestamp_utc
+        },
+        detail=detail
+    )
+
+
+def _latest_timestamp(readings: List[ReadingRecord], current: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Latest reading timestamp of a batch.
+    
+    Args:
+        readings: Batch of readings
+        current: Latest timestamp seen before this batch
+        
+    Returns:
+        The later of `current` and the batch's latest timestamp
+    """
+    latest = max((r.timestamp_utc for r in readings), default=None)
+    if current is None or (latest is not None and latest > current):
+        return latest
+    return current
+
+
+def _summarize_by_station(summary: Dict[str, Dict], readings: List[ReadingRecord]) -> None:
+    """
+    Add a batch to the per-station ingestion summary.
+    
+    Keeps a reading count, the latest timestamp and the latest reading per
+    pollutant for each station, so the summary does not hold every reading.
+    
+    Args:
+        summary: Summary by station name, updated in place
+        readings: Batch of readings
+    """
+    for reading in readings:
+        station = summary.get(reading.station.station_name)
+        if station is None:
+            station = summary[reading.station.station_name] = {
+                'city': reading.station.city,
+                'count': 0,
+                'timestamp': reading.timestamp_utc,
+                'latest': {}
+            }
+        station['count'] += 1
+        if reading.timestamp_utc > station['timestamp']:
+            station['timestamp'] = reading.timestamp_utc
+        latest = station['latest'].get(reading.pollutant_code)
+        if latest is None or reading.timestamp_utc >= latest.timestamp_utc:
+            station['latest'][reading.pollutant_code] = reading
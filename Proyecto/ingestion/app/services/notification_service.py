@@ -0,0 +1,318 @@
+"""
+Notification service.
+
+Delivers triggered alerts through a PostgreSQL outbox table:
+1. Ingestion enqueues one outbox row per triggered alert, in the same
+   transaction as the readings and the trigger update (no delivery work)
+2. The dispatcher (`python -m app.main --mode notifications`) claims due
+   rows in batches with FOR UPDATE SKIP LOCKED, so several dispatchers can
+   run concurrently
+3. Claimed rows are grouped per channel and handed to a pluggable transport
+4. Delivered rows are marked 'sent'; failed rows are retried with
+   exponential backoff until the maximum number of attempts is reached
+
+Claiming a row leases it (next_attempt_at is pushed forward), so rows
+claimed by a dispatcher that crashes are picked up again after the lease.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import Pollutant, Station
+from app.notifications.base_transport import BaseNotificationTransport, NotificationMessage
+from app.notifications.file_transport import FileSinkTransport
+from app.notifications.smtp_transport import SmtpTransport
+from app.services.alert_service import TriggeredAlerts
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Alert IDs per INSERT ... SELECT statement when enqueueing
+OUTBOX_ENQUEUE_CHUNK_SIZE = 50_000
+
+_ENQUEUE_SQL = text("""
+    INSERT INTO notification_outbox (
+        alert_id, user_id, channel, recipient, pollutant_id, station_id,
+        value, threshold, reading_datetime, next_attempt_at, created_at
+    )
+    SELECT a.id, a.user_id, a.method, u.email, a.pollutant_id, :station_id,
+           :value, a.threshold, :reading_datetime, :now, :now
+    FROM alert a
+    JOIN app_user u ON u.id = a.user_id
+    WHERE a.id = ANY(:ids)
+""")
+
+_CLAIM_SQL = text("""
+    UPDATE notification_outbox o
+    SET attempts = o.attempts + 1,
+        next_attempt_at = :lease_until
+    FROM (
+        SELECT id FROM notification_outbox
+        WHERE status = 'pending' AND next_attempt_at <= :now
+        ORDER BY next_attempt_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    ) claimed
+    WHERE o.id = claimed.id
+    RETURNING o.id, o.alert_id, o.channel, o.recipient, o.pollutant_id,
+              o.station_id, o.value, o.threshold, o.reading_datetime, o.attempts
+""")
+
+_MARK_SENT_SQL = text("""
+    UPDATE notification_outbox
+    SET status = 'sent', sent_at = :now, last_error = NULL
+    WHERE id = ANY(:ids)
+""")
+
+_MARK_FAILED_SQL = text("""
+    UPDATE notification_outbox
+    SET status = :status, next_attempt_at = :next_attempt_at, last_error = :error
+    WHERE id = :id
+""")
+
+
+def enqueue_notifications(db: Session, triggered: List[TriggeredAlerts]) -> int:
+    """
+    Queue one notification per triggered alert in the outbox table.
+
+    Runs in the caller's transaction, so notifications are only queued if
+    the readings and trigger updates that caused them are committed.
+
+    Args:
+        db: SQLAlchemy database session
+        triggered: Alerts triggered by an ingestion batch
+
+    Returns:
+        Number of notifications queued
+    """
+    queued = 0
+    for group in triggered:
+        for start in range(0, len(group.alert_ids), OUTBOX_ENQUEUE_CHUNK_SIZE):
+            result = db.execute(_ENQUEUE_SQL, {
+                'ids': group.alert_ids[start:start + OUTBOX_ENQUEUE_CHUNK_SIZE],
+                'station_id': group.station_id,
+                'value': group.value,
+                'reading_datetime': group.reading_datetime,
+                'now': group.triggered_at
+            })
+            queued += result.rowcount
+
+    if queued:
+        logger.info(f"Queued {queued} alert notifications")
+    return queued
+
+
+def build_transports() -> Dict[str, BaseNotificationTransport]:
+    """
+    Build the transport registry from settings.
+
+    Email goes through SMTP when `smtp_host` is configured; every other
+    channel (and email without SMTP) is written to the local file sink.
+
+    Returns:
+        Mapping of channel -> transport, with the fallback under '*'
+    """
+    sink = FileSinkTransport(settings.get_notification_sink_path())
+    transports: Dict[str, BaseNotificationTransport] = {'*': sink}
+
+    if settings.smtp_host:
+        transports['email'] = SmtpTransport(
+            host=settings.smtp_host,
+            port=settings.smtp_port,
+            sender=settings.smtp_sender,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            use_tls=settings.smtp_use_tls
+        )
+
+    return transports
+
+
+class NotificationDispatcher:
+    """
+    Delivers queued notifications in batches.
+
+    Each batch is claimed and committed before any transport is called,
+    so slow or failing transports never hold row locks.
+    """
+
+    def __init__(self, db_session: Session,
+                 transports: Optional[Dict[str, BaseNotificationTransport]] = None,
+                 batch_size: int = 500, max_attempts: int = 5,
+                 retry_base_seconds: int = 60, lease_seconds: int = 300):
+        """
+        Initialize notification dispatcher.
+
+        Args:
+            db_session: SQLAlchemy database session
+            transports: Mapping of channel -> transport ('*' is the fallback);
+                built from settings if omitted
+            batch_size: Notifications claimed per batch
+            max_attempts: Attempts before a notification is marked 'failed'
+            retry_base_seconds: Delay before the first retry (doubled per attempt)
+            lease_seconds: Time a claimed notification stays reserved
+        """
+        self.db = db_session
+        self.transports = transports if transports is not None else build_transports()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = timedelta(seconds=retry_base_seconds)
+        self.lease = timedelta(seconds=lease_seconds)
+
+        self.pollutant_names: Dict[int, str] = {}
+        self.station_names: Dict[int, str] = {}
+
+    def load_names(self) -> None:
+        """Load pollutant and station names once for message formatting."""
+        self.pollutant_names = dict(self.db.execute(select(Pollutant.id, Pollutant.name)).all())
+        self.station_names = dict(self.db.execute(select(Station.id, Station.name)).all())
+
+    def dispatch_pending(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Deliver due notifications until none are left.
+
+        Args:
+            max_batches: Stop after this many batches (no limit if None)
+
+        Returns:
+            Dictionary with 'batches', 'sent', 'retried' and 'failed' counts
+        """
+        stats = {'batches': 0, 'sent': 0, 'retried': 0, 'failed': 0}
+        if not self.pollutant_names:
+            self.load_names()
+
+        while max_batches is None or stats['batches'] < max_batches:
+            batch = self.dispatch_batch()
+            if batch is None:
+                break
+            stats['batches'] += 1
+            for key in ('sent', 'retried', 'failed'):
+                stats[key] += batch[key]
+
+        logger.info(
+            f"Notification dispatch finished: {stats['sent']} sent, "
+            f"{stats['retried']} to retry, {stats['failed']} failed "
+            f"in {stats['batches']} batches"
+        )
+        return stats
+
+    def dispatch_batch(self) -> Optional[Dict[str, int]]:
+        """
+        Claim and deliver one batch of notifications.
+
+        Returns:
+            Dictionary with 'sent', 'retried' and 'failed' counts,
+            or None if there was nothing to deliver
+        """
+        now = datetime.now(timezone.utc)
+        rows = self.db.execute(_CLAIM_SQL, {
+            'now': now,
+            'lease_until': now + self.lease,
+            'limit': self.batch_size
+        }).all()
+        self.db.commit()
+
+        if not rows:
+            return None
+
+        by_channel: Dict[str, List[NotificationMessage]] = defaultdict(list)
+        attempts: Dict[int, int] = {}
+        for row in rows:
+            by_channel[row.channel].append(self._build_message(row))
+            attempts[row.id] = row.attempts
+
+        failures: Dict[int, str] = {}
+        for channel, messages in by_channel.items():
+            transport = self.transports.get(channel) or self.transports.get('*')
+            if transport is None:
+                failures.update({m.outbox_id: f"No transport for channel '{channel}'" for m in messages})
+                continue
+            try:
+                failures.update(transport.send_batch(messages))
+            except Exception as e:
+                logger.error(f"Transport {transport!r} failed for channel '{channel}': {e}")
+                failures.update({m.outbox_id: str(e) for m in messages})
+
+        return self._record_results(attempts, failures)
+
+    def _record_results(self, attempts: Dict[int, int],
+                        failures: Dict[int, str]) -> Dict[str, int]:
+        """
+        Mark delivered notifications as sent and schedule retries for failures.
+
+        Args:
+            attempts: Mapping of outbox_id -> attempts made (including this one)
+            failures: Mapping of outbox_id -> error message
+
+        Returns:
+            Dictionary with 'sent', 'retried' and 'failed' counts
+        """
+        now = datetime.now(timezone.utc)
+        result = {'sent': 0, 'retried': 0, 'failed': 0}
+
+        sent_ids = [outbox_id for outbox_id in attempts if outbox_id not in failures]
+        if sent_ids:
+            self.db.execute(_MARK_SENT_SQL, {'ids': sent_ids, 'now': now})
+            result['sent'] = len(sent_ids)
+
+        failed_params = []
+        for outbox_id, error in failures.items():
+            attempt = attempts[outbox_id]
+            if attempt >= self.max_attempts:
+                status = 'failed'
+                result['failed'] += 1
+            else:
+                status = 'pending'
+                result['retried'] += 1
+            failed_params.append({
+                'id': outbox_id,
+                'status': status,
+                'next_attempt_at': now + self.retry_base * (2 ** (attempt - 1)),
+                'error': error[:1000]
+            })
+
+        if failed_params:
+            self.db.execute(_MARK_FAILED_SQL, failed_params)
+
+        self.db.commit()
+        return result
+
+    def _build_message(self, row) -> NotificationMessage:
+        """
+        Build a notification message from a claimed outbox row.
+
+        Args:
+            row: Row returned by the claim query
+
+        Returns:
+            NotificationMessage
+        """
+        pollutant = self.pollutant_names.get(row.pollutant_id, f"pollutant {row.pollutant_id}")
+        station = self.station_names.get(row.station_id, "a monitoring station")
+        reading_time = row.reading_datetime.strftime("%Y-%m-%d %H:%M %Z").strip()
+
+        return NotificationMessage(
+            outbox_id=row.id,
+            channel=row.channel,
+            recipient=row.recipient,
+            subject=f"Air quality alert: {pollutant} above {row.threshold:g}",
+            body=(
+                f"{pollutant} reached {row.value:g} at {station} ({reading_time}), "
+                f"above your alert threshold of {row.threshold:g}."
+            ),
+            alert_id=row.alert_id,
+            pollutant=pollutant,
+            value=row.value,
+            threshold=row.threshold,
+            reading_datetime=row.reading_datetime
+        )
+
+    def close(self) -> None:
+        """Close all transports."""
+        for transport in set(self.transports.values()):
+            transport.close()
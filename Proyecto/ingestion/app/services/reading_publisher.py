@@ -0,0 +1,89 @@
+"""
+Reading publisher.
+
+Announces newly inserted readings to backend processes with PostgreSQL
+NOTIFY, so dashboards receive updates as soon as a batch is committed
+instead of polling. One notification is sent per station with the latest
+value of each pollutant in the batch; NOTIFY is transactional, so nothing
+is delivered if the batch is rolled back.
+"""
+
+import json
+from typing import Dict, Iterable, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.models import AirQualityReading
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+_NOTIFY_SQL = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
+
+
+def build_payloads(readings: Iterable[AirQualityReading]) -> List[str]:
+    """
+    Build one JSON payload per station with its latest reading per pollutant.
+
+    Args:
+        readings: Readings inserted by a batch
+
+    Returns:
+        List of JSON payloads
+    """
+    latest: Dict[int, Dict[int, AirQualityReading]] = {}
+    for reading in readings:
+        station = latest.setdefault(reading.station_id, {})
+        current = station.get(reading.pollutant_id)
+        if current is None or reading.datetime > current.datetime:
+            station[reading.pollutant_id] = reading
+
+    payloads = []
+    for station_id, by_pollutant in latest.items():
+        payload = json.dumps({
+            'station_id': station_id,
+            'readings': [
+                {
+                    'pollutant_id': r.pollutant_id,
+                    'datetime': r.datetime.isoformat(),
+                    'value': r.value,
+                    'aqi': r.aqi
+                }
+                for r in by_pollutant.values()
+            ]
+        }, separators=(',', ':'))
+
+        if len(payload.encode('utf-8')) > MAX_PAYLOAD_BYTES:
+            # Too large to push: clients are told to refetch the station
+            payload = json.dumps({'station_id': station_id, 'readings': None})
+        payloads.append(payload)
+
+    return payloads
+
+
+def publish_readings(db: Session, readings: List[AirQualityReading], channel: str) -> int:
+    """
+    Queue NOTIFY messages for new readings in the caller's transaction.
+
+    All payloads are sent with a single statement; PostgreSQL delivers them
+    to listeners when the transaction commits.
+
+    Args:
+        db: SQLAlchemy database session
+        readings: Readings inserted by a batch
+        channel: NOTIFY channel name
+
+    Returns:
+        Number of notifications queued (one per station)
+    """
+    if not readings:
+        return 0
+
+    payloads = build_payloads(readings)
+    db.execute(_NOTIFY_SQL, {'channel': channel, 'payloads': payloads})
+    logger.debug(f"Queued {len(payloads)} reading notifications on '{channel}'")
+    return len(payloads)
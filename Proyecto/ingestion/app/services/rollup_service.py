@@ -0,0 +1,173 @@
+"""
+Hourly rollup maintenance.
+
+Keeps air_quality_hourly_stats (one row per station, pollutant and UTC hour)
+up to date with the raw readings, so charts over hours to weeks read a few
+hundred pre-aggregated rows instead of scanning 10-minute readings:
+- Each ingestion batch aggregates its inserted readings per hour and merges
+  them into the rollup with INSERT ... ON CONFLICT DO UPDATE, in the same
+  transaction as the readings (a rolled back batch leaves no trace)
+- Rows store sums, counts, minimum and maximum rather than averages, so
+  merging new readings is exact; averages are computed when reading
+- rebuild_hourly_rollups() recomputes the rollup from the raw readings
+  (initial backfill, or after readings were changed outside the ingestion)
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import AirQualityHourlyStats, AirQualityReading
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Rollup rows per INSERT statement (11 parameters each, PostgreSQL allows 65535)
+ROLLUP_UPSERT_CHUNK_SIZE = 5_000
+
+_REBUILD_DELETE_SQL = "DELETE FROM air_quality_hourly_stats{where}"
+
+_REBUILD_INSERT_SQL = """
+INSERT INTO air_quality_hourly_stats (
+    station_id, pollutant_id, hour, readings_count, value_sum, min_value, max_value,
+    aqi_count, aqi_sum, min_aqi, max_aqi
+)
+SELECT
+    station_id,
+    pollutant_id,
+    date_trunc('hour', datetime AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS hour,
+    count(*), sum(value), min(value), max(value),
+    count(aqi), coalesce(sum(aqi), 0), min(aqi), max(aqi)
+FROM air_quality_reading{where}
+GROUP BY 1, 2, 3
+"""
+
+
+def hour_of(timestamp: datetime) -> datetime:
+    """
+    Start of the UTC hour of a timestamp.
+
+    Args:
+        timestamp: Timezone-aware timestamp
+
+    Returns:
+        Timestamp truncated to the hour, in UTC
+    """
+    return timestamp.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def aggregate_hourly(readings: Iterable[AirQualityReading]) -> List[Dict[str, Any]]:
+    """
+    Aggregate readings into rollup rows.
+
+    Args:
+        readings: Readings inserted by a batch
+
+    Returns:
+        One row per (station_id, pollutant_id, hour), sorted by that key so
+        concurrent writers lock rollup rows in the same order
+    """
+    rows: Dict[Tuple[int, int, datetime], Dict[str, Any]] = {}
+    for reading in readings:
+        key = (reading.station_id, reading.pollutant_id, hour_of(reading.datetime))
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = {
+                'station_id': key[0],
+                'pollutant_id': key[1],
+                'hour': key[2],
+                'readings_count': 0,
+                'value_sum': 0.0,
+                'min_value': reading.value,
+                'max_value': reading.value,
+                'aqi_count': 0,
+                'aqi_sum': 0,
+                'min_aqi': None,
+                'max_aqi': None
+            }
+        row['readings_count'] += 1
+        row['value_sum'] += reading.value
+        row['min_value'] = min(row['min_value'], reading.value)
+        row['max_value'] = max(row['max_value'], reading.value)
+        if reading.aqi is not None:
+            row['aqi_count'] += 1
+            row['aqi_sum'] += reading.aqi
+            row['min_aqi'] = reading.aqi if row['min_aqi'] is None else min(row['min_aqi'], reading.aqi)
+            row['max_aqi'] = reading.aqi if row['max_aqi'] is None else max(row['max_aqi'], reading.aqi)
+
+    return [rows[key] for key in sorted(rows)]
+
+
+def upsert_hourly_rollups(db: Session, readings: List[AirQualityReading]) -> int:
+    """
+    Merge newly inserted readings into the hourly rollup.
+
+    Runs in the caller's transaction. Readings must not have been merged
+    before (the ingestion only passes readings it has just inserted).
+
+    Args:
+        db: SQLAlchemy database session
+        readings: Readings inserted by the current batch
+
+    Returns:
+        Number of rollup rows inserted or updated
+    """
+    rows = aggregate_hourly(readings)
+    table = AirQualityHourlyStats.__table__
+    columns = table.c
+
+    for start in range(0, len(rows), ROLLUP_UPSERT_CHUNK_SIZE):
+        statement = insert(table).values(rows[start:start + ROLLUP_UPSERT_CHUNK_SIZE])
+        new = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[columns.station_id, columns.pollutant_id, columns.hour],
+            set_={
+                'readings_count': columns.readings_count + new.readings_count,
+                'value_sum': columns.value_sum + new.value_sum,
+                # LEAST/GREATEST ignore NULLs
+                'min_value': func.least(columns.min_value, new.min_value),
+                'max_value': func.greatest(columns.max_value, new.max_value),
+                'aqi_count': columns.aqi_count + new.aqi_count,
+                'aqi_sum': columns.aqi_sum + new.aqi_sum,
+                'min_aqi': func.least(columns.min_aqi, new.min_aqi),
+                'max_aqi': func.greatest(columns.max_aqi, new.max_aqi)
+            }
+        )
+        db.execute(statement)
+
+    if rows:
+        logger.debug(f"Merged {len(readings)} readings into {len(rows)} hourly rollup rows")
+    return len(rows)
+
+
+def rebuild_hourly_rollups(db: Session, since: Optional[datetime] = None) -> int:
+    """
+    Recompute the hourly rollup from the raw readings and commit.
+
+    Args:
+        db: SQLAlchemy database session
+        since: Only rebuild hours from this timestamp on (all hours if None)
+
+    Returns:
+        Number of rollup rows written
+    """
+    params: Dict[str, Any] = {}
+    delete_where = insert_where = ""
+    if since is not None:
+        params['since'] = hour_of(since)
+        delete_where = " WHERE hour >= :since"
+        insert_where = " WHERE datetime >= :since"
+
+    try:
+        db.execute(text(_REBUILD_DELETE_SQL.format(where=delete_where)), params)
+        result = db.execute(text(_REBUILD_INSERT_SQL.format(where=insert_where)), params)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(f"Hourly rollup rebuilt: {result.rowcount} rows" + (f" since {params['since']}" if since else ""))
+    return result.rowcount
@@ -0,0 +1,214 @@
+"""
+Station identity resolution.
+
+Maps the station identifier of each data source (station_code of the
+mapping file, AQICN idx) to a station id through the station_external_id
+table. All mappings and station locations are preloaded, so a known
+identifier resolves with one dictionary lookup and no database round trip.
+
+An identifier seen for the first time is matched, in order, to:
+1. An existing station with the same name (case-insensitive)
+2. The nearest existing station within `max_distance_m` meters (the same
+   station under another name, e.g. "Carvajal - Sevillana" in AQICN)
+3. A new station
+and the mapping is stored in the caller's transaction, so later readings
+(and later runs) resolve it directly.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Station, StationExternalId
+from app.domain.records import StationInfo
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Mean Earth radius used for distances
+EARTH_RADIUS_M = 6_371_000.0
+
+# How a mapping was established
+MATCH_CREATED = "created"
+MATCH_SPATIAL = "spatial"
+MATCH_NAME = "name"
+
+
+def haversine_m(lat: float, lon: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distance from one point to many points.
+
+    Args:
+        lat: Latitude of the point (degrees)
+        lon: Longitude of the point (degrees)
+        latitudes: Latitudes of the other points (degrees)
+        longitudes: Longitudes of the other points (degrees)
+
+    Returns:
+        Distances in meters
+    """
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+class StationResolver:
+    """
+    In-memory index of station identities backed by station_external_id.
+    """
+
+    def __init__(self, db_session: Session, max_distance_m: float = 1000.0):
+        """
+        Initialize resolver.
+
+        Args:
+            db_session: SQLAlchemy database session
+            max_distance_m: Maximum distance of a spatial match (0 disables it)
+        """
+        self.db = db_session
+        self.max_distance_m = max_distance_m
+        self._by_external_id: Dict[Tuple[str, str], int] = {}
+        self._by_name: Dict[str, int] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._latitudes = np.empty(0, dtype=float)
+        self._longitudes = np.empty(0, dtype=float)
+        self._loaded = False
+
+    def preload(self) -> None:
+        """Load all external-id mappings and station locations (two queries)."""
+        mappings = self.db.execute(
+            select(StationExternalId.source, StationExternalId.external_id, StationExternalId.station_id)
+        ).all()
+        stations = self.db.execute(
+            select(Station.id, Station.name, Station.latitude, Station.longitude)
+        ).all()
+
+        self._by_external_id = {(row.source, row.external_id): row.station_id for row in mappings}
+        self._by_name = {row.name.strip().lower(): row.id for row in stations}
+        self._ids = np.array([row.id for row in stations], dtype=np.int64)
+        self._latitudes = np.array([row.latitude for row in stations], dtype=float)
+        self._longitudes = np.array([row.longitude for row in stations], dtype=float)
+        self._loaded = True
+
+        logger.info(f"Preloaded {len(mappings)} station identities for {len(stations)} stations")
+
+    def invalidate(self) -> None:
+        """Drop the index (after a rollback); it is reloaded on next use."""
+        self._by_external_id.clear()
+        self._loaded = False
+
+    def resolve(self, source: str, station_info: StationInfo) -> int:
+        """
+        Get the station id of a source's station, matching or creating it
+        the first time the identifier is seen.
+
+        Args:
+            source: Source type of the reading
+            station_info: Station metadata of the reading
+
+        Returns:
+            Station ID
+        """
+        key = (source or "unknown", station_info.external_station_id)
+        station_id = self._by_external_id.get(key)
+        if station_id is not None:
+            return station_id
+
+        if not self._loaded:
+            self.preload()
+            station_id = self._by_external_id.get(key)
+            if station_id is not None:
+                return station_id
+
+        station_id, method = self._match(station_info)
+        if station_id is None:
+            station_id, method = self._create(station_info), MATCH_CREATED
+
+        self._save_mapping(key, station_id, method)
+        return station_id
+
+    def _match(self, station_info: StationInfo) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Find an existing station for a new identifier.
+
+        Args:
+            station_info: Station metadata
+
+        Returns:
+            Tuple of (station id, match method), or (None, None)
+        """
+        if station_info.station_name:
+            station_id = self._by_name.get(station_info.station_name.strip().lower())
+            if station_id is not None:
+                logger.info(
+                    f"Matched '{station_info.station_name}' ({station_info.external_station_id}) "
+                    f"to station {station_id} by name"
+                )
+                return station_id, MATCH_NAME
+
+        if (self.max_distance_m > 0 and len(self._ids)
+                and station_info.latitude is not None and station_info.longitude is not None):
+            distances = haversine_m(station_info.latitude, station_info.longitude,
+                                    self._latitudes, self._longitudes)
+            nearest = int(np.argmin(distances))
+            if distances[nearest] <= self.max_distance_m:
+                logger.info(
+                    f"Matched '{station_info.station_name}' ({station_info.external_station_id}) "
+                    f"to station {self._ids[nearest]} at {distances[nearest]:.0f} m"
+                )
+                return int(self._ids[nearest]), MATCH_SPATIAL
+
+        return None, None
+
+    def _create(self, station_info: StationInfo) -> int:
+        """
+        Create a station and add it to the index.
+
+        Args:
+            station_info: Station metadata
+
+        Returns:
+            New station ID
+        """
+        logger.info(f"Creating new station: {station_info.station_name}")
+
+        station = Station(
+            name=station_info.station_name,
+            latitude=station_info.latitude,
+            longitude=station_info.longitude,
+            city=station_info.city,
+            country=station_info.country
+        )
+        self.db.add(station)
+        self.db.flush()  # Get ID
+
+        self._by_name[station.name.strip().lower()] = station.id
+        self._ids = np.append(self._ids, station.id)
+        self._latitudes = np.append(self._latitudes, station.latitude)
+        self._longitudes = np.append(self._longitudes, station.longitude)
+
+        logger.info(f"✓ Created station: {station.name} (ID: {station.id})")
+        return station.id
+
+    def _save_mapping(self, key: Tuple[str, str], station_id: int, method: str) -> None:
+        """
+        Store a mapping in the caller's transaction and in the index.
+
+        Args:
+            key: (source, external id)
+            station_id: Resolved station
+            method: How the station was matched
+        """
+        source, external_id = key
+        self.db.execute(
+            insert(StationExternalId)
+            .values(source=source, external_id=external_id, station_id=station_id,
+                    match_method=method, created_at=datetime.now(timezone.utc))
+            .on_conflict_do_nothing(index_elements=['source', 'external_id'])
+        )
+        self._by_external_id[key] = station_id
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test for the alert index and the alert evaluation service
+Loads alerts from an in-memory session, no database needed
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.models import AirQualityReading
+from app.services.alert_service import AlertEvaluationService, AlertIndex
+
+PM25, PM10 = 1, 2
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+DEBOUNCE = timedelta(minutes=60)
+
+# (alert id, pollutant id, threshold, triggered_at), in any order
+ALERTS = [
+    (11, PM25, 35.5, None),
+    (10, PM25, 12.0, None),
+    (12, PM25, 55.5, None),
+    (20, PM10, 50.0, None),
+]
+
+
+class AlertSession:
+    """Session stand-in serving the alert rows and recording trigger updates"""
+
+    def __init__(self, alerts=ALERTS):
+        self.alerts = alerts
+        self.loads = 0
+        self.updates = []
+
+    def execute(self, statement, params=None):
+        if params is None:
+            self.loads += 1
+            return iter(sorted(self.alerts, key=lambda a: (a[1], a[2])))
+        self.updates.append((params['now'], list(params['ids'])))
+
+
+def reading(pollutant_id, value, station_id=1, minute=0):
+    return AirQualityReading(station_id=station_id, pollutant_id=pollutant_id,
+                             datetime=NOW.replace(minute=minute), value=value)
+
+
+def test_threshold_boundaries():
+    """A value equal to a threshold crosses it; just below does not"""
+    index = AlertIndex.load(AlertSession())
+    assert len(index) == 4
+    assert index.thresholds[PM25].tolist() == [12.0, 35.5, 55.5]
+
+    assert index.match(PM25, 11.99, NOW, DEBOUNCE).tolist() == []
+    assert index.match(PM25, 12.0, NOW, DEBOUNCE).tolist() == [10]
+    assert AlertIndex.load(AlertSession()).match(PM25, 35.51, NOW, DEBOUNCE).tolist() == [10, 11]
+    assert AlertIndex.load(AlertSession()).match(PM25, 500.0, NOW, DEBOUNCE).tolist() == [10, 11, 12]
+    # Pollutants without alerts
+    assert index.match(99, 500.0, NOW, DEBOUNCE).tolist() == []
+
+
+def test_debounce():
+    """A triggered alert is suppressed within the debounce window and fires again after it"""
+    index = AlertIndex.load(AlertSession())
+    assert index.match(PM25, 40.0, NOW, DEBOUNCE).tolist() == [10, 11]
+
+    # Only the newly crossed alert fires inside the window
+    assert index.match(PM25, 60.0, NOW + timedelta(minutes=30), DEBOUNCE).tolist() == [12]
+    assert index.match(PM25, 60.0, NOW + timedelta(minutes=59), DEBOUNCE).tolist() == []
+
+    # Exactly one window after the first trigger
+    assert index.match(PM25, 60.0, NOW + DEBOUNCE, DEBOUNCE).tolist() == [10, 11]
+
+    # triggered_at loaded from the database also debounces
+    recent = [(10, PM25, 12.0, NOW - timedelta(minutes=10)), (11, PM25, 35.5, NOW - DEBOUNCE)]
+    assert AlertIndex.load(AlertSession(recent)).match(PM25, 40.0, NOW, DEBOUNCE).tolist() == [11]
+
+
+def test_peak_per_pollutant():
+    """Each pollutant is matched once, with the reading of its highest value"""
+    db = AlertSession()
+    service = AlertEvaluationService(db, debounce_minutes=60)
+    triggered = service.evaluate([
+        reading(PM25, 20.0, station_id=1),
+        reading(PM10, 49.0, station_id=1),
+        reading(PM25, 40.0, station_id=2, minute=15),
+        reading(PM25, 30.0, station_id=3),
+    ], now=NOW)
+
+    (pm25,) = triggered
+    assert (pm25.pollutant_id, pm25.alert_ids, pm25.station_id, pm25.value) == (PM25, [10, 11], 2, 40.0)
+    assert pm25.reading_datetime == NOW.replace(minute=15)
+    assert db.updates == [(NOW, [10, 11])]
+    assert service.total_triggered == 2
+
+    # A second batch inside the window only updates newly crossed alerts
+    triggered = service.evaluate([reading(PM25, 60.0), reading(PM10, 51.0)], now=NOW + timedelta(minutes=5))
+    assert {t.pollutant_id: t.alert_ids for t in triggered} == {PM25: [12], PM10: [20]}
+    assert db.updates[-1][1] == [12, 20]
+    assert db.loads == 1
+
+
+def test_reload_after_invalidate():
+    """After invalidate() the index is reloaded and in-memory triggers are forgotten"""
+    db = AlertSession()
+    service = AlertEvaluationService(db, debounce_minutes=60)
+    assert len(service.evaluate([reading(PM25, 40.0)], now=NOW)) == 1
+    assert service.evaluate([reading(PM25, 40.0)], now=NOW) == []
+
+    # The batch was rolled back: its triggered_at was never written
+    service.invalidate()
+    assert service.index is None
+    (again,) = service.evaluate([reading(PM25, 40.0)], now=NOW)
+    assert again.alert_ids == [10, 11]
+    assert db.loads == 2
+
+    # Alerts added since the first load are picked up too
+    db.alerts = ALERTS + [(13, PM25, 38.0, None)]
+    service.invalidate()
+    assert service.load_index().alert_ids[PM25].tolist() == [10, 11, 13, 12]
+
+
+if __name__ == "__main__":
+    for test in (test_threshold_boundaries, test_debounce, test_peak_per_pollutant, test_reload_after_invalidate):
+        test()
+        print(f"✅ {test.__name__}")
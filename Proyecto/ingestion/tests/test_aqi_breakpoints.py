@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test for the EPA AQI breakpoint engine and its inverse
+Checks known breakpoint values (EPA-454/B-18-007, Table 5), no database needed
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.domain.aqi import (
+    AQI_BREAKPOINTS, aqi_for_value, aqi_to_int, calculate_aqi, calculate_concentration,
+    concentrations_for_aqi
+)
+
+# (pollutant, averaging period, concentration, expected AQI); None = undefined
+KNOWN_VALUES = [
+    # Bucket edges: C_high of a row and C_low of the next one
+    ("PM2.5", None, 0.0, 0),
+    ("PM2.5", None, 12.0, 50),
+    ("PM2.5", None, 12.1, 51),
+    ("PM2.5", None, 35.4, 100),
+    ("PM2.5", None, 35.5, 101),
+    ("PM2.5", None, 35.9, 102),
+    ("PM2.5", None, 500.4, 500),
+    ("PM10", None, 54, 50),
+    ("PM10", None, 55, 51),
+    ("PM10", None, 604, 500),
+    ("O3", "8h", 54, 50),
+    ("O3", "8h", 70, 100),
+    ("O3", "8h", 71, 101),
+    ("O3", "8h", 200, 300),
+    ("O3", "1h", 125, 101),
+    ("O3", "1h", 405, 301),
+    ("O3", "1h", 604, 500),
+    ("NO2", None, 53, 50),
+    ("NO2", None, 100, 100),
+    ("NO2", None, 2049, 500),
+    ("SO2", "1h", 35, 50),
+    ("SO2", "1h", 304, 200),
+    ("SO2", "24h", 305, 201),
+    ("SO2", "24h", 1004, 500),
+    ("CO", None, 4.4, 50),
+    ("CO", None, 4.5, 51),
+    ("CO", None, 50.4, 500),
+    # Concentrations are truncated, not rounded, before the lookup
+    ("PM2.5", None, 12.09, 50),
+    ("CO", None, 4.49, 50),
+    # Above the scale of the table, or below the first 1-hour O3 row
+    ("PM2.5", None, 500.5, None),
+    ("PM10", None, 605, None),
+    ("O3", "8h", 201, None),
+    ("O3", "1h", 124, None),
+    ("SO2", "1h", 305, None),
+    # Missing or invalid values
+    ("PM2.5", None, -1.0, None),
+    ("PM2.5", None, float("nan"), None),
+    ("BC", None, 10.0, None),
+]
+
+
+def test_aqi_for_value_known_values():
+    """Scalar path matches the EPA breakpoint values"""
+    for code, period, value, expected in KNOWN_VALUES:
+        assert aqi_for_value(code, value, period) == expected, (code, period, value)
+    assert aqi_for_value("PM2.5", None) is None
+
+
+def test_vectorized_known_values():
+    """Vectorized path matches the same values, NaN where undefined"""
+    for code, period, value, expected in KNOWN_VALUES:
+        assert aqi_to_int(calculate_aqi(code, [value], period)) == [expected], (code, period, value)
+
+
+def test_vectorized_matches_scalar():
+    """Both paths agree on every concentration of every table"""
+    for (code, period), table in AQI_BREAKPOINTS.items():
+        step = 10.0 ** -table.decimals
+        values = np.round(np.arange(table.c_min, table.c_max + 2 * step, step / 2), table.decimals + 1)
+        assert aqi_to_int(calculate_aqi(code, values, period)) == [
+            aqi_for_value(code, float(v), period) for v in values
+        ], (code, period)
+
+
+def test_inverse_known_values():
+    """Sub-indices map back to the breakpoint concentrations"""
+    assert calculate_concentration("PM2.5", [0, 50, 51, 100, 101, 500]).tolist() == [0.0, 12.0, 12.1, 35.4, 35.5, 500.4]
+    assert calculate_concentration("CO", [50, 51]).tolist() == [4.4, 4.5]
+    assert np.isnan(calculate_concentration("PM2.5", [501])).all()
+
+
+def test_inverse_extended_tables():
+    """O3 above 300 continues on 1-hour values and SO2 above 200 on 24-hour values"""
+    # O3: 8-hour up to 300, then 1-hour
+    assert calculate_concentration("O3", [100, 300, 301, 500]).tolist() == [70.0, 200.0, 405.0, 604.0]
+    # SO2: 1-hour up to 200, then 24-hour
+    assert calculate_concentration("SO2", [50, 200, 201, 500]).tolist() == [35.0, 304.0, 305.0, 1004.0]
+    # An explicit period does not switch tables
+    assert np.isnan(calculate_concentration("O3", [301], "8h")).all()
+    assert np.isnan(calculate_concentration("SO2", [201], "1h")).all()
+
+    mixed = concentrations_for_aqi(["O3", "SO2", "PM2.5", "BC"], [301, 201, 51, 10])
+    assert mixed[:3].tolist() == [405.0, 305.0, 12.1]
+    assert np.isnan(mixed[3])
+
+
+def test_round_trip():
+    """AQI -> concentration -> AQI is stable for every concentration of every table"""
+    for (code, period), table in AQI_BREAKPOINTS.items():
+        step = 10.0 ** -table.decimals
+        values = np.round(np.arange(table.c_min, table.c_max + step / 2, step), table.decimals)
+        aqi = calculate_aqi(code, values, period)
+        assert not np.isnan(aqi).any(), (code, period)
+        round_trip = calculate_aqi(code, calculate_concentration(code, aqi, period), period)
+        assert (round_trip == aqi).all(), (code, period)
+
+
+if __name__ == "__main__":
+    for test in (test_aqi_for_value_known_values, test_vectorized_known_values, test_vectorized_matches_scalar,
+                 test_inverse_known_values, test_inverse_extended_tables, test_round_trip):
+        test()
+        print(f"✅ {test.__name__}")
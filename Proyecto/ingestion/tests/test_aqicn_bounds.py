@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test for the AQICN region (map bounds) fetch
+Replays recorded API responses from tests/fixtures/aqicn, no token or network needed
+"""
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.providers.aqicn_adapter import AqicnApiAdapter, cluster_bounds
+from app.providers.resilience import OPEN, ProviderClient
+
+FIXTURES = Path(__file__).parent / "fixtures" / "aqicn"
+
+# Our Bogotá stations (lat, lon)
+BOGOTA_STATIONS = [
+    (4.5958, -74.1486),  # Carvajal
+    (4.6907, -74.0827),  # Las Ferias
+    (4.6318, -74.1175),  # Puente Aranda
+    (4.7612, -74.0934),  # Suba
+    (4.6584, -74.0840),  # Centro de Alto Rendimiento
+]
+
+
+class FixtureResponse:
+    """Recorded response (404 when there is no fixture)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.status_code = 200 if path.exists() else 404
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise RuntimeError(f"No fixture {self.path.name}")
+
+    def json(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+class ReplaySession:
+    """requests.Session stand-in serving fixtures by endpoint"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        path = urlparse(url).path.strip("/")
+        self.requests.append(path)
+        if path == "map/bounds":
+            name = "map_bounds.json"
+        elif path.startswith("feed/@"):
+            name = f"feed_{path[len('feed/@'):]}.json"
+        else:
+            name = path.replace("/", "_").replace(":", "_").replace(";", "_") + ".json"
+        return FixtureResponse(FIXTURES / name)
+
+    def close(self):
+        pass
+
+
+def create_adapter():
+    return AqicnApiAdapter(api_key="fixture", use_bounds=True, session=ReplaySession())
+
+
+def test_cluster_bounds():
+    """Stations of one city share a region; another city gets its own"""
+    boxes = cluster_bounds(BOGOTA_STATIONS + [(6.2442, -75.5812)], max_span_deg=1.0)
+    assert len(boxes) == 2
+    for lat, lon in BOGOTA_STATIONS:
+        assert any(b[0] <= lat <= b[2] and b[1] <= lon <= b[3] for b in boxes)
+
+
+def test_bounds_fetch():
+    """One bounds call plus one feed per station with data"""
+    adapter = create_adapter()
+    batches = list(adapter.iter_batches(100, coordinates=BOGOTA_STATIONS))
+
+    station_ids = sorted({r.station.external_station_id for batch in batches for r in batch})
+    # Suba has no current AQI ('-'), Soacha is not the nearest to any station
+    assert station_ids == ["8372", "8373", "8374", "8376"]
+    assert adapter.api_calls == 1 + 4
+    assert adapter.session.requests[0] == "map/bounds"
+
+
+def test_bounds_skips_unchanged_stations():
+    """Stations not updated since their last reading are not fetched"""
+    adapter = create_adapter()
+    last = datetime(2024, 6, 5, 19, 0, tzinfo=timezone.utc)  # 14:00 -05:00
+    since = {"8372": last, "8373": last}
+    batches = list(adapter.iter_batches(100, coordinates=BOGOTA_STATIONS, since=since))
+
+    station_ids = sorted({r.station.external_station_id for batch in batches for r in batch})
+    assert station_ids == ["8374", "8376"]
+    assert adapter.api_calls == 1 + 2
+
+
+def test_circuit_opens_on_outage():
+    """Once the circuit opens, remaining stations fail fast without requests"""
+    session = ReplaySession()
+    session.get = lambda url, params=None, timeout=None: (
+        session.requests.append(url), FixtureResponse(FIXTURES / "missing.json"))[1]
+    client = ProviderClient("aqicn", session, failure_threshold=2, reset_timeout=60)
+    adapter = AqicnApiAdapter(api_key="fixture", client=client)
+
+    assert list(adapter.iter_batches(100, coordinates=BOGOTA_STATIONS)) == []
+    assert client.breaker.state == OPEN
+    assert len(session.requests) == 2
+    assert client.state()["rejected"] == len(BOGOTA_STATIONS) - 2
+
+
+if __name__ == "__main__":
+    for test in (test_cluster_bounds, test_bounds_fetch, test_bounds_skips_unchanged_stations,
+                 test_circuit_opens_on_outage):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test for the columnar cache of the historical CSV adapter
+Writes a temporary CSV file and cache directory, no database needed
+"""
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.domain.dto import StationMetadata
+from app.providers import historical_csv_adapter
+from app.providers.columnar_cache import ColumnarCache
+from app.providers.historical_csv_adapter import HistoricalCsvAdapter
+
+STATION = StationMetadata(
+    station_code="CAR", station_name="Carvajal", city="Bogotá", country="Colombia",
+    latitude=4.5958, longitude=-74.1486, csv_file="carvajal.csv"
+)
+MAPPING = {
+    "pm25": {"name": "PM2.5", "unit": "µg/m³"},
+    "pm10": {"name": "PM10", "unit": "µg/m³"},
+}
+# Small batches so the file is read (and cached) in several chunks
+BATCH_SIZE = 10
+
+
+@contextmanager
+def csv_with_cache(rows=23):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / STATION.csv_file
+        lines = ["date,pm25,pm10"] + [
+            f"2024/1/{day % 28 + 1},{'' if day % 7 == 3 else 10 + day % 40},{20 + day}" for day in range(rows)
+        ]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        yield path, ColumnarCache(Path(tmp) / "cache")
+
+
+def create_adapter(path, cache, mapping=MAPPING, source_timezone="America/Bogota"):
+    return HistoricalCsvAdapter(path, STATION, mapping, source_timezone=source_timezone, columnar_cache=cache)
+
+
+def records(adapter):
+    return [(r.pollutant_code, r.timestamp_utc, r.value, r.aqi)
+            for batch in adapter.iter_batches(BATCH_SIZE) for r in batch]
+
+
+@contextmanager
+def csv_not_parsed():
+    with mock.patch.object(historical_csv_adapter.pd, "read_csv", side_effect=AssertionError("CSV was parsed")):
+        yield
+
+
+def test_second_run_maps_the_cache():
+    """The first run writes the cache chunk by chunk; the second maps it and yields the same records"""
+    with csv_with_cache() as (path, cache):
+        first = records(create_adapter(path, cache))
+        assert len(first) == 23 + 20  # pm10 on every row, pm25 missing on 3 rows
+
+        adapter = create_adapter(path, cache)
+        columns = cache.load(path.name, adapter._cache_key())
+        assert columns is not None
+        assert all(isinstance(values, np.memmap) and len(values) == 23 for values in columns.values())
+
+        with csv_not_parsed():
+            assert records(adapter) == first
+            assert adapter.rows_read == 23
+
+
+def test_cache_matches_parsed_columns():
+    """Appended chunks equal the columns of the whole file parsed at once"""
+    with csv_with_cache() as (path, cache):
+        records(create_adapter(path, cache))
+        cached = create_adapter(path, cache).read_columns()
+        parsed = create_adapter(path, None).read_columns()
+
+        assert cached.keys() == parsed.keys()
+        for name in parsed:
+            assert cached[name].dtype == parsed[name].dtype
+            np.testing.assert_array_equal(cached[name], parsed[name])
+
+
+def test_changed_inputs_make_the_cache_stale():
+    """Another pollutant mapping or timezone does not read the old cache"""
+    with csv_with_cache() as (path, cache):
+        records(create_adapter(path, cache))
+
+        for adapter in (create_adapter(path, cache, mapping={"pm25": MAPPING["pm25"]}),
+                        create_adapter(path, cache, source_timezone="UTC")):
+            assert cache.load(path.name, adapter._cache_key()) is None
+
+        # A changed timezone shifts every timestamp (and rewrites the cache)
+        utc = create_adapter(path, cache, source_timezone="UTC")
+        shifted = records(utc)
+        assert shifted[0][1] != records(create_adapter(path, None))[0][1]
+        assert cache.load(path.name, utc._cache_key()) is not None
+
+
+def test_partial_read_is_not_cached():
+    """A run stopped before the end of the file leaves no cache entry"""
+    with csv_with_cache() as (path, cache):
+        adapter = create_adapter(path, cache)
+        batches = adapter.iter_batches(BATCH_SIZE)
+        next(batches)
+        batches.close()
+
+        assert cache.load(path.name, adapter._cache_key()) is None
+        assert not cache.directory.exists() or list(cache.directory.iterdir()) == []
+
+
+if __name__ == "__main__":
+    for test in (test_second_run_maps_the_cache, test_cache_matches_parsed_columns,
+                 test_changed_inputs_make_the_cache_stale, test_partial_read_is_not_cached):
+        test()
+        print(f"✅ {test.__name__}")
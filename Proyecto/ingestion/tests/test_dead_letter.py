@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test for the dead-letter store and the dead letters of rolled back batches
+Writes to a temporary directory, no database needed
+"""
+import json
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy.exc import OperationalError
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.domain.records import ReadingRecord, StationInfo
+from app.services.dead_letter import (
+    BATCH_ROLLED_BACK, OUT_OF_RANGE, PERSIST_ERROR, DeadLetter, DeadLetterStore
+)
+from app.services.ingestion_service import IngestionService
+
+STATION = StationInfo(external_station_id="CARV-01", station_name="Carvajal", city="Bogotá")
+
+
+def letter(row, reason=OUT_OF_RANGE, source="historical_csv"):
+    return DeadLetter(source=source, source_key="carvajal.csv", row=row, reason=reason,
+                      values={'pm25': "-5"}, detail="negative concentration")
+
+
+def lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@contextmanager
+def store(flush_size=3):
+    with tempfile.TemporaryDirectory() as tmp:
+        yield DeadLetterStore(Path(tmp) / "dead_letter" / "run.jsonl", flush_size=flush_size)
+
+
+def test_no_file_without_rejections():
+    """A run without rejections creates neither the file nor its directory"""
+    with store() as dead_letters:
+        dead_letters.add([])
+        dead_letters.flush()
+        dead_letters.close()
+        assert not dead_letters.path.parent.exists()
+        assert dead_letters.summary() == {}
+
+
+def test_buffered_until_flush_size():
+    """Records are buffered and appended in bulk once the buffer is full"""
+    with store(flush_size=3) as dead_letters:
+        dead_letters.add([letter(0), letter(1)])
+        assert not dead_letters.path.exists()
+
+        dead_letters.add([letter(2), letter(3)])
+        assert [r['row'] for r in lines(dead_letters.path)] == [0, 1, 2, 3]
+
+        dead_letters.add([letter(4)])
+        assert len(lines(dead_letters.path)) == 4
+        dead_letters.close()
+        (last,) = lines(dead_letters.path)[4:]
+        assert last == {'source': "historical_csv", 'key': "carvajal.csv", 'row': 4, 'reason': OUT_OF_RANGE,
+                        'values': {'pm25': "-5"}, 'detail': "negative concentration"}
+
+
+def test_counts_per_source_and_reason():
+    """Rejections are counted per source and reason, flushed or not"""
+    with store(flush_size=100) as dead_letters:
+        dead_letters.add([letter(0), letter(1), letter(2, reason=PERSIST_ERROR)])
+        dead_letters.add([letter(None, source="aqicn")])
+        assert dead_letters.summary() == {
+            "aqicn.out_of_range": 1,
+            "historical_csv.out_of_range": 2,
+            "historical_csv.persist_error": 1,
+        }
+        assert not dead_letters.path.exists()
+
+
+def test_rolled_back_batch_is_dead_lettered():
+    """A batch whose commit fails is rolled back and its readings are written with their reason"""
+    readings = [
+        ReadingRecord(station=STATION, pollutant_code=code, unit="µg/m³", value=12.5,
+                      timestamp_utc=datetime(2024, 1, 1, 5, tzinfo=timezone.utc), source="historical_csv")
+        for code in ("PM2.5", "PM10")
+    ]
+    with store(flush_size=100) as dead_letters:
+        service = IngestionService.__new__(IngestionService)
+        service.db = mock.Mock()
+        service.db.commit.side_effect = OperationalError("COMMIT", {}, Exception("connection lost"))
+        service.stations = mock.Mock()
+        service.checkpoints = mock.Mock()
+        service.alert_service = None
+        service.dead_letters = dead_letters
+        service._persist_readings = mock.Mock(return_value={})
+
+        try:
+            service._persist_batch(readings)
+            raise AssertionError("The commit error should be re-raised")
+        except OperationalError:
+            pass
+
+        service.db.rollback.assert_called_once()
+        assert dead_letters.summary() == {"historical_csv.batch_rolled_back": 2}
+        dead_letters.close()
+        rows = lines(dead_letters.path)
+        assert [(r['key'], r['reason'], r['values']['pollutant']) for r in rows] == [
+            ("CARV-01", BATCH_ROLLED_BACK, "PM2.5"), ("CARV-01", BATCH_ROLLED_BACK, "PM10")
+        ]
+        assert rows[0]['detail'].startswith("OperationalError:")
+
+
+if __name__ == "__main__":
+    for test in (test_no_file_without_rejections, test_buffered_until_flush_size,
+                 test_counts_per_source_and_reason, test_rolled_back_batch_is_dead_lettered):
+        test()
+        print(f"✅ {test.__name__}")
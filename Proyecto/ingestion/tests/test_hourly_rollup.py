@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test for the hourly rollup maintained by the ingestion
+Aggregates in-memory readings, no database needed
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.models import AirQualityReading
+from app.services.rollup_service import aggregate_hourly, hour_of
+
+START = datetime(2024, 6, 5, 13, 0, tzinfo=timezone.utc)
+
+
+def reading(station_id, pollutant_id, minutes, value, aqi=None):
+    return AirQualityReading(station_id=station_id, pollutant_id=pollutant_id,
+                             datetime=START + timedelta(minutes=minutes), value=value, aqi=aqi)
+
+
+def test_hour_of_truncates_in_utc():
+    """Hours are UTC even for readings with another offset"""
+    bogota = timezone(timedelta(hours=-5))
+    assert hour_of(datetime(2024, 6, 5, 8, 50, tzinfo=bogota)) == datetime(2024, 6, 5, 13, 0, tzinfo=timezone.utc)
+
+
+def test_aggregate_hourly():
+    """One row per station, pollutant and hour with sums, counts and extremes"""
+    rows = aggregate_hourly([
+        reading(1, 1, 0, 10.0, 40),
+        reading(1, 1, 10, 20.0, 60),
+        reading(1, 1, 50, 30.0),        # No AQI
+        reading(1, 1, 60, 5.0, 20),     # Next hour
+        reading(1, 2, 20, 7.0, 30),     # Other pollutant
+    ])
+
+    assert [(r['pollutant_id'], r['hour']) for r in rows] == [
+        (1, START), (1, START + timedelta(hours=1)), (2, START)
+    ]
+    first = rows[0]
+    assert first['readings_count'] == 3
+    assert first['value_sum'] == 60.0
+    assert (first['min_value'], first['max_value']) == (10.0, 30.0)
+    assert (first['aqi_count'], first['aqi_sum']) == (2, 100)
+    assert (first['min_aqi'], first['max_aqi']) == (40, 60)
+    assert rows[1]['readings_count'] == 1
+
+
+def test_aggregate_is_mergeable():
+    """Aggregating two batches and summing equals aggregating them together"""
+    batch_a = [reading(1, 1, m, float(m), m) for m in range(0, 60, 10)]
+    batch_b = [reading(1, 1, m, float(m), m) for m in range(5, 60, 10)]
+    (a,), (b,), (both,) = aggregate_hourly(batch_a), aggregate_hourly(batch_b), aggregate_hourly(batch_a + batch_b)
+
+    assert a['readings_count'] + b['readings_count'] == both['readings_count']
+    assert a['value_sum'] + b['value_sum'] == both['value_sum']
+    assert min(a['min_value'], b['min_value']) == both['min_value']
+    assert max(a['max_aqi'], b['max_aqi']) == both['max_aqi']
+
+
+if __name__ == "__main__":
+    for test in (test_hour_of_truncates_in_utc, test_aggregate_hourly, test_aggregate_is_mergeable):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test for the notification dispatcher retry paths
+Serves the outbox from memory (the dispatcher's statements are replayed by
+an in-memory session), no database needed
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.notifications.base_transport import BaseNotificationTransport
+from app.services import notification_service
+from app.services.notification_service import NotificationDispatcher
+
+RETRY_BASE_SECONDS = 60
+LEASE_SECONDS = 300
+
+
+class Crash(BaseException):
+    """Dispatcher process dying mid-batch (not caught like transport errors)"""
+
+
+class OutboxSession:
+    """Session stand-in applying the dispatcher's outbox statements to rows in memory"""
+
+    def __init__(self, *rows):
+        self.rows = {row.id: row for row in rows}
+
+    def execute(self, statement, params):
+        if statement is notification_service._CLAIM_SQL:
+            due = sorted((r for r in self.rows.values()
+                          if r.status == 'pending' and r.next_attempt_at <= params['now']),
+                         key=lambda r: r.next_attempt_at)[:params['limit']]
+            for row in due:
+                row.attempts += 1
+                row.next_attempt_at = params['lease_until']
+            return SimpleNamespace(all=lambda: [SimpleNamespace(**vars(r)) for r in due])
+        if statement is notification_service._MARK_SENT_SQL:
+            for outbox_id in params['ids']:
+                self.rows[outbox_id].status = 'sent'
+                self.rows[outbox_id].sent_at = params['now']
+            return None
+        if statement is notification_service._MARK_FAILED_SQL:
+            for update in params:
+                row = self.rows[update['id']]
+                row.status = update['status']
+                row.next_attempt_at = update['next_attempt_at']
+                row.last_error = update['error']
+            return None
+        raise AssertionError(f"Unexpected statement: {statement}")
+
+    def commit(self):
+        pass
+
+    def age(self, delta):
+        """Move every row's schedule back in time (time passing)"""
+        for row in self.rows.values():
+            row.next_attempt_at -= delta
+
+
+class RecordingTransport(BaseNotificationTransport):
+    """Transport that raises the given exception, or delivers if there is none"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = []
+
+    def send_batch(self, messages):
+        if self.error:
+            raise self.error
+        self.sent.extend(m.outbox_id for m in messages)
+        return {}
+
+
+def outbox_row(outbox_id=1):
+    return SimpleNamespace(
+        id=outbox_id, alert_id=10, channel='email', recipient='user@example.com',
+        pollutant_id=1, station_id=1, value=80.0, threshold=50.0,
+        reading_datetime=datetime(2024, 6, 5, 13, 0, tzinfo=timezone.utc),
+        status='pending', attempts=0, next_attempt_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        last_error=None, sent_at=None
+    )
+
+
+def create_dispatcher(session, transport, max_attempts=3):
+    return NotificationDispatcher(session, transports={'*': transport}, max_attempts=max_attempts,
+                                  retry_base_seconds=RETRY_BASE_SECONDS, lease_seconds=LEASE_SECONDS)
+
+
+def test_backoff_until_failed():
+    """A failing transport is retried with doubling delays, then the row is marked failed"""
+    row = outbox_row()
+    session = OutboxSession(row)
+    dispatcher = create_dispatcher(session, RecordingTransport(ConnectionError("SMTP down")))
+
+    for attempt in (1, 2):
+        started = datetime.now(timezone.utc)
+        assert dispatcher.dispatch_batch() == {'sent': 0, 'retried': 1, 'failed': 0}
+        delay = timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+        assert row.attempts == attempt
+        assert row.status == 'pending'
+        assert row.last_error == "SMTP down"
+        assert started + delay <= row.next_attempt_at <= datetime.now(timezone.utc) + delay
+
+        # Not due again before the backoff expires
+        assert dispatcher.dispatch_batch() is None
+        session.age(delay)
+
+    assert dispatcher.dispatch_batch() == {'sent': 0, 'retried': 0, 'failed': 1}
+    assert (row.attempts, row.status) == (3, 'failed')
+
+    # Failed rows are never claimed again
+    session.age(timedelta(days=1))
+    assert dispatcher.dispatch_batch() is None
+
+
+def test_lease_expiry():
+    """A row claimed by a crashed dispatcher is delivered by another one after the lease"""
+    row = outbox_row()
+    session = OutboxSession(row)
+
+    try:
+        create_dispatcher(session, RecordingTransport(Crash())).dispatch_batch()
+        raise AssertionError("The crash should propagate")
+    except Crash:
+        pass
+    assert (row.attempts, row.status) == (1, 'pending')
+
+    transport = RecordingTransport()
+    dispatcher = create_dispatcher(session, transport)
+    assert dispatcher.dispatch_batch() is None  # Still leased
+
+    session.age(timedelta(seconds=LEASE_SECONDS))
+    assert dispatcher.dispatch_batch() == {'sent': 1, 'retried': 0, 'failed': 0}
+    assert transport.sent == [row.id]
+    assert (row.attempts, row.status) == (2, 'sent')
+
+
+if __name__ == "__main__":
+    for test in (test_backoff_until_failed, test_lease_expiry):
+        test()
+        print(f"✅ {test.__name__}")
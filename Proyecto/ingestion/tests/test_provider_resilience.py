@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test for the resilient provider client (circuit breaker and hedged requests)
+Serves scripted responses from memory, no network needed
+"""
+import sys
+import threading
+from pathlib import Path
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.providers.resilience import (
+    CLOSED, HALF_OPEN, OPEN, MIN_LATENCY_SAMPLES, CircuitBreaker, CircuitOpenError, ProviderClient
+)
+
+URL = "https://provider.test/feed"
+
+
+def response(status_code, body=b"{}"):
+    r = requests.Response()
+    r.status_code = status_code
+    r.url = URL
+    r._content = body
+    return r
+
+
+class ScriptedSession:
+    """requests.Session stand-in answering each request with the next scripted status"""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.requests += 1
+        return response(self.statuses.pop(0))
+
+    def close(self):
+        pass
+
+
+def fail(client, error=requests.RequestException):
+    try:
+        client.get(URL)
+    except error:
+        return
+    raise AssertionError(f"Expected {error.__name__}")
+
+
+def test_half_open_probe_closes_the_circuit():
+    """After the reset timeout one probe is let through; its success closes the circuit"""
+    client = ProviderClient("probe-ok", ScriptedSession(503, 503, 200, 200),
+                            failure_threshold=2, reset_timeout=0, hedge=False)
+    fail(client)
+    fail(client)
+    assert client.breaker.state == OPEN
+
+    assert client.get(URL).status_code == 200
+    assert client.breaker.state == CLOSED
+    assert client.breaker.failures == 0
+    assert client.get(URL).status_code == 200
+
+
+def test_half_open_probe_reopens_the_circuit():
+    """A failed probe opens the circuit again; other calls are rejected meanwhile"""
+    session = ScriptedSession(503, 503, 503)
+    client = ProviderClient("probe-fail", session, failure_threshold=2, reset_timeout=0, hedge=False)
+    fail(client)
+    fail(client)
+
+    fail(client)  # The probe
+    assert client.breaker.state == OPEN
+    assert client.breaker.times_opened == 2
+    assert session.requests == 3
+
+    # Only one probe at a time while half-open
+    breaker = CircuitBreaker("single-probe", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    try:
+        breaker.before_call()
+        raise AssertionError("A second probe should be rejected")
+    except CircuitOpenError:
+        pass
+    assert breaker.rejected == 1
+
+
+def test_open_circuit_rejects_without_sending():
+    """While open (before the reset timeout), calls fail without a request"""
+    session = ScriptedSession(503, 503)
+    client = ProviderClient("open", session, failure_threshold=2, reset_timeout=60, hedge=False)
+    fail(client)
+    fail(client)
+
+    fail(client, CircuitOpenError)
+    assert session.requests == 2
+    assert client.state()["rejected"] == 1
+
+
+def test_client_errors_are_not_outages():
+    """4xx responses are raised but never open the circuit; 5xx do"""
+    client = ProviderClient("client-errors", ScriptedSession(404, 400, 404, 429, 404),
+                            failure_threshold=2, hedge=False)
+    for _ in range(5):
+        fail(client, requests.HTTPError)
+    assert client.breaker.state == CLOSED
+    assert client.breaker.failures == 0
+    assert client.errors == 5
+
+    # A client error also ends a run of server errors
+    client = ProviderClient("mixed-errors", ScriptedSession(503, 404, 503), failure_threshold=2, hedge=False)
+    for _ in range(3):
+        fail(client, requests.HTTPError)
+    assert client.breaker.state == CLOSED
+
+
+def test_hedged_request_returns_the_second_response():
+    """A request slower than the hedge delay is duplicated and the faster copy wins"""
+    release = threading.Event()
+
+    class SlowFirstSession(ScriptedSession):
+        def get(self, url, params=None, timeout=None):
+            self.requests += 1
+            if self.requests == 1:
+                release.wait(timeout)
+                return response(200, b'{"copy": "first"}')
+            return response(200, b'{"copy": "second"}')
+
+    session = SlowFirstSession()
+    client = ProviderClient("hedged", session, max_timeout=5.0, min_timeout=2.0)
+    for _ in range(MIN_LATENCY_SAMPLES):
+        client.latencies.add(0.01)
+
+    try:
+        assert client.get(URL).json() == {"copy": "second"}
+        assert session.requests == 2
+        assert (client.hedged, client.hedge_wins) == (1, 1)
+        assert client.state()["hedge_wins"] == 1
+        assert client.breaker.state == CLOSED
+    finally:
+        release.set()
+        client.close()
+
+
+if __name__ == "__main__":
+    for test in (test_half_open_probe_closes_the_circuit, test_half_open_probe_reopens_the_circuit,
+                 test_open_circuit_rejects_without_sending, test_client_errors_are_not_outages,
+                 test_hedged_request_returns_the_second_response):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test for resuming CSV files from their checkpoint
+Writes temporary CSV files and plans their resume against an in-memory
+checkpoint store, no database needed
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.domain import fingerprint
+from app.domain.fingerprint import fingerprint_file, unchanged_prefix
+from app.services.checkpoint_service import Checkpoint
+from app.services.ingestion_service import IngestionService
+
+# Small blocks so a few rows span several of them; every line is 32 bytes,
+# so a block holds exactly two lines
+BLOCK_SIZE = 64
+ROWS = 20
+
+
+def line(text):
+    return f"{text:<31}\n".encode()
+
+
+HEADER = line("datetime,station,PM2.5")
+
+
+def rows(start, end, value="12.5"):
+    return b"".join(line(f"2024-01-01 {i:05d},CAR,{value}") for i in range(start, end))
+
+
+class MemoryCheckpoints:
+    """CheckpointStore stand-in holding one previous checkpoint"""
+
+    def __init__(self, previous=None):
+        self.previous = previous
+        self.saved = []
+
+    def get(self, source, key):
+        return self.previous
+
+    def save(self, checkpoint):
+        self.saved.append(checkpoint)
+
+
+class FileAdapter:
+    """Resumable adapter stand-in reading one file"""
+
+    def __init__(self, path):
+        self.source_path = path
+
+    def fingerprint(self):
+        return fingerprint_file(self.source_path)
+
+
+@contextmanager
+def csv_file(content):
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(fingerprint, "FINGERPRINT_BLOCK_SIZE", BLOCK_SIZE):
+        path = Path(tmp) / "station.csv"
+        path.write_bytes(content)
+        yield path
+
+
+def write(path, content):
+    """Replace a file's content with a different mtime than before"""
+    mtime = path.stat().st_mtime
+    path.write_bytes(content)
+    os.utime(path, (mtime + 10, mtime + 10))
+
+
+def previous_run(path, last_row=ROWS, completed=True):
+    """Checkpoint left by a run over the file as it is now"""
+    checkpoint = Checkpoint(source="historical_csv", source_key=path.name, last_row=last_row, completed=completed)
+    checkpoint.set_fingerprint(fingerprint_file(path))
+    return checkpoint
+
+
+def plan(path, previous):
+    service = IngestionService.__new__(IngestionService)
+    service.checkpoints = MemoryCheckpoints(previous)
+    service.db = mock.Mock()
+    checkpoint = Checkpoint(source="historical_csv", source_key=path.name)
+    return service._plan_resume(FileAdapter(path), checkpoint), service
+
+
+def test_first_run():
+    """Without a checkpoint the file is read from the first row"""
+    with csv_file(HEADER + rows(0, ROWS)) as path:
+        assert plan(path, None)[0] == 0
+
+
+def test_unchanged_file():
+    """Same size and mtime: skipped; only touched: skipped and recorded"""
+    with csv_file(HEADER + rows(0, ROWS)) as path:
+        previous = previous_run(path)
+        assert plan(path, previous)[0] is None
+
+        write(path, HEADER + rows(0, ROWS))
+        start_row, service = plan(path, previous)
+        assert start_row is None
+        (saved,) = service.checkpoints.saved
+        assert saved.completed and saved.last_row == ROWS
+        assert saved.file_mtime == path.stat().st_mtime
+
+
+def test_appended_file():
+    """Rows appended after a completed run: resume after the previous rows"""
+    with csv_file(HEADER + rows(0, ROWS)) as path:
+        previous = previous_run(path)
+        # The previous content ends mid-block (21 lines of 32 bytes)
+        assert previous.file_size % BLOCK_SIZE
+        write(path, HEADER + rows(0, ROWS + 5))
+
+        assert unchanged_prefix(path, previous.fingerprint, fingerprint_file(path)) == previous.file_size
+        assert plan(path, previous)[0] == ROWS
+
+
+def test_interrupted_run():
+    """Same file after a run that stopped at row 8: resume after row 8"""
+    with csv_file(HEADER + rows(0, ROWS)) as path:
+        assert plan(path, previous_run(path, last_row=8, completed=False))[0] == 8
+
+
+def test_modified_in_the_middle():
+    """A changed row: resume after the rows of the blocks before it"""
+    with csv_file(HEADER + rows(0, ROWS)) as path:
+        previous = previous_run(path)
+        # Data row 10 is line 11 (bytes 320-351), in block 5 (bytes 320-383)
+        write(path, HEADER + rows(0, 9) + rows(9, 10, value="99.9") + rows(10, ROWS))
+
+        assert unchanged_prefix(path, previous.fingerprint, fingerprint_file(path)) == 320
+        assert plan(path, previous)[0] == 9
+
+
+def test_changed_first_block():
+    """A change in the first block: read the whole file again"""
+    with csv_file(HEADER + rows(0, ROWS)) as path:
+        previous = previous_run(path)
+        write(path, line("datetime,station,PM10") + rows(0, ROWS))
+        assert plan(path, previous)[0] == 0
+
+
+def test_truncated_file():
+    """Rows removed from the end: resume within the shorter file"""
+    with csv_file(HEADER + rows(0, ROWS)) as path:
+        previous = previous_run(path)
+        # 13 lines (416 bytes): 6 full blocks plus half a block
+        write(path, HEADER + rows(0, 12))
+
+        assert unchanged_prefix(path, previous.fingerprint, fingerprint_file(path)) == 384
+        assert plan(path, previous)[0] == 11
+
+
+if __name__ == "__main__":
+    for test in (test_first_run, test_unchanged_file, test_appended_file, test_interrupted_run,
+                 test_modified_in_the_middle, test_changed_first_block, test_truncated_file):
+        test()
+        print(f"✅ {test.__name__}")